@@ -0,0 +1,65 @@
+"""add_compliance_export_jobs
+
+Revision ID: a7c4e9b2d618
+Revises: f3a9c7e1d284
+Create Date: 2026-10-17 23:05:12.418907
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c4e9b2d618"
+down_revision: Union[str, Sequence[str], None] = "f3a9c7e1d284"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "compliance_export_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("requested_by", sa.Integer(), nullable=False),
+        sa.Column("company_id", sa.Integer(), nullable=True),
+        sa.Column("format", sa.String(length=10), nullable=False),
+        sa.Column("parameters", sa.JSON(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "COMPLETED", "FAILED", name="exportstatus"),
+            nullable=False,
+        ),
+        sa.Column("rows_total", sa.Integer(), nullable=True),
+        sa.Column("rows_written", sa.Integer(), nullable=False),
+        sa.Column("file_path", sa.String(), nullable=True),
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["requested_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_compliance_export_jobs_id"),
+        "compliance_export_jobs",
+        ["id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_compliance_export_jobs_id"), table_name="compliance_export_jobs"
+    )
+    op.drop_table("compliance_export_jobs")
+    sa.Enum(name="exportstatus").drop(op.get_bind(), checkfirst=True)
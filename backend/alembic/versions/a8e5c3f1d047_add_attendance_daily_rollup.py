@@ -0,0 +1,48 @@
+"""add_attendance_daily_rollup
+
+Revision ID: a8e5c3f1d047
+Revises: d7a3f0b8e215
+Create Date: 2026-10-17 14:05:27.904316
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8e5c3f1d047"
+down_revision: Union[str, Sequence[str], None] = "d7a3f0b8e215"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "attendance_daily_rollup",
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("work_date", sa.Date(), nullable=False),
+        sa.Column("department", sa.String(length=100), nullable=False),
+        sa.Column("hour", sa.Integer(), nullable=False),
+        sa.Column("present_count", sa.Integer(), nullable=False),
+        sa.Column("clock_ins", sa.Integer(), nullable=False),
+        sa.Column("total_hours", sa.Float(), nullable=False),
+        sa.Column("overtime_hours", sa.Float(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"]),
+        sa.PrimaryKeyConstraint("company_id", "work_date", "department", "hour"),
+    )
+    # Populate with: python scripts/backfill_attendance_rollup.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("attendance_daily_rollup")
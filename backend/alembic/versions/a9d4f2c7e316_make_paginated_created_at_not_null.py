@@ -0,0 +1,43 @@
+"""make_paginated_created_at_not_null
+
+Revision ID: a9d4f2c7e316
+Revises: c3f7a1d9e852
+Create Date: 2026-10-17 14:02:41.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d4f2c7e316"
+down_revision: Union[str, Sequence[str], None] = "c3f7a1d9e852"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset pagination seeks on (created_at, id), which skips NULL created_at
+PAGINATED_TABLES = ["tasks", "shifts", "leaves", "documents", "employee_profiles"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in PAGINATED_TABLES:
+        op.execute(
+            f"UPDATE {table} SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) "
+            "WHERE created_at IS NULL"
+        )
+        op.alter_column(
+            table,
+            "created_at",
+            existing_type=sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in PAGINATED_TABLES:
+        op.alter_column(table, "created_at", existing_type=sa.DateTime(), nullable=True)
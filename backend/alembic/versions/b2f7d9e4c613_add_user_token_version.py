@@ -0,0 +1,34 @@
+"""add_user_token_version
+
+Revision ID: b2f7d9e4c613
+Revises: a8e5c3f1d047
+Create Date: 2026-10-17 15:22:51.417032
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f7d9e4c613"
+down_revision: Union[str, Sequence[str], None] = "a8e5c3f1d047"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_version", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
@@ -0,0 +1,40 @@
+"""add_scheduled_tasks
+
+Revision ID: c3f7a1d9e852
+Revises: b6d2e8f4a591
+Create Date: 2026-10-17 11:18:05.662140
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f7a1d9e852"
+down_revision: Union[str, Sequence[str], None] = "b6d2e8f4a591"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scheduled_tasks",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("last_scheduled_at", sa.DateTime(), nullable=True),
+        sa.Column("last_started_at", sa.DateTime(), nullable=True),
+        sa.Column("last_finished_at", sa.DateTime(), nullable=True),
+        sa.Column("last_success_at", sa.DateTime(), nullable=True),
+        sa.Column("last_status", sa.String(length=20), nullable=True),
+        sa.Column("last_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_node", sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("scheduled_tasks")
@@ -0,0 +1,87 @@
+"""add_composite_indexes_for_hot_filters
+
+Revision ID: c4e1a7d2b9f3
+Revises: f19bf976d61f
+Create Date: 2026-10-17 09:12:44.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e1a7d2b9f3"
+down_revision: Union[str, Sequence[str], None] = "f19bf976d61f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    (
+        "ix_attendance_company_status_clock_in",
+        "attendance",
+        ["company_id", "status", "clock_in_time"],
+        None,
+    ),
+    (
+        "ix_attendance_employee_open",
+        "attendance",
+        ["employee_id"],
+        "clock_out_time IS NULL",
+    ),
+    (
+        "ix_audit_logs_user_event_created",
+        "audit_logs",
+        ["user_id", "event_type", "created_at"],
+        None,
+    ),
+    (
+        "ix_audit_logs_ai_security_company_created",
+        "audit_logs",
+        ["company_id", "created_at"],
+        "event_type LIKE 'SECURITY_AI_%'",
+    ),
+    (
+        "ix_notifications_user_company_created",
+        "notifications",
+        ["user_id", "company_id", "created_at"],
+        None,
+    ),
+    (
+        "ix_chat_messages_channel_id_id",
+        "chat_messages",
+        ["channel_id", "id"],
+        None,
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build concurrently so the hot tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,35 @@
+"""add_audit_chain_sequence_unique
+
+Revision ID: c4e8a2b7d915
+Revises: b2f7d9e4c613
+Create Date: 2026-10-17 16:05:12.804417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a2b7d915"
+down_revision: Union[str, Sequence[str], None] = "b2f7d9e4c613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if concurrent appends already produced duplicate positions; those
+    # chains have to be repaired (and re-verified) before upgrading
+    op.create_unique_constraint(
+        "uq_audit_chains_chain_sequence",
+        "audit_chains",
+        ["chain_id", "sequence_number"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_audit_chains_chain_sequence", "audit_chains", type_="unique"
+    )
@@ -0,0 +1,66 @@
+"""add_audit_chain_checkpoints
+
+Revision ID: d5f1c9a3e627
+Revises: c4e8a2b7d915
+Create Date: 2026-10-17 18:22:41.317052
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f1c9a3e627"
+down_revision: Union[str, Sequence[str], None] = "c4e8a2b7d915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "audit_chain_checkpoints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("chain_id", sa.String(), nullable=False),
+        sa.Column("sequence_number", sa.Integer(), nullable=False),
+        sa.Column("entry_hash", sa.String(length=64), nullable=False),
+        sa.Column("signature", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "chain_id",
+            "sequence_number",
+            name="uq_audit_chain_checkpoints_position",
+        ),
+    )
+    op.create_index(
+        op.f("ix_audit_chain_checkpoints_id"),
+        "audit_chain_checkpoints",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_audit_chain_checkpoints_chain_id"),
+        "audit_chain_checkpoints",
+        ["chain_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_audit_chain_checkpoints_chain_id"),
+        table_name="audit_chain_checkpoints",
+    )
+    op.drop_index(
+        op.f("ix_audit_chain_checkpoints_id"), table_name="audit_chain_checkpoints"
+    )
+    op.drop_table("audit_chain_checkpoints")
@@ -0,0 +1,66 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: d7a3f0b8e215
+Revises: c4e1a7d2b9f3
+Create Date: 2026-10-17 11:40:03.552871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a3f0b8e215"
+down_revision: Union[str, Sequence[str], None] = "c4e1a7d2b9f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) backing ORDER BY created_at DESC, id DESC per tenant
+INDEXES = [
+    ("ix_tasks_company_created_id", "tasks", ["company_id", "created_at", "id"]),
+    ("ix_shifts_company_created_id", "shifts", ["company_id", "created_at", "id"]),
+    ("ix_leaves_tenant_created_id", "leaves", ["tenant_id", "created_at", "id"]),
+    (
+        "ix_documents_company_created_id",
+        "documents",
+        ["company_id", "created_at", "id"],
+    ),
+    (
+        "ix_employee_profiles_company_created_id",
+        "employee_profiles",
+        ["company_id", "created_at", "id"],
+    ),
+    ("ix_audit_logs_created_id", "audit_logs", ["created_at", "id"]),
+    (
+        "ix_audit_logs_company_created_id",
+        "audit_logs",
+        ["company_id", "created_at", "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,91 @@
+"""add_audit_chain_merkle_tables
+
+Revision ID: e8b2d4f6a139
+Revises: d5f1c9a3e627
+Create Date: 2026-10-17 20:41:09.552318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b2d4f6a139"
+down_revision: Union[str, Sequence[str], None] = "d5f1c9a3e627"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing chains get their nodes from scripts/backfill_audit_merkle.py
+    # (or lazily, on their next append)
+    op.create_table(
+        "audit_chain_merkle_nodes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("chain_id", sa.String(), nullable=False),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("node_index", sa.Integer(), nullable=False),
+        sa.Column("hash", sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "chain_id",
+            "level",
+            "node_index",
+            name="uq_audit_chain_merkle_nodes_key",
+        ),
+    )
+    op.create_index(
+        op.f("ix_audit_chain_merkle_nodes_id"),
+        "audit_chain_merkle_nodes",
+        ["id"],
+        unique=False,
+    )
+    op.create_table(
+        "audit_chain_merkle_roots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("chain_id", sa.String(), nullable=False),
+        sa.Column("tree_size", sa.Integer(), nullable=False),
+        sa.Column("root_hash", sa.String(length=64), nullable=False),
+        sa.Column("signature", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "chain_id", "tree_size", name="uq_audit_chain_merkle_roots_size"
+        ),
+    )
+    op.create_index(
+        op.f("ix_audit_chain_merkle_roots_id"),
+        "audit_chain_merkle_roots",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_audit_chain_merkle_roots_chain_id"),
+        "audit_chain_merkle_roots",
+        ["chain_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_audit_chain_merkle_roots_chain_id"),
+        table_name="audit_chain_merkle_roots",
+    )
+    op.drop_index(
+        op.f("ix_audit_chain_merkle_roots_id"), table_name="audit_chain_merkle_roots"
+    )
+    op.drop_table("audit_chain_merkle_roots")
+    op.drop_index(
+        op.f("ix_audit_chain_merkle_nodes_id"), table_name="audit_chain_merkle_nodes"
+    )
+    op.drop_table("audit_chain_merkle_nodes")
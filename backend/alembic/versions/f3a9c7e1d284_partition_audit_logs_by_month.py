@@ -0,0 +1,138 @@
+"""partition_audit_logs_by_month
+
+Revision ID: f3a9c7e1d284
+Revises: e8b2d4f6a139
+Create Date: 2026-10-17 22:10:37.640281
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9c7e1d284"
+down_revision: Union[str, Sequence[str], None] = "e8b2d4f6a139"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, event_type, user_id, company_id, resource_type, resource_id, details, "
+    "ip_address, user_agent, created_at, ai_request_text, ai_capability, "
+    "ai_decision, ai_scope_valid, ai_required_role, ai_user_role, ai_severity"
+)
+
+COLUMN_DEFINITIONS = """
+    id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+    event_type varchar NOT NULL,
+    user_id integer NOT NULL,
+    company_id integer,
+    resource_type varchar,
+    resource_id integer,
+    details json,
+    ip_address varchar,
+    user_agent text,
+    created_at timestamp without time zone NOT NULL DEFAULT now(),
+    ai_request_text text,
+    ai_capability varchar,
+    ai_decision varchar,
+    ai_scope_valid boolean,
+    ai_required_role varchar,
+    ai_user_role varchar,
+    ai_severity varchar
+"""
+
+INDEXES = (
+    "CREATE INDEX ix_audit_logs_id ON audit_logs (id)",
+    "CREATE INDEX ix_audit_logs_event_type ON audit_logs (event_type)",
+    "CREATE INDEX ix_audit_logs_user_id ON audit_logs (user_id)",
+    "CREATE INDEX ix_audit_logs_company_id ON audit_logs (company_id)",
+    "CREATE INDEX ix_audit_logs_user_event_created "
+    "ON audit_logs (user_id, event_type, created_at)",
+    "CREATE INDEX ix_audit_logs_ai_security_company_created "
+    "ON audit_logs (company_id, created_at) "
+    "WHERE event_type LIKE 'SECURITY_AI_%'",
+    "CREATE INDEX ix_audit_logs_created_id ON audit_logs (created_at, id)",
+    "CREATE INDEX ix_audit_logs_company_created_id "
+    "ON audit_logs (company_id, created_at, id)",
+)
+
+
+def _swap_tables(create_new: str):
+    """Move audit_logs aside and create its replacement (see _finish_swap)"""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_old")
+    # The id sequence is owned by the old table; keep it across the swap
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    op.execute(create_new)
+
+
+def _finish_swap(primary_key: str):
+    """Copy rows into the new audit_logs, then restore its keys and indexes"""
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) "
+        f"SELECT {COLUMNS.replace('created_at', 'COALESCE(created_at, now())')} "
+        "FROM audit_logs_old"
+    )
+    op.execute("DROP TABLE audit_logs_old")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(f"ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey {primary_key}")
+    op.execute(
+        "ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id)"
+    )
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # The partition key has to be part of the primary key. Existing rows are
+    # copied, so this needs a maintenance window on large installations.
+    _swap_tables(
+        f"CREATE TABLE audit_logs ({COLUMN_DEFINITIONS}) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    # One partition per month from the oldest row through three months ahead;
+    # scripts/manage_audit_partitions.py keeps creating them afterwards
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(
+                        (SELECT min(created_at) FROM audit_logs_old), now()
+                    )),
+                    date_trunc('month', now()) + interval '3 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_p' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END
+        $$
+        """
+    )
+    _finish_swap("PRIMARY KEY (id, created_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Detached partitions are not copied back
+    _swap_tables(f"CREATE TABLE audit_logs ({COLUMN_DEFINITIONS})")
+    _finish_swap("PRIMARY KEY (id)")
@@ -21,12 +21,17 @@ def verify_password(plain: str, hashed: str) -> bool:
 
 
 def create_access_token(
-    sub: str, company_id: int | None, role: str, expires_minutes: int = 15
+    sub: str,
+    company_id: int | None,
+    role: str,
+    expires_minutes: int = 15,
+    token_version: int = 0,
 ) -> str:
     payload = {
         "sub": sub,
         "company_id": company_id,
         "role": role,
+        "tv": token_version,
         "exp": datetime.utcnow() + timedelta(minutes=expires_minutes),
         "type": "access",
     }
@@ -1,9 +1,15 @@
+import base64
+import hashlib
 import json
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import insert, text, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query, Session
 from sqlalchemy.sql import func
 
 from app.models.company import Company
@@ -23,6 +29,210 @@ logger = structlog.get_logger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+# Keyset pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def paginate_keyset(
+    query: Query, model, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+):
+    """
+    Return one page of ``query`` newest first, keyed on (created_at, id), and
+    the cursor for the next page (None on the last page). Cursors are opaque
+    to clients; an undecodable one raises InvalidCursorError.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (created_at, row_id))
+
+    # One extra row tells us whether another page exists without a COUNT
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+# Bulk writes
+BULK_BATCH_SIZE = 500
+MAX_BULK_ROWS = 5000
+
+
+def validate_bulk_rows(schema, rows: List[Dict[str, Any]]):
+    """
+    Validate each raw row against ``schema`` independently. Returns
+    (valid, errors): (request index, model) pairs and {"index", "errors"}.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as e:
+            errors.append(
+                {
+                    "index": index,
+                    "errors": [
+                        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ],
+                }
+            )
+    return valid, errors
+
+
+def _execute_batch(
+    db: Session, stmt, batch, batch_indexes, table: str, returning: bool = False
+):
+    """
+    Run ``stmt`` for ``batch`` in one transaction. If the database rejects
+    the batch, retry its rows one transaction each so only the offending
+    rows fail. Returns (results, errors), results being the RETURNING rows
+    as dicts when ``returning`` is set.
+    """
+
+    def execute(params):
+        result = db.execute(stmt, params)
+        return [dict(row._mapping) for row in result] if returning else []
+
+    try:
+        results = execute(batch)
+        db.commit()
+        return results, []
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning(
+            "Bulk batch failed, retrying row by row",
+            table=table,
+            batch_size=len(batch),
+            error=str(e.orig if hasattr(e, "orig") else e),
+        )
+
+    results, errors = [], []
+    for row, index in zip(batch, batch_indexes):
+        try:
+            results.extend(execute([row]))
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            errors.append({"index": index, "errors": ["Database rejected this row"]})
+    return results, errors
+
+
+def bulk_insert(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    indexes: Optional[List[int]] = None,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Insert ``rows`` with one multi-row INSERT ... RETURNING per batch and one
+    transaction per batch. Returns (created, errors): created rows as column
+    dicts ordered by id, and {"index", "errors"} for rows the database
+    rejected, indexed by ``indexes`` (the rows' request positions) when
+    given. A rejected batch is retried row by row, so one bad row does not
+    fail its neighbours.
+    """
+    indexes = indexes if indexes is not None else list(range(len(rows)))
+    # Asking RETURNING for parameter order makes some dialects fall back to
+    # one INSERT per row, so batches are sorted by id instead
+    stmt = insert(model).returning(*model.__table__.c)
+    created, errors = [], []
+    for start in range(0, len(rows), batch_size):
+        inserted, failed = _execute_batch(
+            db,
+            stmt,
+            rows[start : start + batch_size],
+            indexes[start : start + batch_size],
+            model.__tablename__,
+            returning=True,
+        )
+        created.extend(sorted(inserted, key=lambda row: row["id"]))
+        errors.extend(failed)
+    return created, errors
+
+
+def bulk_update(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    indexes: Optional[List[int]] = None,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Update rows by primary key (each dict carries "id" plus the changed
+    columns) with one executemany UPDATE and commit per batch. Returns
+    {"index", "errors"} for rows the database rejected, as in bulk_insert.
+    """
+    indexes = indexes if indexes is not None else list(range(len(rows)))
+    errors = []
+    for start in range(0, len(rows), batch_size):
+        _, failed = _execute_batch(
+            db,
+            update(model),
+            rows[start : start + batch_size],
+            indexes[start : start + batch_size],
+            model.__tablename__,
+        )
+        errors.extend(failed)
+    return errors
+
+
+def upsert_insert(db: Session, table):
+    """
+    Dialect-specific INSERT that supports on_conflict_do_update, for
+    set-based merges on PostgreSQL and SQLite (tests)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return dialect_insert(table)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg_advisory locks (hash() is per-process)"""
+    return int.from_bytes(
+        hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True
+    )
+
+
+def advisory_xact_lock(db: Session, name: str):
+    """
+    Take a PostgreSQL transaction-level advisory lock on ``name``, held until
+    the session's transaction commits or rolls back. No-op on other dialects
+    (SQLite serializes writers anyway).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": advisory_lock_key(name)},
+        )
+
+
 def get_user_by_email(
     db: Session, email: str, company_id: Optional[int] = None
 ) -> Optional[User]:
@@ -554,7 +764,7 @@ def list_shifts_by_company(db: Session, company_id: int):
     return db.query(Shift).filter(Shift.company_id == company_id).all()
 
 
-from app.models.attendance import Attendance, Break
+from app.models.attendance import Attendance, AttendanceDailyRollup, Break
 from app.models.payroll import Allowance, Bonus, Deduction
 from app.models.payroll import Employee as PayrollEmployee
 from app.models.payroll import PayrollEntry, PayrollRun, Salary
@@ -1031,7 +1241,10 @@ def clock_out_attendance(db: Session, attendance_id: int, notes: str = None):
     attendance.status = "completed"
     # Calculate total hours
     if attendance.clock_in_time and attendance.clock_out_time:
-        duration = attendance.clock_out_time - attendance.clock_in_time
+        clock_in = attendance.clock_in_time
+        if clock_in.tzinfo is None:  # drivers without timezone support
+            clock_in = clock_in.replace(tzinfo=timezone.utc)
+        duration = attendance.clock_out_time - clock_in
         attendance.total_hours = duration.total_seconds() / 3600
     db.commit()
     db.refresh(attendance)
@@ -1077,7 +1290,7 @@ def end_break(db: Session, break_id: int):
 from datetime import date, timedelta
 from typing import Any, Dict, List
 
-from sqlalchemy import and_, distinct, extract, func, or_
+from sqlalchemy import distinct
 
 
 def get_attendance_heatmap(
@@ -1090,24 +1303,23 @@ def get_attendance_heatmap(
         db.query(func.count(User.id)).filter(User.company_id == company_id).scalar()
     )
 
-    # Daily attendance counts
+    # Daily attendance counts from the rollup
     daily_data = (
         db.query(
-            func.date(Attendance.clock_in_time).label("date"),
-            func.count(distinct(Attendance.employee_id)).label("present"),
+            AttendanceDailyRollup.work_date.label("date"),
+            func.sum(AttendanceDailyRollup.present_count).label("present"),
         )
         .filter(
-            Attendance.company_id == company_id,
-            Attendance.clock_in_time >= start_date,
-            Attendance.clock_in_time <= end_date,
-            Attendance.status == "active",
+            AttendanceDailyRollup.company_id == company_id,
+            AttendanceDailyRollup.work_date >= start_date,
+            AttendanceDailyRollup.work_date <= end_date,
         )
-        .group_by(func.date(Attendance.clock_in_time))
+        .group_by(AttendanceDailyRollup.work_date)
         .all()
     )
 
     # Convert to dict for easy lookup
-    data_dict = {row.date: row.present for row in daily_data}
+    data_dict = {row.date: int(row.present) for row in daily_data}
     result = []
 
     current_date = start_date
@@ -1198,52 +1410,40 @@ def get_overtime_trend(
 
     if period == "weekly":
         # Last 12 weeks
-        start_date = now - timedelta(weeks=12)
-        group_expr = extract("week", Attendance.clock_in_time)
-        label_expr = func.concat(
-            extract("year", Attendance.clock_in_time),
-            "-",
-            func.lpad(extract("week", Attendance.clock_in_time), 2, "0"),
-        )
+        start_date = (now - timedelta(weeks=12)).date()
+        label_format = "%Y-%W"
     else:
         # Last 12 months
-        start_date = now - timedelta(days=365)
-        group_expr = extract("month", Attendance.clock_in_time)
-        label_expr = func.concat(
-            extract("year", Attendance.clock_in_time),
-            "-",
-            func.lpad(extract("month", Attendance.clock_in_time), 2, "0"),
-        )
+        start_date = (now - timedelta(days=365)).date()
+        label_format = "%Y-%m"
 
+    rollup = AttendanceDailyRollup
     query = (
         db.query(
-            label_expr.label("period"),
-            EmployeeProfile.department.label("dept"),
-            func.sum(Attendance.overtime_hours).label("hours"),
+            rollup.work_date,
+            rollup.department,
+            func.sum(rollup.overtime_hours).label("hours"),
         )
-        .outerjoin(EmployeeProfile, EmployeeProfile.user_id == Attendance.employee_id)
         .filter(
-            Attendance.company_id == company_id,
-            Attendance.clock_in_time >= start_date,
-            Attendance.overtime_hours > 0,
+            rollup.company_id == company_id,
+            rollup.work_date >= start_date,
+            rollup.overtime_hours > 0,
         )
-        .group_by(label_expr, EmployeeProfile.department)
+        .group_by(rollup.work_date, rollup.department)
     )
 
     if dept_filter:
-        query = query.filter(EmployeeProfile.department == dept_filter)
+        query = query.filter(rollup.department == dept_filter)
 
-    overtime_data = query.all()
+    # Daily rows are bucketed into periods here, which keeps the SQL portable
+    totals: Dict[tuple, float] = {}
+    for row in query.all():
+        key = (row.work_date.strftime(label_format), row.department or "Unknown")
+        totals[key] = totals.get(key, 0.0) + (row.hours or 0.0)
 
     result = []
-    for row in overtime_data:
-        result.append(
-            {
-                "period": row.period,
-                "dept": row.dept or "Unknown",
-                "hours": row.hours or 0.0,
-            }
-        )
+    for (period_label, dept), hours in sorted(totals.items()):
+        result.append({"period": period_label, "dept": dept, "hours": hours})
 
     return result
 
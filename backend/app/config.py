@@ -1,11 +1,56 @@
 # app/config.py
 import os
+from typing import Optional
 
 from pydantic import validator
 from pydantic_settings import BaseSettings
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.db_pool import engine_options
+
+
+# Named engine profiles: pool sizing, liveness checks and per-statement timeout
+ENGINE_PROFILES = {
+    "dev": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_timeout": 30,
+        "statement_timeout_ms": 0,
+        "echo": True,
+    },
+    "test": {
+        "pool_size": 2,
+        "max_overflow": 2,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+        "pool_timeout": 5,
+        "statement_timeout_ms": 10000,
+        "echo": False,
+    },
+    "prod": {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_timeout": 10,
+        "statement_timeout_ms": 15000,
+        "echo": False,
+    },
+}
+
+APP_ENV_PROFILES = {
+    "dev": "dev",
+    "development": "dev",
+    "test": "test",
+    "testing": "test",
+    "staging": "prod",
+    "prod": "prod",
+    "production": "prod",
+}
+
 
 class Settings(BaseSettings):
     # PostgreSQL settings
@@ -20,6 +65,133 @@ class Settings(BaseSettings):
         f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
 
+    # Read replica for read-only endpoints; empty means reads use the primary
+    DATABASE_REPLICA_URL: str = ""
+
+    # Per-request SQL query budget; SQL_QUERY_BUDGETS overrides it per route
+    # template, e.g. {"/api/chat/messages/history": 5}
+    SQL_QUERY_BUDGET: int = 50
+    SQL_QUERY_BUDGETS: dict[str, int] = {}
+
+    # Budget for importing app.main in a fresh interpreter (cold start);
+    # enforced by test_startup_budget and reported by scripts/profile_startup.py
+    STARTUP_IMPORT_BUDGET_SECONDS: float = 6.0
+
+    # Per-company dashboard KPI snapshots are dropped on task/leave/shift
+    # writes in this process; the TTL bounds staleness across workers
+    KPI_SNAPSHOT_TTL_SECONDS: int = 60
+
+    # Principal cache for get_current_user: a short-lived per-process LRU in
+    # front of Redis. Entries are dropped when a user's role, company,
+    # active or locked state changes.
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 300
+
+    # ?stream=ndjson mode: rows fetched per server-side cursor batch, and
+    # sent per response chunk
+    NDJSON_STREAM_BATCH_SIZE: int = 1000
+
+    # Audit log durability: "sync" commits each event in the caller's session;
+    # "async" hands events to an in-process queue that a background thread
+    # inserts in batches (flushed on shutdown, dropped when the queue is full)
+    AUDIT_LOG_DURABILITY: str = "sync"
+    AUDIT_LOG_QUEUE_SIZE: int = 10000
+    AUDIT_LOG_BATCH_SIZE: int = 500
+    AUDIT_LOG_FLUSH_INTERVAL_SECONDS: float = 0.2
+    AUDIT_LOG_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+
+    # Monthly audit_logs partitions (PostgreSQL): scripts/manage_audit_partitions.py
+    # keeps MONTHS_AHEAD future months created and detaches partitions older
+    # than RETENTION_MONTHS (0 keeps everything attached)
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD: int = 3
+    AUDIT_LOG_PARTITION_RETENTION_MONTHS: int = 24
+
+    # The live threat feed only looks this far back, so it reads the newest
+    # audit_logs partitions rather than all of them
+    THREAT_FEED_LOOKBACK_DAYS: int = 30
+
+    # Cold storage: scripts/archive_cold_data.py moves audit_logs, audit_chains
+    # and chat_messages rows older than RETENTION_DAYS to zstd-compressed JSONL
+    # files under ARCHIVE_DIR (audit chain entries only up to a signed
+    # checkpoint). Compliance exports read archived and live rows together.
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_RETENTION_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 5000
+    # Rows per archive part; bounds what one run holds in memory
+    ARCHIVE_PART_ROWS: int = 100000
+    ARCHIVE_ZSTD_LEVEL: int = 10
+
+    # Background compliance exports (run by the job workers): files are
+    # written under EXPORT_DIR and job progress is saved every
+    # PROGRESS_INTERVAL rows. PDFs list at most PDF_MAX_ROWS events.
+    COMPLIANCE_EXPORT_DIR: str = "exports"
+    COMPLIANCE_EXPORT_PROGRESS_INTERVAL: int = 5000
+    COMPLIANCE_EXPORT_PDF_MAX_ROWS: int = 50000
+
+    # Background jobs are queued in the background_jobs table. Workers run
+    # inside the API process when WORKER_EMBEDDED is set, or separately via
+    # scripts/run_job_worker.py. Failed jobs are retried with exponential
+    # backoff (RETRY_BASE_SECONDS doubling up to RETRY_MAX_SECONDS, jittered);
+    # a RUNNING job whose lease expires is assumed lost and requeued.
+    # Finished jobs are kept RETENTION_DAYS (jobs.purge_finished).
+    JOB_WORKER_EMBEDDED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 10.0
+    JOB_RETRY_MAX_SECONDS: float = 3600.0
+    JOB_LEASE_SECONDS: int = 900
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+    JOB_RETENTION_DAYS: int = 7
+
+    # Daily and weekly digests are built for all users in one pass
+    # (digests.build jobs); each batch of BATCH_SIZE users is committed with
+    # its notifications marked read, so a rerun picks up where one stopped.
+    DIGEST_BATCH_SIZE: int = 1000
+
+    # Periodic maintenance (app.services.scheduled_tasks), cron specs in UTC.
+    # One node, elected with a PostgreSQL advisory lock, runs cluster-wide
+    # tasks; per-process tasks run everywhere. SCHEDULES overrides a task's
+    # spec by name ("" disables it), e.g. {"digests.cleanup_old": "0 4 * * *"}.
+    # At most MAX_CATCH_UP_RUNS missed runs are replayed for a task.
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_TICK_SECONDS: float = 15.0
+    SCHEDULER_MAX_CATCH_UP_RUNS: int = 10
+    SCHEDULES: dict[str, str] = {}
+
+    # Audit chain verification. Clean runs store a checkpoint every
+    # CHECKPOINT_INTERVAL entries, signed with HMAC-SHA256 (SECRET_KEY when no
+    # signing key is set); later runs resume from the latest checkpoint. Full
+    # runs hash SEGMENT_SIZE-entry segments on a pool of VERIFY_WORKERS
+    # processes (0 = one per CPU).
+    AUDIT_CHAIN_SIGNING_KEY: str = ""
+    AUDIT_CHAIN_CHECKPOINT_INTERVAL: int = 10000
+    AUDIT_CHAIN_VERIFY_BATCH_SIZE: int = 5000
+    AUDIT_CHAIN_VERIFY_SEGMENT_SIZE: int = 100000
+    AUDIT_CHAIN_VERIFY_WORKERS: int = 0
+
+    # A signed Merkle root is stored for each chain every this many entries
+    # (inclusion proofs are issued against the latest one; 0 = on demand only)
+    AUDIT_CHAIN_MERKLE_ROOT_INTERVAL: int = 1000
+
+    # Async database settings (opt-in). When enabled, WebSocket, notification
+    # and chat paths run on an asyncpg-backed AsyncSession instead of the sync engine.
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: str = ""  # Derived from the sync URL when empty
+
+    # Engine profile (dev/test/prod); defaults to the profile matching APP_ENV.
+    # The DB_* values below override individual profile fields when set.
+    DB_ENGINE_PROFILE: str = ""
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_POOL_RECYCLE: Optional[int] = None  # seconds
+    DB_POOL_TIMEOUT: Optional[int] = None  # seconds to wait for a free connection
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None  # 0 disables the timeout
+    DB_ECHO: Optional[bool] = None
+
     # JWT / App settings
     SECRET_KEY: str = "CHANGE_ME"
     JWT_SECRET: str = "CHANGE_ME"
@@ -41,6 +213,20 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = "apikey"
     SMTP_PASSWORD: str = ""  # Set in .env
     EMAIL_FROM: str = "noreply@workforceapp.com"
+    # SMTP mail goes through an in-process dispatcher: up to POOL_SIZE sender
+    # threads each take a batch of at most BATCH_SIZE queued messages and
+    # send them over one authenticated connection from the pool. Connections
+    # stay open between batches; they are closed after POOL_IDLE_SECONDS
+    # unused or MAX_MESSAGES_PER_CONNECTION messages. Callers wait up to
+    # SEND_TIMEOUT_SECONDS for their message before falling back to SendGrid.
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_IDLE_SECONDS: float = 60.0
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 500
+    SMTP_BATCH_SIZE: int = 50
+    SMTP_QUEUE_SIZE: int = 5000
+    SMTP_SEND_TIMEOUT_SECONDS: float = 120.0
     SENDGRID_API_KEY: str = ""  # Set in .env (required for prod email)
 
     @validator("SENDGRID_API_KEY", pre=True, always=True)
@@ -49,6 +235,25 @@ class Settings(BaseSettings):
             raise ValueError("SENDGRID_API_KEY is required in production")
         return v
 
+    def engine_profile(self) -> dict:
+        """Resolve the named engine profile with any DB_* overrides applied"""
+        name = self.DB_ENGINE_PROFILE or APP_ENV_PROFILES.get(self.APP_ENV, "dev")
+        if name not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB_ENGINE_PROFILE: {name}")
+
+        profile = dict(ENGINE_PROFILES[name], name=name)
+        overrides = {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "statement_timeout_ms": self.DB_STATEMENT_TIMEOUT_MS,
+            "echo": self.DB_ECHO,
+        }
+        profile.update({k: v for k, v in overrides.items() if v is not None})
+        return profile
+
     class Config:
         env_file = ".env"
 
@@ -60,8 +265,48 @@ settings = Settings()
 DATABASE_URL = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}/{settings.POSTGRES_DB}"
 
 # SQLAlchemy engine and session
-engine = create_engine(DATABASE_URL, echo=True, future=True)
+engine_profile = settings.engine_profile()
+engine = create_engine(
+    DATABASE_URL, **engine_options(engine_profile, DATABASE_URL, "primary")
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for dependencies marked read-only (see app.db.get_read_db)
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        **engine_options(engine_profile, settings.DATABASE_REPLICA_URL, "replica"),
+    )
+    ReplicaSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=replica_engine
+    )
+
+
+def get_async_database_url() -> str:
+    """Async driver URL, derived from the sync URL unless set explicitly"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+# Async engine and session (opt-in, requires asyncpg)
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_database_url = get_async_database_url()
+    async_engine = create_async_engine(
+        async_database_url,
+        **engine_options(
+            engine_profile, async_database_url, "primary_async", is_async=True
+        ),
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
 # Base class for models
 Base = declarative_base()
@@ -12,6 +12,13 @@ from app.models.company_team import CompanyTeam
 from app.models.meetings import Meeting
 from app.models.user import User, UserRole
 
+# Roles that manage other employees' schedules and records
+MANAGER_ROLES = (
+    UserRole.SUPERADMIN,
+    UserRole.COMPANY_ADMIN,
+    UserRole.DEPARTMENT_ADMIN,
+    UserRole.TEAM_LEAD,
+)
 
 class RBACService:
     @staticmethod
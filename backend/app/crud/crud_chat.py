@@ -1,7 +1,6 @@
 from typing import Dict, List, Optional
 
 import structlog
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.channels import Channel, ChannelMember
@@ -104,17 +103,18 @@ def get_channel_messages(
         .filter(
             ChatMessage.channel_id == channel_id, ChatMessage.company_id == company_id
         )
-        .order_by(ChatMessage.created_at.desc())
-        .limit(limit)
+        .order_by(ChatMessage.id.desc())
     )
 
     if before:
         query = query.filter(ChatMessage.id < before)
+    query = query.limit(limit)
 
     messages = query.all()
+    reactions_by_message = get_reactions_for_messages(db, [m.id for m in messages])
     result = []
     for msg in messages:
-        reactions = get_reactions_for_message(db, msg.id)
+        reactions = reactions_by_message.get(msg.id, [])
         result.append(
             {
                 "id": msg.id,
@@ -244,21 +244,35 @@ def add_reaction(
     return reaction
 
 
-def get_reactions_for_message(db: Session, message_id: int) -> List[Dict]:
-    """Get reactions for a message, grouped by emoji with counts and users"""
-    reactions = (
+def get_reactions_for_messages(
+    db: Session, message_ids: List[int]
+) -> Dict[int, List[Dict]]:
+    """Get reactions for several messages in one query, grouped by emoji"""
+    if not message_ids:
+        return {}
+
+    rows = (
         db.query(
-            MessageReaction.emoji,
-            func.count(MessageReaction.id).label("count"),
-            func.group_concat(MessageReaction.user_id).label("users"),
+            MessageReaction.message_id, MessageReaction.emoji, MessageReaction.user_id
         )
-        .filter(MessageReaction.message_id == message_id)
-        .group_by(MessageReaction.emoji)
+        .filter(MessageReaction.message_id.in_(message_ids))
+        .order_by(MessageReaction.message_id, MessageReaction.id)
         .all()
     )
 
-    result = []
-    for emoji, count, users_str in reactions:
-        users = [int(u) for u in users_str.split(",") if u] if users_str else []
-        result.append({"emoji": emoji, "count": count, "users": users})
-    return result
+    grouped: Dict[int, Dict[str, List[int]]] = {}
+    for message_id, emoji, user_id in rows:
+        grouped.setdefault(message_id, {}).setdefault(emoji, []).append(user_id)
+
+    return {
+        message_id: [
+            {"emoji": emoji, "count": len(users), "users": users}
+            for emoji, users in by_emoji.items()
+        ]
+        for message_id, by_emoji in grouped.items()
+    }
+
+
+def get_reactions_for_message(db: Session, message_id: int) -> List[Dict]:
+    """Get reactions for a message, grouped by emoji with counts and users"""
+    return get_reactions_for_messages(db, [message_id]).get(message_id, [])
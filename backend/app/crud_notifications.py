@@ -1,11 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
 from app.models.notification import Notification, NotificationStatus
-from app.services.email_service import email_service
 from app.services.fcm_service import fcm_service
+from app.services.job_queue import JobQueue
 
 logger = get_logger()
 
@@ -85,22 +85,85 @@ def create_notification(
         _send_email_notification_if_enabled(
             db, user_id, notification.id, title, message, type
         )
+        db.commit()
 
         # Invalidate cache for this user to ensure fresh data includes new notification
-        import asyncio
+        _invalidate_notification_cache(company_id, user_id)
 
-        from app.services.redis_service import redis_service
+    return notification
+
+
+def create_notifications(
+    db: Session,
+    user_ids: List[int],
+    company_id: int,
+    title: str,
+    message: str,
+    type: str,
+) -> List[Notification]:
+    """
+    Send the same notification to many users. Each user gets their own
+    notification and push, but the emails go out as one batched job.
+    """
+    from app.crud_notification_preferences import should_send_notification
+
+    notifications = [
+        Notification(
+            user_id=user_id,
+            company_id=company_id,
+            title=title,
+            message=message,
+            type=type,
+            status=NotificationStatus.UNREAD,
+        )
+        for user_id in user_ids
+        if should_send_notification(db, user_id, company_id, type)
+    ]
+    if not notifications:
+        return []
+    db.add_all(notifications)
+    db.commit()
 
+    recipients = []
+    for notification in notifications:
+        _send_push_notification_if_enabled(
+            db, notification.user_id, company_id, notification.id, title, message, type
+        )
+        recipient = _email_recipient(db, notification.user_id, type)
+        if recipient:
+            recipients.append(recipient)
+    if recipients:
         try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(
-                redis_service.invalidate_notification_cache(company_id, user_id)
-            )
-        except RuntimeError:
-            # No running event loop, skip async operation
-            pass
+            with db.begin_nested():
+                JobQueue.enqueue(
+                    db,
+                    "email.notifications",
+                    {"recipients": recipients, "title": title, "message": message},
+                    idempotency_key=f"email:notifications:{notifications[0].id}",
+                )
+            logger.info("Email notifications queued", count=len(recipients), type=type)
+        except Exception as e:
+            logger.error("Error queueing email notifications", error=str(e))
+    db.commit()
 
-    return notification
+    for notification in notifications:
+        _invalidate_notification_cache(company_id, notification.user_id)
+    return notifications
+
+
+def _invalidate_notification_cache(company_id: int, user_id: int):
+    import asyncio
+
+    from app.services.redis_service import redis_service
+
+    try:
+        loop = asyncio.get_running_loop()
+        loop.create_task(
+            redis_service.invalidate_notification_cache(company_id, user_id)
+        )
+    except RuntimeError:
+        # No running event loop, skip async operation
+        pass
 
 
 def _send_push_notification_if_enabled(
@@ -112,7 +175,7 @@ def _send_push_notification_if_enabled(
     message: str,
     notification_type: str,
 ):
-    """Send push notification if user has FCM token and push notifications are enabled"""
+    """Queue a push notification if user has FCM token and push notifications are enabled"""
     try:
         # Get user's FCM token
         fcm_token = fcm_service.get_user_fcm_token(db, user_id)
@@ -128,27 +191,24 @@ def _send_push_notification_if_enabled(
         ):
             return  # Push notifications disabled for this type
 
-        # Send push notification
+        # Sent by a job worker (with retries) rather than in the request
         data = {
             "notification_id": str(notification_id),
             "type": notification_type,
             "user_id": str(user_id),
         }
-
-        success = fcm_service.send_push_notification(fcm_token, title, message, data)
-        if success:
-            logger.info(
-                "Push notification sent", user_id=user_id, type=notification_type
-            )
-        else:
-            logger.warning(
-                "Failed to send push notification",
-                user_id=user_id,
-                type=notification_type,
+        # A savepoint, so a failed enqueue doesn't poison the caller's session
+        with db.begin_nested():
+            JobQueue.enqueue(
+                db,
+                "push.send",
+                {"token": fcm_token, "title": title, "body": message, "data": data},
+                idempotency_key=f"push:notification:{notification_id}",
             )
+        logger.info("Push notification queued", user_id=user_id, type=notification_type)
 
     except Exception as e:
-        logger.error("Error sending push notification", user_id=user_id, error=str(e))
+        logger.error("Error queueing push notification", user_id=user_id, error=str(e))
 
 
 def _send_email_notification_if_enabled(
@@ -159,39 +219,49 @@ def _send_email_notification_if_enabled(
     message: str,
     notification_type: str,
 ):
-    """Send email notification if user has email notifications enabled"""
+    """Queue an email notification if user has email notifications enabled"""
     try:
-        # Get user email
-        from app.models.user import User
-
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user or not user.email:
-            return  # No email available
-
-        # Check if email notifications are enabled for this user and notification type
-        from app.crud_notification_preferences import \
-            should_send_email_notification
-
-        if not should_send_email_notification(
-            db, user_id, user.company_id, notification_type
-        ):
-            return  # Email notifications disabled for this type
-
-        # Send email notification with user name
-        user_name = user.full_name or user.email
-        success = email_service.send_notification_email(
-            user.email, title, message, user_name
-        )
-        if success:
-            logger.info(
-                "Email notification sent", user_id=user_id, type=notification_type
-            )
-        else:
-            logger.warning(
-                "Failed to send email notification",
-                user_id=user_id,
-                type=notification_type,
+        recipient = _email_recipient(db, user_id, notification_type)
+        if not recipient:
+            return
+
+        # Send email notification with user name, from a job worker
+        to_email, user_name = recipient
+        with db.begin_nested():
+            JobQueue.enqueue(
+                db,
+                "email.notification",
+                {
+                    "to_email": to_email,
+                    "title": title,
+                    "message": message,
+                    "user_name": user_name,
+                },
+                idempotency_key=f"email:notification:{notification_id}",
             )
+        logger.info(
+            "Email notification queued", user_id=user_id, type=notification_type
+        )
 
     except Exception as e:
-        logger.error("Error sending email notification", user_id=user_id, error=str(e))
+        logger.error("Error queueing email notification", user_id=user_id, error=str(e))
+
+
+def _email_recipient(
+    db: Session, user_id: int, notification_type: str
+) -> Optional[Tuple[str, str]]:
+    """(email, user name) if the user wants this type of notification by email"""
+    from app.crud_notification_preferences import \
+        should_send_email_notification
+    from app.models.user import User
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user or not user.email:
+        return None  # No email available
+
+    # Check if email notifications are enabled for this user and notification type
+    if not should_send_email_notification(
+        db, user_id, user.company_id, notification_type
+    ):
+        return None  # Email notifications disabled for this type
+    return user.email, user.full_name or user.email
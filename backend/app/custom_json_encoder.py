@@ -1,40 +1,31 @@
-import json
+from decimal import Decimal
 from typing import Any
 
+import orjson
+from pydantic import BaseModel
 
-def custom_json_dumps(obj: Any, **kwargs) -> str:
-    """Custom JSON dumps function that ensures proper formatting with commas"""
-    if isinstance(obj, dict):
-        items = []
-        for key, value in obj.items():
-            if isinstance(value, (dict, list)):
-                value_str = custom_json_dumps(value, **kwargs)
-            else:
-                value_str = json.dumps(value, **kwargs)
-            items.append(f'"{key}": {value_str}')
-        return "{" + ", ".join(items) + "}"
-    elif isinstance(obj, list):
-        items = []
-        for item in obj:
-            if isinstance(item, (dict, list)):
-                items.append(custom_json_dumps(item, **kwargs))
-            else:
-                items.append(json.dumps(item, **kwargs))
-        return "[" + ", ".join(items) + "]"
-    else:
-        return json.dumps(obj, **kwargs)
+# Non-string dict keys (e.g. ids) are stringified instead of rejected
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
 
 
-# Test the custom encoder
-if __name__ == "__main__":
-    test_data = {
-        "test": "value",
-        "number": 123,
-        "boolean": True,
-        "nested": {"key": "value"},
-        "array": [1, 2, 3],
-    }
+def json_default(obj: Any) -> Any:
+    """Types orjson does not serialize natively, encoded as FastAPI does"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        # Same as fastapi.encoders.decimal_encoder
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
-    result = custom_json_dumps(test_data, indent=2)
-    print("Custom encoder result:")
-    print(result)
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize a response body to compact UTF-8 JSON. datetime, date, Enum,
+    UUID and dataclasses are handled natively by orjson; Decimal and Pydantic
+    models go through json_default.
+    """
+    return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS)
@@ -2,9 +2,9 @@ from typing import Any
 
 from starlette.responses import JSONResponse
 
-from app.custom_json_encoder import custom_json_dumps
+from app.custom_json_encoder import json_dumps_bytes
 
 
 class CustomJSONResponse(JSONResponse):
     def render(self, content: Any) -> bytes:
-        return custom_json_dumps(content).encode("utf-8")
+        return json_dumps_bytes(content)
@@ -1,7 +1,10 @@
-# app/db.py
+from fastapi import Request
 from sqlalchemy.orm import Session
 
-from app.config import Base, SessionLocal, engine
+from app.config import (AsyncSessionLocal, Base, ReplicaSessionLocal,
+                        SessionLocal, engine)
+
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
 
 
 # Dependency to get DB session in FastAPI routes
@@ -11,3 +14,84 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class SessionRouter:
+    """Hand out primary or replica sessions.
+
+    Read-only callers get the replica when one is configured, unless the
+    request asked to read its own writes, in which case they get the primary.
+    """
+
+    def __init__(self, primary_factory, replica_factory=None):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+
+    def session(self, read_only: bool = False, read_your_writes: bool = False):
+        if read_only and not read_your_writes and self.replica_factory is not None:
+            return self.replica_factory()
+        return self.primary_factory()
+
+
+session_router = SessionRouter(SessionLocal, ReplicaSessionLocal)
+
+
+def wants_read_your_writes(request: Request) -> bool:
+    """Per-request override: header from the client or a flag set server-side"""
+    if getattr(request.state, "read_your_writes", False):
+        return True
+    value = request.headers.get(READ_YOUR_WRITES_HEADER, "")
+    return value.lower() in ("1", "true", "yes")
+
+
+def read_session(request: Request) -> Session:
+    return session_router.session(
+        read_only=True, read_your_writes=wants_read_your_writes(request)
+    )
+
+
+# Dependency for read-only endpoints; served by the replica when configured
+def get_read_db(request: Request):
+    db: Session = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class SyncSessionShim:
+    """AsyncSession-shaped wrapper around a sync Session.
+
+    Used by get_async_db when ASYNC_DB_ENABLED is off so async handlers keep a
+    single code path (``await db.run_sync(fn, ...)``). Work still runs on the
+    calling thread, exactly as before the async engine existed.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def close(self):
+        self.sync_session.close()
+
+
+# Dependency to get an async DB session for async handlers and WebSockets
+async def get_async_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SyncSessionShim(SessionLocal())
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,69 @@
+# app/db_pool.py
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics import (observe_db_pool_checkout_wait, record_db_pool_overflow,
+                         set_db_pool_connections_in_use)
+
+
+class _PoolMetricsMixin:
+    """Export checkout wait, in-use connections and overflow events per pool"""
+
+    metrics_name = "primary"
+
+    def connect(self):
+        overflow_before = self._overflow
+        start = time.perf_counter()
+        conn = super().connect()
+        observe_db_pool_checkout_wait(self.metrics_name, time.perf_counter() - start)
+        if self._overflow > overflow_before and self._overflow > 0:
+            record_db_pool_overflow(self.metrics_name)
+        set_db_pool_connections_in_use(self.metrics_name, self.checkedout())
+        return conn
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        set_db_pool_connections_in_use(self.metrics_name, self.checkedout())
+
+
+def instrumented_pool_class(name: str, is_async: bool = False):
+    """QueuePool subclass labelled ``name`` in the pool metrics.
+
+    A class (rather than an attribute on the pool instance) so the label
+    survives engine.dispose(), which recreates the pool from its class.
+    """
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(
+        f"Instrumented{base.__name__}",
+        (_PoolMetricsMixin, base),
+        {"metrics_name": name},
+    )
+
+
+def engine_options(profile: dict, url: str, pool_name: str, is_async: bool = False):
+    """create_engine/create_async_engine kwargs for a resolved engine profile"""
+    options = {"echo": profile["echo"], "future": True}
+
+    if url.startswith("sqlite"):
+        # SQLite has no server-side pool or statement timeout to tune
+        return options
+
+    options.update(
+        poolclass=instrumented_pool_class(pool_name, is_async),
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+        pool_pre_ping=profile["pool_pre_ping"],
+        pool_recycle=profile["pool_recycle"],
+        pool_timeout=profile["pool_timeout"],
+    )
+
+    timeout_ms = profile["statement_timeout_ms"]
+    if timeout_ms:
+        if is_async:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(timeout_ms)}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
@@ -1,5 +1,5 @@
 import structlog
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 from app.base_crud import get_user_by_email, get_user_by_email_only
 from app.config import settings
 from app.db import SessionLocal
+from app.services.principal_cache import (principal_cache, principal_data,
+                                           principal_from_data)
 
 logger = structlog.get_logger(__name__)
 logger.info("import_fix_applied", file="deps.py", status="success")
@@ -34,17 +36,26 @@ def get_current_claims(token: HTTPAuthorizationCredentials = Depends(security)):
         )
 
 
-def get_current_user(
-    db: Session = Depends(get_db), claims: dict = Depends(get_current_claims)
-):
+def _resolve_principal(db: Session, claims: dict):
+    """
+    Load the user a token's claims refer to, through the principal cache.
+    Tokens minted before the user's token_version was bumped are revoked.
+    """
     email = claims.get("sub")
     company_id = claims.get("company_id")
+    token_version = claims.get("tv", 0)
 
     if not email:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token claims"
         )
 
+    key = (email, company_id, token_version)
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        cached = principal_cache.get(key)
+        if cached is not None:
+            return principal_from_data(db, cached)
+
     from app.crud import get_user_by_email_only
 
     if company_id is None:
@@ -62,6 +73,24 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive"
         )
 
+    if (user.token_version or 0) != token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+        )
+
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal_cache.put(key, principal_data(user))
+    return user
+
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+):
+    user = _resolve_principal(db, claims)
+    # Read by the request logging middleware once the response is ready
+    request.state.user_id = user.id
     return user
 
 
@@ -69,33 +98,8 @@ def get_current_user_from_token(token: str, db: Session):
     """Get user from JWT token string for WebSocket auth"""
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
-        email = payload.get("sub")
-        company_id = payload.get("company_id")
-
-        if not email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token claims"
-            )
-
-        from app.crud import get_user_by_email_only
-
-        if company_id is None:
-            user = get_user_by_email_only(db, email)
-        else:
-            user = get_user_by_email(db, email, company_id)
-
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
-
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive"
-            )
-
-        return user
-    except jwt.JWTError:
+    except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+    return _resolve_principal(db, payload)
@@ -1,10 +1,11 @@
 import asyncio
+from datetime import datetime
 
 import structlog
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config import Base, engine, settings
+from app.config import Base, async_engine, engine, settings
 from app.custom_json_response import CustomJSONResponse
 from app.models import *
 from app.routers import (admin, ai, approvals, attendance, auth, chat,
@@ -70,36 +71,29 @@ async def log_requests(request: Request, call_next):
     response = await call_next(request)
     process_time = time.time() - start_time
 
-    # Extract user_id from token if available (simplified for demo)
-    user_id = None
-    auth_header = request.headers.get("authorization")
-    if auth_header and auth_header.startswith("Bearer "):
-        # In real implementation, decode JWT to get user_id
-        user_id = "extracted_user_id"  # Placeholder
+    # Set by get_current_user on authenticated requests
+    user_id = getattr(request.state, "user_id", None)
 
-    # Enhanced observability: log admin actions and request duration
+    # Enhanced observability: log admin actions and request duration. Queued
+    # for the batched audit writer so the event loop never waits on the DB.
     is_admin_endpoint = request.url.path.startswith("/api/admin")
-    if is_admin_endpoint:
-        from app.db import SessionLocal
-        from app.services.audit_service import AuditService
-
-        db = SessionLocal()
-        try:
-            AuditService.log_admin_action(
-                db=db,
-                action="ENDPOINT_ACCESS",
-                user_id=(
-                    int(user_id) if user_id and user_id != "extracted_user_id" else None
-                ),
-                company_id=None,  # Will be set in endpoint if needed
-                details={
+    if is_admin_endpoint and user_id is not None:
+        from app.services.audit_writer import audit_log_writer
+
+        audit_log_writer.submit(
+            {
+                "event_type": "ADMIN_ENDPOINT_ACCESS",
+                "user_id": user_id,
+                "company_id": None,  # Will be set in endpoint if needed
+                "resource_type": "admin",
+                "details": {
                     "endpoint": request.url.path,
                     "method": request.method,
                     "duration_ms": process_time * 1000,
                 },
-            )
-        finally:
-            db.close()
+                "created_at": datetime.utcnow(),
+            }
+        )
 
     logger.info(
         "HTTP Request",
@@ -116,6 +110,27 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# Count SQL statements per request and flag routes that go over budget
+@app.middleware("http")
+async def track_sql_queries(request: Request, call_next):
+    from app.metrics import record_query_budget_exceeded, record_request_queries
+    from app.monitoring.query_stats import check_query_budget, track_queries
+
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    route = request.scope.get("route")
+    if route is None:
+        return response
+
+    route_template = route.path
+    record_request_queries(route_template, stats.count, stats.duration)
+    budget = settings.SQL_QUERY_BUDGETS.get(route_template, settings.SQL_QUERY_BUDGET)
+    if not check_query_budget(route_template, stats, budget):
+        record_query_budget_exceeded(route_template)
+    return response
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -173,6 +188,38 @@ async def startup_event():
     # Skip Redis subscriber for now
     logger.info("Skipping Redis subscriber for invite system testing")
 
+    if settings.JOB_WORKER_EMBEDDED:
+        from app.services.job_queue import job_worker
+
+        job_worker.start()
+
+    if settings.SCHEDULER_ENABLED:
+        from app.services.scheduled_tasks import scheduler
+
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.services.audit_writer import audit_log_writer
+    from app.services.email_service import email_service
+    from app.services.job_queue import job_worker
+    from app.services.scheduled_tasks import scheduler
+
+    # Hand scheduler leadership over before the rest shuts down
+    await scheduler.stop()
+    # Write queued audit events before the process exits
+    await asyncio.to_thread(audit_log_writer.stop)
+    # Let running jobs finish; anything still running is requeued later
+    await asyncio.to_thread(job_worker.stop, settings.JOB_SHUTDOWN_TIMEOUT_SECONDS)
+    # Send mail queued by those jobs, then close the SMTP connections
+    await asyncio.to_thread(
+        email_service.smtp_dispatcher.stop, settings.SMTP_SEND_TIMEOUT_SECONDS
+    )
+
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 async def redis_subscriber():
     """Subscribe to Redis pub/sub for chat channels and forward to WS"""
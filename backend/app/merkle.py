@@ -0,0 +1,241 @@
+"""
+Hashing for audit chains: entry hashes, and Merkle trees over a chain's
+entries following RFC 6962 / RFC 9162 (leaves and interior nodes are
+domain-separated, and a tree of n leaves splits at the largest power of two
+below n).
+
+Stdlib only, so auditors can verify inclusion proofs and signed roots
+offline (see scripts/verify_audit_proof.py).
+"""
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+# Perfect subtree covering leaves [index * 2**level, (index + 1) * 2**level)
+NodeKey = Tuple[int, int]  # (level, index)
+
+
+def compute_entry_hash(
+    chain_id: str,
+    sequence_number: int,
+    previous_hash: str,
+    event_type: str,
+    user_id: int,
+    company_id: Optional[int],
+    data: str,
+    created_at: Optional[datetime],
+) -> str:
+    """
+    SHA-256 of an entry's fields. A plain function so verification can hash
+    rows fetched as tuples, including in worker processes.
+    """
+    # Create deterministic data for hashing
+    hash_data = {
+        "chain_id": chain_id,
+        "sequence_number": sequence_number,
+        "previous_hash": previous_hash,
+        "event_type": event_type,
+        "user_id": user_id,
+        "company_id": company_id,
+        "data": data,
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+    # Serialize to JSON with sorted keys for consistency
+    json_data = json.dumps(hash_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(json_data.encode("utf-8")).hexdigest()
+
+
+def leaf_hash(entry_hash: str) -> str:
+    """Leaf of an audit chain entry, from its current_hash (hex)"""
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(entry_hash)).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(
+        NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)
+    ).hexdigest()
+
+
+def _split(size: int) -> int:
+    """Largest power of two strictly below size (size > 1)"""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+def root_from_frontier(frontier: Dict[int, str]) -> Optional[str]:
+    """
+    Root of a tree given its frontier: the roots of its perfect subtrees,
+    by level (one per set bit of the tree size)
+    """
+    root = None
+    for level in sorted(frontier):
+        root = frontier[level] if root is None else node_hash(frontier[level], root)
+    return root
+
+
+def append_leaf(
+    frontier: Dict[int, str], size: int, leaf: str
+) -> Tuple[int, List[Tuple[int, int, str]]]:
+    """
+    Add a leaf to a tree of `size` leaves, updating frontier in place.
+    Returns the new size and the interior nodes completed, as
+    (level, index, hash).
+    """
+    completed = []
+    level, current = 0, leaf
+    while (size >> level) & 1:
+        current = node_hash(frontier.pop(level), current)
+        level += 1
+        completed.append((level, size >> level, current))
+    frontier[level] = current
+    return size + 1, completed
+
+
+def frontier_keys(size: int) -> List[NodeKey]:
+    """Nodes making up the frontier of a tree of `size` leaves"""
+    return [
+        (level, (size >> level) - 1)
+        for level in range(size.bit_length())
+        if (size >> level) & 1
+    ]
+
+
+def _subtree_root(start: int, end: int, node: Callable[[int, int], str]) -> str:
+    size = end - start
+    if size & (size - 1) == 0:
+        level = size.bit_length() - 1
+        return node(level, start >> level)
+    k = _split(size)
+    return node_hash(
+        _subtree_root(start, start + k, node), _subtree_root(start + k, end, node)
+    )
+
+
+def _path(index: int, start: int, end: int, node: Callable[[int, int], str]):
+    size = end - start
+    if size == 1:
+        return []
+    k = _split(size)
+    if index < start + k:
+        return _path(index, start, start + k, node) + [
+            _subtree_root(start + k, end, node)
+        ]
+    return _path(index, start + k, end, node) + [_subtree_root(start, start + k, node)]
+
+
+def proof_node_keys(leaf_index: int, tree_size: int) -> Set[NodeKey]:
+    """Stored nodes needed to build an inclusion proof (O(log^2 n) at most)"""
+    keys: Set[NodeKey] = set()
+
+    def record(level, index):
+        keys.add((level, index))
+        return "00"
+
+    _path(leaf_index, 0, tree_size, record)
+    _subtree_root(0, tree_size, record)
+    return keys
+
+
+def inclusion_proof(
+    leaf_index: int, tree_size: int, nodes: Dict[NodeKey, str]
+) -> Tuple[List[str], str]:
+    """Audit path for a leaf, and the tree root, from the nodes of proof_node_keys"""
+    node = lambda level, index: nodes[(level, index)]  # noqa: E731
+    return _path(leaf_index, 0, tree_size, node), _subtree_root(0, tree_size, node)
+
+
+def root_from_inclusion_proof(
+    leaf: str, leaf_index: int, tree_size: int, proof: Iterable[str]
+) -> str:
+    """RFC 9162 section 2.1.3.2; raises ValueError on a malformed proof"""
+    if not 0 <= leaf_index < tree_size:
+        raise ValueError("Leaf index outside the tree")
+    fn, sn, root = leaf_index, tree_size - 1, leaf
+    for sibling in proof:
+        if sn == 0:
+            raise ValueError("Proof is longer than the tree is deep")
+        if fn & 1 or fn == sn:
+            root = node_hash(sibling, root)
+            while not fn & 1 and fn:
+                fn >>= 1
+                sn >>= 1
+        else:
+            root = node_hash(root, sibling)
+        fn >>= 1
+        sn >>= 1
+    if sn != 0:
+        raise ValueError("Proof is shorter than the tree is deep")
+    return root
+
+
+def verify_inclusion(
+    entry_hash: str, leaf_index: int, tree_size: int, proof: List[str], root: str
+) -> bool:
+    """True if the entry with entry_hash is leaf leaf_index of the tree with root"""
+    try:
+        computed = root_from_inclusion_proof(
+            leaf_hash(entry_hash), leaf_index, tree_size, proof
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(computed, root)
+
+
+def sign_root(key: bytes, chain_id: str, tree_size: int, root: str) -> str:
+    """HMAC-SHA256 (hex) over a chain's root at a given size"""
+    message = f"merkle:{chain_id}:{tree_size}:{root}".encode("utf-8")
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def verify_root_signature(
+    key: bytes, chain_id: str, tree_size: int, root: str, signature: str
+) -> bool:
+    return hmac.compare_digest(sign_root(key, chain_id, tree_size, root), signature)
+
+
+def verify_proof(document: dict, key: Optional[bytes] = None) -> List[str]:
+    """
+    Check an inclusion proof as returned by the admin proof endpoint: the
+    entry's fields hash to entry_hash, the entry is in the tree with
+    root_hash, and (given the signing key) the root's signature. Returns the
+    failed checks; an empty list means the proof holds.
+    """
+    failures = []
+    entry = document["entry"]
+    created_at = entry["created_at"]
+    computed = compute_entry_hash(
+        entry["chain_id"],
+        entry["sequence_number"],
+        entry["previous_hash"],
+        entry["event_type"],
+        entry["user_id"],
+        entry["company_id"],
+        entry["data"],
+        datetime.fromisoformat(created_at) if created_at else None,
+    )
+    if computed != document["entry_hash"]:
+        failures.append("entry_hash_mismatch")
+    if entry["sequence_number"] != document["leaf_index"]:
+        failures.append("leaf_index_mismatch")
+    if not verify_inclusion(
+        computed,
+        document["leaf_index"],
+        document["tree_size"],
+        document["proof"],
+        document["root_hash"],
+    ):
+        failures.append("not_included")
+    if key is not None and not verify_root_signature(
+        key,
+        document["chain_id"],
+        document["tree_size"],
+        document["root_hash"],
+        document["root_signature"],
+    ):
+        failures.append("bad_root_signature")
+    return failures
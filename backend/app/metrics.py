@@ -123,6 +123,259 @@ meeting_participants_active = Gauge(
     registry=registry,
 )
 
+# Database Connection Pool Metrics
+db_pool_checkout_wait_seconds = Histogram(
+    "workforce_db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    registry=registry,
+)
+
+db_pool_connections_in_use = Gauge(
+    "workforce_db_pool_connections_in_use",
+    "Number of connections currently checked out of the pool",
+    ["pool"],
+    registry=registry,
+)
+
+db_pool_overflow_total = Counter(
+    "workforce_db_pool_overflow_total",
+    "Total number of overflow connections opened beyond pool_size",
+    ["pool"],
+    registry=registry,
+)
+
+# Per-request SQL Metrics
+db_queries_per_request = Histogram(
+    "workforce_db_queries_per_request",
+    "Number of SQL statements executed per request",
+    ["route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    registry=registry,
+)
+
+db_query_time_per_request = Histogram(
+    "workforce_db_query_time_per_request_seconds",
+    "Total SQL execution time per request in seconds",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0),
+    registry=registry,
+)
+
+db_query_budget_exceeded_total = Counter(
+    "workforce_db_query_budget_exceeded_total",
+    "Total number of requests that exceeded their SQL query budget",
+    ["route"],
+    registry=registry,
+)
+
+# Dashboard KPI snapshot cache
+kpi_snapshot_requests_total = Counter(
+    "workforce_kpi_snapshot_requests_total",
+    "Dashboard KPI snapshot lookups by result (hit/miss)",
+    ["result"],
+    registry=registry,
+)
+
+kpi_snapshot_invalidations_total = Counter(
+    "workforce_kpi_snapshot_invalidations_total",
+    "Dashboard KPI snapshots invalidated by task, leave and shift writes",
+    registry=registry,
+)
+
+# Principal (current user) cache
+principal_cache_lookups_total = Counter(
+    "workforce_principal_cache_lookups_total",
+    "Principal cache lookups by tier (lru/redis) and result (hit/miss)",
+    ["tier", "result"],
+    registry=registry,
+)
+
+principal_cache_hit_ratio = Gauge(
+    "workforce_principal_cache_hit_ratio",
+    "Share of principal cache lookups answered by each tier since startup",
+    ["tier"],
+    registry=registry,
+)
+
+principal_cache_invalidations_total = Counter(
+    "workforce_principal_cache_invalidations_total",
+    "Principals evicted after role, company, active or lock changes",
+    registry=registry,
+)
+
+# Batched audit log writer
+audit_log_queue_depth = Gauge(
+    "workforce_audit_log_queue_depth",
+    "Audit events waiting in the in-process writer queue",
+    registry=registry,
+)
+
+audit_log_events_written_total = Counter(
+    "workforce_audit_log_events_written_total",
+    "Audit events inserted by the batched writer",
+    registry=registry,
+)
+
+audit_log_events_dropped_total = Counter(
+    "workforce_audit_log_events_dropped_total",
+    "Audit events lost by the batched writer (queue_full/shutdown/write_error)",
+    ["reason"],
+    registry=registry,
+)
+
+audit_log_batch_size = Histogram(
+    "workforce_audit_log_batch_size",
+    "Audit events committed per writer transaction",
+    buckets=[1, 5, 10, 25, 50, 100, 250, 500, 1000],
+    registry=registry,
+)
+
+# Background compliance exports
+compliance_exports_total = Counter(
+    "workforce_compliance_exports_total",
+    "Compliance export jobs finished, by format and status (COMPLETED/FAILED)",
+    ["format", "status"],
+    registry=registry,
+)
+
+compliance_export_duration_seconds = Histogram(
+    "workforce_compliance_export_duration_seconds",
+    "Time to generate a compliance export file",
+    ["format"],
+    buckets=[1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600],
+    registry=registry,
+)
+
+compliance_export_rows_total = Counter(
+    "workforce_compliance_export_rows_total",
+    "Audit log rows written to compliance export files",
+    registry=registry,
+)
+
+# Background job queue
+background_jobs_enqueued_total = Counter(
+    "workforce_background_jobs_enqueued_total",
+    "Background jobs queued, by type (idempotent duplicates are not counted)",
+    ["job_type"],
+    registry=registry,
+)
+
+background_jobs_finished_total = Counter(
+    "workforce_background_jobs_finished_total",
+    "Background job attempts, by type and outcome (succeeded/retried/failed/lost)",
+    ["job_type", "outcome"],
+    registry=registry,
+)
+
+background_job_duration_seconds = Histogram(
+    "workforce_background_job_duration_seconds",
+    "Time spent running a background job attempt",
+    ["job_type"],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 5, 15, 60, 300, 1800],
+    registry=registry,
+)
+
+background_job_queue_latency_seconds = Histogram(
+    "workforce_background_job_queue_latency_seconds",
+    "Delay between a job becoming due and a worker starting it",
+    ["job_type"],
+    buckets=[0.1, 0.5, 1, 2, 5, 15, 60, 300, 900],
+    registry=registry,
+)
+
+background_jobs_requeued_total = Counter(
+    "workforce_background_jobs_requeued_total",
+    "RUNNING jobs requeued after their worker's lease expired",
+    registry=registry,
+)
+
+# Periodic scheduler
+scheduler_leader = Gauge(
+    "workforce_scheduler_leader",
+    "1 while this process holds the scheduler leader lock",
+    registry=registry,
+)
+
+scheduled_task_runs_total = Counter(
+    "workforce_scheduled_task_runs_total",
+    "Scheduled task runs, by task and status (succeeded/failed)",
+    ["task", "status"],
+    registry=registry,
+)
+
+scheduled_task_duration_seconds = Histogram(
+    "workforce_scheduled_task_duration_seconds",
+    "Time spent in a scheduled task run",
+    ["task"],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 5, 15, 60, 300, 1800],
+    registry=registry,
+)
+
+scheduled_task_last_success_timestamp = Gauge(
+    "workforce_scheduled_task_last_success_timestamp_seconds",
+    "Unix time this process last finished a task successfully",
+    ["task"],
+    registry=registry,
+)
+
+scheduled_task_missed_runs_total = Counter(
+    "workforce_scheduled_task_missed_runs_total",
+    "Missed fire times, by task and outcome (run/dropped) under its catch-up policy",
+    ["task", "outcome"],
+    registry=registry,
+)
+
+# Notification digests
+notification_digests_created_total = Counter(
+    "workforce_notification_digests_created_total",
+    "Digests created by the bulk digest builder, by digest type",
+    ["digest_type"],
+    registry=registry,
+)
+
+notifications_digested_total = Counter(
+    "workforce_notifications_digested_total",
+    "Notifications summarized into digests and marked read, by digest type",
+    ["digest_type"],
+    registry=registry,
+)
+
+# Outgoing SMTP mail
+email_queue_depth = Gauge(
+    "workforce_email_queue_depth",
+    "Emails waiting in the in-process SMTP dispatcher queue",
+    registry=registry,
+)
+
+emails_sent_total = Counter(
+    "workforce_emails_sent_total",
+    "Emails handed to the SMTP dispatcher, by outcome (sent/failed/dropped)",
+    ["outcome"],
+    registry=registry,
+)
+
+email_batch_size = Histogram(
+    "workforce_email_batch_size",
+    "Emails sent over one SMTP connection checkout",
+    buckets=[1, 2, 5, 10, 25, 50, 100, 250],
+    registry=registry,
+)
+
+email_batch_duration_seconds = Histogram(
+    "workforce_email_batch_duration_seconds",
+    "Time spent sending one batch of emails, including connection setup",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 15, 60],
+    registry=registry,
+)
+
+smtp_connections_opened_total = Counter(
+    "workforce_smtp_connections_opened_total",
+    "Authenticated SMTP connections opened by the connection pool",
+    registry=registry,
+)
+
 # Application Counters for external exporter - Redis-backed
 messages_sent_total = Counter(
     "workforce_messages_sent_total", "Total messages sent", registry=registry
@@ -197,6 +450,123 @@ def set_ws_backpressure_queue_size(room_type: str, size: int):
     ws_backpressure_queue_size.labels(room_type=room_type).set(size)
 
 
+def observe_db_pool_checkout_wait(pool: str, wait_seconds: float):
+    db_pool_checkout_wait_seconds.labels(pool=pool).observe(wait_seconds)
+
+
+def set_db_pool_connections_in_use(pool: str, count: int):
+    db_pool_connections_in_use.labels(pool=pool).set(count)
+
+
+def record_db_pool_overflow(pool: str):
+    db_pool_overflow_total.labels(pool=pool).inc()
+
+
+def record_request_queries(route: str, query_count: int, sql_seconds: float):
+    db_queries_per_request.labels(route=route).observe(query_count)
+    db_query_time_per_request.labels(route=route).observe(sql_seconds)
+
+
+def record_query_budget_exceeded(route: str):
+    db_query_budget_exceeded_total.labels(route=route).inc()
+
+
+def record_kpi_snapshot(result: str):
+    kpi_snapshot_requests_total.labels(result=result).inc()
+
+
+def record_kpi_invalidation():
+    kpi_snapshot_invalidations_total.inc()
+
+
+def record_principal_lookup(tier: str, hit: bool, hit_ratio: float):
+    principal_cache_lookups_total.labels(
+        tier=tier, result="hit" if hit else "miss"
+    ).inc()
+    principal_cache_hit_ratio.labels(tier=tier).set(hit_ratio)
+
+
+def record_principal_invalidation():
+    principal_cache_invalidations_total.inc()
+
+
+def set_audit_log_queue_depth(depth: int):
+    audit_log_queue_depth.set(depth)
+
+
+def record_audit_log_batch(written: int):
+    audit_log_events_written_total.inc(written)
+    audit_log_batch_size.observe(written)
+
+
+def record_audit_log_dropped(reason: str, count: int = 1):
+    audit_log_events_dropped_total.labels(reason=reason).inc(count)
+
+
+def record_compliance_export(fmt: str, status: str, seconds: float, rows: int):
+    compliance_exports_total.labels(format=fmt, status=status).inc()
+    compliance_export_duration_seconds.labels(format=fmt).observe(seconds)
+    compliance_export_rows_total.inc(rows)
+
+
+def record_job_enqueued(job_type: str):
+    background_jobs_enqueued_total.labels(job_type=job_type).inc()
+
+
+def record_job_started(job_type: str, queue_latency_seconds: float):
+    background_job_queue_latency_seconds.labels(job_type=job_type).observe(
+        max(queue_latency_seconds, 0.0)
+    )
+
+
+def record_job_finished(job_type: str, outcome: str, seconds: float):
+    background_jobs_finished_total.labels(job_type=job_type, outcome=outcome).inc()
+    background_job_duration_seconds.labels(job_type=job_type).observe(seconds)
+
+
+def record_jobs_requeued(count: int):
+    background_jobs_requeued_total.inc(count)
+
+
+def set_scheduler_leader(is_leader: bool):
+    scheduler_leader.set(1 if is_leader else 0)
+
+
+def record_scheduled_task(task: str, status: str, seconds: float):
+    scheduled_task_runs_total.labels(task=task, status=status).inc()
+    scheduled_task_duration_seconds.labels(task=task).observe(seconds)
+    if status == "succeeded":
+        scheduled_task_last_success_timestamp.labels(task=task).set_to_current_time()
+
+
+def record_scheduled_task_missed(task: str, outcome: str, count: int = 1):
+    scheduled_task_missed_runs_total.labels(task=task, outcome=outcome).inc(count)
+
+
+def record_digest_batch(digest_type: str, digests: int, notifications: int):
+    notification_digests_created_total.labels(digest_type=digest_type).inc(digests)
+    notifications_digested_total.labels(digest_type=digest_type).inc(notifications)
+
+
+def set_email_queue_depth(depth: int):
+    email_queue_depth.set(depth)
+
+
+def record_email_batch(sent: int, failed: int, seconds: float):
+    emails_sent_total.labels(outcome="sent").inc(sent)
+    emails_sent_total.labels(outcome="failed").inc(failed)
+    email_batch_size.observe(sent + failed)
+    email_batch_duration_seconds.observe(seconds)
+
+
+def record_email_dropped(count: int = 1):
+    emails_sent_total.labels(outcome="dropped").inc(count)
+
+
+def record_smtp_connection_opened():
+    smtp_connections_opened_total.inc()
+
+
 async def increment_messages_sent():
     """Increment messages sent counter with Redis persistence"""
     try:
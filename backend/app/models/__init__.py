@@ -2,15 +2,18 @@
 from .announcement import Announcement
 from .approval_queue import ApprovalQueue, ApprovalQueueItem
 from .attachment import Attachment
-from .attendance import Attendance, Break
-from .audit_chain import AuditChain
+from .attendance import Attendance, AttendanceDailyRollup, Break
+from .audit_chain import (AuditChain, AuditChainCheckpoint,
+                          AuditChainMerkleNode, AuditChainMerkleRoot)
 from .audit_log import AuditLog
+from .background_job import BackgroundJob
 from .channels import Channel, ChannelMember
 from .chat import ChatMessage
 from .company import Company
 from .company_department import CompanyDepartment
 from .company_settings import CompanySettings
 from .company_team import CompanyTeam
+from .compliance_export_job import ComplianceExportJob
 from .document import Document
 from .employee_profile import EmployeeProfile
 from .inventory_item import InventoryItem
@@ -27,6 +30,7 @@ from .payroll import (Allowance, Bonus, Deduction, Employee, PayrollEntry,
 from .profile_update_request import ProfileUpdateRequest
 from .purchase_order import PurchaseOrder
 from .refresh_token import RefreshToken
+from .scheduled_task import ScheduledTaskState
 from .shift import Shift
 from .swap_request import SwapRequest
 from .task import Task
@@ -38,6 +42,12 @@ __all__ = [
     "CompanySettings",
     "AuditLog",
     "AuditChain",
+    "AuditChainCheckpoint",
+    "AuditChainMerkleNode",
+    "AuditChainMerkleRoot",
+    "ComplianceExportJob",
+    "BackgroundJob",
+    "ScheduledTaskState",
     "CompanyDepartment",
     "CompanyTeam",
     "User",
@@ -1,13 +1,29 @@
-from sqlalchemy import (Column, DateTime, Float, ForeignKey, Integer, String,
-                        Text)
+from sqlalchemy import (Column, Date, DateTime, Float, ForeignKey, Index,
+                        Integer, String, Text)
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.db import Base
 
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # Dashboard trends/heatmap: company + status equality, clock-in range
+        Index(
+            "ix_attendance_company_status_clock_in",
+            "company_id",
+            "status",
+            "clock_in_time",
+        ),
+        # Clock-in/out lookup of the employee's open session
+        Index(
+            "ix_attendance_employee_open",
+            "employee_id",
+            postgresql_where=text("clock_out_time IS NULL"),
+            sqlite_where=text("clock_out_time IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
@@ -42,6 +58,30 @@ class Break(Base):
     attendance = relationship("Attendance", back_populates="breaks")
 
 
+class AttendanceDailyRollup(Base):
+    """
+    Per-company daily attendance totals, maintained incrementally on clock-in
+    and clock-out so dashboards never rescan raw attendance rows. Rows are
+    split by department and clock-in hour (UTC); sum over hour for per-day
+    figures. present_count counts each employee once per day, in the bucket
+    of the clock-in that made them present.
+    """
+
+    __tablename__ = "attendance_daily_rollup"
+
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True)
+    work_date = Column(Date, primary_key=True)
+    department = Column(String(100), primary_key=True, default="")
+    hour = Column(Integer, primary_key=True, default=0)
+    present_count = Column(Integer, nullable=False, default=0)
+    clock_ins = Column(Integer, nullable=False, default=0)
+    total_hours = Column(Float, nullable=False, default=0.0)
+    overtime_hours = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 # Add relationships to User model
 # This will be added to the User model in user.py
 # user.attendance_records = relationship("Attendance", back_populates="employee")
@@ -1,16 +1,23 @@
-import hashlib
 import json
+from datetime import datetime
 
 from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Integer, String,
-                        Text)
+                        Text, UniqueConstraint)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db import Base
+from app.merkle import compute_entry_hash
 
 
 class AuditChain(Base):
     __tablename__ = "audit_chains"
+    __table_args__ = (
+        # One entry per position; catches appends built on a stale chain head
+        UniqueConstraint(
+            "chain_id", "sequence_number", name="uq_audit_chains_chain_sequence"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     chain_id = Column(String, nullable=False, index=True)  # Unique chain identifier
@@ -35,21 +42,16 @@ class AuditChain(Base):
 
     def compute_hash(self) -> str:
         """Compute SHA-256 hash of this audit entry"""
-        # Create deterministic data for hashing
-        hash_data = {
-            "chain_id": self.chain_id,
-            "sequence_number": self.sequence_number,
-            "previous_hash": self.previous_hash,
-            "event_type": self.event_type,
-            "user_id": self.user_id,
-            "company_id": self.company_id,
-            "data": self.data,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-        }
-
-        # Serialize to JSON with sorted keys for consistency
-        json_data = json.dumps(hash_data, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(json_data.encode("utf-8")).hexdigest()
+        return compute_entry_hash(
+            self.chain_id,
+            self.sequence_number,
+            self.previous_hash,
+            self.event_type,
+            self.user_id,
+            self.company_id,
+            self.data,
+            self.created_at,
+        )
 
     def verify_integrity(self) -> bool:
         """Verify that current_hash matches computed hash"""
@@ -65,8 +67,12 @@ class AuditChain(Base):
         company_id: int = None,
         data: dict = None,
         signature: str = None,
+        created_at: datetime = None,
     ) -> "AuditChain":
-        """Create a new audit chain entry"""
+        """
+        Create a new audit chain entry. With an application-supplied
+        created_at the hash is computed here, before the row is inserted.
+        """
         entry = AuditChain(
             chain_id=chain_id,
             sequence_number=sequence_number,
@@ -76,7 +82,70 @@ class AuditChain(Base):
             company_id=company_id,
             data=json.dumps(data or {}, sort_keys=True),
             signature=signature,
+            created_at=created_at,
         )
-
-        # Hash will be computed after saving to include created_at
+        if created_at is not None:
+            entry.current_hash = entry.compute_hash()
         return entry
+
+
+class AuditChainCheckpoint(Base):
+    """
+    Signed record that a chain verified clean from genesis up to
+    sequence_number, whose entry had entry_hash. Later verifications resume
+    from the latest checkpoint instead of genesis.
+    """
+
+    __tablename__ = "audit_chain_checkpoints"
+    __table_args__ = (
+        UniqueConstraint(
+            "chain_id", "sequence_number", name="uq_audit_chain_checkpoints_position"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(String, nullable=False, index=True)
+    sequence_number = Column(Integer, nullable=False)
+    entry_hash = Column(String(64), nullable=False)
+    signature = Column(String(64), nullable=False)  # HMAC-SHA256, hex
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class AuditChainMerkleNode(Base):
+    """
+    Interior node of a chain's Merkle tree (see app.merkle): the root of the
+    perfect subtree over leaves [index * 2**level, (index + 1) * 2**level).
+    Leaves (level 0) are derived from audit_chains.current_hash and not
+    stored. Nodes are written once, when their subtree fills up.
+    """
+
+    __tablename__ = "audit_chain_merkle_nodes"
+    __table_args__ = (
+        UniqueConstraint(
+            "chain_id", "level", "node_index", name="uq_audit_chain_merkle_nodes_key"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(String, nullable=False)
+    level = Column(Integer, nullable=False)
+    node_index = Column(Integer, nullable=False)
+    hash = Column(String(64), nullable=False)
+
+
+class AuditChainMerkleRoot(Base):
+    """Signed Merkle root of a chain at tree_size entries"""
+
+    __tablename__ = "audit_chain_merkle_roots"
+    __table_args__ = (
+        UniqueConstraint(
+            "chain_id", "tree_size", name="uq_audit_chain_merkle_roots_size"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(String, nullable=False, index=True)
+    tree_size = Column(Integer, nullable=False)
+    root_hash = Column(String(64), nullable=False)
+    signature = Column(String(64), nullable=False)  # HMAC-SHA256, hex
+    created_at = Column(DateTime, server_default=func.now())
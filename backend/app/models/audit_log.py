@@ -1,13 +1,34 @@
-from sqlalchemy import (JSON, Boolean, Column, DateTime, ForeignKey, Integer,
-                        String, Text)
+from sqlalchemy import (JSON, Boolean, Column, DateTime, ForeignKey, Index,
+                        Integer, String, Text)
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.db import Base
 
 
 class AuditLog(Base):
+    # On PostgreSQL this is range-partitioned by month on created_at, with
+    # primary key (id, created_at) (migration f3a9c7e1d284, partitions managed
+    # by AuditPartitionService). Queries should bound created_at so they only
+    # read the partitions they need.
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Anomaly rules and recent-violation counts per user and event type
+        Index(
+            "ix_audit_logs_user_event_created", "user_id", "event_type", "created_at"
+        ),
+        # Threat monitor feed and risk heatmap over AI security events
+        Index(
+            "ix_audit_logs_ai_security_company_created",
+            "company_id",
+            "created_at",
+            postgresql_where=text("event_type LIKE 'SECURITY_AI_%'"),
+            sqlite_where=text("event_type LIKE 'SECURITY_AI_%'"),
+        ),
+        # Keyset pagination of the admin audit log listing
+        Index("ix_audit_logs_created_id", "created_at", "id"),
+        Index("ix_audit_logs_company_created_id", "company_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_type = Column(String, nullable=False, index=True)
@@ -18,7 +39,7 @@ class AuditLog(Base):
     details = Column(JSON, default=dict)
     ip_address = Column(String, nullable=True)
     user_agent = Column(Text, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
 
     # AI-specific audit fields
     ai_request_text = Column(Text, nullable=True)
@@ -0,0 +1,45 @@
+import enum
+
+from sqlalchemy import (JSON, Column, DateTime, Enum, Index, Integer, String,
+                        Text)
+from sqlalchemy.sql import func
+
+from app.db import Base
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"  # Out of attempts (or no handler for the job type)
+
+
+class BackgroundJob(Base):
+    """A unit of work for the job workers (see app.services.job_queue)"""
+
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)  # Keyword arguments for the handler
+    # Enqueueing twice with the same key returns the first job
+    idempotency_key = Column(String(255), nullable=True, unique=True)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime, nullable=False)  # Not picked up before this
+    locked_by = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)  # Requeued after this
+    result = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers claim the oldest due job of a status
+        Index("ix_background_jobs_status_run_at", "status", "run_at"),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} {self.job_type} {self.status}>"
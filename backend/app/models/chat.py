@@ -1,5 +1,5 @@
-from sqlalchemy import (JSON, Boolean, Column, DateTime, ForeignKey, Integer,
-                        String, Text)
+from sqlalchemy import (JSON, Boolean, Column, DateTime, ForeignKey, Index,
+                        Integer, String, Text)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -8,6 +8,10 @@ from app.db import Base
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Channel history pages, newest first, paged by message id
+        Index("ix_chat_messages_channel_id_id", "channel_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(
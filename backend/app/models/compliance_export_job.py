@@ -0,0 +1,50 @@
+import enum
+
+from sqlalchemy import (JSON, BigInteger, Column, DateTime, Enum, ForeignKey,
+                        Integer, String, Text)
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db import Base
+
+
+class ExportStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class ComplianceExportJob(Base):
+    """A compliance report generated in the background to a file on disk"""
+
+    __tablename__ = "compliance_export_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    company_id = Column(Integer, nullable=True)
+    format = Column(String(10), nullable=False)  # json, csv or pdf
+    parameters = Column(JSON, nullable=False)  # The ComplianceExportRequest
+    status = Column(Enum(ExportStatus), default=ExportStatus.PENDING, nullable=False)
+    rows_total = Column(Integer, nullable=True)  # Known once the summary is done
+    rows_written = Column(Integer, default=0, nullable=False)
+    file_path = Column(String, nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    requester = relationship("User")
+
+    @property
+    def progress(self) -> float:
+        """Share of rows written, 0-1 (1 once completed)"""
+        if self.status == ExportStatus.COMPLETED:
+            return 1.0
+        if not self.rows_total:
+            return 0.0
+        return min(self.rows_written / self.rows_total, 1.0)
+
+    def __repr__(self):
+        return f"<ComplianceExportJob {self.id} {self.format} {self.status}>"
@@ -1,4 +1,5 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
+                        String)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,6 +8,12 @@ from app.db import Base
 
 class EmployeeProfile(Base):
     __tablename__ = "employee_profiles"
+    __table_args__ = (
+        # Keyset pagination of the list endpoint
+        Index(
+            "ix_employee_profiles_company_created_id", "company_id", "created_at", "id"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
@@ -24,7 +31,7 @@ class EmployeeProfile(Base):
     emergency_contact = Column(String, nullable=True)
     employee_id = Column(String, unique=True, nullable=True)
     profile_picture_url = Column(String, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
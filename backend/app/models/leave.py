@@ -1,4 +1,5 @@
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (Column, DateTime, Enum, ForeignKey, Index, Integer,
+                        String)
 from sqlalchemy.sql import func
 
 from app.db import Base
@@ -6,6 +7,11 @@ from app.db import Base
 
 class Leave(Base):
     __tablename__ = "leaves"
+    __table_args__ = (
+        # Keyset pagination of the list endpoint
+        Index("ix_leaves_tenant_created_id", "tenant_id", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     tenant_id = Column(String, nullable=False)
@@ -19,5 +25,7 @@ class Leave(Base):
     status = Column(
         Enum("Approved", "Pending", "Rejected", name="leavestatus"), default="Pending"
     )
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(
+        DateTime, nullable=False, default=func.now(), server_default=func.now()
+    )
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
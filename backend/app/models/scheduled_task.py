@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Float, String, Text
+
+from app.db import Base
+
+
+class ScheduledTaskState(Base):
+    """Last runs of a cluster-wide scheduled task (see app.services.scheduler)"""
+
+    __tablename__ = "scheduled_tasks"
+
+    name = Column(String(100), primary_key=True)
+    # Cron fire time of the latest run; later fire times not yet run are missed
+    last_scheduled_at = Column(DateTime, nullable=True)
+    last_started_at = Column(DateTime, nullable=True)
+    last_finished_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    last_status = Column(String(20), nullable=True)  # running/succeeded/failed
+    last_duration_seconds = Column(Float, nullable=True)
+    last_error = Column(Text, nullable=True)
+    last_node = Column(String(255), nullable=True)
+
+    def __repr__(self):
+        return f"<ScheduledTaskState {self.name} {self.last_status}>"
@@ -1,6 +1,7 @@
 import enum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (Column, DateTime, Enum, ForeignKey, Index, Integer,
+                        String)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -16,6 +17,11 @@ class ShiftStatus(str, enum.Enum):
 
 class Shift(Base):
     __tablename__ = "shifts"
+    __table_args__ = (
+        # Keyset pagination of the list endpoint
+        Index("ix_shifts_company_created_id", "company_id", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -23,7 +29,9 @@ class Shift(Base):
     end_at = Column(DateTime, nullable=False)
     location = Column(String, nullable=True)
     status = Column(Enum(ShiftStatus), default=ShiftStatus.SCHEDULED, nullable=False)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(
+        DateTime, nullable=False, default=func.now(), server_default=func.now()
+    )
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     # Relationships
@@ -33,6 +33,9 @@ class User(Base):
     team_id = Column(Integer, ForeignKey("company_teams.id"), nullable=True)
     is_active = Column(Boolean, default=True)
     is_locked = Column(Boolean, default=False)  # Account lockout flag
+    # Bumped on role/company/active/lock changes; access tokens carry it as
+    # "tv" and older versions are rejected
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     locked_until = Column(DateTime, nullable=True)  # Lockout expiration time
     trust_score = Column(Integer, default=100)  # Trust score 0-100, starts at 100
     fcm_token = Column(
@@ -0,0 +1,83 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = structlog.get_logger(__name__)
+
+
+class RequestQueryStats:
+    """SQL statements executed while handling one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def most_repeated(self):
+        """(statement, executions) for the most repeated statement, or None"""
+        if not self.statements:
+            return None
+        return self.statements.most_common(1)[0]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries():
+    """Collect stats for every statement executed in the current context.
+
+    Sync endpoints run in the threadpool with a copy of this context, so the
+    same stats object is shared with the request that started tracking.
+    """
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_start_time"):
+        return
+    stats.record(statement, time.perf_counter() - conn.info["query_start_time"].pop())
+
+
+def check_query_budget(route: str, stats: RequestQueryStats, budget: int) -> bool:
+    """Log the most repeated statement when a route goes over its query budget"""
+    if stats.count <= budget:
+        return True
+
+    statement, executions = stats.most_repeated()
+    logger.warning(
+        "SQL query budget exceeded",
+        route=route,
+        query_count=stats.count,
+        query_budget=budget,
+        sql_time_ms=round(stats.duration * 1000, 2),
+        repeated_statement=statement,
+        repeated_count=executions,
+    )
+    return False
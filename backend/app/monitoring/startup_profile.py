@@ -0,0 +1,113 @@
+"""Import-time profile of the API process, from ``python -X importtime``"""
+
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Dependencies that must only be imported on first use, never at startup
+LAZY_MODULES = ("pandas", "reportlab", "firebase_admin", "requests")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    records: List[ImportRecord] = field(default_factory=list)
+    loaded: List[str] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        """Cumulative import time of the top-level target module"""
+        top = [r.cumulative_us for r in self.records if r.depth == 0]
+        return top[-1] / 1e6 if top else 0.0
+
+    def slowest(self, limit: int = 25, cumulative: bool = True) -> List[ImportRecord]:
+        key = (lambda r: r.cumulative_us) if cumulative else (lambda r: r.self_us)
+        return sorted(self.records, key=key, reverse=True)[:limit]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time in microseconds summed per top-level package"""
+        totals: Dict[str, int] = {}
+        for record in self.records:
+            package = record.module.split(".")[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def eager_heavy_modules(self) -> List[str]:
+        return [m for m in LAZY_MODULES if m in self.loaded]
+
+    def report(self, limit: int = 25) -> str:
+        lines = [f"Total import time: {self.total_seconds:.3f}s", ""]
+        lines.append("Slowest modules (cumulative ms, self ms):")
+        for record in self.slowest(limit):
+            lines.append(
+                f"  {record.cumulative_us / 1000:9.1f} {record.self_us / 1000:9.1f}"
+                f"  {'  ' * record.depth}{record.module}"
+            )
+        lines += ["", "Self time by package (ms):"]
+        for package, self_us in list(self.by_package().items())[:limit]:
+            lines.append(f"  {self_us / 1000:9.1f}  {package}")
+        eager = self.eager_heavy_modules()
+        lines += ["", f"Heavy modules imported at startup: {', '.join(eager) or 'none'}"]
+        return "\n".join(lines) + "\n"
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(
+                ImportRecord(
+                    module=module,
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    depth=max(len(indent) - 1, 0) // 2,
+                )
+            )
+    return records
+
+
+def profile_startup(
+    target: str = "app.main", env: Optional[Dict[str, str]] = None
+) -> StartupProfile:
+    """Import ``target`` in a fresh interpreter and collect its import times"""
+    probe = (
+        f"import sys, {target}; "
+        f"print('loaded:' + ','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ, **(env or {})),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Startup logging also goes to stdout, so pick out the probe's own line
+    loaded = next(
+        (
+            line[len("loaded:"):]
+            for line in result.stdout.splitlines()
+            if line.startswith("loaded:")
+        ),
+        "",
+    )
+    return StartupProfile(
+        records=parse_importtime(result.stderr),
+        loaded=[m for m in loaded.split(",") if m],
+    )
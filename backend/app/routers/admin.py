@@ -1,25 +1,37 @@
+import os
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.rbac import (RBACService, require_company_access,
                            require_superadmin)
-from app.db import get_db
+from app.crud import (DEFAULT_PAGE_SIZE, InvalidCursorError, encode_cursor,
+                      paginate_keyset)
+from app.db import get_db, get_read_db
 from app.deps import get_current_user
+from app.models.audit_log import AuditLog
+from app.models.background_job import BackgroundJob
+from app.models.compliance_export_job import ComplianceExportJob, ExportStatus
 from app.models.user import User, UserRole
 from app.schemas.ai import (AIApprovalRequest, AIPolicyUpdate,
-                            ComplianceExportRequest, RiskHeatMapData,
-                            TrustScoreUpdate, WebhookAlertConfig)
+                            ComplianceExportJobOut, ComplianceExportRequest,
+                            RiskHeatMapData, TrustScoreUpdate,
+                            WebhookAlertConfig)
 from app.services.analytics_service import AnalyticsService
 from app.services.audit_chain_service import AuditChainService
+from app.services.audit_merkle_service import AuditMerkleService
 from app.services.audit_service import AuditService
-from app.services.compliance_export_service import ComplianceExportService
+from app.services.compliance_export_jobs import ComplianceExportJobService
+from app.services.job_queue import JobQueue
+from app.services.report_writers import REPORT_WRITERS
 from app.services.security_service import SecurityService
 from app.services.threat_monitor_service import ThreatMonitorService
 from app.services.trust_service import TrustService
+from app.streaming import STREAM_MODES, file_range_response, ndjson_response
 
 router = APIRouter()
 
@@ -27,6 +39,7 @@ router = APIRouter()
 @router.get("/stats/users")
 def get_user_stats(
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     company_id: Optional[int] = Query(
         None, description="Company ID for scoping (required for COMPANY_ADMIN)"
@@ -46,7 +59,7 @@ def get_user_stats(
     else:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    stats = AnalyticsService.get_user_stats(db, company_id)
+    stats = AnalyticsService.get_user_stats(read_db, company_id)
 
     # Log admin action
     AuditService.log_admin_action(
@@ -63,6 +76,7 @@ def get_user_stats(
 @router.get("/stats/channels")
 def get_channel_stats(
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     company_id: Optional[int] = Query(
         None, description="Company ID for scoping (required for COMPANY_ADMIN)"
@@ -81,7 +95,7 @@ def get_channel_stats(
     else:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    stats = AnalyticsService.get_channel_stats(db, company_id)
+    stats = AnalyticsService.get_channel_stats(read_db, company_id)
 
     AuditService.log_admin_action(
         db=db,
@@ -97,6 +111,7 @@ def get_channel_stats(
 @router.get("/stats/meetings")
 def get_meeting_stats(
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     company_id: Optional[int] = Query(
         None, description="Company ID for scoping (required for COMPANY_ADMIN)"
@@ -115,7 +130,7 @@ def get_meeting_stats(
     else:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    stats = AnalyticsService.get_meeting_stats(db, company_id)
+    stats = AnalyticsService.get_meeting_stats(read_db, company_id)
 
     AuditService.log_admin_action(
         db=db,
@@ -131,6 +146,7 @@ def get_meeting_stats(
 @router.get("/stats/audit")
 def get_audit_stats(
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     company_id: Optional[int] = Query(
         None, description="Company ID for scoping (required for COMPANY_ADMIN)"
@@ -149,7 +165,7 @@ def get_audit_stats(
     else:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    stats = AnalyticsService.get_audit_stats(db, company_id)
+    stats = AnalyticsService.get_audit_stats(read_db, company_id)
 
     AuditService.log_admin_action(
         db=db,
@@ -162,22 +178,86 @@ def get_audit_stats(
     return stats
 
 
+def _audit_log_row(log: AuditLog) -> dict:
+    return {
+        "id": log.id,
+        "event_type": log.event_type,
+        "user_id": log.user_id,
+        "company_id": log.company_id,
+        "resource_type": log.resource_type,
+        "resource_id": log.resource_id,
+        "details": log.details,
+        "ip_address": log.ip_address,
+        "created_at": log.created_at.isoformat(),
+    }
+
+
 @router.get("/audit/logs")
 def get_audit_logs(
+    request: Request,
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(require_superadmin),
     company_id: Optional[int] = Query(None),
-    limit: int = Query(50, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000),
+    offset: Optional[int] = Query(
+        None, ge=0, deprecated=True, description="Ignored when a cursor is given"
+    ),
+    include_total: bool = Query(
+        False, description="Count every matching log; always on with offset"
+    ),
+    stream: Optional[str] = Query(
+        None,
+        pattern=STREAM_MODES,
+        description="ndjson: stream every matching log, one per line, newest first",
+    ),
 ):
-    """Get audit logs - Superadmin only"""
-    query = db.query(AuditLog).order_by(AuditLog.created_at.desc())
+    """
+    Get audit logs - Superadmin only. Pages are keyed by ``next_cursor``;
+    ``offset`` is still honoured for older clients until they move to cursors.
+    ``total`` costs a full count, so cursor pages only return it when
+    ``include_total`` is set.
+    """
+    if stream:
+        AuditService.log_admin_action(
+            db=db,
+            action="VIEW_AUDIT_LOGS",
+            user_id=current_user.id,
+            company_id=company_id,
+            details={"stream": stream},
+        )
+
+        def produce(stream_db: Session):
+            query = stream_db.query(AuditLog)
+            if company_id:
+                query = query.filter(AuditLog.company_id == company_id)
+            query = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            for log in query.yield_per(settings.NDJSON_STREAM_BATCH_SIZE):
+                yield _audit_log_row(log)
+
+        return ndjson_response(produce, request)
+
+    query = read_db.query(AuditLog)
 
     if company_id:
         query = query.filter(AuditLog.company_id == company_id)
 
-    total = query.count()
-    logs = query.limit(limit).offset(offset).all()
+    by_offset = offset is not None and not cursor
+    total = query.count() if by_offset or include_total else None
+    if by_offset:
+        query = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        logs = query.offset(offset).limit(limit).all()
+        next_cursor = (
+            encode_cursor(logs[-1].created_at, logs[-1].id)
+            if logs and offset + len(logs) < total
+            else None
+        )
+    else:
+        try:
+            logs, next_cursor = paginate_keyset(query, AuditLog, cursor, limit)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     # Log admin action
     AuditService.log_admin_action(
@@ -185,27 +265,15 @@ def get_audit_logs(
         action="VIEW_AUDIT_LOGS",
         user_id=current_user.id,
         company_id=company_id,
-        details={"limit": limit, "offset": offset},
+        details={"limit": limit, "offset": offset, "cursor": cursor},
     )
 
     return {
-        "logs": [
-            {
-                "id": log.id,
-                "event_type": log.event_type,
-                "user_id": log.user_id,
-                "company_id": log.company_id,
-                "resource_type": log.resource_type,
-                "resource_id": log.resource_id,
-                "details": log.details,
-                "ip_address": log.ip_address,
-                "created_at": log.created_at.isoformat(),
-            }
-            for log in logs
-        ],
+        "logs": [_audit_log_row(log) for log in logs],
         "total": total,
         "limit": limit,
-        "offset": offset,
+        "offset": offset or 0,
+        "next_cursor": next_cursor,
     }
 
 
@@ -224,10 +292,11 @@ class AuditSearchRequest(BaseModel):
 def search_audit_logs(
     search_request: AuditSearchRequest,
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(require_superadmin),
 ):
     """Search audit logs - Superadmin only"""
-    query = db.query(AuditLog).order_by(AuditLog.created_at.desc())
+    query = read_db.query(AuditLog).order_by(AuditLog.created_at.desc())
 
     if search_request.event_type:
         query = query.filter(AuditLog.event_type == search_request.event_type)
@@ -416,6 +485,33 @@ def update_ai_policy(
     return {"message": "AI policy updated successfully"}
 
 
+def _ai_log_row(log: AuditLog) -> dict:
+    return {
+        "id": log.id,
+        "user_id": log.user_id,
+        "company_id": log.company_id,
+        "ai_request_text": log.ai_request_text,
+        "ai_capability": log.ai_capability,
+        "ai_decision": log.ai_decision,
+        "ai_scope_valid": log.ai_scope_valid,
+        "ai_required_role": log.ai_required_role,
+        "ai_user_role": log.ai_user_role,
+        "ai_severity": log.ai_severity,
+        "created_at": log.created_at.isoformat(),
+    }
+
+
+def _ai_logs_query(db: Session, company_id: Optional[int]):
+    query = (
+        db.query(AuditLog)
+        .filter(AuditLog.event_type == "AI_REQUEST")
+        .order_by(AuditLog.created_at.desc())
+    )
+    if company_id:
+        query = query.filter(AuditLog.company_id == company_id)
+    return query
+
+
 @router.get("/ai/logs")
 def get_ai_logs(
     db: Session = Depends(get_db),
@@ -423,16 +519,30 @@ def get_ai_logs(
     company_id: Optional[int] = Query(None),
     limit: int = Query(50, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    stream: Optional[str] = Query(
+        None,
+        pattern=STREAM_MODES,
+        description="ndjson: stream every matching log, one per line, newest first",
+    ),
 ):
     """Get AI audit logs - Superadmin only"""
-    query = (
-        db.query(AuditLog)
-        .filter(AuditLog.event_type == "AI_REQUEST")
-        .order_by(AuditLog.created_at.desc())
-    )
+    if stream:
+        AuditService.log_admin_action(
+            db=db,
+            action="VIEW_AI_LOGS",
+            user_id=current_user.id,
+            company_id=company_id,
+            details={"stream": stream},
+        )
 
-    if company_id:
-        query = query.filter(AuditLog.company_id == company_id)
+        def produce(stream_db: Session):
+            query = _ai_logs_query(stream_db, company_id).order_by(AuditLog.id.desc())
+            for log in query.yield_per(settings.NDJSON_STREAM_BATCH_SIZE):
+                yield _ai_log_row(log)
+
+        return ndjson_response(produce)
+
+    query = _ai_logs_query(db, company_id)
 
     total = query.count()
     logs = query.limit(limit).offset(offset).all()
@@ -447,22 +557,7 @@ def get_ai_logs(
     )
 
     return {
-        "logs": [
-            {
-                "id": log.id,
-                "user_id": log.user_id,
-                "company_id": log.company_id,
-                "ai_request_text": log.ai_request_text,
-                "ai_capability": log.ai_capability,
-                "ai_decision": log.ai_decision,
-                "ai_scope_valid": log.ai_scope_valid,
-                "ai_required_role": log.ai_required_role,
-                "ai_user_role": log.ai_user_role,
-                "ai_severity": log.ai_severity,
-                "created_at": log.created_at.isoformat(),
-            }
-            for log in logs
-        ],
+        "logs": [_ai_log_row(log) for log in logs],
         "total": total,
         "limit": limit,
         "offset": offset,
@@ -603,7 +698,7 @@ def get_live_violations(
 
 @router.get("/ai/risk-heatmap")
 def get_risk_heatmap(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_superadmin),
     company_id: Optional[int] = Query(None),
     time_range_hours: int = Query(24, ge=1, le=168),  # Max 1 week
@@ -616,54 +711,94 @@ def get_risk_heatmap(
     )
 
 
-@router.post("/ai/compliance-export")
-def export_compliance_report(
+def _export_job_out(job: ComplianceExportJob) -> ComplianceExportJobOut:
+    out = ComplianceExportJobOut.model_validate(job)
+    if job.status == ExportStatus.COMPLETED:
+        out.download_url = f"/api/admin/ai/compliance-exports/{job.id}/download"
+    return out
+
+
+@router.post(
+    "/ai/compliance-exports", response_model=ComplianceExportJobOut, status_code=202
+)
+# The old synchronous export built whole reports in the request; it now
+# queues a job like the endpoint above
+@router.post(
+    "/ai/compliance-export",
+    response_model=ComplianceExportJobOut,
+    status_code=202,
+    deprecated=True,
+)
+def start_compliance_export(
     export_request: ComplianceExportRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_superadmin),
 ):
-    """Export compliance report - Superadmin only"""
+    """Generate a compliance report (json, csv or pdf) in the background - Superadmin only"""
     try:
-        result = ComplianceExportService.export_report(db, export_request)
+        job = ComplianceExportJobService.create_job(db, export_request, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Log export action
-        AuditService.log_admin_action(
-            db=db,
-            action="EXPORT_COMPLIANCE_REPORT",
-            user_id=current_user.id,
-            company_id=export_request.company_id,
-            details={
-                "format": export_request.format,
-                "date_range": f"{export_request.start_date} to {export_request.end_date}",
-                "include_logs": export_request.include_logs,
-                "include_trust_history": export_request.include_trust_history,
-            },
-        )
+    AuditService.log_admin_action(
+        db=db,
+        action="START_COMPLIANCE_EXPORT",
+        user_id=current_user.id,
+        company_id=export_request.company_id,
+        details={
+            "job_id": job.id,
+            "format": job.format,
+            "date_range": f"{export_request.start_date} to {export_request.end_date}",
+        },
+    )
+    JobQueue.enqueue(
+        db,
+        "compliance_export.generate",
+        {"job_id": job.id},
+        idempotency_key=f"compliance_export:{job.id}",
+    )
+    db.commit()
+    return _export_job_out(job)
 
-        if export_request.format.lower() == "pdf":
-            import io
 
-            from fastapi.responses import StreamingResponse
+@router.get("/ai/compliance-exports/{job_id}", response_model=ComplianceExportJobOut)
+def get_compliance_export(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superadmin),
+):
+    """Status and progress of a background compliance export - Superadmin only"""
+    job = db.get(ComplianceExportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return _export_job_out(job)
 
-            return StreamingResponse(
-                io.BytesIO(result["data"]),
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f"attachment; filename={result['filename']}"
-                },
-            )
-        else:
-            from fastapi.responses import JSONResponse
-
-            return JSONResponse(
-                content=json.loads(result["data"]),
-                headers={
-                    "Content-Disposition": f"attachment; filename={result['filename']}"
-                },
-            )
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+@router.get("/ai/compliance-exports/{job_id}/download")
+def download_compliance_export(
+    job_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superadmin),
+):
+    """Download a finished export; supports Range requests - Superadmin only"""
+    job = db.get(ComplianceExportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.status != ExportStatus.COMPLETED:
+        raise HTTPException(
+            status_code=409, detail=f"Export is {job.status.value.lower()}"
+        )
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(
+            status_code=410, detail="Export file is no longer available"
+        )
+    return file_range_response(
+        request,
+        job.file_path,
+        REPORT_WRITERS[job.format].media_type,
+        filename=ComplianceExportJobService.filename(job),
+    )
 
 
 @router.post("/ai/webhook-config")
@@ -697,11 +832,33 @@ def configure_alert_webhook(
 @router.get("/audit-chain/verify/{chain_id}")
 def verify_audit_chain(
     chain_id: str,
+    response: Response,
+    full: bool = Query(
+        False, description="Re-verify from genesis instead of the latest checkpoint"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_superadmin),
 ):
-    """Verify integrity of an audit chain - Superadmin only"""
-    is_valid, issues = AuditChainService.verify_chain_integrity(db, chain_id)
+    """
+    Verify integrity of an audit chain - Superadmin only. Full runs hash
+    the whole chain on a process pool, so they are queued as a background
+    job (202 with the job id) rather than run in the request.
+    """
+    if full:
+        job = JobQueue.enqueue(db, "audit_chain.verify_full", {"chain_id": chain_id})
+        AuditService.log_admin_action(
+            db=db,
+            action="START_AUDIT_CHAIN_VERIFICATION",
+            user_id=current_user.id,
+            company_id=None,
+            details={"chain_id": chain_id, "job_id": job.id, "full": True},
+        )
+        db.commit()
+        response.status_code = 202
+        return {"chain_id": chain_id, "job_id": job.id, "status": job.status.value}
+
+    result = AuditChainService.run_verification(db, chain_id)
+    is_valid, issues = result.is_valid, result.issues
 
     # Log admin action
     AuditService.log_admin_action(
@@ -713,6 +870,8 @@ def verify_audit_chain(
             "chain_id": chain_id,
             "is_valid": is_valid,
             "issues_count": len(issues),
+            "full": False,
+            "entries_verified": result.entries_verified,
         },
     )
 
@@ -720,10 +879,66 @@ def verify_audit_chain(
         "chain_id": chain_id,
         "is_valid": is_valid,
         "issues": issues,
+        "verified_from_sequence": result.start_sequence,
+        "entries_verified": result.entries_verified,
+        "checkpoints_created": len(result.checkpoints),
         "verified_at": datetime.utcnow().isoformat(),
     }
 
 
+@router.get("/audit-chain/verify-jobs/{job_id}")
+def get_audit_chain_verification_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superadmin),
+):
+    """Status and outcome of a queued full verification - Superadmin only"""
+    job = db.get(BackgroundJob, job_id)
+    if job is None or job.job_type != "audit_chain.verify_full":
+        raise HTTPException(status_code=404, detail="Verification job not found")
+    return {
+        "job_id": job.id,
+        "chain_id": job.payload.get("chain_id"),
+        "status": job.status.value,
+        "result": job.result,
+        "error": job.last_error,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+@router.get("/audit-chain/proof/{chain_id}/{sequence_number}")
+def get_audit_chain_inclusion_proof(
+    chain_id: str,
+    sequence_number: int,
+    tree_size: Optional[int] = Query(
+        None, ge=1, description="Signed root to prove against (default: latest)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superadmin),
+):
+    """Merkle inclusion proof for an audit chain entry - Superadmin only"""
+    proof = AuditMerkleService.inclusion_proof(
+        db, chain_id, sequence_number, tree_size=tree_size
+    )
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Entry or signed root not found")
+
+    # Log admin action
+    AuditService.log_admin_action(
+        db=db,
+        action="AUDIT_CHAIN_INCLUSION_PROOF",
+        user_id=current_user.id,
+        company_id=None,
+        details={
+            "chain_id": chain_id,
+            "sequence_number": sequence_number,
+            "tree_size": proof["tree_size"],
+        },
+    )
+
+    return proof
+
+
 @router.get("/audit-chain/stats/{chain_id}")
 def get_audit_chain_stats(
     chain_id: str,
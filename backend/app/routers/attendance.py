@@ -1,19 +1,26 @@
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, Dict, List
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.crud import (clock_out_attendance, create_attendance, create_break,
-                      end_break, get_active_attendance_by_employee,
-                      get_attendance_by_id, get_break_by_id, get_user_by_id,
-                      list_attendance_by_employee, list_breaks_by_attendance)
+from app.core.rbac import MANAGER_ROLES
+from app.crud import (MAX_BULK_ROWS, bulk_insert, clock_out_attendance,
+                      create_attendance, create_break, end_break,
+                      get_active_attendance_by_employee, get_attendance_by_id,
+                      get_break_by_id, get_user_by_id,
+                      list_attendance_by_employee, list_breaks_by_attendance,
+                      validate_bulk_rows)
 from app.deps import get_current_user, get_db
-from app.models.user import User
-from app.schemas.attendance import (Attendance, AttendanceSummary, Break,
-                                    BreakEndRequest, BreakStartRequest,
-                                    ClockInRequest, ClockOutRequest)
+from app.models.attendance import Attendance as AttendanceModel
+from app.models.user import User, UserRole
+from app.schemas import BulkResult
+from app.schemas.attendance import (Attendance, AttendanceBulkCreate,
+                                    AttendanceSummary, Break, BreakEndRequest,
+                                    BreakStartRequest, ClockInRequest,
+                                    ClockOutRequest)
+from app.services.attendance_rollup_service import AttendanceRollupService
 
 logger = structlog.get_logger(__name__)
 
@@ -64,9 +71,10 @@ def clock_in(
         clock_in_time=datetime.now(timezone.utc),
         notes=payload.notes,
     )
+    AttendanceRollupService.record_clock_in(db, attendance)
     logger.info(
         "Attendance clock-in created",
-        event="attendance_clock_in",
+        action="attendance_clock_in",
         employee_id=payload.employee_id,
         clock_in_time=str(attendance.clock_in_time),
         user_id=current_user.id,
@@ -107,7 +115,7 @@ def clock_out(
 
     logger.info(
         "Clocking out attendance",
-        event="attendance_clock_out_attempt",
+        action="attendance_clock_out_attempt",
         attendance_id=payload.attendance_id,
         employee_id=payload.employee_id,
         user_id=current_user.id,
@@ -120,7 +128,7 @@ def clock_out(
     if not updated_attendance:
         logger.error(
             "Clock out failed",
-            event="attendance_clock_out_failed",
+            action="attendance_clock_out_failed",
             attendance_id=payload.attendance_id,
             employee_id=payload.employee_id,
             user_id=current_user.id,
@@ -130,9 +138,10 @@ def clock_out(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to clock out",
         )
+    AttendanceRollupService.record_clock_out(db, updated_attendance)
     logger.info(
         "Successfully clocked out attendance",
-        event="attendance_clock_out_success",
+        action="attendance_clock_out_success",
         attendance_id=updated_attendance.id,
         employee_id=payload.employee_id,
         user_id=current_user.id,
@@ -141,6 +150,104 @@ def clock_out(
     return updated_attendance
 
 
+@router.post("/bulk", response_model=BulkResult[Attendance])
+def bulk_create_attendance(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Import many attendance records with batched inserts. Rows with a
+    clock_out_time are stored as completed; invalid rows are skipped and
+    reported by their index in the request body.
+    """
+    if current_user.role not in MANAGER_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
+        )
+    if len(rows) > MAX_BULK_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ROWS} rows per request",
+        )
+
+    valid, errors = validate_bulk_rows(AttendanceBulkCreate, rows)
+
+    employee_ids = {record.employee_id for _, record in valid}
+    employee_companies = dict(
+        db.query(User.id, User.company_id).filter(User.id.in_(employee_ids)).all()
+    )
+    # Employees may only have one open record, including across this request
+    open_employees = {
+        employee_id
+        for (employee_id,) in db.query(AttendanceModel.employee_id)
+        .filter(
+            AttendanceModel.employee_id.in_(employee_ids),
+            AttendanceModel.clock_out_time.is_(None),
+        )
+        .all()
+    }
+
+    values, indexes = [], []
+    for index, record in valid:
+        company_id = employee_companies.get(record.employee_id)
+        if company_id is None:
+            errors.append({"index": index, "errors": ["Employee not found"]})
+            continue
+        if (
+            current_user.role != UserRole.SUPERADMIN
+            and company_id != current_user.company_id
+        ):
+            errors.append({"index": index, "errors": ["Access denied"]})
+            continue
+
+        fields = {
+            "company_id": company_id,
+            "employee_id": record.employee_id,
+            "clock_in_time": record.clock_in_time,
+            "clock_out_time": record.clock_out_time,
+            "total_hours": None,
+            "status": "active",
+            "notes": record.notes,
+        }
+        if record.clock_out_time:
+            duration = record.clock_out_time - record.clock_in_time
+            fields["total_hours"] = duration.total_seconds() / 3600
+            fields["status"] = "completed"
+        elif record.employee_id in open_employees:
+            errors.append(
+                {
+                    "index": index,
+                    "errors": ["User already has an active attendance record"],
+                }
+            )
+            continue
+        else:
+            open_employees.add(record.employee_id)
+
+        values.append(fields)
+        indexes.append(index)
+
+    created, failed = bulk_insert(db, AttendanceModel, values, indexes)
+    errors.extend(failed)
+    if created:
+        AttendanceRollupService.record_attendance(
+            db,
+            db.query(AttendanceModel)
+            .filter(AttendanceModel.id.in_([a["id"] for a in created]))
+            .all(),
+        )
+
+    logger.info(
+        "Bulk attendance records created",
+        created=len(created),
+        rejected=len(errors),
+        user_id=current_user.id,
+        company_id=current_user.company_id,
+    )
+    return {"items": created, "errors": sorted(errors, key=lambda e: e["index"])}
+
+
 @router.post("/breaks/start", response_model=Break, status_code=status.HTTP_201_CREATED)
 def start_break(
     payload: BreakStartRequest,
@@ -332,7 +439,7 @@ def get_employee_attendance(
     Get attendance records for a specific employee (role-based access)
     """
     # Role-based access control
-    if current_user.role.upper() not in ["SUPERADMIN", "COMPANYADMIN", "MANAGER"]:
+    if current_user.role not in MANAGER_ROLES:
         # Employees can only view their own records
         if current_user.id != employee_id:
             raise HTTPException(
@@ -352,7 +459,7 @@ def get_active_attendance_by_id(
     Get active attendance records for a specific employee (for cleanup/testing)
     """
     # Role-based access control
-    if current_user.role.upper() not in ["SUPERADMIN", "COMPANYADMIN", "MANAGER"]:
+    if current_user.role not in MANAGER_ROLES:
         # Employees can only view their own records
         if current_user.id != employee_id:
             raise HTTPException(
@@ -399,7 +506,7 @@ def get_breaks_for_attendance(
 
     if attendance.employee_id != current_user.id:
         # Allow managers/admins to view breaks
-        if current_user.role.upper() not in ["SUPERADMIN", "COMPANYADMIN", "MANAGER"]:
+        if current_user.role not in MANAGER_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
             )
@@ -414,7 +521,7 @@ def get_all_active_attendances(
     """
     Get all active attendance records (admin only)
     """
-    if current_user.role.upper() not in ["SUPERADMIN", "COMPANYADMIN", "MANAGER"]:
+    if current_user.role not in MANAGER_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
         )
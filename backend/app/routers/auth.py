@@ -20,6 +20,7 @@ from app.schemas import (LoginPayload, RefreshTokenRequest, Token, UserCreate,
                          UserOut, UserUpdate)
 from app.services.email_service import email_service
 from app.services.fcm_service import fcm_service
+from app.services.job_queue import JobQueue
 
 logger = structlog.get_logger(__name__)
 
@@ -65,7 +66,7 @@ def signup(payload: UserCreate, db: Session = Depends(get_db)):
         db, payload.email, payload.password, payload.full_name or "", role, company_id
     )
 
-    # Send welcome email
+    # Queue the welcome email for a job worker
     try:
         # Get company name if available
         company_name = "Your Company"
@@ -73,12 +74,21 @@ def signup(payload: UserCreate, db: Session = Depends(get_db)):
             company = get_company_by_id(db, user.company_id)
             if company:
                 company_name = company.name
-        email_service.send_welcome_email(
-            user.email, user.full_name or user.email, company_name
+        JobQueue.enqueue(
+            db,
+            "email.welcome",
+            {
+                "to_email": user.email,
+                "user_name": user.full_name or user.email,
+                "company_name": company_name,
+            },
+            idempotency_key=f"email:welcome:{user.id}",
         )
+        db.commit()
     except Exception as e:
+        db.rollback()
         logger.warning(
-            "Failed to send welcome email", error=str(e), user_email=user.email
+            "Failed to queue welcome email", error=str(e), user_email=user.email
         )
 
     return user
@@ -97,6 +107,7 @@ def login(payload: LoginPayload, db: Session = Depends(get_db)):
         sub=user.email,
         company_id=user.company_id,
         role=user.role,
+        token_version=user.token_version,
     )
 
     refresh_token_str = auth_create_refresh_token(
@@ -220,7 +231,10 @@ def refresh_token(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
 
         # Create new tokens
         access_token = create_access_token(
-            sub=user_email, company_id=company_id, role=role
+            sub=user_email,
+            company_id=company_id,
+            role=role,
+            token_version=user.token_version,
         )
         new_refresh_token_str = auth_create_refresh_token(
             sub=user_email, company_id=company_id, role=role
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 import structlog
 from fastapi import (APIRouter, Depends, HTTPException, WebSocket,
                      WebSocketDisconnect)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.rbac import require_channel_access
@@ -15,7 +16,7 @@ from app.crud.crud_chat import (create_chat_message, get_channel_messages,
                                 mark_message_as_read)
 from app.crud.crud_reactions import (add_reaction, get_reactions_for_message,
                                      remove_reaction)
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app.deps import get_current_user
 from app.models.company import Company
 from app.models.notification import NotificationType
@@ -37,7 +38,7 @@ active_connections: Dict[int, List[WebSocket]] = {}
 
 @router.websocket("/ws/{user_id}")
 async def websocket_endpoint(
-    websocket: WebSocket, user_id: int, db: Session = Depends(get_db)
+    websocket: WebSocket, user_id: int, db: AsyncSession = Depends(get_async_db)
 ):
     """WebSocket endpoint for real-time chat"""
     await websocket.accept()
@@ -59,8 +60,8 @@ async def websocket_endpoint(
             elif data.get("type") == "message":
                 # Create message and broadcast
                 message_data = data.get("message")
-                message = create_chat_message(
-                    db=db,
+                message = await db.run_sync(
+                    create_chat_message,
                     message_create=ChatMessageCreate(**message_data),
                     sender_id=user_id,
                     company_id=1,  # TODO: Get from token
@@ -76,7 +77,7 @@ async def websocket_endpoint(
         await redis_service.set_user_offline(1, user_id)
 
 
-async def broadcast_message(message, db: Session):
+async def broadcast_message(message, db: AsyncSession):
     """Broadcast message to relevant users"""
     # Get recipients based on message type
     recipients = []
@@ -84,7 +85,8 @@ async def broadcast_message(message, db: Session):
         # Channel message - get all channel members
         from app.crud.crud_channels import get_channel_members
 
-        recipients = [m.user_id for m in get_channel_members(db, message.channel_id)]
+        members = await db.run_sync(get_channel_members, message.channel_id)
+        recipients = [m.user_id for m in members]
     elif message.receiver_id:
         # Direct message
         recipients = [message.receiver_id]
@@ -109,77 +111,86 @@ async def broadcast_message(message, db: Session):
                 )
 
 
-@router.post("/messages/send", response_model=ChatMessageResponse)
-async def send_message(
+def _send_message(
+    db: Session,
     message: ChatMessageCreate,
-    channel_id: Optional[int] = None,
-    attachments: Optional[List[Dict[str, Any]]] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Send a chat message"""
-    try:
-        # Cross-org block for direct messages
-        if message.receiver_id:
-            receiver = db.query(User).filter(User.id == message.receiver_id).first()
-            if not receiver:
-                raise HTTPException(status_code=404, detail="Receiver not found")
-            if not RBACService.can_send_cross_org_message(current_user, receiver):
-                from app.services.audit_service import AuditService
-
-                AuditService.log_permission_denied(
-                    db=db,
-                    user_id=current_user.id,
-                    company_id=current_user.company_id,
-                    action="send_cross_org_dm",
-                    resource_type="user",
-                    resource_id=message.receiver_id,
-                    details={"receiver_company_id": receiver.company_id},
-                )
-                raise HTTPException(
-                    status_code=403, detail="Cannot send messages across organizations"
-                )
+    channel_id: Optional[int],
+    attachments: Optional[List[Dict[str, Any]]],
+    current_user: User,
+) -> ChatMessageResponse:
+    # Cross-org block for direct messages
+    if message.receiver_id:
+        receiver = db.query(User).filter(User.id == message.receiver_id).first()
+        if not receiver:
+            raise HTTPException(status_code=404, detail="Receiver not found")
+        if not RBACService.can_send_cross_org_message(current_user, receiver):
+            from app.services.audit_service import AuditService
 
-        # Validate channel membership if channel message
-        if channel_id and not is_user_member_of_channel(
-            db, channel_id, current_user.id
-        ):
-            raise HTTPException(status_code=403, detail="Not a member of this channel")
+            AuditService.log_permission_denied(
+                db=db,
+                user_id=current_user.id,
+                company_id=current_user.company_id,
+                action="send_cross_org_dm",
+                resource_type="user",
+                resource_id=message.receiver_id,
+                details={"receiver_company_id": receiver.company_id},
+            )
+            raise HTTPException(
+                status_code=403, detail="Cannot send messages across organizations"
+            )
 
-        chat_message = create_chat_message(
+    # Validate channel membership if channel message
+    if channel_id and not is_user_member_of_channel(db, channel_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this channel")
+
+    chat_message = create_chat_message(
+        db=db,
+        message_create=message,
+        sender_id=current_user.id,
+        company_id=current_user.company_id,
+        channel_id=channel_id,
+        attachments=attachments,
+    )
+
+    # Send FCM notification if direct message
+    if message.receiver_id and message.receiver_id != current_user.id:
+        fcm_service.send_chat_message(
+            db, current_user.id, message.receiver_id, message.message
+        )
+
+    # Create in-app notification
+    if message.receiver_id:
+        create_notification(
             db=db,
-            message_create=message,
-            sender_id=current_user.id,
+            user_id=message.receiver_id,
             company_id=current_user.company_id,
-            channel_id=channel_id,
-            attachments=attachments,
+            title=f"New message from {current_user.first_name}",
+            message=(
+                message.message[:100] + "..."
+                if len(message.message) > 100
+                else message.message
+            ),
+            type=NotificationType.CHAT_MESSAGE,
         )
 
-        # Send FCM notification if direct message
-        if message.receiver_id and message.receiver_id != current_user.id:
-            fcm_service.send_chat_message(
-                db, current_user.id, message.receiver_id, message.message
-            )
+    return ChatMessageResponse.from_orm(chat_message)
 
-        # Create in-app notification
-        if message.receiver_id:
-            create_notification(
-                db=db,
-                user_id=message.receiver_id,
-                company_id=current_user.company_id,
-                title=f"New message from {current_user.first_name}",
-                message=(
-                    message.message[:100] + "..."
-                    if len(message.message) > 100
-                    else message.message
-                ),
-                type=NotificationType.CHAT_MESSAGE,
-            )
 
-        logger.info(
-            "Message sent", message_id=chat_message.id, sender_id=current_user.id
+@router.post("/messages/send", response_model=ChatMessageResponse)
+async def send_message(
+    message: ChatMessageCreate,
+    channel_id: Optional[int] = None,
+    attachments: Optional[List[Dict[str, Any]]] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Send a chat message"""
+    try:
+        response = await db.run_sync(
+            _send_message, message, channel_id, attachments, current_user
         )
-        return ChatMessageResponse.from_orm(chat_message)
+        logger.info("Message sent", message_id=response.id, sender_id=current_user.id)
+        return response
     except Exception as e:
         logger.error("Failed to send message", error=str(e), user_id=current_user.id)
         raise HTTPException(status_code=500, detail="Failed to send message")
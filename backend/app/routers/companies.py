@@ -71,7 +71,8 @@ def create_new_company(
         new_access_token = create_access_token(
             sub=updated_user.email,
             company_id=new_company.id,
-            role="SUPERADMIN"
+            role="SUPERADMIN",
+            token_version=updated_user.token_version,
         )
 
         return {
@@ -1,24 +1,25 @@
 import io
 from datetime import date, datetime, timedelta
+from typing import Optional
 
-import pandas as pd
 import structlog
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, distinct, extract, func, or_
 from sqlalchemy.orm import Session
 
-from app.crud import (list_leaves_by_tenant, list_shifts_by_company,
-                      list_tasks, list_users_by_company)
-from app.deps import get_current_user, get_db
+from app.db import get_read_db
+from app.deps import get_current_user
 from app.models.attendance import Attendance
 from app.models.company import Company
-from app.models.employee_profile import EmployeeProfile
 from app.models.leave import Leave
 from app.models.payroll import Employee
-from app.models.task import TaskStatus
+from app.models.task import Task, TaskStatus
 from app.models.user import User
 from app.schemas.schemas import LeaveStatus
+from app.services.attendance_rollup_service import AttendanceRollupService
+from app.services.kpi_service import kpi_service
+from app.streaming import NDJSON_MEDIA_TYPE, STREAM_MODES, iter_ndjson
 
 logger = structlog.get_logger(__name__)
 
@@ -38,7 +39,7 @@ def _require_company_id(user: User) -> int:
 
 @router.get("/kpis")
 def get_dashboard_kpis(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)
 ):
     """
     Get dashboard KPIs for the current user's company
@@ -51,45 +52,20 @@ def get_dashboard_kpis(
         # Check user role for role-based dashboard
         user_role = "Manager"  # Default role for testing
 
+        snapshot = kpi_service.get_snapshot(db, company_id)
+
         # Employee-specific KPIs
         if user_role == "Employee":
-            # Get tasks assigned to this specific employee
-            tasks = list_tasks(db, company_id)
-            employee_tasks = [
-                task
-                for task in tasks
-                if getattr(task, "assignee_id", None) == current_user_id
-            ]
-
-            # Calculate employee-specific metrics
-            total_tasks = len(employee_tasks)
-            active_tasks = sum(
-                1
-                for task in employee_tasks
-                if (getattr(task, "status", "") or "").strip()
-                == TaskStatus.IN_PROGRESS.value
-            )
-            completed_tasks = sum(
-                1
-                for task in employee_tasks
-                if (getattr(task, "status", "") or "").strip()
-                == TaskStatus.COMPLETED.value
-            )
+            # Tasks assigned to this specific employee
+            employee_tasks = snapshot["tasks_by_assignee"].get(current_user_id, {})
+            total_tasks = sum(employee_tasks.values())
+            active_tasks = employee_tasks.get(TaskStatus.IN_PROGRESS.value, 0)
+            completed_tasks = employee_tasks.get(TaskStatus.COMPLETED.value, 0)
 
             # Get pending approvals for this employee (if approval system exists)
             # For now, we'll use pending leaves as a proxy for pending approvals
-            leaves = list_leaves_by_tenant(db, str(company_id))
-            employee_leaves = [
-                leave
-                for leave in leaves
-                if getattr(leave, "employee_id", None) == current_user_id
-            ]
-            pending_approvals = sum(
-                1
-                for leave in employee_leaves
-                if (getattr(leave, "status", "") or "").strip()
-                == LeaveStatus.PENDING.value
-            )
+            employee_leaves = snapshot["leaves_by_employee"].get(current_user_id, {})
+            pending_approvals = employee_leaves.get(LeaveStatus.PENDING.value, 0)
 
             # Get active teams count (if team system exists)
             # For now, we'll use a placeholder - this would need to be implemented based on team structure
@@ -105,43 +81,14 @@ def get_dashboard_kpis(
 
         # Manager, CompanyAdmin, and SuperAdmin - keep existing response
         else:
-            # Get total employees
-            employees = list_users_by_company(db, company_id)
-            total_employees = len(employees)
-
-            # Get active tasks (tasks that are not completed)
-            tasks = list_tasks(db, company_id)
-            active_tasks = sum(
-                1
-                for task in tasks
-                if (getattr(task, "status", "") or "").strip()
-                != TaskStatus.COMPLETED.value
-            )
-
-            # Get pending leave requests
-            leaves = list_leaves_by_tenant(db, str(company_id))
-            pending_leaves = sum(
-                1
-                for leave in leaves
-                if (getattr(leave, "status", "") or "").strip()
-                == LeaveStatus.PENDING.value
-            )
-
-            # Get shifts for today
-            today = date.today()
-            shifts = list_shifts_by_company(db, company_id)
-            shifts_today = 0
-            for shift in shifts:
-                start = getattr(shift, "start_at", None)
-                end = getattr(shift, "end_at", None)
-                if (start and start.date() == today) or (end and end.date() == today):
-                    shifts_today += 1
-
+            tasks = snapshot["tasks"]
             return {
-                "total_employees": total_employees,
-                "active_tasks": active_tasks,
-                "pending_leaves": pending_leaves,
-                "shifts_today": shifts_today,
+                "total_employees": snapshot["total_employees"],
+                # Tasks that are not completed
+                "active_tasks": sum(tasks.values())
+                - tasks.get(TaskStatus.COMPLETED.value, 0),
+                "pending_leaves": snapshot["leaves"].get(LeaveStatus.PENDING.value, 0),
+                "shifts_today": snapshot["shifts_today"],
             }
 
     except HTTPException:
@@ -155,7 +102,7 @@ def get_dashboard_kpis(
 
 @router.get("/recent-activities")
 def get_recent_activities(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user),
     limit: int = 10,
 ):
@@ -169,12 +116,13 @@ def get_recent_activities(
         activities = []
 
         # Get recent tasks (last N)
-        tasks = list_tasks(db, company_id)
-        recent_tasks = sorted(
-            tasks,
-            key=lambda x: getattr(x, "created_at", datetime.min),
-            reverse=True,
-        )[:limit]
+        recent_tasks = (
+            db.query(Task)
+            .filter(Task.company_id == company_id)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+            .limit(limit)
+            .all()
+        )
 
         for task in recent_tasks:
             title = (
@@ -207,12 +155,13 @@ def get_recent_activities(
             )
 
         # Get recent leaves (last N) - treat as approval requests
-        leaves = list_leaves_by_tenant(db, str(company_id))
-        recent_leaves = sorted(
-            leaves,
-            key=lambda x: getattr(x, "created_at", datetime.min),
-            reverse=True,
-        )[:limit]
+        recent_leaves = (
+            db.query(Leave)
+            .filter(Leave.tenant_id == str(company_id))
+            .order_by(Leave.created_at.desc(), Leave.id.desc())
+            .limit(limit)
+            .all()
+        )
 
         for leave in recent_leaves:
             leave_type = getattr(leave, "type", "Leave")
@@ -270,7 +219,7 @@ def get_recent_activities(
 
 @router.get("/charts/task-status")
 def get_task_status_chart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -282,26 +231,18 @@ def get_task_status_chart(
         current_user_id = 1
         user_role = "Manager"  # Default role for testing
 
+        snapshot = kpi_service.get_snapshot(db, company_id)
+
         # Employee-specific: only show their own tasks
         if user_role == "Employee":
-            tasks = list_tasks(db, company_id)
-            tasks = [
-                task
-                for task in tasks
-                if getattr(task, "assignee_id", None) == current_user_id
-            ]
+            tasks = snapshot["tasks_by_assignee"].get(current_user_id, {})
         else:
             # Manager, CompanyAdmin, SuperAdmin: show all company tasks
-            tasks = list_tasks(db, company_id)
-
-        # Initialize counts from enum values to avoid typos
-        status_count = {s.value: 0 for s in TaskStatus}
+            tasks = snapshot["tasks"]
 
-        for task in tasks:
-            s = (getattr(task, "status", "") or "").strip()
-            if s in status_count:
-                status_count[s] += 1
-            # Unknown statuses are ignored; alternatively map them to "Pending" or a catch-all
+        # Initialize counts from enum values to avoid typos; unknown statuses
+        # are ignored
+        status_count = {s.value: tasks.get(s.value, 0) for s in TaskStatus}
 
         return [
             {"name": "Pending", "value": status_count[TaskStatus.PENDING.value]},
@@ -323,7 +264,7 @@ def get_task_status_chart(
 
 @router.get("/charts/reports")
 def get_reports_chart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -348,12 +289,9 @@ def get_reports_chart(
             )
 
             # Get their own leave requests
-            leaves = list_leaves_by_tenant(db, str(company_id))
-            leaves = [
-                leave
-                for leave in leaves
-                if getattr(leave, "employee_id", None) == current_user_id
-            ]
+            leave_counts = kpi_service.get_snapshot(db, company_id)[
+                "leaves_by_employee"
+            ].get(current_user_id, {})
         else:
             # Manager, CompanyAdmin, SuperAdmin: show all company requests
             profile_requests = (
@@ -367,7 +305,7 @@ def get_reports_chart(
             )
 
             # Get all leave requests for the company
-            leaves = list_leaves_by_tenant(db, str(company_id))
+            leave_counts = kpi_service.get_snapshot(db, company_id)["leaves"]
 
         # Count profile update requests by status
         profile_status_count = {"pending": 0, "approved": 0, "rejected": 0}
@@ -377,11 +315,10 @@ def get_reports_chart(
                 profile_status_count[status] += 1
 
         # Count leave requests by status
-        leave_status_count = {"Pending": 0, "Approved": 0, "Rejected": 0}
-        for leave in leaves:
-            status = getattr(leave, "status", "Pending")
-            if status in leave_status_count:
-                leave_status_count[status] += 1
+        leave_status_count = {
+            status: leave_counts.get(status, 0)
+            for status in ("Pending", "Approved", "Rejected")
+        }
 
         # Combine the data for the chart
         # For employees, show their own requests
@@ -421,7 +358,7 @@ def get_reports_chart(
 
 @router.get("/charts/employee-distribution")
 def get_employee_distribution_chart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -430,8 +367,6 @@ def get_employee_distribution_chart(
     try:
         # For testing, use default company_id = 1
         company_id = 1
-        employees = list_users_by_company(db, company_id)
-
         role_count = {
             "SuperAdmin": 0,
             "CompanyAdmin": 0,
@@ -439,11 +374,15 @@ def get_employee_distribution_chart(
             "Employee": 0,
         }
 
-        for employee in employees:
-            role = (getattr(employee, "role", "") or "Employee").strip()
+        for role, total in (
+            db.query(User.role, func.count(User.id))
+            .filter(User.company_id == company_id)
+            .group_by(User.role)
+        ):
+            role = (getattr(role, "value", role) or "Employee").strip()
             if role not in role_count:
                 role = "Employee"
-            role_count[role] += 1
+            role_count[role] += total
 
         return [
             {"name": "Super Admin", "value": role_count["SuperAdmin"]},
@@ -463,7 +402,7 @@ def get_employee_distribution_chart(
 
 @router.get("/charts/contribution/tasks-completed")
 def get_tasks_completed_chart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -482,45 +421,13 @@ def get_tasks_completed_chart(
                 detail="Access denied. This endpoint is for employees only.",
             )
 
-        from datetime import datetime, timedelta
-
-        # Get tasks completed by this employee
-        tasks = list_tasks(db, company_id)
-        employee_tasks = [
-            task
-            for task in tasks
-            if getattr(task, "assignee_id", None) == current_user_id
-        ]
-
-        # Group by completion status and time periods
-        completed_tasks = [
-            task
-            for task in employee_tasks
-            if (getattr(task, "status", "") or "").strip() == TaskStatus.COMPLETED.value
-        ]
-
-        # Group by time periods (last 30 days, 30-60 days, 60-90 days, older)
-        now = datetime.now()
-        time_periods = {
-            "Last 7 days": timedelta(days=7),
-            "Last 30 days": timedelta(days=30),
-            "Last 90 days": timedelta(days=90),
-            "Older": None,
-        }
-
-        time_data = {period: 0 for period in time_periods.keys()}
-
-        for task in completed_tasks:
-            updated_at = getattr(task, "updated_at", None)
-            if updated_at:
-                if now - updated_at <= time_periods["Last 7 days"]:
-                    time_data["Last 7 days"] += 1
-                elif now - updated_at <= time_periods["Last 30 days"]:
-                    time_data["Last 30 days"] += 1
-                elif now - updated_at <= time_periods["Last 90 days"]:
-                    time_data["Last 90 days"] += 1
-                else:
-                    time_data["Older"] += 1
+        # Completed tasks of this employee by age (last 7/30/90 days, older)
+        time_data = {"Last 7 days": 0, "Last 30 days": 0, "Last 90 days": 0, "Older": 0}
+        time_data.update(
+            kpi_service.get_snapshot(db, company_id)["completed_by_age"].get(
+                current_user_id, {}
+            )
+        )
 
         return [
             {"name": "Last 7 days", "value": time_data["Last 7 days"]},
@@ -539,7 +446,7 @@ def get_tasks_completed_chart(
 
 @router.get("/charts/contribution/tasks-created")
 def get_tasks_created_chart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -558,21 +465,11 @@ def get_tasks_created_chart(
                 detail="Access denied. This endpoint is for employees only.",
             )
 
-        # Get tasks created by this employee
-        tasks = list_tasks(db, company_id)
-        created_tasks = [
-            task
-            for task in tasks
-            if getattr(task, "assigned_by", None) == current_user_id
-        ]
-
-        # Group by status
-        status_data = {s.value: 0 for s in TaskStatus}
-
-        for task in created_tasks:
-            s = (getattr(task, "status", "") or "").strip()
-            if s in status_data:
-                status_data[s] += 1
+        # Tasks created by this employee, by status
+        created_tasks = kpi_service.get_snapshot(db, company_id)[
+            "tasks_by_creator"
+        ].get(current_user_id, {})
+        status_data = {s.value: created_tasks.get(s.value, 0) for s in TaskStatus}
 
         return [
             {"name": "Pending", "value": status_data[TaskStatus.PENDING.value]},
@@ -591,7 +488,7 @@ def get_tasks_created_chart(
 
 @router.get("/charts/contribution/productivity")
 def get_productivity_chart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -610,48 +507,20 @@ def get_productivity_chart(
                 detail="Access denied. This endpoint is for employees only.",
             )
 
-        # Get tasks assigned to this employee
-        tasks = list_tasks(db, company_id)
-        employee_tasks = [
-            task
-            for task in tasks
-            if getattr(task, "assignee_id", None) == current_user_id
-        ]
+        # Tasks assigned to this employee, by status
+        employee_tasks = kpi_service.get_snapshot(db, company_id)[
+            "tasks_by_assignee"
+        ].get(current_user_id, {})
 
-        total_tasks = len(employee_tasks)
+        total_tasks = sum(employee_tasks.values())
         if total_tasks == 0:
             return [{"name": "No Tasks", "value": 1}]
 
         # Calculate productivity metrics
-        completed_tasks = sum(
-            1
-            for task in employee_tasks
-            if (getattr(task, "status", "") or "").strip() == TaskStatus.COMPLETED.value
-        )
-
-        in_progress_tasks = sum(
-            1
-            for task in employee_tasks
-            if (getattr(task, "status", "") or "").strip()
-            == TaskStatus.IN_PROGRESS.value
-        )
-
-        pending_tasks = sum(
-            1
-            for task in employee_tasks
-            if (getattr(task, "status", "") or "").strip() == TaskStatus.PENDING.value
-        )
-
-        overdue_tasks = sum(
-            1
-            for task in employee_tasks
-            if (getattr(task, "status", "") or "").strip() == TaskStatus.OVERDUE.value
-        )
-
-        # Calculate completion rate
-        completion_rate = (
-            (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
-        )
+        completed_tasks = employee_tasks.get(TaskStatus.COMPLETED.value, 0)
+        in_progress_tasks = employee_tasks.get(TaskStatus.IN_PROGRESS.value, 0)
+        pending_tasks = employee_tasks.get(TaskStatus.PENDING.value, 0)
+        overdue_tasks = employee_tasks.get(TaskStatus.OVERDUE.value, 0)
 
         return [
             {"name": "Completed", "value": completed_tasks},
@@ -687,7 +556,7 @@ def _require_manager_role(current_user: User):
 
 @router.get("/attendance")
 def get_attendance_trend(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str = "weekly",  # "daily" or "weekly"
 ):
@@ -705,73 +574,44 @@ def get_attendance_trend(
 
         today = date.today()
         start_date = today - timedelta(days=30 if period == "daily" else 90)
+        daily = AttendanceRollupService.daily_totals(db, company_id, start_date)
 
         if period == "daily":
-            trend_data = (
-                db.query(
-                    func.date(Attendance.clock_in_time).label("date"),
-                    func.count(distinct(Attendance.employee_id)).label("present"),
-                )
-                .filter(
-                    Attendance.company_id == company_id,
-                    Attendance.clock_in_time >= start_date,
-                    Attendance.status == "active",
-                )
-                .group_by(func.date(Attendance.clock_in_time))
-                .all()
-            )
-
-            # Fill missing dates with 0 present
-            data_dict = {row.date: row.present for row in trend_data}
             result = []
             current_date = start_date
             while current_date <= today:
-                present = data_dict.get(current_date, 0)
-                absent = total_employees - present
+                present = int(daily.get(current_date, {}).get("present_count", 0))
                 result.append(
                     {
                         "date": current_date.isoformat(),
                         "present": present,
-                        "absent": absent,
+                        "absent": total_employees - present,
                     }
                 )
                 current_date += timedelta(days=1)
             return result
 
         else:  # weekly
-            trend_data = (
-                db.query(
-                    extract("year", Attendance.clock_in_time).label("year"),
-                    extract("week", Attendance.clock_in_time).label("week"),
-                    func.count(distinct(Attendance.employee_id)).label("present"),
+            # Average daily headcount over the days of the week with attendance
+            weeks = {}
+            for work_date, totals in daily.items():
+                weeks.setdefault(work_date.strftime("%Y-%W"), []).append(
+                    totals["present_count"]
                 )
-                .filter(
-                    Attendance.company_id == company_id,
-                    Attendance.clock_in_time >= start_date,
-                    Attendance.status == "active",
-                )
-                .group_by(
-                    extract("year", Attendance.clock_in_time),
-                    extract("week", Attendance.clock_in_time),
-                )
-                .all()
-            )
-
-            # Process weeks
-            data_dict = {
-                f"{int(row.year)}-{int(row.week):02d}": row.present
-                for row in trend_data
-            }
             result = []
-            current_date = start_date
-            week_start = current_date - timedelta(days=current_date.weekday())  # Monday
+            week_start = start_date - timedelta(days=start_date.weekday())  # Monday
             while week_start <= today:
                 week_key = week_start.strftime("%Y-%W")
-                present = data_dict.get(week_key, 0)
-                absent = total_employees - present
-                result.append({"week": week_key, "present": present, "absent": absent})
-                current_date += timedelta(weeks=1)
-                week_start = current_date - timedelta(days=current_date.weekday())
+                days = weeks.get(week_key, [])
+                present = round(sum(days) / len(days)) if days else 0
+                result.append(
+                    {
+                        "week": week_key,
+                        "present": present,
+                        "absent": total_employees - present,
+                    }
+                )
+                week_start += timedelta(weeks=1)
             return result
 
     except HTTPException:
@@ -784,7 +624,7 @@ def get_attendance_trend(
 
 @router.get("/leaves")
 def get_leave_utilization(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str = "monthly",  # "weekly" or "monthly"
 ):
@@ -905,7 +745,7 @@ def get_leave_utilization(
 
 @router.get("/overtime")
 def get_overtime_data(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user),
     period: str = "monthly",  # "weekly" or "monthly"
 ):
@@ -919,28 +759,11 @@ def get_overtime_data(
         today = date.today()
         start_date = today - timedelta(days=30 if period == "weekly" else 90)
 
-        # Join Attendance with EmployeeProfile for department
-        overtime_query = (
-            db.query(
-                EmployeeProfile.department.label("department"),
-                func.sum(Attendance.overtime_hours).label("total_overtime"),
-            )
-            .outerjoin(Attendance, Attendance.employee_id == EmployeeProfile.user_id)
-            .filter(
-                EmployeeProfile.company_id == company_id,
-                Attendance.clock_in_time >= start_date,
-                Attendance.overtime_hours > 0,
-            )
-            .group_by(EmployeeProfile.department)
-            .all()
-        )
-
         result = [
-            {
-                "department": row.department or "Unknown",
-                "total_overtime": row.total_overtime or 0,
-            }
-            for row in overtime_query
+            {"department": department or "Unknown", "total_overtime": total or 0}
+            for department, total in AttendanceRollupService.overtime_by_department(
+                db, company_id, start_date
+            )
         ]
         return result
 
@@ -954,7 +777,7 @@ def get_overtime_data(
 
 @router.get("/payroll")
 def get_payroll_estimates(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str = "monthly",
 ):
@@ -1011,32 +834,41 @@ def get_payroll_estimates(
 @router.get("/export/{data_type}")
 def export_dashboard_data(
     data_type: str,
-    db: Session = Depends(get_db),
-    # current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
     period: str = "weekly",
+    stream: Optional[str] = Query(
+        None, pattern=STREAM_MODES, description="ndjson: one record per line"
+    ),
 ):
     """
-    Export dashboard data as CSV: attendance, leaves, overtime, payroll
+    Export dashboard data as CSV (or NDJSON): attendance, leaves, overtime, payroll
     """
     try:
-        # For testing, use default company_id = 1
-        company_id = 1
-
         if data_type == "attendance":
-            trend_data = get_attendance_trend(db, current_user, period)
-            df = pd.DataFrame(trend_data)
+            records = get_attendance_trend(db, current_user, period)
         elif data_type == "leaves":
-            trend_data = get_leave_utilization(db, current_user, period)
-            df = pd.DataFrame(trend_data)
+            records = get_leave_utilization(db, current_user, period)
         elif data_type == "overtime":
-            trend_data = get_overtime_data(db, current_user, period)
-            df = pd.DataFrame(trend_data)
+            records = get_overtime_data(db, period)
         elif data_type == "payroll":
-            payroll_data = get_payroll_estimates(db, current_user, period)
-            df = pd.DataFrame([payroll_data])  # Single row for summary
+            records = [get_payroll_estimates(db, current_user, period)]  # Single row
         else:
             raise HTTPException(status_code=400, detail="Invalid data type")
 
+        if stream:
+            return StreamingResponse(
+                iter_ndjson(records),
+                media_type=NDJSON_MEDIA_TYPE,
+                headers={
+                    "Content-Disposition": f"attachment; filename={data_type}_export_{period}.ndjson"
+                },
+            )
+
+        # pandas is only needed here; importing it lazily keeps it off the startup path
+        import pandas as pd
+
+        df = pd.DataFrame(records)
         output = io.StringIO()
         df.to_csv(output, index=False)
         output.seek(0)
@@ -1057,7 +889,7 @@ def export_dashboard_data(
 
 @router.get("/analytics/trends")
 def get_analytics_trends(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str = "monthly",  # "weekly" or "monthly"
 ):
@@ -1085,20 +917,15 @@ def get_analytics_trends(
             .all()
         )
 
-        # Attendance patterns by day of week
-        attendance_patterns = (
-            db.query(
-                extract("dow", Attendance.clock_in_time).label("day_of_week"),
-                func.count(distinct(Attendance.employee_id)).label("present_count"),
-            )
-            .filter(
-                Attendance.company_id == company_id,
-                Attendance.clock_in_time >= start_date,
-                Attendance.status == "active",
+        # Attendance patterns by day of week (0 = Sunday), in employee-days
+        attendance_patterns = {}
+        for work_date, totals in AttendanceRollupService.daily_totals(
+            db, company_id, start_date
+        ).items():
+            day_of_week = (work_date.weekday() + 1) % 7
+            attendance_patterns[day_of_week] = (
+                attendance_patterns.get(day_of_week, 0) + totals["present_count"]
             )
-            .group_by(extract("dow", Attendance.clock_in_time))
-            .all()
-        )
 
         # Leave utilization by month
         leave_trends = (
@@ -1134,7 +961,7 @@ def get_analytics_trends(
             ],
             "attendance_patterns": [
                 {
-                    "day_of_week": int(row.day_of_week),
+                    "day_of_week": day_of_week,
                     "day_name": [
                         "Sunday",
                         "Monday",
@@ -1143,10 +970,10 @@ def get_analytics_trends(
                         "Thursday",
                         "Friday",
                         "Saturday",
-                    ][int(row.day_of_week)],
-                    "present_count": row.present_count,
+                    ][day_of_week],
+                    "present_count": int(present_count),
                 }
-                for row in attendance_patterns
+                for day_of_week, present_count in sorted(attendance_patterns.items())
             ],
             "leave_utilization_trends": [
                 {
@@ -1167,7 +994,7 @@ def get_analytics_trends(
 
 @router.get("/analytics/heatmap")
 def get_activity_heatmap(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str = "weekly",  # "daily" or "weekly"
 ):
@@ -1181,23 +1008,9 @@ def get_activity_heatmap(
         today = date.today()
         start_date = today - timedelta(days=30 if period == "daily" else 90)
 
-        # Attendance heatmap: count by day of week and hour
-        heatmap_data = (
-            db.query(
-                extract("dow", Attendance.clock_in_time).label("day_of_week"),
-                extract("hour", Attendance.clock_in_time).label("hour"),
-                func.count(Attendance.id).label("activity_count"),
-            )
-            .filter(
-                Attendance.company_id == company_id,
-                Attendance.clock_in_time >= start_date,
-                Attendance.status == "active",
-            )
-            .group_by(
-                extract("dow", Attendance.clock_in_time),
-                extract("hour", Attendance.clock_in_time),
-            )
-            .all()
+        # Attendance heatmap: clock-ins by day of week and hour
+        heatmap_data = AttendanceRollupService.clock_ins_by_hour(
+            db, company_id, start_date
         )
 
         # Task activity heatmap: tasks created/updated by hour and day
@@ -1216,10 +1029,9 @@ def get_activity_heatmap(
         attendance_heatmap = [[0 for _ in range(24)] for _ in range(7)]
         task_activity_heatmap = [[0 for _ in range(24)] for _ in range(7)]
 
-        for row in heatmap_data:
-            day = int(row.day_of_week)
-            hour = int(row.hour)
-            attendance_heatmap[day][hour] = row.activity_count
+        for work_date, hour, clock_ins in heatmap_data:
+            day = (work_date.weekday() + 1) % 7  # 0 = Sunday
+            attendance_heatmap[day][hour] += int(clock_ins)
 
         for row in task_heatmap:
             day = int(row.day_of_week)
@@ -1265,7 +1077,7 @@ def get_activity_heatmap(
 
 @router.get("/analytics/real-time")
 def get_real_time_kpis(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
@@ -1295,27 +1107,15 @@ def get_real_time_kpis(
                 .scalar()
             )
 
-            # Today's attendance
-            today_attendance = (
-                db.query(func.count(distinct(Attendance.employee_id)))
-                .filter(
-                    Attendance.company_id == company_id,
-                    func.date(Attendance.clock_in_time) == today,
-                    Attendance.status == "active",
-                )
-                .scalar()
+            # Today's attendance and this week's daily average
+            week_daily = AttendanceRollupService.daily_totals(
+                db, company_id, this_week_start, today
             )
-
-            # This week's attendance average
+            today_attendance = int(week_daily.get(today, {}).get("present_count", 0))
             week_attendance = (
-                db.query(func.avg(func.count(distinct(Attendance.employee_id))))
-                .filter(
-                    Attendance.company_id == company_id,
-                    Attendance.clock_in_time >= this_week_start,
-                    Attendance.status == "active",
-                )
-                .group_by(func.date(Attendance.clock_in_time))
-                .scalar()
+                sum(d["present_count"] for d in week_daily.values()) / len(week_daily)
+                if week_daily
+                else 0
             )
 
             # Active tasks
@@ -1,18 +1,20 @@
 import os
 import shutil
-from typing import List
+from typing import Optional
 
 import structlog
-from fastapi import (APIRouter, Depends, File, Form, HTTPException, UploadFile,
-                     status)
+from fastapi import (APIRouter, Depends, File, Form, HTTPException, Query,
+                     UploadFile, status)
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
+from app.crud import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError,
+                      paginate_keyset)
 from app.db import get_db
 from app.deps import get_current_user
 from app.models.document import Document, DocumentType
 from app.models.user import User
-from app.schemas.schemas import DocumentCreate, DocumentOut
+from app.schemas.schemas import DocumentCreate, DocumentOut, Page
 
 logger = structlog.get_logger(__name__)
 
@@ -20,6 +22,8 @@ router = APIRouter()
 
 UPLOAD_DIR = "backend/uploads"
 
+DOCUMENT_ACCESS_ROLES = ["EMPLOYEE", "MANAGER", "ADMIN"]
+
 
 def get_role_level(role: str) -> int:
     levels = {"Employee": 1, "Manager": 2, "CompanyAdmin": 3, "SuperAdmin": 3}
@@ -51,7 +55,7 @@ def upload_document(
         raise HTTPException(status_code=400, detail="Invalid document type")
 
     # Validate access_role
-    if access_role not in ["EMPLOYEE", "MANAGER", "ADMIN"]:
+    if access_role not in DOCUMENT_ACCESS_ROLES:
         raise HTTPException(status_code=400, detail="Invalid access role")
 
     # Sanitize filename
@@ -82,19 +86,28 @@ def upload_document(
     return document
 
 
-@router.get("/list", response_model=List[DocumentOut])
+@router.get("/list", response_model=Page[DocumentOut])
 def list_documents(
-    db: Session = Depends(get_db), current_user=Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
 ):
     query = db.query(Document).filter(Document.company_id == current_user.company_id)
-    documents = query.all()
-    # Filter based on access
-    visible_docs = [
-        doc
-        for doc in documents
-        if can_access_document(current_user.role, doc.access_role)
+    # Filter based on access in SQL so every page is full
+    hidden_roles = [
+        role
+        for role in DOCUMENT_ACCESS_ROLES
+        if not can_access_document(current_user.role, role)
     ]
-    return visible_docs
+    if hidden_roles:
+        query = query.filter(Document.access_role.notin_(hidden_roles))
+
+    try:
+        documents, next_cursor = paginate_keyset(query, Document, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": documents, "next_cursor": next_cursor}
 
 
 @router.get("/download/{document_id}")
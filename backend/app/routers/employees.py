@@ -1,33 +1,54 @@
-from typing import List
+import io
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import (APIRouter, Depends, File, HTTPException, Query, Response,
+                     UploadFile, status)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
-from app.crud import (create_employee_profile, delete_employee_profile,
-                      get_employee_profile_by_user_id,
-                      list_employee_profiles_by_company,
+from app.crud import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError,
+                      create_employee_profile, delete_employee_profile,
+                      get_employee_profile_by_user_id, paginate_keyset,
                       update_employee_profile)
+from app.db import SessionLocal
 from app.deps import get_current_user, get_db
-from app.models.user import User
+from app.models.employee_profile import EmployeeProfile
+from app.models.user import User, UserRole
 from app.schemas import (EmployeeProfileCreate, EmployeeProfileOut,
-                         EmployeeProfileUpdate)
+                         EmployeeProfileUpdate, Page)
+from app.services.employee_import_service import (IMPORT_FORMATS,
+                                                  EmployeeImportService)
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
 
-@router.get("/", response_model=List[EmployeeProfileOut])
+@router.get("/", response_model=Page[EmployeeProfileOut])
 def get_employee_profiles(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
-    Get all employee profiles for the current user's company
+    Get one page of employee profiles for the current user's company
     """
-    profiles = list_employee_profiles_by_company(db, current_user.company_id)
-    return profiles
+    query = db.query(EmployeeProfile).filter(
+        EmployeeProfile.company_id == current_user.company_id
+    )
+    try:
+        profiles, next_cursor = paginate_keyset(query, EmployeeProfile, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": profiles, "next_cursor": next_cursor}
 
 
 @router.post(
@@ -154,6 +175,73 @@ def create_employee_profile_endpoint(
         raise
 
 
+@router.post("/import")
+def import_employees(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(
+        None, description="csv or ndjson; defaults to the file extension"
+    ),
+    company_id: Optional[int] = Query(None, description="SuperAdmin only"),
+    dry_run: bool = Query(False, description="Validate without writing"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Onboard employees in bulk from a CSV or NDJSON file. Streams progress
+    as NDJSON events; the last event (stage "done") is the import summary.
+    """
+    if current_user.role not in (UserRole.SUPERADMIN, UserRole.COMPANY_ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to import employees",
+        )
+    if company_id is None or current_user.role != UserRole.SUPERADMIN:
+        company_id = current_user.company_id
+    if company_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="company_id is required"
+        )
+
+    fmt = format or os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+    fmt = "ndjson" if fmt == "jsonl" else fmt
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format, expected one of {IMPORT_FORMATS}",
+        )
+
+    # The upload is closed once the endpoint returns, so the stream reads a
+    # copy; it is removed after the response, even if the stream never starts
+    spool = tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False)
+    try:
+        with spool:
+            shutil.copyfileobj(file.file, spool)
+    except Exception:
+        os.unlink(spool.name)
+        raise
+
+    logger.info(
+        "Employee import started",
+        user_id=current_user.id,
+        company_id=company_id,
+        format=fmt,
+        dry_run=dry_run,
+    )
+
+    def events():
+        with open(spool.name, "rb") as raw, SessionLocal() as db:
+            stream = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            for event in EmployeeImportService.iter_import(
+                db, stream, fmt, company_id, dry_run
+            ):
+                yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(os.unlink, spool.name),
+    )
+
+
 @router.get("/{user_id}", response_model=EmployeeProfileOut)
 def get_employee_profile(
     user_id: int,
@@ -1,36 +1,47 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.crud import (create_leave, delete_leave, get_leave_by_id,
-                      list_leaves_by_employee, list_leaves_by_tenant,
+from app.crud import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError,
+                      create_leave, delete_leave, get_leave_by_id,
+                      list_leaves_by_employee, paginate_keyset,
                       update_leave_status)
 from app.crud_notifications import create_notification
 from app.deps import get_current_user, get_db
+from app.models.leave import Leave
 from app.models.notification import NotificationType
 from app.models.user import User
-from app.schemas import LeaveCreate, LeaveOut, LeaveStatus
+from app.schemas import LeaveCreate, LeaveOut, LeaveStatus, Page
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/leaves", tags=["Leaves"])
 
 
-@router.get("/", response_model=List[LeaveOut])
+@router.get("/", response_model=Page[LeaveOut])
 def get_leaves(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
-    Get all leave requests for the current user's company
+    Get one page of leave requests for the current user's company
     """
-    # For SuperAdmin, get all leaves; for others, get leaves for their company
+    # SuperAdmin may have no company and falls back to the default tenant
     if current_user.role == "SuperAdmin":
-        leaves = list_leaves_by_tenant(db, str(current_user.company_id or "default"))
+        tenant_id = str(current_user.company_id or "default")
     else:
-        leaves = list_leaves_by_tenant(db, str(current_user.company_id))
-    return leaves
+        tenant_id = str(current_user.company_id)
+
+    query = db.query(Leave).filter(Leave.tenant_id == tenant_id)
+    try:
+        leaves, next_cursor = paginate_keyset(query, Leave, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": leaves, "next_cursor": next_cursor}
 
 
 @router.get("/balances", response_model=Dict[str, Dict[str, int]])
@@ -2,13 +2,14 @@ from typing import List
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud_announcements import (create_announcement,
                                     get_announcements_for_company)
 from app.crud_notifications import (get_notifications_for_user,
                                     mark_notification_as_read)
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app.deps import get_current_user
 from app.models.announcement import Announcement
 from app.models.notification import Notification, NotificationStatus
@@ -20,12 +21,33 @@ logger = structlog.get_logger(__name__)
 router = APIRouter()
 
 
+def _query_notifications(
+    db: Session,
+    user_id: int,
+    company_id: int,
+    type: str = None,
+    offset: int = 0,
+    limit: int = 50,
+) -> List[Notification]:
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+
+    if company_id != 0:
+        query = query.filter(Notification.company_id == company_id)
+
+    if type:
+        query = query.filter(Notification.type == type)
+
+    return (
+        query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
+    )
+
+
 @router.get("/notifications/", response_model=List[NotificationOut])
 async def get_notifications(
     type: str = None,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     """Get notifications for the current user with caching and pagination"""
@@ -57,16 +79,8 @@ async def get_notifications(
         return cached_notifications
 
     # Cache miss - fetch from database
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
-
-    if company_id != 0:
-        query = query.filter(Notification.company_id == company_id)
-
-    if type:
-        query = query.filter(Notification.type == type)
-
-    notifications = (
-        query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
+    notifications = await db.run_sync(
+        _query_notifications, current_user.id, company_id, type, offset, limit
     )
 
     # Convert to dict for caching
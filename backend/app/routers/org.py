@@ -1,9 +1,11 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.rbac import (RBACService, require_company_admin,
                            require_department_admin, require_team_lead)
 from app.db import get_db
@@ -11,6 +13,7 @@ from app.deps import get_current_user
 from app.models.company_department import CompanyDepartment
 from app.models.company_team import CompanyTeam
 from app.models.user import User, UserRole
+from app.streaming import STREAM_MODES, ndjson_response
 
 router = APIRouter(prefix="/api/org", tags=["organization"])
 
@@ -271,11 +274,79 @@ def assign_user_org(
 
 
 # Organization tree endpoint
+def _stream_org_tree(db: Session, company_id: int):
+    """
+    The org tree as NDJSON rows tagged with "type": departments, then teams,
+    then users. Users are paged with a server-side cursor; member counts come
+    from grouped queries instead of loading every user up front.
+    """
+    batch_size = settings.NDJSON_STREAM_BATCH_SIZE
+    teams = (
+        db.query(CompanyTeam.id, CompanyTeam.name, CompanyTeam.department_id)
+        .join(CompanyDepartment)
+        .filter(CompanyDepartment.company_id == company_id)
+        .order_by(CompanyTeam.id)
+        .all()
+    )
+    company_users = db.query(User).filter(User.company_id == company_id)
+    department_counts = dict(
+        company_users.with_entities(User.department_id, func.count(User.id))
+        .group_by(User.department_id)
+        .all()
+    )
+    team_counts = dict(
+        company_users.with_entities(User.team_id, func.count(User.id))
+        .group_by(User.team_id)
+        .all()
+    )
+
+    departments = (
+        db.query(CompanyDepartment)
+        .filter(CompanyDepartment.company_id == company_id)
+        .order_by(CompanyDepartment.id)
+    )
+    for dept in departments.yield_per(batch_size):
+        yield {
+            "type": "department",
+            "id": dept.id,
+            "name": dept.name,
+            "company_id": dept.company_id,
+            "teams": [team.id for team in teams if team.department_id == dept.id],
+            "user_count": department_counts.get(dept.id, 0),
+        }
+    for team in teams:
+        yield {
+            "type": "team",
+            "id": team.id,
+            "name": team.name,
+            "department_id": team.department_id,
+            "user_count": team_counts.get(team.id, 0),
+        }
+    users = company_users.with_entities(
+        User.id, User.email, User.full_name, User.role, User.department_id, User.team_id
+    ).order_by(User.id)
+    for user in users.yield_per(batch_size):
+        yield {
+            "type": "user",
+            "id": user.id,
+            "email": user.email,
+            "full_name": user.full_name,
+            "role": user.role.value,
+            "department_id": user.department_id,
+            "team_id": user.team_id,
+        }
+
+
 @router.get("/tree", response_model=OrgTreeResponse)
 def get_org_tree(
     company_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    stream: Optional[str] = Query(
+        None,
+        pattern=STREAM_MODES,
+        description="ndjson: one department, team or user per line",
+    ),
 ):
     """Get complete organization tree for a company"""
     if not RBACService.can_access_company(current_user, company_id):
@@ -283,6 +354,11 @@ def get_org_tree(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
         )
 
+    if stream:
+        return ndjson_response(
+            lambda stream_db: _stream_org_tree(stream_db, company_id)
+        )
+
     departments = (
         db.query(CompanyDepartment)
         .filter(CompanyDepartment.company_id == company_id)
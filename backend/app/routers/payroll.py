@@ -1,17 +1,18 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.crud import (create_allowance, create_bonus, create_deduction,
-                      create_payroll_employee, create_payroll_entry,
-                      create_payroll_run, create_salary, delete_allowance,
-                      delete_bonus, delete_deduction, delete_payroll_employee,
-                      delete_payroll_entry, delete_payroll_run, delete_salary,
-                      get_allowance_by_id, get_bonus_by_id, get_company_by_id,
-                      get_deduction_by_id, get_payroll_employee_by_employee_id,
+from app.crud import (MAX_BULK_ROWS, bulk_insert, create_allowance,
+                      create_bonus, create_deduction, create_payroll_employee,
+                      create_payroll_entry, create_payroll_run, create_salary,
+                      delete_allowance, delete_bonus, delete_deduction,
+                      delete_payroll_employee, delete_payroll_entry,
+                      delete_payroll_run, delete_salary, get_allowance_by_id,
+                      get_bonus_by_id, get_company_by_id, get_deduction_by_id,
+                      get_payroll_employee_by_employee_id,
                       get_payroll_employee_by_id, get_payroll_entry_by_id,
                       get_payroll_run_by_id, get_salary_by_id, get_user_by_id,
                       list_allowances_by_employee, list_bonuses_by_employee,
@@ -21,14 +22,18 @@ from app.crud import (create_allowance, create_bonus, create_deduction,
                       list_payroll_entries_by_run, list_payroll_runs_by_tenant,
                       list_salaries_by_employee, update_allowance,
                       update_bonus, update_deduction, update_payroll_employee,
-                      update_payroll_entry, update_payroll_run, update_salary)
+                      update_payroll_entry, update_payroll_run, update_salary,
+                      validate_bulk_rows)
 from app.db import get_db
 from app.deps import get_current_user
+from app.models.payroll import Employee as PayrollEmployee
+from app.models.payroll import PayrollEntry, PayrollRun
+from app.models.user import UserRole
 from app.schemas import (AllowanceCreate, AllowanceOut, BonusCreate, BonusOut,
-                         DeductionCreate, DeductionOut, EmployeeCreate,
-                         EmployeeOut, PayrollEntryCreate, PayrollEntryOut,
-                         PayrollRunCreate, PayrollRunOut, SalaryCreate,
-                         SalaryOut)
+                         BulkResult, DeductionCreate, DeductionOut,
+                         EmployeeCreate, EmployeeOut, PayrollEntryCreate,
+                         PayrollEntryOut, PayrollRunCreate, PayrollRunOut,
+                         SalaryCreate, SalaryOut)
 
 logger = structlog.get_logger(__name__)
 
@@ -678,6 +683,71 @@ def create_payroll_entry_endpoint(
     )
 
 
+@router.post("/payroll-entries/bulk", response_model=BulkResult[PayrollEntryOut])
+def bulk_create_payroll_entries_endpoint(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Create many payroll entries with batched inserts. Invalid rows are
+    skipped and reported by their index in the request body.
+    """
+    check_role_access(
+        current_user,
+        [UserRole.SUPERADMIN, UserRole.COMPANY_ADMIN, UserRole.DEPARTMENT_ADMIN],
+    )
+    if len(rows) > MAX_BULK_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ROWS} rows per request",
+        )
+
+    tenant_id = get_tenant_id(current_user.id, db)
+    valid, errors = validate_bulk_rows(PayrollEntryCreate, rows)
+
+    # Resolve every referenced run and employee in one query each
+    run_ids = {entry.payroll_run_id for _, entry in valid}
+    employee_ids = {entry.employee_id for _, entry in valid}
+    run_tenants = dict(
+        db.query(PayrollRun.id, PayrollRun.tenant_id)
+        .filter(PayrollRun.id.in_(run_ids))
+        .all()
+    )
+    employee_tenants = dict(
+        db.query(PayrollEmployee.id, PayrollEmployee.tenant_id)
+        .filter(PayrollEmployee.id.in_(employee_ids))
+        .all()
+    )
+
+    values, indexes = [], []
+    for index, entry in valid:
+        problems = []
+        if run_tenants.get(entry.payroll_run_id) != tenant_id:
+            problems.append("Payroll run not found")
+        if employee_tenants.get(entry.employee_id) != tenant_id:
+            problems.append("Employee not found")
+        if problems:
+            errors.append({"index": index, "errors": problems})
+            continue
+        fields = entry.model_dump()
+        fields["status"] = entry.status.value
+        values.append(fields)
+        indexes.append(index)
+
+    created, failed = bulk_insert(db, PayrollEntry, values, indexes)
+    errors.extend(failed)
+
+    logger.info(
+        "Bulk payroll entries created",
+        created=len(created),
+        rejected=len(errors),
+        user_id=current_user.id,
+        tenant_id=tenant_id,
+    )
+    return {"items": created, "errors": sorted(errors, key=lambda e: e["index"])}
+
+
 @router.get(
     "/payroll-entries/run/{payroll_run_id}", response_model=List[PayrollEntryOut]
 )
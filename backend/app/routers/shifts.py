@@ -1,19 +1,25 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.crud import (create_shift, delete_shift, get_shift_by_id,
-                      list_shifts_by_company, list_shifts_by_employee,
-                      update_shift)
+from app.core.rbac import MANAGER_ROLES
+from app.crud import (DEFAULT_PAGE_SIZE, MAX_BULK_ROWS, MAX_PAGE_SIZE,
+                      InvalidCursorError, bulk_insert, bulk_update,
+                      create_shift, delete_shift, get_shift_by_id,
+                      list_shifts_by_employee, paginate_keyset, update_shift,
+                      validate_bulk_rows)
 from app.crud_notifications import create_notification
 from app.deps import get_current_user, get_db
 from app.models.notification import NotificationType
+from app.models.shift import Shift
 from app.models.swap_request import SwapRequest, SwapStatus
-from app.models.user import User
-from app.schemas import ShiftCreate, ShiftOut
+from app.models.user import User, UserRole
+from app.schemas import (BulkResult, Page, ShiftBulkUpdate, ShiftCreate,
+                         ShiftOut)
 from app.schemas.swap_request import SwapRequestCreate, SwapRequestOut
 
 logger = structlog.get_logger(__name__)
@@ -21,19 +27,22 @@ logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/shifts", tags=["Shifts"])
 
 
-@router.get("/", response_model=List[ShiftOut])
+@router.get("/", response_model=Page[ShiftOut])
 def get_shifts(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
-    Get all shifts for the current user's company
+    Get one page of shifts for the current user's company
     """
-    # For SuperAdmin, get all shifts; for others, get shifts for their company
-    if current_user.role == "SuperAdmin":
-        shifts = list_shifts_by_company(db, current_user.company_id)
-    else:
-        shifts = list_shifts_by_company(db, current_user.company_id)
-    return shifts
+    query = db.query(Shift).filter(Shift.company_id == current_user.company_id)
+    try:
+        shifts, next_cursor = paginate_keyset(query, Shift, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": shifts, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=ShiftOut, status_code=status.HTTP_201_CREATED)
@@ -104,6 +113,159 @@ def create_shift_schedule(
     return shift
 
 
+def _check_bulk_request(rows: List[Dict[str, Any]], current_user: User):
+    if current_user.role not in MANAGER_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to manage shift schedules",
+        )
+    if len(rows) > MAX_BULK_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ROWS} rows per request",
+        )
+
+
+@router.post("/bulk", response_model=BulkResult[ShiftOut])
+def bulk_create_shift_schedules(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create many shift schedules with batched inserts. Invalid rows are
+    skipped and reported by their index in the request body.
+    """
+    _check_bulk_request(rows, current_user)
+    valid, errors = validate_bulk_rows(ShiftCreate, rows)
+
+    employee_ids = {shift.employee_id for _, shift in valid}
+    employee_companies = dict(
+        db.query(User.id, User.company_id).filter(User.id.in_(employee_ids)).all()
+    )
+
+    values, indexes = [], []
+    for index, shift in valid:
+        problems = []
+        if (
+            current_user.role != UserRole.SUPERADMIN
+            and shift.company_id != current_user.company_id
+        ):
+            problems.append("Cannot create shift schedule for another company")
+        if employee_companies.get(shift.employee_id) != shift.company_id:
+            problems.append("Employee not found in company")
+        if shift.end_at <= shift.start_at:
+            problems.append("end_at must be after start_at")
+        if problems:
+            errors.append({"index": index, "errors": problems})
+            continue
+        values.append(shift.model_dump())
+        indexes.append(index)
+
+    created, failed = bulk_insert(db, Shift, values, indexes)
+    errors.extend(failed)
+
+    # One summary notification per employee rather than one per shift
+    scheduled = defaultdict(list)
+    for shift in created:
+        scheduled[(shift["employee_id"], shift["company_id"])].append(shift)
+    for (employee_id, company_id), shifts in scheduled.items():
+        first_start = min(s["start_at"] for s in shifts)
+        try:
+            create_notification(
+                db=db,
+                user_id=employee_id,
+                company_id=company_id,
+                title="New Shifts Scheduled",
+                message=f"You have been scheduled for {len(shifts)} new shift(s) starting {first_start.strftime('%Y-%m-%d %H:%M')}",
+                type=NotificationType.SHIFT_SCHEDULED,
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to create bulk shift notification",
+                employee_id=employee_id,
+                company_id=company_id,
+                user_id=current_user.id,
+                error=str(e),
+            )
+
+    logger.info(
+        "Bulk shift schedules created",
+        created=len(created),
+        rejected=len(errors),
+        user_id=current_user.id,
+        company_id=current_user.company_id,
+    )
+    return {"items": created, "errors": sorted(errors, key=lambda e: e["index"])}
+
+
+@router.put("/bulk", response_model=BulkResult[ShiftOut])
+def bulk_update_shift_schedules(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Update many shift schedules by id with batched updates. Only the fields
+    present in a row are changed; invalid rows are reported by index.
+    """
+    _check_bulk_request(rows, current_user)
+    valid, errors = validate_bulk_rows(ShiftBulkUpdate, rows)
+
+    shift_ids = {change.id for _, change in valid}
+    existing = {
+        shift.id: shift
+        for shift in db.query(Shift.id, Shift.company_id, Shift.start_at, Shift.end_at)
+        .filter(Shift.id.in_(shift_ids))
+        .all()
+    }
+
+    values, indexes = [], []
+    for index, change in valid:
+        stored = existing.get(change.id)
+        if stored is None:
+            errors.append({"index": index, "errors": ["Shift not found"]})
+            continue
+        if (
+            current_user.role != UserRole.SUPERADMIN
+            and stored.company_id != current_user.company_id
+        ):
+            errors.append(
+                {"index": index, "errors": ["Cannot update shift from another company"]}
+            )
+            continue
+        fields = change.model_dump(exclude_unset=True, exclude_none=True)
+        if fields.keys() == {"id"}:
+            errors.append({"index": index, "errors": ["No fields to update"]})
+            continue
+        # Check the shift as it will be stored, not just the fields sent
+        start_at = change.start_at or stored.start_at
+        end_at = change.end_at or stored.end_at
+        if end_at <= start_at:
+            errors.append({"index": index, "errors": ["end_at must be after start_at"]})
+            continue
+        values.append(fields)
+        indexes.append(index)
+
+    failed = bulk_update(db, Shift, values, indexes)
+    errors.extend(failed)
+
+    failed_indexes = {e["index"] for e in failed}
+    updated_ids = [
+        row["id"] for row, index in zip(values, indexes) if index not in failed_indexes
+    ]
+    updated = db.query(Shift).filter(Shift.id.in_(updated_ids)).all()
+
+    logger.info(
+        "Bulk shift schedules updated",
+        updated=len(updated),
+        rejected=len(errors),
+        user_id=current_user.id,
+        company_id=current_user.company_id,
+    )
+    return {"items": updated, "errors": sorted(errors, key=lambda e: e["index"])}
+
+
 @router.get("/{shift_id}", response_model=ShiftOut)
 def get_shift(
     shift_id: int,
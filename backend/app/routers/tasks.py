@@ -1,43 +1,48 @@
 import os
 import shutil
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 import structlog
 from fastapi import (APIRouter, Depends, File, HTTPException, Query,
                      UploadFile, status)
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
-from app.crud import (create_attachment, create_task, delete_attachment,
+from app.crud import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError,
+                      create_attachment, create_task, delete_attachment,
                       delete_task, get_task_by_id, list_attachments_by_task,
-                      list_tasks, update_task)
+                      list_tasks, paginate_keyset, update_task)
 from app.crud_notifications import create_notification
 from app.deps import get_current_user, get_db
 from app.models.attachment import Attachment
 from app.models.notification import NotificationType
 from app.models.task import Task, TaskPriority, TaskStatus
 from app.models.user import User
-from app.schemas import AttachmentOut, TaskCreate, TaskOut
+from app.schemas import AttachmentOut, Page, TaskCreate, TaskOut
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
-@router.get("/", response_model=List[TaskOut])
+@router.get("/", response_model=Page[TaskOut])
 def get_tasks(
     status: Optional[str] = Query(None, description="Filter by task status"),
     priority: Optional[str] = Query(None, description="Filter by task priority"),
     assignee_id: Optional[int] = Query(None, description="Filter by assignee ID"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Get all tasks for the current user's company with optional filters
+    Get one page of tasks for the current user's company with optional filters
     """
-    from sqlalchemy import and_
-
-    query = db.query(Task).filter(Task.company_id == current_user.company_id)
+    query = (
+        db.query(Task)
+        .options(selectinload(Task.attachments))
+        .filter(Task.company_id == current_user.company_id)
+    )
 
     if status:
         query = query.filter(Task.status == status)
@@ -46,8 +51,12 @@ def get_tasks(
     if assignee_id:
         query = query.filter(Task.assignee_id == assignee_id)
 
-    tasks = query.all()
-    return tasks
+    try:
+        tasks, next_cursor = paginate_keyset(query, Task, cursor, limit)
+    except InvalidCursorError as e:
+        # The "status" filter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": tasks, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
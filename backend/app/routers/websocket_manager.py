@@ -6,11 +6,12 @@ from typing import Dict, List, Optional
 import structlog
 from fastapi import Depends, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.crud_channels import is_user_member_of_channel
 from app.crud.crud_meetings import is_user_participant
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app.deps import get_current_user
 from app.metrics import (decrement_ws_connections, increment_ws_connections,
                          record_ws_error, record_ws_latency, record_ws_message,
@@ -49,14 +50,11 @@ class WebSocketManager:
         self.backpressure_queues: Dict[str, deque] = (
             {}
         )  # connection_key -> queue of pending messages
-        # self.cleanup_task = asyncio.create_task(self._periodic_cleanup())  # Commented out for testing
 
-    async def _periodic_cleanup(self):
-        """Periodic cleanup of stale data and dead sockets"""
-        while True:
-            await asyncio.sleep(60)  # Every minute
-            await self._cleanup_dead_sockets()
-            await self._cleanup_rate_limits()
+    async def cleanup(self):
+        """Close dead sockets and drop old connection attempts (run every minute)"""
+        await self._cleanup_dead_sockets()
+        await self._cleanup_rate_limits()
 
     async def _cleanup_dead_sockets(self):
         """Cleanup dead sockets based on last activity"""
@@ -95,7 +93,7 @@ class WebSocketManager:
         room_type: str,
         room_id: int,
         user: User,
-        db: Session,
+        db: AsyncSession,
     ):
         """Handle WebSocket connection with authentication and reliability features"""
         # Rate limiting check
@@ -131,7 +129,7 @@ class WebSocketManager:
 
         # Validate access
         if room_type == "chat":
-            if not is_user_member_of_channel(db, room_id, user.id):
+            if not await db.run_sync(is_user_member_of_channel, room_id, user.id):
                 record_ws_error("unauthorized_channel")
                 await websocket.close(
                     code=4003, reason="Not authorized for this channel"
@@ -145,7 +143,7 @@ class WebSocketManager:
                 company_id=company_id,
             )
         elif room_type == "meeting":
-            if not is_user_participant(db, room_id, user.id):
+            if not await db.run_sync(is_user_participant, room_id, user.id):
                 record_ws_error("unauthorized_meeting")
                 await websocket.close(
                     code=4003, reason="Not authorized for this meeting"
@@ -321,7 +319,7 @@ class WebSocketManager:
         room_type: str,
         room_id: int,
         user: User,
-        db: Session,
+        db: AsyncSession,
     ):
         """Handle incoming WebSocket messages with backpressure handling"""
         msg_type = data.get("type")
@@ -361,7 +359,9 @@ class WebSocketManager:
                     user.id,
                 )
             elif msg_type == "read_receipt":
-                chat_service.mark_channel_messages_read(db, room_id, user.id)
+                await db.run_sync(
+                    chat_service.mark_channel_messages_read, room_id, user.id
+                )
                 await self.broadcast(
                     websocket,
                     {"type": "read_receipt", "user_id": user.id, "channel_id": room_id},
@@ -375,8 +375,11 @@ class WebSocketManager:
                 if reaction_data.get("action") == "add":
                     from app.crud.crud_reactions import add_reaction
 
-                    db_reaction = add_reaction(
-                        db, reaction_data["message_id"], user.id, reaction_data["emoji"]
+                    db_reaction = await db.run_sync(
+                        add_reaction,
+                        reaction_data["message_id"],
+                        user.id,
+                        reaction_data["emoji"],
                     )
                     await self.broadcast(
                         websocket,
@@ -396,8 +399,11 @@ class WebSocketManager:
                 elif reaction_data.get("action") == "remove":
                     from app.crud.crud_reactions import remove_reaction
 
-                    success = remove_reaction(
-                        db, reaction_data["message_id"], user.id, reaction_data["emoji"]
+                    success = await db.run_sync(
+                        remove_reaction,
+                        reaction_data["message_id"],
+                        user.id,
+                        reaction_data["emoji"],
                     )
                     if success:
                         await self.broadcast(
@@ -443,7 +449,7 @@ class WebSocketManager:
                     user.id,
                 )
             elif msg_type == "join_meeting":
-                await meeting_service.join_meeting(db, room_id, user.id)
+                await db.run_sync(meeting_service.join_meeting, room_id, user.id)
                 await self.broadcast(
                     websocket,
                     {"type": "user_joined", "user_id": user.id, "meeting_id": room_id},
@@ -516,12 +522,10 @@ import json
 
 from fastapi import APIRouter, Query
 
-from app.crud.crud_channels import is_user_member_of_channel
 from app.crud.crud_chat import (add_reaction, create_chat_message,
                                 get_reactions_for_message)
 from app.deps import get_current_user_from_token
 from app.metrics import messages_sent_total
-from app.services.redis_service import redis_service
 from app.services.ws_broadcast import ws_manager
 
 router = APIRouter()
@@ -533,16 +537,18 @@ async def chat_websocket(
     websocket: WebSocket,
     channel_id: int,
     token: str = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        user = get_current_user_from_token(token, db)
+        user = await db.run_sync(
+            lambda session: get_current_user_from_token(token, session)
+        )
     except Exception:
         await websocket.close(code=4401, reason="Invalid token")
         return
 
     # Validate membership
-    if not is_user_member_of_channel(db, channel_id, user.id):
+    if not await db.run_sync(is_user_member_of_channel, channel_id, user.id):
         await websocket.close(code=4003, reason="Not authorized for this channel")
         return
 
@@ -553,8 +559,12 @@ async def chat_websocket(
             data = await websocket.receive_json()
 
             if data["type"] == "message_send":
-                msg = create_chat_message(
-                    db, channel_id, user.id, data["text"], data.get("attachments", [])
+                msg = await db.run_sync(
+                    create_chat_message,
+                    channel_id,
+                    user.id,
+                    data["text"],
+                    data.get("attachments", []),
                 )
                 payload = {"type": "message", "data": msg}
                 await redis_service.publish(
@@ -591,12 +601,17 @@ async def chat_websocket(
                 await ws_manager.broadcast(channel_id, json.dumps(payload))
 
             elif data["type"] == "reaction_add":
-                reaction = add_reaction(db, data["message_id"], user.id, data["emoji"])
+                reaction = await db.run_sync(
+                    add_reaction, data["message_id"], user.id, data["emoji"]
+                )
+                reactions = await db.run_sync(
+                    get_reactions_for_message, data["message_id"]
+                )
                 payload = {
                     "type": "reaction_update",
                     "data": {
                         "message_id": data["message_id"],
-                        "reactions": get_reactions_for_message(db, data["message_id"]),
+                        "reactions": reactions,
                     },
                 }
                 await ws_manager.broadcast(channel_id, json.dumps(payload))
@@ -619,7 +634,7 @@ async def meeting_websocket(
     websocket: WebSocket,
     meeting_id: int,
     user=Depends(get_websocket_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     await ws_manager.connect(websocket, "meeting", meeting_id, user, db)
 
@@ -627,10 +642,14 @@ async def meeting_websocket(
 # Notifications WebSocket route
 @router.websocket("/notifications")
 async def notifications_websocket(
-    websocket: WebSocket, token: str = Query(...), db: Session = Depends(get_db)
+    websocket: WebSocket,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        user = get_current_user_from_token(token, db)
+        user = await db.run_sync(
+            lambda session: get_current_user_from_token(token, session)
+        )
     except Exception:
         await websocket.close(code=4401, reason="Invalid token")
         return
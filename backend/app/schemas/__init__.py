@@ -2,11 +2,66 @@ from .attendance import (Attendance, AttendanceSummary, Break, BreakEndRequest,
                          BreakStartRequest, ClockInRequest, ClockOutRequest)
 from .schemas import (  # Enums; User schemas; Company schemas; Task schemas; Leave schemas; Shift schemas; Employee schemas; Profile Update Request schemas; Payroll schemas
     AllowanceCreate, AllowanceOut, AttachmentOut, BonusCreate, BonusOut,
-    CompanyCreate, CompanyOut, DeductionCreate, DeductionOut, EmployeeCreate,
-    EmployeeOut, EmployeeProfileCreate, EmployeeProfileOut,
-    EmployeeProfileUpdate, LeaveCreate, LeaveOut, LeaveStatus, LoginPayload,
-    PayrollEntryCreate, PayrollEntryOut, PayrollEntryStatus, PayrollRunCreate,
-    PayrollRunOut, PayrollStatus, ProfileUpdateRequestCreate,
-    ProfileUpdateRequestOut, ProfileUpdateRequestReview, RefreshTokenRequest,
-    Role, SalaryCreate, SalaryOut, ShiftCreate, ShiftOut, TaskCreate, TaskOut,
+    BulkResult, BulkRowError, CompanyCreate, CompanyOut, DeductionCreate,
+    DeductionOut, EmployeeCreate, EmployeeOut, EmployeeProfileCreate,
+    EmployeeProfileOut, EmployeeProfileUpdate, LeaveCreate, LeaveOut,
+    LeaveStatus, LoginPayload, Page, PayrollEntryCreate, PayrollEntryOut,
+    PayrollEntryStatus, PayrollRunCreate, PayrollRunOut, PayrollStatus,
+    ProfileUpdateRequestCreate, ProfileUpdateRequestOut,
+    ProfileUpdateRequestReview, RefreshTokenRequest, Role, SalaryCreate,
+    SalaryOut, ShiftBulkUpdate, ShiftCreate, ShiftOut, TaskCreate, TaskOut,
     TaskStatus, Token, UserCreate, UserOut, UserUpdate)
+
+__all__ = [
+    "Attendance",
+    "AttendanceSummary",
+    "Break",
+    "BreakEndRequest",
+    "BreakStartRequest",
+    "ClockInRequest",
+    "ClockOutRequest",
+    "AllowanceCreate",
+    "AllowanceOut",
+    "AttachmentOut",
+    "BonusCreate",
+    "BonusOut",
+    "BulkResult",
+    "BulkRowError",
+    "CompanyCreate",
+    "CompanyOut",
+    "DeductionCreate",
+    "DeductionOut",
+    "EmployeeCreate",
+    "EmployeeOut",
+    "EmployeeProfileCreate",
+    "EmployeeProfileOut",
+    "EmployeeProfileUpdate",
+    "LeaveCreate",
+    "LeaveOut",
+    "LeaveStatus",
+    "LoginPayload",
+    "Page",
+    "PayrollEntryCreate",
+    "PayrollEntryOut",
+    "PayrollEntryStatus",
+    "PayrollRunCreate",
+    "PayrollRunOut",
+    "PayrollStatus",
+    "ProfileUpdateRequestCreate",
+    "ProfileUpdateRequestOut",
+    "ProfileUpdateRequestReview",
+    "RefreshTokenRequest",
+    "Role",
+    "SalaryCreate",
+    "SalaryOut",
+    "ShiftBulkUpdate",
+    "ShiftCreate",
+    "ShiftOut",
+    "TaskCreate",
+    "TaskOut",
+    "TaskStatus",
+    "Token",
+    "UserCreate",
+    "UserOut",
+    "UserUpdate",
+]
@@ -130,7 +130,26 @@ class ComplianceExportRequest(BaseModel):
     include_policies: bool = True
     include_logs: bool = True
     include_trust_history: bool = True
-    format: str = "pdf"  # pdf or json
+    format: str = "pdf"  # pdf or json (csv for background exports)
+
+
+class ComplianceExportJobOut(BaseModel):
+    id: int
+    status: str  # PENDING, RUNNING, COMPLETED, FAILED
+    format: str
+    company_id: Optional[int] = None
+    rows_total: Optional[int] = None
+    rows_written: int = 0
+    progress: float = 0.0  # 0-1
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
 
 
 class WebhookAlertConfig(BaseModel):
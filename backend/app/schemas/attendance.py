@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class BreakBase(BaseModel):
@@ -41,6 +41,16 @@ class AttendanceCreate(AttendanceBase):
     clock_in_time: datetime
 
 
+class AttendanceBulkCreate(AttendanceCreate):
+    clock_out_time: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_clock_out_after_clock_in(self):
+        if self.clock_out_time and self.clock_out_time <= self.clock_in_time:
+            raise ValueError("clock_out_time must be after clock_in_time")
+        return self
+
+
 class AttendanceUpdate(BaseModel):
     clock_out_time: Optional[datetime] = None
     total_hours: Optional[float] = None
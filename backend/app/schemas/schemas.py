@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, EmailStr, Field, validator
 
@@ -271,6 +271,13 @@ class ShiftCreate(ShiftBase):
     pass
 
 
+class ShiftBulkUpdate(BaseModel):
+    id: int
+    start_at: Optional[datetime] = None
+    end_at: Optional[datetime] = None
+    location: Optional[str] = None
+
+
 class ShiftOut(ShiftBase):
     id: int
     status: str
@@ -742,3 +749,23 @@ class ReportExportResponse(BaseModel):
     content: Optional[bytes] = None  # For blob download
     filename: str
     content_type: str  # "text/csv" or "application/pdf"
+
+
+# Pagination Schemas
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+
+# Bulk Write Schemas
+class BulkRowError(BaseModel):
+    index: int  # Position of the row in the request body
+    errors: List[str]
+
+
+class BulkResult(BaseModel, Generic[T]):
+    items: List[T] = []
+    errors: List[BulkRowError] = []
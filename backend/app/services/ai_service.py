@@ -1,6 +1,5 @@
 import re
 
-import requests
 import structlog
 from sqlalchemy.orm import Session
 
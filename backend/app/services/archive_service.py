@@ -0,0 +1,557 @@
+import hashlib
+import heapq
+import io
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+import orjson
+import structlog
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.sqltypes import DateTime
+
+from app.base_crud import advisory_xact_lock
+from app.config import settings
+from app.custom_json_encoder import json_dumps_bytes
+from app.merkle import leaf_hash
+from app.models.audit_chain import (AuditChain, AuditChainCheckpoint,
+                                    AuditChainMerkleNode)
+from app.models.audit_log import AuditLog
+from app.models.chat import ChatMessage
+from app.models.message_reactions import MessageReaction
+from app.services.audit_chain_verification import checkpoint_is_authentic
+from app.services.audit_partition_service import add_months, month_start
+
+logger = structlog.get_logger(__name__)
+
+ARCHIVE_FORMAT = "jsonl.zst"
+MANIFEST = "manifest.json"
+READ_CHUNK_BYTES = 1 << 20
+
+
+class ArchiveIntegrityError(Exception):
+    """An archive file does not match the checksum in its manifest"""
+
+
+def _attach_reactions(db: Session, rows: List[Dict[str, Any]]):
+    # Reactions are deleted with their message, so they go into its row
+    reactions: Dict[int, List[Dict[str, Any]]] = {}
+    query = db.query(
+        MessageReaction.message_id,
+        MessageReaction.user_id,
+        MessageReaction.emoji,
+        MessageReaction.created_at,
+    ).filter(MessageReaction.message_id.in_([row["id"] for row in rows]))
+    for message_id, user_id, emoji, created_at in query:
+        reactions.setdefault(message_id, []).append(
+            {"user_id": user_id, "emoji": emoji, "created_at": created_at}
+        )
+    for row in rows:
+        row["reactions"] = reactions.get(row["id"], [])
+
+
+@dataclass(frozen=True)
+class ArchiveTable:
+    model: Any
+    # Adds related data to a batch of rows before they are written
+    enrich: Optional[Callable[[Session, List[Dict[str, Any]]], None]] = None
+
+    @property
+    def name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def columns(self):
+        return list(self.model.__table__.columns)
+
+
+ARCHIVE_TABLES = {
+    spec.name: spec
+    for spec in (
+        ArchiveTable(AuditLog),
+        ArchiveTable(AuditChain),
+        ArchiveTable(ChatMessage, enrich=_attach_reactions),
+    )
+}
+
+
+@dataclass
+class ArchiveResult:
+    table: str
+    rows: int = 0
+    files: List[str] = field(default_factory=list)
+
+
+class _HashingWriter:
+    """File wrapper computing the sha256 and size of what is written"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+class ArchiveService:
+    """
+    Cold storage for old rows of audit_logs, audit_chains and chat_messages:
+    zstd-compressed JSON Lines under ARCHIVE_DIR, laid out as
+    {table}/company={id}/month={YYYY-MM}/part-*.jsonl.zst. Each month
+    directory has a manifest.json listing its parts with row counts, ranges
+    and sha256 checksums.
+
+    Rows are deleted only after their part and manifest are on disk. A run
+    interrupted between the two archives the rows again next time, and
+    read() drops the duplicates by id.
+    """
+
+    @staticmethod
+    def root() -> str:
+        return os.path.abspath(settings.ARCHIVE_DIR)
+
+    @staticmethod
+    def _directory(table: str, company_id: Optional[int], month: date) -> str:
+        company = "none" if company_id is None else str(company_id)
+        return os.path.join(
+            ArchiveService.root(),
+            table,
+            f"company={company}",
+            f"month={month:%Y-%m}",
+        )
+
+    @staticmethod
+    def _read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(directory, MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    @staticmethod
+    def _write_atomic(path: str, write: Callable[[Any], None]):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_part(
+        table: str, company_id: Optional[int], month: date, rows: List[Dict]
+    ) -> str:
+        import zstandard
+
+        directory = ArchiveService._directory(table, company_id, month)
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        filename = f"{name}.{ARCHIVE_FORMAT}"
+        writer = {}
+
+        def write(f):
+            hashing = _HashingWriter(f)
+            compressor = zstandard.ZstdCompressor(level=settings.ARCHIVE_ZSTD_LEVEL)
+            with compressor.stream_writer(hashing, closefd=False) as stream:
+                for row in rows:
+                    stream.write(json_dumps_bytes(row) + b"\n")
+            writer["hashing"] = hashing
+
+        ArchiveService._write_atomic(os.path.join(directory, filename), write)
+        part = {
+            "file": filename,
+            "rows": len(rows),
+            "bytes": writer["hashing"].size,
+            "sha256": writer["hashing"].sha256.hexdigest(),
+            "min_id": min(row["id"] for row in rows),
+            "max_id": max(row["id"] for row in rows),
+            "min_created_at": rows[0]["created_at"],
+            "max_created_at": rows[-1]["created_at"],
+            "archived_at": datetime.utcnow(),
+        }
+        if table == AuditChain.__tablename__:
+            chains: Dict[str, List[int]] = {}
+            for row in rows:
+                bounds = chains.setdefault(
+                    row["chain_id"], [row["sequence_number"]] * 2
+                )
+                bounds[0] = min(bounds[0], row["sequence_number"])
+                bounds[1] = max(bounds[1], row["sequence_number"])
+            part["chains"] = chains
+
+        manifest = ArchiveService._read_manifest(directory) or {
+            "table": table,
+            "company_id": company_id,
+            "month": f"{month:%Y-%m}",
+            "format": ARCHIVE_FORMAT,
+            "parts": [],
+        }
+        manifest["parts"].append(part)
+        ArchiveService._write_atomic(
+            os.path.join(directory, MANIFEST),
+            lambda f: f.write(
+                orjson.dumps(manifest, default=str, option=orjson.OPT_INDENT_2)
+            ),
+        )
+        return os.path.join(directory, filename)
+
+    @staticmethod
+    def _chain_boundaries(db: Session, before: datetime) -> Dict[str, int]:
+        """
+        For each chain, the sequence number below which entries can go: the
+        latest valid checkpoint older than `before`. The checkpoint entry
+        stays, so verification can restart from it.
+        """
+        boundaries = {}
+        checkpoints = (
+            db.query(AuditChainCheckpoint)
+            .join(
+                AuditChain,
+                (AuditChain.chain_id == AuditChainCheckpoint.chain_id)
+                & (AuditChain.sequence_number == AuditChainCheckpoint.sequence_number),
+            )
+            .filter(
+                AuditChain.created_at < before,
+                AuditChain.current_hash == AuditChainCheckpoint.entry_hash,
+            )
+            .order_by(
+                AuditChainCheckpoint.chain_id,
+                AuditChainCheckpoint.sequence_number.desc(),
+            )
+        )
+        for checkpoint in checkpoints:
+            if checkpoint.chain_id in boundaries:
+                continue
+            if checkpoint_is_authentic(checkpoint):
+                boundaries[checkpoint.chain_id] = checkpoint.sequence_number
+        return boundaries
+
+    @staticmethod
+    def _windows(
+        db: Session, spec: ArchiveTable, filters: Sequence, before: datetime
+    ) -> Iterator[Tuple[date, datetime, datetime]]:
+        oldest = (
+            db.query(func.min(spec.model.created_at))
+            .filter(*filters, spec.model.created_at < before)
+            .scalar()
+        )
+        if oldest is None:
+            return
+        month = month_start(oldest)
+        while datetime.combine(month, datetime.min.time()) < before:
+            start = datetime.combine(month, datetime.min.time())
+            end = min(datetime.combine(add_months(month, 1), start.time()), before)
+            yield month, start, end
+            month = add_months(month, 1)
+
+    @staticmethod
+    def _archive_rows(
+        db: Session,
+        spec: ArchiveTable,
+        filters: Sequence,
+        before: datetime,
+        result: ArchiveResult,
+        dry_run: bool,
+    ):
+        model = spec.model
+        for month, start, end in ArchiveService._windows(db, spec, filters, before):
+            # Concurrent runs take turns per month, and the later one finds
+            # the rows already gone
+            advisory_xact_lock(db, f"archive:{spec.name}")
+            window = [*filters, model.created_at >= start, model.created_at < end]
+            if dry_run:
+                result.rows += (
+                    db.query(func.count(model.id)).filter(*window).scalar() or 0
+                )
+                continue
+
+            companies = [
+                company_id
+                for (company_id,) in db.query(model.company_id)
+                .filter(*window)
+                .distinct()
+                .order_by(model.company_id)
+            ]
+            for company_id in companies:
+                company = (
+                    model.company_id.is_(None)
+                    if company_id is None
+                    else model.company_id == company_id
+                )
+                ArchiveService._archive_company(
+                    db, spec, [*window, company], company_id, month, result
+                )
+            db.commit()
+
+    @staticmethod
+    def _archive_company(
+        db: Session,
+        spec: ArchiveTable,
+        filters: Sequence,
+        company_id: Optional[int],
+        month: date,
+        result: ArchiveResult,
+    ):
+        """
+        Archive one company's rows for a month. Rows are read in pages by
+        id; a part is written and its rows deleted every ARCHIVE_PART_ROWS
+        rows, so at most one part is held in memory. Each part is sorted by
+        (created_at, id), which is all read() needs to merge them.
+        """
+        model = spec.model
+        columns = spec.columns
+        batch_size = settings.ARCHIVE_BATCH_SIZE
+        part: List[Dict[str, Any]] = []
+        last_id = None
+        while True:
+            query = db.query(*columns).filter(*filters)
+            if last_id is not None:
+                query = query.filter(model.id > last_id)
+            rows = [
+                {column.name: value for column, value in zip(columns, values)}
+                for values in query.order_by(model.id).limit(batch_size)
+            ]
+            if rows and spec.enrich is not None:
+                spec.enrich(db, rows)
+            part.extend(rows)
+            done = len(rows) < batch_size
+            if part and (done or len(part) >= settings.ARCHIVE_PART_ROWS):
+                part.sort(key=lambda row: (row["created_at"], row["id"]))
+                result.files.append(
+                    ArchiveService._write_part(spec.name, company_id, month, part)
+                )
+                ArchiveService._delete(db, spec, part)
+                result.rows += len(part)
+                part = []
+            if done:
+                return
+            last_id = rows[-1]["id"]
+
+    @staticmethod
+    def _delete(db: Session, spec: ArchiveTable, rows: List[Dict[str, Any]]):
+        batch_size = settings.ARCHIVE_BATCH_SIZE
+        if spec.model is AuditChain:
+            # Merkle proofs still need the leaves of archived entries
+            db.bulk_insert_mappings(
+                AuditChainMerkleNode,
+                [
+                    {
+                        "chain_id": row["chain_id"],
+                        "level": 0,
+                        "node_index": row["sequence_number"],
+                        "hash": leaf_hash(row["current_hash"]),
+                    }
+                    for row in rows
+                ],
+            )
+        ids = [row["id"] for row in rows]
+        for i in range(0, len(ids), batch_size):
+            if spec.model is ChatMessage:
+                # Bulk deletes skip the ORM cascade
+                db.query(MessageReaction).filter(
+                    MessageReaction.message_id.in_(ids[i : i + batch_size])
+                ).delete(synchronize_session=False)
+            db.query(spec.model).filter(
+                spec.model.id.in_(ids[i : i + batch_size])
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def archive_table(
+        db: Session,
+        table: str,
+        before: Optional[datetime] = None,
+        dry_run: bool = False,
+    ) -> ArchiveResult:
+        """Move rows created before `before` (default: the retention horizon)"""
+        spec = ARCHIVE_TABLES[table]
+        before = before or datetime.utcnow() - timedelta(
+            days=settings.ARCHIVE_RETENTION_DAYS
+        )
+        result = ArchiveResult(table=table)
+        if spec.model is AuditChain:
+            for chain_id, boundary in ArchiveService._chain_boundaries(
+                db, before
+            ).items():
+                filters = [
+                    AuditChain.chain_id == chain_id,
+                    AuditChain.sequence_number < boundary,
+                ]
+                ArchiveService._archive_rows(db, spec, filters, before, result, dry_run)
+        else:
+            ArchiveService._archive_rows(db, spec, [], before, result, dry_run)
+
+        logger.info(
+            "Cold data archived",
+            table=table,
+            rows=result.rows,
+            files=len(result.files),
+            before=before.isoformat(),
+            dry_run=dry_run,
+        )
+        return result
+
+    @staticmethod
+    def _month_directories(
+        table: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        company_id: Optional[int],
+    ) -> Dict[str, List[str]]:
+        """Archive directories by month (YYYY-MM) overlapping [start, end]"""
+        base = os.path.join(ArchiveService.root(), table)
+        if not os.path.isdir(base):
+            return {}
+        if company_id is not None:
+            companies = [f"company={company_id}"]
+        else:
+            companies = sorted(os.listdir(base))
+        first = f"{start:%Y-%m}" if start else None
+        last = f"{end:%Y-%m}" if end else None
+        months: Dict[str, List[str]] = {}
+        for company in companies:
+            company_dir = os.path.join(base, company)
+            if not os.path.isdir(company_dir):
+                continue
+            for entry in os.listdir(company_dir):
+                month = entry.partition("=")[2]
+                if (first and month < first) or (last and month > last):
+                    continue
+                months.setdefault(month, []).append(os.path.join(company_dir, entry))
+        return months
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _read_part(
+        directory: str, part: Dict[str, Any], verify: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Rows of one part, decompressed a line at a time"""
+        import zstandard
+
+        path = os.path.join(directory, part["file"])
+        if verify and ArchiveService._file_sha256(path) != part["sha256"]:
+            raise ArchiveIntegrityError(f"Checksum mismatch for {path}")
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            for line in io.BufferedReader(reader, READ_CHUNK_BYTES):
+                yield orjson.loads(line)
+
+    @staticmethod
+    def read(
+        table: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        company_id: Optional[int] = None,
+        verify: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Archived rows of a table with start <= created_at <= end, in
+        (created_at, id) order, with DateTime columns parsed back to
+        datetimes. Each part is already in that order, so a month's parts
+        are merged lazily rather than loaded and sorted.
+        """
+        spec = ARCHIVE_TABLES[table]
+        datetime_columns = [
+            column.name for column in spec.columns if isinstance(column.type, DateTime)
+        ]
+
+        def rows_in_range(directory, part):
+            for row in ArchiveService._read_part(directory, part, verify):
+                for name in datetime_columns:
+                    if row.get(name):
+                        row[name] = datetime.fromisoformat(row[name])
+                created_at = row["created_at"]
+                if (start and created_at < start) or (end and created_at > end):
+                    continue
+                yield row
+
+        months = ArchiveService._month_directories(table, start, end, company_id)
+        for month in sorted(months):
+            parts = [
+                rows_in_range(directory, part)
+                for directory in months[month]
+                for part in (ArchiveService._read_manifest(directory) or {}).get(
+                    "parts", []
+                )
+            ]
+            # A row archived twice (by an interrupted run) has the same key
+            # in both parts, so the copies come out next to each other
+            last_id = None
+            for row in heapq.merge(
+                *parts, key=lambda row: (row["created_at"], row["id"])
+            ):
+                if row["id"] != last_id:
+                    last_id = row["id"]
+                    yield row
+
+    @staticmethod
+    def merge(
+        live: Iterable[Dict[str, Any]], archived: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Merge live and archived rows, both in (created_at, id) order. A row
+        in both (archived by an interrupted run) comes out once.
+        """
+        last_id = None
+        for row in heapq.merge(
+            archived, live, key=lambda row: (row["created_at"], row["id"])
+        ):
+            if row["id"] != last_id:
+                last_id = row["id"]
+                yield row
+
+    @staticmethod
+    def find_chain_entry(chain_id: str, sequence_number: int) -> Optional[Dict]:
+        """An archived audit chain entry, located through the manifests"""
+        months = ArchiveService._month_directories(
+            AuditChain.__tablename__, None, None, None
+        )
+        for directories in months.values():
+            for directory in directories:
+                manifest = ArchiveService._read_manifest(directory) or {}
+                for part in manifest.get("parts", []):
+                    low, high = part.get("chains", {}).get(chain_id, (-1, -2))
+                    if not low <= sequence_number <= high:
+                        continue
+                    for row in ArchiveService._read_part(directory, part, True):
+                        if (
+                            row["chain_id"] == chain_id
+                            and row["sequence_number"] == sequence_number
+                        ):
+                            row["created_at"] = datetime.fromisoformat(
+                                row["created_at"]
+                            )
+                            return row
+        return None
+
+    @staticmethod
+    def verify_archive(table: Optional[str] = None) -> List[str]:
+        """Paths of archive parts whose checksum does not match the manifest"""
+        failures = []
+        for name in [table] if table else list(ARCHIVE_TABLES):
+            for directories in ArchiveService._month_directories(
+                name, None, None, None
+            ).values():
+                for directory in directories:
+                    manifest = ArchiveService._read_manifest(directory) or {}
+                    for part in manifest.get("parts", []):
+                        path = os.path.join(directory, part["file"])
+                        if ArchiveService._file_sha256(path) != part["sha256"]:
+                            failures.append(path)
+        return failures
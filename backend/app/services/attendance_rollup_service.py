@@ -0,0 +1,275 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.base_crud import upsert_insert
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.employee_profile import EmployeeProfile
+
+logger = structlog.get_logger(__name__)
+
+COUNTERS = ("present_count", "clock_ins", "total_hours", "overtime_hours")
+
+# (company_id, work_date, department, hour)
+RollupKey = Tuple[int, date, str, int]
+
+
+def _bucket(attendance: Attendance, department: Optional[str]) -> RollupKey:
+    clock_in = attendance.clock_in_time
+    return (attendance.company_id, clock_in.date(), department or "", clock_in.hour)
+
+
+class AttendanceRollupService:
+    @staticmethod
+    def _departments(db: Session, employee_ids: Iterable[int]) -> Dict[int, str]:
+        return dict(
+            db.query(EmployeeProfile.user_id, EmployeeProfile.department)
+            .filter(EmployeeProfile.user_id.in_(set(employee_ids)))
+            .all()
+        )
+
+    @staticmethod
+    def _apply(db: Session, deltas: Dict[RollupKey, Dict[str, float]]):
+        """Add counter deltas to their rollup rows with one upsert"""
+        if not deltas:
+            return
+        table = AttendanceDailyRollup.__table__
+        rows = [
+            {
+                "company_id": company_id,
+                "work_date": work_date,
+                "department": department,
+                "hour": hour,
+                **{counter: delta.get(counter, 0) for counter in COUNTERS},
+            }
+            for (company_id, work_date, department, hour), delta in deltas.items()
+        ]
+        stmt = upsert_insert(db, table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    table.c.company_id,
+                    table.c.work_date,
+                    table.c.department,
+                    table.c.hour,
+                ],
+                set_={
+                    **{
+                        counter: table.c[counter] + stmt.excluded[counter]
+                        for counter in COUNTERS
+                    },
+                    "updated_at": func.now(),
+                },
+            ),
+            rows,
+        )
+
+    @staticmethod
+    def _commit(db: Session, deltas: Dict[RollupKey, Dict[str, float]]):
+        """
+        Apply deltas after the attendance write has committed. A failure is
+        logged rather than raised so clocking in/out still succeeds; the
+        backfill command repairs any drift.
+        """
+        try:
+            AttendanceRollupService._apply(db, deltas)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(
+                "Attendance rollup update failed",
+                buckets=len(deltas),
+                error=str(e.orig if hasattr(e, "orig") else e),
+            )
+
+    @staticmethod
+    def _present_days(
+        db: Session, attendances: List[Attendance]
+    ) -> Dict[Tuple[int, date], int]:
+        """
+        (employee_id, work_date) -> id of the record that makes the employee
+        present that day, skipping days already counted by older records
+        """
+        firsts: Dict[Tuple[int, date], Attendance] = {}
+        for attendance in attendances:
+            key = (attendance.employee_id, attendance.clock_in_time.date())
+            if key not in firsts or attendance.clock_in_time < firsts[key].clock_in_time:
+                firsts[key] = attendance
+
+        new_ids = [a.id for a in attendances]
+        days = sorted({work_date for _, work_date in firsts})
+        already_present = set()
+        if days:
+            start = datetime.combine(days[0], datetime.min.time())
+            end = datetime.combine(days[-1], datetime.min.time()) + timedelta(days=1)
+            already_present = {
+                (employee_id, clock_in.date())
+                for employee_id, clock_in in db.query(
+                    Attendance.employee_id, Attendance.clock_in_time
+                ).filter(
+                    Attendance.employee_id.in_({e for e, _ in firsts}),
+                    Attendance.clock_in_time >= start,
+                    Attendance.clock_in_time < end,
+                    Attendance.id.notin_(new_ids),
+                )
+            }
+        return {
+            key: attendance.id
+            for key, attendance in firsts.items()
+            if key not in already_present
+        }
+
+    @staticmethod
+    def record_attendance(db: Session, attendances: List[Attendance]):
+        """
+        Count newly created attendance records (clock-ins and, for records
+        created already closed, their hours) in the rollup and commit
+        """
+        if not attendances:
+            return
+        departments = AttendanceRollupService._departments(
+            db, (a.employee_id for a in attendances)
+        )
+        present = set(AttendanceRollupService._present_days(db, attendances).values())
+
+        deltas: Dict[RollupKey, Dict[str, float]] = defaultdict(
+            lambda: dict.fromkeys(COUNTERS, 0)
+        )
+        for attendance in attendances:
+            delta = deltas[_bucket(attendance, departments.get(attendance.employee_id))]
+            delta["clock_ins"] += 1
+            delta["present_count"] += attendance.id in present
+            delta["total_hours"] += attendance.total_hours or 0
+            delta["overtime_hours"] += attendance.overtime_hours or 0
+        AttendanceRollupService._commit(db, deltas)
+
+    @staticmethod
+    def record_clock_in(db: Session, attendance: Attendance):
+        AttendanceRollupService.record_attendance(db, [attendance])
+
+    @staticmethod
+    def record_clock_out(db: Session, attendance: Attendance):
+        """Add a closed record's hours to the bucket of its clock-in"""
+        department = AttendanceRollupService._departments(
+            db, [attendance.employee_id]
+        ).get(attendance.employee_id)
+        AttendanceRollupService._commit(
+            db,
+            {
+                _bucket(attendance, department): {
+                    "total_hours": attendance.total_hours or 0,
+                    "overtime_hours": attendance.overtime_hours or 0,
+                }
+            },
+        )
+
+    @staticmethod
+    def rebuild(
+        db: Session,
+        company_id: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """
+        Recompute rollup rows from raw attendance for a company and/or date
+        range (inclusive), replacing what is there. Returns rows written.
+        """
+        rollup = AttendanceDailyRollup
+        clear = delete(rollup)
+        query = select(Attendance).order_by(Attendance.clock_in_time, Attendance.id)
+        if company_id is not None:
+            clear = clear.where(rollup.company_id == company_id)
+            query = query.where(Attendance.company_id == company_id)
+        if start is not None:
+            clear = clear.where(rollup.work_date >= start)
+            query = query.where(
+                Attendance.clock_in_time >= datetime.combine(start, datetime.min.time())
+            )
+        if end is not None:
+            clear = clear.where(rollup.work_date <= end)
+            query = query.where(
+                Attendance.clock_in_time
+                < datetime.combine(end + timedelta(days=1), datetime.min.time())
+            )
+        db.execute(clear)
+
+        departments: Dict[int, str] = dict(
+            db.query(EmployeeProfile.user_id, EmployeeProfile.department).all()
+        )
+        deltas: Dict[RollupKey, Dict[str, float]] = defaultdict(
+            lambda: dict.fromkeys(COUNTERS, 0)
+        )
+        seen_days = set()
+        for attendance in db.execute(
+            query.execution_options(yield_per=batch_size)
+        ).scalars():
+            delta = deltas[_bucket(attendance, departments.get(attendance.employee_id))]
+            day = (attendance.employee_id, attendance.clock_in_time.date())
+            delta["clock_ins"] += 1
+            delta["present_count"] += day not in seen_days
+            delta["total_hours"] += attendance.total_hours or 0
+            delta["overtime_hours"] += attendance.overtime_hours or 0
+            seen_days.add(day)
+
+        AttendanceRollupService._apply(db, deltas)
+        db.commit()
+        logger.info(
+            "Attendance rollup rebuilt",
+            company_id=company_id,
+            start=str(start) if start else None,
+            end=str(end) if end else None,
+            rows=len(deltas),
+        )
+        return len(deltas)
+
+    # Dashboard reads
+
+    @staticmethod
+    def daily_totals(
+        db: Session, company_id: int, start: date, end: Optional[date] = None
+    ) -> Dict[date, Dict[str, float]]:
+        """work_date -> summed counters for the company, oldest first"""
+        rollup = AttendanceDailyRollup
+        query = db.query(
+            rollup.work_date,
+            *(func.sum(getattr(rollup, counter)).label(counter) for counter in COUNTERS),
+        ).filter(rollup.company_id == company_id, rollup.work_date >= start)
+        if end is not None:
+            query = query.filter(rollup.work_date <= end)
+        return {
+            row.work_date: {counter: getattr(row, counter) or 0 for counter in COUNTERS}
+            for row in query.group_by(rollup.work_date).order_by(rollup.work_date)
+        }
+
+    @staticmethod
+    def clock_ins_by_hour(
+        db: Session, company_id: int, start: date
+    ) -> List[Tuple[date, int, int]]:
+        """(work_date, hour, clock-ins) for the company since start"""
+        rollup = AttendanceDailyRollup
+        return (
+            db.query(rollup.work_date, rollup.hour, func.sum(rollup.clock_ins))
+            .filter(rollup.company_id == company_id, rollup.work_date >= start)
+            .group_by(rollup.work_date, rollup.hour)
+            .all()
+        )
+
+    @staticmethod
+    def overtime_by_department(
+        db: Session, company_id: int, start: date
+    ) -> List[Tuple[str, float]]:
+        rollup = AttendanceDailyRollup
+        total = func.sum(rollup.overtime_hours)
+        return (
+            db.query(rollup.department, total)
+            .filter(rollup.company_id == company_id, rollup.work_date >= start)
+            .group_by(rollup.department)
+            .having(total > 0)
+            .all()
+        )
@@ -1,19 +1,77 @@
 import hashlib
 import json
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 from sqlalchemy import and_, desc, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.base_crud import advisory_xact_lock
+from app.config import settings
 from app.db import SessionLocal
 from app.models.audit_chain import AuditChain
 from app.models.user import User
+from app.services.audit_chain_verification import (ChainVerification,
+                                                   ChainVerificationService)
+from app.services.audit_merkle_service import AuditMerkleService
 
 logger = structlog.get_logger(__name__)
 
 
+class ChainHeadCache:
+    """
+    Last (sequence_number, current_hash) of each chain appended to by this
+    process, so appends don't re-read the head. Appends from other processes
+    make an entry stale; the (chain_id, sequence_number) unique constraint
+    rejects the resulting insert and the head is reloaded. The archiver only
+    removes entries before a checkpoint, never a chain's head, so the cache
+    can't run ahead of the table.
+    """
+
+    def __init__(self):
+        self._heads: Dict[str, Tuple[int, str]] = {}
+        # Merkle frontier of each cached chain, with the tree size it is for
+        self._frontiers: Dict[str, Tuple[int, Dict[int, str]]] = {}
+        self._chain_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def chain_lock(self, chain_id: str) -> threading.Lock:
+        """Serializes this process's writers of a chain"""
+        with self._lock:
+            return self._chain_locks.setdefault(chain_id, threading.Lock())
+
+    def get(self, chain_id: str) -> Optional[Tuple[int, str]]:
+        return self._heads.get(chain_id)
+
+    def set(self, chain_id: str, sequence_number: int, current_hash: str):
+        self._heads[chain_id] = (sequence_number, current_hash)
+
+    def get_frontier(self, chain_id: str, size: int) -> Optional[Dict[int, str]]:
+        """A copy of the cached frontier, if it is for a tree of `size` entries"""
+        cached = self._frontiers.get(chain_id)
+        if cached is None or cached[0] != size:
+            return None
+        return dict(cached[1])
+
+    def set_frontier(self, chain_id: str, size: int, frontier: Dict[int, str]):
+        self._frontiers[chain_id] = (size, dict(frontier))
+
+    def discard(self, chain_id: str):
+        self._heads.pop(chain_id, None)
+        self._frontiers.pop(chain_id, None)
+
+    def clear(self):
+        self._heads.clear()
+        self._frontiers.clear()
+
+
+chain_head_cache = ChainHeadCache()
+
+
 class AuditChainService:
     # Genesis hash for chain initialization
     GENESIS_HASH = "0" * 64
@@ -41,6 +99,114 @@ class AuditChainService:
         head = AuditChainService.get_chain_head(db, chain_id)
         return (head.sequence_number + 1) if head else 0
 
+    @staticmethod
+    def _load_head(db: Session, chain_id: str) -> Tuple[int, str]:
+        """(sequence_number, current_hash) of the head; (-1, genesis) if empty"""
+        head = AuditChainService.get_chain_head(db, chain_id)
+        if head is None:
+            return -1, AuditChainService.GENESIS_HASH
+        return head.sequence_number, head.current_hash
+
+    @staticmethod
+    def _is_taken_position(error: IntegrityError) -> bool:
+        """Whether an insert hit the (chain_id, sequence_number) constraint"""
+        message = str(error.orig)
+        # PostgreSQL names the constraint, SQLite its columns
+        return (
+            "uq_audit_chains_chain_sequence" in message
+            or "audit_chains.sequence_number" in message
+        )
+
+    @staticmethod
+    def append_many(
+        db: Session, chain_id: str, events: List[Dict[str, Any]]
+    ) -> List[AuditChain]:
+        """
+        Append events to a chain in one transaction. Each event has
+        event_type, user_id and optionally company_id, data and signature.
+
+        Writers of a chain are serialized by a PostgreSQL advisory lock (and a
+        per-process lock); hashes are computed before insert from an
+        application timestamp, and the head comes from chain_head_cache.
+        The chain's Merkle accumulator is extended in the same transaction.
+        """
+        if not events:
+            return []
+
+        with chain_head_cache.chain_lock(chain_id):
+            advisory_xact_lock(db, f"audit_chain:{chain_id}")
+            head = chain_head_cache.get(chain_id)
+            for attempt in range(2):
+                if head is None:
+                    head = AuditChainService._load_head(db, chain_id)
+                sequence_number, previous_hash = head
+                created_at = datetime.utcnow()
+                entries = []
+                for event in events:
+                    sequence_number += 1
+                    entry = AuditChain.create_entry(
+                        chain_id=chain_id,
+                        sequence_number=sequence_number,
+                        previous_hash=previous_hash,
+                        event_type=event["event_type"],
+                        user_id=event["user_id"],
+                        company_id=event.get("company_id"),
+                        data=event.get("data") or {},
+                        signature=event.get("signature"),
+                        created_at=created_at,
+                    )
+                    previous_hash = entry.current_hash
+                    entries.append(entry)
+
+                try:
+                    with db.begin_nested():
+                        db.add_all(entries)
+                        db.flush()
+                    break
+                except IntegrityError as e:
+                    if not AuditChainService._is_taken_position(e):
+                        raise
+                    # Another process appended since the head was cached
+                    chain_head_cache.discard(chain_id)
+                    head = None
+                    if attempt:
+                        raise
+                    logger.info(
+                        "Audit chain head was stale, reloading", chain_id=chain_id
+                    )
+
+            size = head[0] + 1
+            try:
+                frontier = chain_head_cache.get_frontier(
+                    chain_id, size
+                ) or AuditMerkleService.frontier(db, chain_id, size)
+                # Without a frontier the tree is left for the verifier to
+                # rebuild, not rebuilt under the lock
+                if frontier is not None:
+                    size = AuditMerkleService.extend(
+                        db,
+                        chain_id,
+                        size,
+                        frontier,
+                        [entry.current_hash for entry in entries],
+                    )
+                db.commit()
+            except Exception:
+                chain_head_cache.discard(chain_id)
+                raise
+            chain_head_cache.set(chain_id, entries[-1].sequence_number, previous_hash)
+            if frontier is not None:
+                chain_head_cache.set_frontier(chain_id, size, frontier)
+
+        logger.info(
+            "Audit chain entries appended",
+            chain_id=chain_id,
+            count=len(entries),
+            first_sequence=entries[0].sequence_number,
+            last_sequence=entries[-1].sequence_number,
+        )
+        return entries
+
     @staticmethod
     def append_to_chain(
         db: Session,
@@ -52,117 +218,81 @@ class AuditChainService:
         signature: str = None,
     ) -> AuditChain:
         """Append a new entry to the audit chain"""
-        # Get chain head for previous hash and sequence number
-        head = AuditChainService.get_chain_head(db, chain_id)
-        previous_hash = head.current_hash if head else AuditChainService.GENESIS_HASH
-        sequence_number = AuditChainService.get_next_sequence_number(db, chain_id)
-
-        # Create new entry
-        entry = AuditChain.create_entry(
-            chain_id=chain_id,
-            sequence_number=sequence_number,
-            previous_hash=previous_hash,
-            event_type=event_type,
-            user_id=user_id,
-            company_id=company_id,
-            data=data or {},
-            signature=signature,
+        (entry,) = AuditChainService.append_many(
+            db,
+            chain_id,
+            [
+                {
+                    "event_type": event_type,
+                    "user_id": user_id,
+                    "company_id": company_id,
+                    "data": data,
+                    "signature": signature,
+                }
+            ],
         )
+        return entry
 
-        # Save to database first to get created_at timestamp
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
+    @staticmethod
+    def run_verification(
+        db: Session,
+        chain_id: str,
+        full: bool = False,
+        max_entries: int = None,
+        workers: int = None,
+    ) -> ChainVerification:
+        """
+        Verify a chain and record the outcome. Incremental runs (the default)
+        stream entries after the latest signed checkpoint; full runs re-verify
+        from genesis on a process pool. Tampered entries are flagged and clean
+        prefixes are checkpointed; an incomplete Merkle tree is rebuilt once
+        the chain verifies.
+        """
+        started = time.perf_counter()
+        if full:
+            result = ChainVerificationService.verify_full(db, chain_id, workers=workers)
+        else:
+            result = ChainVerificationService.verify_incremental(
+                db, chain_id, max_entries=max_entries
+            )
 
-        # Now compute and set the hash with the actual created_at
-        entry.current_hash = entry.compute_hash()
+        # Mark tampered entries
+        tampered_ids = [
+            issue["entry_id"]
+            for issue in result.issues
+            if issue["type"] in ["entry_tampered", "hash_chain_broken"]
+        ]
+        if tampered_ids:
+            db.query(AuditChain).filter(AuditChain.id.in_(tampered_ids)).update(
+                {"is_tampered": True}, synchronize_session=False
+            )
+        ChainVerificationService.save_checkpoints(db, chain_id, result.checkpoints)
+        if result.is_valid:
+            AuditMerkleService.ensure_tree(db, chain_id)
         db.commit()
-        db.refresh(entry)
 
         logger.info(
-            "Audit chain entry appended",
+            "Audit chain verified",
             chain_id=chain_id,
-            sequence_number=sequence_number,
-            event_type=event_type,
-            user_id=user_id,
+            full=full,
+            parallel=result.parallel,
+            start_sequence=result.start_sequence,
+            entries_verified=result.entries_verified,
+            issues=len(result.issues),
+            checkpoints=len(result.checkpoints),
+            duration_seconds=round(time.perf_counter() - started, 3),
         )
-
-        return entry
+        return result
 
     @staticmethod
     def verify_chain_integrity(
-        db: Session, chain_id: str, max_entries: int = None
+        db: Session, chain_id: str, max_entries: int = None, full: bool = False
     ) -> Tuple[bool, List[Dict]]:
-        """Verify the integrity of an entire audit chain"""
-        # Get all entries in sequence order
-        query = (
-            db.query(AuditChain)
-            .filter(AuditChain.chain_id == chain_id)
-            .order_by(AuditChain.sequence_number)
+        """Verify the integrity of an audit chain"""
+        result = AuditChainService.run_verification(
+            db, chain_id, full=full, max_entries=max_entries
         )
-
-        if max_entries:
-            query = query.limit(max_entries)
-
-        entries = query.all()
-
-        if not entries:
-            return True, []  # Empty chain is valid
-
-        issues = []
-        previous_hash = AuditChainService.GENESIS_HASH
-        expected_sequence = 0
-
-        for entry in entries:
-            # Check sequence continuity
-            if entry.sequence_number != expected_sequence:
-                issues.append(
-                    {
-                        "type": "sequence_gap",
-                        "entry_id": entry.id,
-                        "expected_sequence": expected_sequence,
-                        "actual_sequence": entry.sequence_number,
-                    }
-                )
-
-            expected_sequence = entry.sequence_number + 1
-
-            # Check hash chain continuity
-            if entry.previous_hash != previous_hash:
-                issues.append(
-                    {
-                        "type": "hash_chain_broken",
-                        "entry_id": entry.id,
-                        "expected_previous_hash": previous_hash,
-                        "actual_previous_hash": entry.previous_hash,
-                    }
-                )
-
-            # Check entry integrity
-            if not entry.verify_integrity():
-                issues.append(
-                    {
-                        "type": "entry_tampered",
-                        "entry_id": entry.id,
-                        "stored_hash": entry.current_hash,
-                        "computed_hash": entry.compute_hash(),
-                    }
-                )
-
-            # Update previous hash for next iteration
-            previous_hash = entry.current_hash
-
-        # Mark tampered entries
-        for issue in issues:
-            if issue["type"] in ["entry_tampered", "hash_chain_broken"]:
-                db.query(AuditChain).filter(AuditChain.id == issue["entry_id"]).update(
-                    {"is_tampered": True}
-                )
-
-        db.commit()
-
-        is_valid = len(issues) == 0
-        return is_valid, issues
+        return result.is_valid, result.issues
 
     @staticmethod
     def replay_chain(
@@ -170,7 +300,15 @@ class AuditChainService:
     ) -> List[Dict]:
         """Replay audit chain entries in order"""
         query = (
-            db.query(AuditChain)
+            db.query(
+                AuditChain.sequence_number,
+                AuditChain.event_type,
+                AuditChain.user_id,
+                AuditChain.company_id,
+                AuditChain.data,
+                AuditChain.created_at,
+                AuditChain.is_tampered,
+            )
             .filter(
                 and_(
                     AuditChain.chain_id == chain_id,
@@ -183,10 +321,8 @@ class AuditChainService:
         if end_sequence is not None:
             query = query.filter(AuditChain.sequence_number <= end_sequence)
 
-        entries = query.all()
-
         replay_data = []
-        for entry in entries:
+        for entry in query.yield_per(settings.AUDIT_CHAIN_VERIFY_BATCH_SIZE):
             replay_data.append(
                 {
                     "sequence_number": entry.sequence_number,
@@ -243,8 +379,8 @@ class AuditChainService:
     @staticmethod
     def detect_tampering(db: Session, chain_id: str) -> List[Dict]:
         """Detect and return all tampering incidents in a chain"""
-        # First verify integrity to mark any tampered entries
-        AuditChainService.verify_chain_integrity(db, chain_id)
+        # First verify the whole chain to mark any tampered entries
+        AuditChainService.verify_chain_integrity(db, chain_id, full=True)
 
         tampered_entries = (
             db.query(AuditChain)
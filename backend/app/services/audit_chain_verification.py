@@ -0,0 +1,427 @@
+import hashlib
+import hmac
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.base_crud import upsert_insert
+from app.config import settings
+from app.merkle import compute_entry_hash
+from app.models.audit_chain import AuditChain, AuditChainCheckpoint
+
+logger = structlog.get_logger(__name__)
+
+GENESIS_HASH = "0" * 64
+
+# Columns fetched per entry; rows are plain tuples so they can be pickled
+# to worker processes
+ENTRY_COLUMNS = (
+    AuditChain.id,
+    AuditChain.chain_id,
+    AuditChain.sequence_number,
+    AuditChain.previous_hash,
+    AuditChain.current_hash,
+    AuditChain.event_type,
+    AuditChain.user_id,
+    AuditChain.company_id,
+    AuditChain.data,
+    AuditChain.created_at,
+)
+
+# (sequence_number, entry_hash)
+Checkpoint = Tuple[int, str]
+
+
+def signing_key() -> bytes:
+    return (settings.AUDIT_CHAIN_SIGNING_KEY or settings.SECRET_KEY).encode("utf-8")
+
+
+def sign_checkpoint(chain_id: str, sequence_number: int, entry_hash: str) -> str:
+    message = f"{chain_id}:{sequence_number}:{entry_hash}".encode("utf-8")
+    return hmac.new(signing_key(), message, hashlib.sha256).hexdigest()
+
+
+def checkpoint_is_authentic(checkpoint: AuditChainCheckpoint) -> bool:
+    expected = sign_checkpoint(
+        checkpoint.chain_id, checkpoint.sequence_number, checkpoint.entry_hash
+    )
+    return hmac.compare_digest(expected, checkpoint.signature)
+
+
+class SegmentVerifier:
+    """
+    Checks a run of consecutive entries: sequence continuity, hash links and
+    each entry's own hash. With previous_hash/expected_sequence unknown (a
+    segment verified in a worker), the first entry's links are left for the
+    caller to check against the preceding segment.
+    """
+
+    def __init__(
+        self,
+        previous_hash: Optional[str] = None,
+        expected_sequence: Optional[int] = None,
+        checkpoint_interval: Optional[int] = None,
+    ):
+        self.previous_hash = previous_hash
+        self.expected_sequence = expected_sequence
+        self.checkpoint_interval = (
+            checkpoint_interval or settings.AUDIT_CHAIN_CHECKPOINT_INTERVAL
+        )
+        self.issues: List[Dict[str, Any]] = []
+        # Checkpoint candidates before the first issue
+        self.checkpoints: List[Checkpoint] = []
+        self.count = 0
+        self.first: Optional[Tuple[int, int, str]] = None  # id, sequence, prev hash
+
+    def feed(self, row: Sequence[Any]):
+        (
+            entry_id,
+            chain_id,
+            sequence_number,
+            previous_hash,
+            current_hash,
+            event_type,
+            user_id,
+            company_id,
+            data,
+            created_at,
+        ) = row
+        if self.first is None:
+            self.first = (entry_id, sequence_number, previous_hash)
+        self.count += 1
+
+        # Check sequence continuity
+        if (
+            self.expected_sequence is not None
+            and sequence_number != self.expected_sequence
+        ):
+            self.issues.append(
+                {
+                    "type": "sequence_gap",
+                    "entry_id": entry_id,
+                    "expected_sequence": self.expected_sequence,
+                    "actual_sequence": sequence_number,
+                }
+            )
+        self.expected_sequence = sequence_number + 1
+
+        # Check hash chain continuity
+        if self.previous_hash is not None and previous_hash != self.previous_hash:
+            self.issues.append(
+                {
+                    "type": "hash_chain_broken",
+                    "entry_id": entry_id,
+                    "expected_previous_hash": self.previous_hash,
+                    "actual_previous_hash": previous_hash,
+                }
+            )
+
+        # Check entry integrity
+        computed = compute_entry_hash(
+            chain_id,
+            sequence_number,
+            previous_hash,
+            event_type,
+            user_id,
+            company_id,
+            data,
+            created_at,
+        )
+        if computed != current_hash:
+            self.issues.append(
+                {
+                    "type": "entry_tampered",
+                    "entry_id": entry_id,
+                    "stored_hash": current_hash,
+                    "computed_hash": computed,
+                }
+            )
+
+        self.previous_hash = current_hash
+        if not self.issues and (sequence_number + 1) % self.checkpoint_interval == 0:
+            self.checkpoints.append((sequence_number, current_hash))
+
+
+def verify_segment(rows: List[Sequence[Any]], checkpoint_interval: int) -> Dict:
+    """Worker entry point: verify one segment in isolation"""
+    verifier = SegmentVerifier(checkpoint_interval=checkpoint_interval)
+    for row in rows:
+        verifier.feed(row)
+    return {
+        "first": verifier.first,
+        "last_sequence": verifier.expected_sequence - 1,
+        "last_hash": verifier.previous_hash,
+        "count": verifier.count,
+        "issues": verifier.issues,
+        "checkpoints": verifier.checkpoints,
+    }
+
+
+@dataclass
+class ChainVerification:
+    chain_id: str
+    start_sequence: int  # First sequence number checked in this run
+    entries_verified: int = 0
+    issues: List[Dict[str, Any]] = field(default_factory=list)
+    checkpoints: List[Checkpoint] = field(default_factory=list)
+    parallel: bool = False
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.issues
+
+
+class ChainVerificationService:
+    @staticmethod
+    def latest_checkpoint(db: Session, chain_id: str) -> Optional[AuditChainCheckpoint]:
+        return (
+            db.query(AuditChainCheckpoint)
+            .filter(AuditChainCheckpoint.chain_id == chain_id)
+            .order_by(AuditChainCheckpoint.sequence_number.desc())
+            .first()
+        )
+
+    @staticmethod
+    def _start_point(
+        db: Session, chain_id: str, issues: List[Dict[str, Any]]
+    ) -> Tuple[int, str]:
+        """
+        Where a full verification starts: genesis, or for a chain whose
+        oldest entries were archived, the signed checkpoint at its first
+        remaining entry (the archiver only prunes up to one)
+        """
+        first = (
+            db.query(func.min(AuditChain.sequence_number))
+            .filter(AuditChain.chain_id == chain_id)
+            .scalar()
+        )
+        if not first:
+            return -1, GENESIS_HASH
+        checkpoint = (
+            db.query(AuditChainCheckpoint)
+            .filter(
+                AuditChainCheckpoint.chain_id == chain_id,
+                AuditChainCheckpoint.sequence_number == first,
+            )
+            .first()
+        )
+        stored_hash = (
+            db.query(AuditChain.current_hash)
+            .filter(
+                AuditChain.chain_id == chain_id,
+                AuditChain.sequence_number == first,
+            )
+            .scalar()
+        )
+        if (
+            checkpoint is not None
+            and checkpoint_is_authentic(checkpoint)
+            and stored_hash == checkpoint.entry_hash
+        ):
+            return first, stored_hash
+        issues.append({"type": "chain_truncated", "first_sequence": first})
+        logger.warning(
+            "Audit chain has no valid checkpoint at its first entry",
+            chain_id=chain_id,
+            first_sequence=first,
+        )
+        return -1, GENESIS_HASH
+
+    @staticmethod
+    def _resume_point(
+        db: Session, chain_id: str, issues: List[Dict[str, Any]]
+    ) -> Tuple[int, str]:
+        """
+        (last verified sequence, its hash) to resume from: the latest
+        checkpoint if its signature and entry still match, else the start of
+        the chain
+        """
+        checkpoint = ChainVerificationService.latest_checkpoint(db, chain_id)
+        if checkpoint is None:
+            return ChainVerificationService._start_point(db, chain_id, issues)
+        stored_hash = (
+            db.query(AuditChain.current_hash)
+            .filter(
+                AuditChain.chain_id == chain_id,
+                AuditChain.sequence_number == checkpoint.sequence_number,
+            )
+            .scalar()
+        )
+        if checkpoint_is_authentic(checkpoint) and stored_hash == checkpoint.entry_hash:
+            return checkpoint.sequence_number, checkpoint.entry_hash
+        issues.append(
+            {
+                "type": "checkpoint_invalid",
+                "checkpoint_id": checkpoint.id,
+                "sequence_number": checkpoint.sequence_number,
+            }
+        )
+        logger.warning(
+            "Audit chain checkpoint failed validation, verifying from the start",
+            chain_id=chain_id,
+            sequence_number=checkpoint.sequence_number,
+        )
+        return ChainVerificationService._start_point(db, chain_id, issues)
+
+    @staticmethod
+    def _entries(db: Session, chain_id: str, after_sequence: int = -1):
+        return (
+            db.query(*ENTRY_COLUMNS)
+            .filter(
+                AuditChain.chain_id == chain_id,
+                AuditChain.sequence_number > after_sequence,
+            )
+            .order_by(AuditChain.sequence_number)
+        )
+
+    @staticmethod
+    def verify_incremental(
+        db: Session,
+        chain_id: str,
+        max_entries: Optional[int] = None,
+        from_checkpoint: bool = True,
+    ) -> ChainVerification:
+        """Stream entries after the latest checkpoint and verify them serially"""
+        issues: List[Dict[str, Any]] = []
+        if from_checkpoint:
+            sequence, entry_hash = ChainVerificationService._resume_point(
+                db, chain_id, issues
+            )
+        else:
+            sequence, entry_hash = ChainVerificationService._start_point(
+                db, chain_id, issues
+            )
+
+        verifier = SegmentVerifier(entry_hash, sequence + 1)
+        query = ChainVerificationService._entries(db, chain_id, sequence)
+        if max_entries:
+            query = query.limit(max_entries)
+        for row in query.yield_per(settings.AUDIT_CHAIN_VERIFY_BATCH_SIZE):
+            verifier.feed(row)
+
+        return ChainVerification(
+            chain_id=chain_id,
+            start_sequence=sequence + 1,
+            entries_verified=verifier.count,
+            issues=issues + verifier.issues,
+            checkpoints=verifier.checkpoints,
+        )
+
+    @staticmethod
+    def _segments(rows: Iterable[Sequence[Any]], size: int):
+        segment = []
+        for row in rows:
+            segment.append(tuple(row))
+            if len(segment) >= size:
+                yield segment
+                segment = []
+        if segment:
+            yield segment
+
+    @staticmethod
+    def verify_full(
+        db: Session,
+        chain_id: str,
+        workers: Optional[int] = None,
+        segment_size: Optional[int] = None,
+    ) -> ChainVerification:
+        """
+        Re-verify a chain from its start, hashing segments on a process
+        pool. At most two segments per worker are held in memory at a time.
+        """
+        workers = workers or settings.AUDIT_CHAIN_VERIFY_WORKERS or os.cpu_count() or 1
+        if workers <= 1:
+            return ChainVerificationService.verify_incremental(
+                db, chain_id, from_checkpoint=False
+            )
+        segment_size = segment_size or settings.AUDIT_CHAIN_VERIFY_SEGMENT_SIZE
+        interval = settings.AUDIT_CHAIN_CHECKPOINT_INTERVAL
+        issues: List[Dict[str, Any]] = []
+        sequence, entry_hash = ChainVerificationService._start_point(
+            db, chain_id, issues
+        )
+        result = ChainVerification(
+            chain_id=chain_id,
+            start_sequence=sequence + 1,
+            issues=issues,
+            parallel=True,
+        )
+        state = {"sequence": sequence, "hash": entry_hash, "clean": not issues}
+
+        def stitch(segment: Dict):
+            entry_id, first_sequence, first_previous = segment["first"]
+            boundary = []
+            if first_sequence != state["sequence"] + 1:
+                boundary.append(
+                    {
+                        "type": "sequence_gap",
+                        "entry_id": entry_id,
+                        "expected_sequence": state["sequence"] + 1,
+                        "actual_sequence": first_sequence,
+                    }
+                )
+            if first_previous != state["hash"]:
+                boundary.append(
+                    {
+                        "type": "hash_chain_broken",
+                        "entry_id": entry_id,
+                        "expected_previous_hash": state["hash"],
+                        "actual_previous_hash": first_previous,
+                    }
+                )
+            result.issues.extend(boundary + segment["issues"])
+            result.entries_verified += segment["count"]
+            if state["clean"] and not boundary:
+                result.checkpoints.extend(segment["checkpoints"])
+            state["clean"] = state["clean"] and not result.issues
+            state["sequence"] = segment["last_sequence"]
+            state["hash"] = segment["last_hash"]
+
+        rows = ChainVerificationService._entries(db, chain_id, sequence).yield_per(
+            settings.AUDIT_CHAIN_VERIFY_BATCH_SIZE
+        )
+        pending = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for segment in ChainVerificationService._segments(rows, segment_size):
+                pending.append(pool.submit(verify_segment, segment, interval))
+                if len(pending) >= workers * 2:
+                    stitch(pending.pop(0).result())
+            for future in pending:
+                stitch(future.result())
+        return result
+
+    @staticmethod
+    def save_checkpoints(db: Session, chain_id: str, checkpoints: List[Checkpoint]):
+        """
+        Store signed checkpoints. A position already checkpointed is only
+        rewritten when its signature differs, i.e. it was stored under an
+        old signing key or for a hash this verification did not reach.
+        """
+        if not checkpoints:
+            return
+        table = AuditChainCheckpoint.__table__
+        insert = upsert_insert(db, table)
+        db.execute(
+            insert.on_conflict_do_update(
+                index_elements=[table.c.chain_id, table.c.sequence_number],
+                set_={
+                    "entry_hash": insert.excluded.entry_hash,
+                    "signature": insert.excluded.signature,
+                },
+                where=table.c.signature != insert.excluded.signature,
+            ),
+            [
+                {
+                    "chain_id": chain_id,
+                    "sequence_number": sequence_number,
+                    "entry_hash": entry_hash,
+                    "signature": sign_checkpoint(chain_id, sequence_number, entry_hash),
+                }
+                for sequence_number, entry_hash in checkpoints
+            ],
+        )
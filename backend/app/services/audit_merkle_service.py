@@ -0,0 +1,356 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import structlog
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+
+from app import merkle
+from app.base_crud import advisory_xact_lock, upsert_insert
+from app.config import settings
+from app.models.audit_chain import (AuditChain, AuditChainMerkleNode,
+                                    AuditChainMerkleRoot)
+from app.services.archive_service import ArchiveService
+from app.services.audit_chain_verification import signing_key
+
+logger = structlog.get_logger(__name__)
+
+
+class AuditMerkleService:
+    """
+    Merkle accumulator over each audit chain (leaf i = entry with
+    sequence_number i). Interior nodes are written as their subtrees fill up,
+    in the same transaction as the entries; a signed root is stored every
+    AUDIT_CHAIN_MERKLE_ROOT_INTERVAL entries or on demand. Leaves are not
+    stored while their entry is live; the archiver stores them (level 0)
+    when it moves entries to cold storage.
+    """
+
+    @staticmethod
+    def _fetch_nodes(
+        db: Session, chain_id: str, keys: Set[merkle.NodeKey]
+    ) -> Dict[merkle.NodeKey, str]:
+        nodes = {}
+        leaves = [index for level, index in keys if level == 0]
+        interior = [key for key in keys if key[0]]
+        if leaves:
+            rows = db.query(AuditChain.sequence_number, AuditChain.current_hash).filter(
+                AuditChain.chain_id == chain_id,
+                AuditChain.sequence_number.in_(leaves),
+            )
+            for sequence_number, current_hash in rows:
+                nodes[(0, sequence_number)] = merkle.leaf_hash(current_hash)
+            interior.extend((0, index) for index in leaves if (0, index) not in nodes)
+        if interior:
+            rows = db.query(
+                AuditChainMerkleNode.level,
+                AuditChainMerkleNode.node_index,
+                AuditChainMerkleNode.hash,
+            ).filter(
+                AuditChainMerkleNode.chain_id == chain_id,
+                tuple_(AuditChainMerkleNode.level, AuditChainMerkleNode.node_index).in_(
+                    interior
+                ),
+            )
+            for level, node_index, node_hash in rows:
+                nodes[(level, node_index)] = node_hash
+        return nodes
+
+    @staticmethod
+    def frontier(db: Session, chain_id: str, size: int) -> Optional[Dict[int, str]]:
+        """
+        Frontier of the chain's tree at `size` entries, or None when nodes
+        are missing (chains older than the accumulator). Appends then skip
+        the accumulator; ensure_tree, run by the verifier, rebuilds it.
+        """
+        keys = merkle.frontier_keys(size)
+        nodes = AuditMerkleService._fetch_nodes(db, chain_id, set(keys))
+        if len(nodes) == len(keys):
+            return {level: nodes[(level, index)] for level, index in keys}
+        logger.warning("Audit chain Merkle nodes missing", chain_id=chain_id, size=size)
+        return None
+
+    @staticmethod
+    def _size(db: Session, chain_id: str) -> int:
+        head = (
+            db.query(AuditChain.sequence_number)
+            .filter(AuditChain.chain_id == chain_id)
+            .order_by(AuditChain.sequence_number.desc())
+            .first()
+        )
+        return 0 if head is None else head.sequence_number + 1
+
+    @staticmethod
+    @contextmanager
+    def _writing_tree(db: Session, chain_id: str):
+        """
+        Hold the chain's writer locks (the same ones append_many takes) while
+        its nodes are rewritten, then drop this process's cached frontier.
+        The advisory lock lasts until the caller's transaction ends.
+        """
+        # audit_chain_service imports this module
+        from app.services.audit_chain_service import chain_head_cache
+
+        with chain_head_cache.chain_lock(chain_id):
+            advisory_xact_lock(db, f"audit_chain:{chain_id}")
+            try:
+                yield
+            finally:
+                chain_head_cache.discard(chain_id)
+
+    @staticmethod
+    def ensure_tree(db: Session, chain_id: str) -> Dict[int, str]:
+        """The chain's current frontier, rebuilding the tree if it is incomplete"""
+        with AuditMerkleService._writing_tree(db, chain_id):
+            size = AuditMerkleService._size(db, chain_id)
+            frontier = AuditMerkleService.frontier(db, chain_id, size)
+            if frontier is None:
+                frontier = AuditMerkleService._rebuild(db, chain_id, size)
+            return frontier
+
+    @staticmethod
+    def extend(
+        db: Session,
+        chain_id: str,
+        size: int,
+        frontier: Dict[int, str],
+        entry_hashes: Iterable[str],
+    ) -> int:
+        """
+        Add leaves for the next entries of a tree of `size` entries, writing
+        completed nodes and any periodic signed roots. Updates frontier in
+        place and returns the new size.
+        """
+        return AuditMerkleService._add_leaves(
+            db,
+            chain_id,
+            size,
+            frontier,
+            (merkle.leaf_hash(entry_hash) for entry_hash in entry_hashes),
+        )
+
+    @staticmethod
+    def _add_leaves(
+        db: Session,
+        chain_id: str,
+        size: int,
+        frontier: Dict[int, str],
+        leaves: Iterable[str],
+    ) -> int:
+        interval = settings.AUDIT_CHAIN_MERKLE_ROOT_INTERVAL
+        nodes: List[Dict[str, Any]] = []
+        roots: List[Dict[str, Any]] = []
+        for leaf in leaves:
+            size, completed = merkle.append_leaf(frontier, size, leaf)
+            nodes.extend(
+                {
+                    "chain_id": chain_id,
+                    "level": level,
+                    "node_index": index,
+                    "hash": node_hash,
+                }
+                for level, index, node_hash in completed
+            )
+            if interval and size % interval == 0:
+                roots.append(
+                    AuditMerkleService._root_row(
+                        chain_id, size, merkle.root_from_frontier(frontier)
+                    )
+                )
+        if nodes:
+            db.execute(insert(AuditChainMerkleNode), nodes)
+        AuditMerkleService._save_roots(db, roots)
+        return size
+
+    @staticmethod
+    def rebuild(
+        db: Session, chain_id: str, size: Optional[int] = None
+    ) -> Dict[int, str]:
+        """
+        Recompute a chain's interior nodes (over its first `size` entries)
+        from the stored leaves of archived entries and the live entries
+        """
+        with AuditMerkleService._writing_tree(db, chain_id):
+            return AuditMerkleService._rebuild(db, chain_id, size)
+
+    @staticmethod
+    def _rebuild(
+        db: Session, chain_id: str, size: Optional[int] = None
+    ) -> Dict[int, str]:
+        db.query(AuditChainMerkleNode).filter(
+            AuditChainMerkleNode.chain_id == chain_id, AuditChainMerkleNode.level > 0
+        ).delete(synchronize_session=False)
+
+        archived = (
+            db.query(AuditChainMerkleNode.hash)
+            .filter(
+                AuditChainMerkleNode.chain_id == chain_id,
+                AuditChainMerkleNode.level == 0,
+            )
+            .order_by(AuditChainMerkleNode.node_index)
+        )
+        live = (
+            db.query(AuditChain.current_hash)
+            .filter(AuditChain.chain_id == chain_id)
+            .order_by(AuditChain.sequence_number)
+        )
+        if size is not None:
+            archived = archived.filter(AuditChainMerkleNode.node_index < size)
+            live = live.filter(AuditChain.sequence_number < size)
+
+        frontier: Dict[int, str] = {}
+        built = 0
+        batch_size = settings.AUDIT_CHAIN_VERIFY_BATCH_SIZE
+        # Archived entries all precede the live ones
+        for query, to_leaf in ((archived, None), (live, merkle.leaf_hash)):
+            batch = []
+            for (value,) in query.yield_per(batch_size):
+                batch.append(to_leaf(value) if to_leaf else value)
+                if len(batch) >= batch_size:
+                    built = AuditMerkleService._add_leaves(
+                        db, chain_id, built, frontier, batch
+                    )
+                    batch = []
+            built = AuditMerkleService._add_leaves(db, chain_id, built, frontier, batch)
+        logger.info("Audit chain Merkle tree rebuilt", chain_id=chain_id, size=built)
+        return frontier
+
+    @staticmethod
+    def _root_row(chain_id: str, tree_size: int, root_hash: str) -> Dict[str, Any]:
+        return {
+            "chain_id": chain_id,
+            "tree_size": tree_size,
+            "root_hash": root_hash,
+            "signature": merkle.sign_root(
+                signing_key(), chain_id, tree_size, root_hash
+            ),
+        }
+
+    @staticmethod
+    def _save_roots(db: Session, roots: List[Dict[str, Any]]):
+        if not roots:
+            return
+        table = AuditChainMerkleRoot.__table__
+        db.execute(
+            upsert_insert(db, table).on_conflict_do_nothing(
+                index_elements=[table.c.chain_id, table.c.tree_size]
+            ),
+            roots,
+        )
+
+    @staticmethod
+    def publish_root(db: Session, chain_id: str) -> Optional[AuditChainMerkleRoot]:
+        """Sign and store the chain's current root; None for an empty chain"""
+        size = AuditMerkleService._size(db, chain_id)
+        if not size:
+            return None
+        frontier = AuditMerkleService.ensure_tree(db, chain_id)
+        AuditMerkleService._save_roots(
+            db,
+            [
+                AuditMerkleService._root_row(
+                    chain_id, size, merkle.root_from_frontier(frontier)
+                )
+            ],
+        )
+        db.commit()
+        return AuditMerkleService.signed_root(db, chain_id, tree_size=size)
+
+    @staticmethod
+    def signed_root(
+        db: Session,
+        chain_id: str,
+        tree_size: Optional[int] = None,
+        min_size: int = 0,
+    ) -> Optional[AuditChainMerkleRoot]:
+        """The root at tree_size, or the latest one covering min_size entries"""
+        query = db.query(AuditChainMerkleRoot).filter(
+            AuditChainMerkleRoot.chain_id == chain_id
+        )
+        if tree_size is not None:
+            return query.filter(AuditChainMerkleRoot.tree_size == tree_size).first()
+        return (
+            query.filter(AuditChainMerkleRoot.tree_size >= min_size)
+            .order_by(AuditChainMerkleRoot.tree_size.desc())
+            .first()
+        )
+
+    @staticmethod
+    def inclusion_proof(
+        db: Session, chain_id: str, sequence_number: int, tree_size: int = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Inclusion proof for an entry against a signed root: the one at
+        tree_size, else the latest covering the entry (publishing the current
+        root if none does). None if the entry or requested root doesn't exist.
+        """
+        entry = (
+            db.query(AuditChain)
+            .filter(
+                AuditChain.chain_id == chain_id,
+                AuditChain.sequence_number == sequence_number,
+            )
+            .first()
+        )
+        if entry is not None:
+            entry = {
+                column.name: getattr(entry, column.name)
+                for column in AuditChain.__table__.columns
+            }
+        else:
+            entry = ArchiveService.find_chain_entry(chain_id, sequence_number)
+        if entry is None:
+            return None
+
+        if tree_size is not None:
+            root = AuditMerkleService.signed_root(db, chain_id, tree_size=tree_size)
+            if root is None or tree_size <= sequence_number:
+                return None
+        else:
+            root = AuditMerkleService.signed_root(
+                db, chain_id, min_size=sequence_number + 1
+            ) or AuditMerkleService.publish_root(db, chain_id)
+
+        keys = merkle.proof_node_keys(sequence_number, root.tree_size)
+        nodes = AuditMerkleService._fetch_nodes(db, chain_id, keys)
+        if len(nodes) < len(keys):
+            AuditMerkleService.rebuild(db, chain_id)
+            db.commit()
+            nodes = AuditMerkleService._fetch_nodes(db, chain_id, keys)
+        path, computed_root = merkle.inclusion_proof(
+            sequence_number, root.tree_size, nodes
+        )
+        if computed_root != root.root_hash:
+            # The entries no longer hash to the signed root; the proof is
+            # still returned so the verifier reports the mismatch
+            logger.warning(
+                "Audit chain Merkle tree does not match its signed root",
+                chain_id=chain_id,
+                tree_size=root.tree_size,
+            )
+
+        return {
+            "chain_id": chain_id,
+            "sequence_number": sequence_number,
+            "entry": {
+                "chain_id": entry["chain_id"],
+                "sequence_number": entry["sequence_number"],
+                "previous_hash": entry["previous_hash"],
+                "event_type": entry["event_type"],
+                "user_id": entry["user_id"],
+                "company_id": entry["company_id"],
+                "data": entry["data"],
+                "created_at": (
+                    entry["created_at"].isoformat() if entry["created_at"] else None
+                ),
+            },
+            "entry_hash": entry["current_hash"],
+            "leaf_index": sequence_number,
+            "tree_size": root.tree_size,
+            "proof": path,
+            "root_hash": root.root_hash,
+            "root_signature": root.signature,
+            "root_signed_at": (
+                root.created_at.isoformat() if root.created_at else None
+            ),
+        }
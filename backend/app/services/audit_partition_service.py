@@ -0,0 +1,208 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.base_crud import advisory_xact_lock
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+@dataclass
+class PartitionPlan:
+    create: List[date] = field(default_factory=list)  # Months to add
+    detach: List[str] = field(default_factory=list)  # Partitions past retention
+
+    def __bool__(self):
+        return bool(self.create or self.detach)
+
+
+class AuditPartitionService:
+    """
+    Monthly range partitions of audit_logs on created_at (PostgreSQL only;
+    see migration f3a9c7e1d284). Rows outside every monthly partition land in
+    audit_logs_default and are moved out when their month is created.
+    """
+
+    @staticmethod
+    def plan(
+        existing: List[date],
+        today: date,
+        months_ahead: int,
+        retention_months: int,
+    ) -> PartitionPlan:
+        """Partitions to create (this month plus months_ahead) and to detach"""
+        current = month_start(today)
+        wanted = [add_months(current, n) for n in range(months_ahead + 1)]
+        plan = PartitionPlan(create=[m for m in wanted if m not in existing])
+        if retention_months:
+            # A partition goes once its whole month is past the horizon
+            horizon = add_months(current, -retention_months)
+            plan.detach = [
+                partition_name(m)
+                for m in sorted(existing)
+                if add_months(m, 1) <= horizon
+            ]
+        return plan
+
+    @staticmethod
+    def is_partitioned(db: Session) -> bool:
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        return bool(
+            db.execute(
+                text(
+                    "SELECT 1 FROM pg_partitioned_table pt "
+                    "JOIN pg_class c ON c.oid = pt.partrelid "
+                    "WHERE c.relname = :parent"
+                ),
+                {"parent": PARENT_TABLE},
+            ).scalar()
+        )
+
+    @staticmethod
+    def list_partitions(db: Session) -> Dict[date, str]:
+        """Attached monthly partitions, by month"""
+        rows = db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        partitions = {}
+        for (name,) in rows:
+            month = partition_month(name)
+            if month is not None:
+                partitions[month] = name
+        return partitions
+
+    @staticmethod
+    def create_partition(db: Session, month: date):
+        name = partition_name(month)
+        # Bounds are formatted from dates; DDL takes no bind parameters
+        start, end = month.isoformat(), add_months(month, 1).isoformat()
+        bounds = {"start": start, "end": end}
+        parked = db.execute(
+            text(
+                f"SELECT count(*) FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :start AND created_at < :end"
+            ),
+            bounds,
+        ).scalar()
+
+        if not parked:
+            db.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                    f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                )
+            )
+        else:
+            # Attaching checks the default partition holds no rows for the
+            # new range, so move them into the new table first
+            db.execute(
+                text(
+                    f"CREATE TABLE {name} (LIKE {PARENT_TABLE} "
+                    "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+            )
+            db.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+            db.execute(
+                text(
+                    f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                )
+            )
+        logger.info("Audit log partition created", partition=name, moved_rows=parked)
+
+    @staticmethod
+    def detach_partition(db: Session, name: str, drop: bool = False):
+        """Detach a partition; it is kept as a standalone table unless drop"""
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            db.execute(text(f"DROP TABLE {name}"))
+        logger.info("Audit log partition detached", partition=name, dropped=drop)
+
+    @staticmethod
+    def maintain(
+        db: Session,
+        months_ahead: Optional[int] = None,
+        retention_months: Optional[int] = None,
+        drop: bool = False,
+        dry_run: bool = False,
+        today: Optional[date] = None,
+    ) -> PartitionPlan:
+        """Pre-create upcoming monthly partitions and detach expired ones"""
+        if not AuditPartitionService.is_partitioned(db):
+            logger.info("audit_logs is not partitioned, nothing to maintain")
+            return PartitionPlan()
+
+        # One maintainer at a time
+        advisory_xact_lock(db, "audit_logs:partitions")
+        plan = AuditPartitionService.plan(
+            list(AuditPartitionService.list_partitions(db)),
+            today or datetime.utcnow().date(),
+            (
+                settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD
+                if months_ahead is None
+                else months_ahead
+            ),
+            (
+                settings.AUDIT_LOG_PARTITION_RETENTION_MONTHS
+                if retention_months is None
+                else retention_months
+            ),
+        )
+        if dry_run or not plan:
+            db.rollback()
+            return plan
+
+        try:
+            for month in plan.create:
+                AuditPartitionService.create_partition(db, month)
+            for name in plan.detach:
+                AuditPartitionService.detach_partition(db, name, drop=drop)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return plan
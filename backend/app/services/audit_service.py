@@ -3,13 +3,32 @@ from datetime import datetime
 import structlog
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db import SessionLocal
 from app.models.audit_log import AuditLog
+from app.services.audit_writer import audit_log_writer
 
 logger = structlog.get_logger(__name__)
 
 
 class AuditService:
+    @staticmethod
+    def _write(db: Session, **columns):
+        """
+        Persist one audit row according to AUDIT_LOG_DURABILITY. In async mode
+        the row is queued for the batched writer; the caller's open
+        transaction, flushed or not, is still committed as in sync mode,
+        since callers rely on that.
+        """
+        if settings.AUDIT_LOG_DURABILITY == "async":
+            columns.setdefault("created_at", datetime.utcnow())
+            audit_log_writer.submit(columns)
+            if db.in_transaction():
+                db.commit()
+            return
+        db.add(AuditLog(**columns))
+        db.commit()
+
     @staticmethod
     def log_event(
         db: Session,
@@ -23,7 +42,8 @@ class AuditService:
         user_agent: str = None,
     ):
         """Log an audit event"""
-        audit_log = AuditLog(
+        AuditService._write(
+            db,
             event_type=event_type,
             user_id=user_id,
             company_id=company_id,
@@ -33,8 +53,6 @@ class AuditService:
             ip_address=ip_address,
             user_agent=user_agent,
         )
-        db.add(audit_log)
-        db.commit()
         logger.info(
             "Audit event logged",
             event_type=event_type,
@@ -328,7 +346,8 @@ class AuditService:
         details: dict = None,
     ):
         """Log AI request events"""
-        audit_log = AuditLog(
+        AuditService._write(
+            db,
             event_type="AI_REQUEST",
             user_id=user_id,
             company_id=company_id,
@@ -343,8 +362,6 @@ class AuditService:
             ai_user_role=user_role,
             ai_severity=severity,
         )
-        db.add(audit_log)
-        db.commit()
 
         # Also log to cryptographic audit chain
         from app.services.audit_chain_service import AuditChainService
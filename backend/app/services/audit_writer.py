@@ -0,0 +1,187 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.metrics import (record_audit_log_batch, record_audit_log_dropped,
+                         set_audit_log_queue_depth)
+from app.models.audit_log import AuditLog
+
+logger = structlog.get_logger(__name__)
+
+
+class AuditLogWriter:
+    """
+    In-process audit log writer: a bounded queue drained by a daemon thread
+    that inserts events in batches, one transaction per batch. Events are
+    dropped (and counted) rather than blocking callers when the queue is full.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.AUDIT_LOG_BATCH_SIZE
+        self.flush_interval = (
+            settings.AUDIT_LOG_FLUSH_INTERVAL_SECONDS
+            if flush_interval is None
+            else flush_interval
+        )
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(
+            max_queue or settings.AUDIT_LOG_QUEUE_SIZE
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue one AuditLog row (column -> value); False if it was dropped"""
+        if self._stopping.is_set():
+            record_audit_log_dropped("shutdown")
+            logger.warning("Audit event dropped during shutdown", **_summary(row))
+            return False
+        self.start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            record_audit_log_dropped("queue_full")
+            logger.warning("Audit log queue full, event dropped", **_summary(row))
+            return False
+        set_audit_log_queue_depth(self._queue.qsize())
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been written (or dropped)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting events, write what is queued and join the thread"""
+        timeout = (
+            settings.AUDIT_LOG_SHUTDOWN_TIMEOUT_SECONDS if timeout is None else timeout
+        )
+        self._stopping.set()
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.error(
+                "Audit log writer did not drain before shutdown", pending=self.depth
+            )
+            return False
+        self._thread = None
+        return True
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch:
+                try:
+                    self._write(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                    set_audit_log_queue_depth(self._queue.qsize())
+            elif self._stopping.is_set():
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        db = self.session_factory()
+        try:
+            try:
+                _insert(db, batch)
+                db.commit()
+                record_audit_log_batch(len(batch))
+                return
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.warning(
+                    "Audit log batch insert failed, retrying row by row",
+                    rows=len(batch),
+                    error=str(e.orig if hasattr(e, "orig") else e),
+                )
+
+            # One bad row must not take the rest of the batch with it
+            written = 0
+            for row in batch:
+                try:
+                    _insert(db, [row])
+                    db.commit()
+                    written += 1
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    record_audit_log_dropped("write_error")
+                    logger.error(
+                        "Audit event could not be written",
+                        error=str(e.orig if hasattr(e, "orig") else e),
+                        **_summary(row),
+                    )
+            if written:
+                record_audit_log_batch(written)
+        finally:
+            db.close()
+
+
+def _insert(db: Session, rows: List[Dict[str, Any]]):
+    # Rows may set different columns (e.g. AI fields), so insert them
+    # grouped by column set; each group is a single executemany
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for group in groups.values():
+        db.execute(insert(AuditLog), group)
+
+
+def _summary(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "event_type": row.get("event_type"),
+        "user_id": row.get("user_id"),
+        "company_id": row.get("company_id"),
+    }
+
+
+audit_log_writer = AuditLogWriter()
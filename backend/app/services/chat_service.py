@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from app.crud.crud_channels import add_member_to_channel, create_channel
 from app.crud.crud_reactions import add_reaction, remove_reaction
 from app.crud_chat import create_chat_message, get_chat_history
-from app.crud_notifications import create_notification
+from app.crud_notifications import create_notifications
 from app.metrics import increment_messages_sent
 from app.models.channels import Channel, ChannelMember, ChannelType
 from app.models.chat import ChatMessage
@@ -256,15 +256,16 @@ class ChatService:
             .all()
         )
 
-        for member in members:
-            create_notification(
-                db=db,
-                user_id=member.user_id,
-                company_id=message.company_id,
-                title=f"New message in {message.channel.name}",
-                message=f"{message.sender.first_name}: {message.message[:50]}...",
-                type=NotificationType.CHAT_MESSAGE,
-            )
+        if not members:
+            return
+        create_notifications(
+            db=db,
+            user_ids=[member.user_id for member in members],
+            company_id=message.company_id,
+            title=f"New message in {message.channel.name}",
+            message=f"{message.sender.first_name}: {message.message[:50]}...",
+            type=NotificationType.CHAT_MESSAGE,
+        )
 
 
 # Global chat service instance
@@ -0,0 +1,173 @@
+import os
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+import structlog
+from sqlalchemy.orm import Session
+
+from app import db as database
+from app.config import settings
+from app.metrics import record_compliance_export
+from app.models.compliance_export_job import ComplianceExportJob, ExportStatus
+from app.schemas.ai import ComplianceExportRequest
+from app.services.compliance_export_service import ComplianceExportService
+from app.services.report_writers import REPORT_WRITERS
+
+logger = structlog.get_logger(__name__)
+
+
+class ComplianceExportJobService:
+    @staticmethod
+    def create_job(
+        db: Session, request: ComplianceExportRequest, user_id: int
+    ) -> ComplianceExportJob:
+        fmt = request.format.lower()
+        if fmt not in REPORT_WRITERS:
+            raise ValueError(
+                f"Unsupported export format {request.format!r}; "
+                f"use one of {', '.join(sorted(REPORT_WRITERS))}"
+            )
+        # Validate the dates now rather than in the background
+        datetime.fromisoformat(request.start_date)
+        datetime.fromisoformat(request.end_date)
+
+        job = ComplianceExportJob(
+            requested_by=user_id,
+            company_id=request.company_id,
+            format=fmt,
+            parameters=request.model_dump(),
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def filename(job: ComplianceExportJob) -> str:
+        request = job.parameters
+        return (
+            f"ai_compliance_report_{request['start_date']}_to_"
+            f"{request['end_date']}.{job.format}"
+        )
+
+    @staticmethod
+    def _claim(db: Session, job_id: int) -> Optional[ComplianceExportJob]:
+        """
+        Move a pending job to RUNNING; None once it has finished. A RUNNING
+        job is taken over too: the job queue only retries an export whose
+        worker was lost part way through.
+        """
+        claimed = (
+            db.query(ComplianceExportJob)
+            .filter(
+                ComplianceExportJob.id == job_id,
+                ComplianceExportJob.status.in_(
+                    [ExportStatus.PENDING, ExportStatus.RUNNING]
+                ),
+            )
+            .update(
+                {"status": ExportStatus.RUNNING, "started_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return db.get(ComplianceExportJob, job_id) if claimed else None
+
+    @staticmethod
+    def run(
+        job_id: int,
+        session_factory: Callable[[], Session] = None,
+        read_session_factory: Callable[[], Session] = None,
+    ):
+        """
+        Generate a job's file. Job state is saved through its own session so
+        progress commits don't disturb the server-side cursor the logs are
+        read with (from the replica when one is configured).
+        """
+        session_factory = session_factory or database.session_router.session
+        read_session_factory = read_session_factory or (
+            lambda: database.session_router.session(read_only=True)
+        )
+        db = session_factory()
+        try:
+            job = ComplianceExportJobService._claim(db, job_id)
+            if job is None:
+                return
+            ComplianceExportJobService._generate(db, job, read_session_factory)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _generate(
+        db: Session,
+        job: ComplianceExportJob,
+        read_session_factory: Callable[[], Session],
+    ):
+        started = time.monotonic()
+        writer_class = REPORT_WRITERS[job.format]
+        directory = os.path.abspath(settings.COMPLIANCE_EXPORT_DIR)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"compliance_export_{job.id}.{job.format}")
+        partial = f"{path}.part"
+        interval = settings.COMPLIANCE_EXPORT_PROGRESS_INTERVAL
+        rows = 0
+
+        try:
+            request = ComplianceExportRequest(**job.parameters)
+            read_db = read_session_factory()
+            try:
+                header = ComplianceExportService.report_header(read_db, request)
+                total = header["violation_summary"]["total_events"]
+                job.rows_total = total if request.include_logs else 0
+                db.commit()
+
+                with open(partial, "wb") as f:
+                    writer = writer_class(f)
+                    writer.begin(header)
+                    if request.include_logs:
+                        for row in ComplianceExportService.iter_detailed_logs(
+                            read_db,
+                            request.company_id,
+                            datetime.fromisoformat(request.start_date),
+                            datetime.fromisoformat(request.end_date),
+                        ):
+                            writer.write_log(row)
+                            rows += 1
+                            if rows % interval == 0:
+                                job.rows_written = rows
+                                db.commit()
+                    writer.finish()
+            finally:
+                read_db.close()
+            os.replace(partial, path)
+        except Exception as e:
+            db.rollback()
+            if os.path.exists(partial):
+                os.remove(partial)
+            job.status = ExportStatus.FAILED
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            record_compliance_export(
+                job.format, job.status.value, time.monotonic() - started, rows
+            )
+            logger.exception("Compliance export failed", job_id=job.id)
+            return
+
+        job.status = ExportStatus.COMPLETED
+        job.rows_written = rows
+        job.file_path = path
+        job.file_size = os.path.getsize(path)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        elapsed = time.monotonic() - started
+        record_compliance_export(job.format, job.status.value, elapsed, rows)
+        logger.info(
+            "Compliance export completed",
+            job_id=job.id,
+            format=job.format,
+            rows=rows,
+            bytes=job.file_size,
+            seconds=round(elapsed, 2),
+        )
@@ -1,30 +1,34 @@
 import json
 from datetime import datetime, timedelta
 from io import BytesIO
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 import structlog
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
-                                TableStyle)
-from sqlalchemy import and_, or_
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.schemas.ai import ComplianceExportRequest
+from app.services.archive_service import ArchiveService
 from app.services.trust_service import TrustService
 
 logger = structlog.get_logger(__name__)
 
+# Events in compliance reports (SQL; _is_reported_event for archived rows)
+REPORTED_EVENTS = or_(
+    AuditLog.event_type.like("AI_%"),
+    AuditLog.event_type.like("SECURITY_AI_%"),
+    AuditLog.event_type == "TRUST_SCORE_UPDATE",
+)
+
 
 class ComplianceExportService:
     @staticmethod
-    def generate_compliance_report(
-        db: Session, request: ComplianceExportRequest
-    ) -> dict:
-        """Generate comprehensive compliance report"""
+    def report_header(db: Session, request: ComplianceExportRequest) -> dict:
+        """Everything in a report except the detailed logs"""
         start_date = datetime.fromisoformat(request.start_date)
         end_date = datetime.fromisoformat(request.end_date)
 
@@ -36,30 +40,35 @@ class ComplianceExportService:
                 "format": request.format,
             },
             "policies_in_effect": ComplianceExportService._get_policies_in_effect(),
-            "violation_summary": {},
+            "violation_summary": ComplianceExportService.violation_summary(
+                db, request.company_id, start_date, end_date
+            ),
             "trust_score_history": {},
-            "detailed_logs": [],
         }
 
-        if request.include_logs:
-            report_data["detailed_logs"] = ComplianceExportService._get_detailed_logs(
+        if request.include_trust_history:
+            report_data[
+                "trust_score_history"
+            ] = ComplianceExportService._get_trust_history(
                 db, request.company_id, start_date, end_date
             )
 
-        if request.include_trust_history:
-            report_data["trust_score_history"] = (
-                ComplianceExportService._get_trust_history(
-                    db, request.company_id, start_date, end_date
-                )
-            )
+        return report_data
 
-        # Generate summary statistics
-        report_data["violation_summary"] = (
-            ComplianceExportService._calculate_violation_summary(
-                report_data["detailed_logs"]
+    @staticmethod
+    def generate_compliance_report(
+        db: Session, request: ComplianceExportRequest
+    ) -> dict:
+        """Generate comprehensive compliance report"""
+        report_data = ComplianceExportService.report_header(db, request)
+        report_data["detailed_logs"] = []
+        if request.include_logs:
+            report_data["detailed_logs"] = ComplianceExportService._get_detailed_logs(
+                db,
+                request.company_id,
+                datetime.fromisoformat(request.start_date),
+                datetime.fromisoformat(request.end_date),
             )
-        )
-
         return report_data
 
     @staticmethod
@@ -94,132 +103,264 @@ class ComplianceExportService:
         }
 
     @staticmethod
-    def _get_detailed_logs(
-        db: Session, company_id: int, start_date: datetime, end_date: datetime
-    ) -> list:
-        """Get detailed audit logs for the period"""
+    def _is_reported_event(event_type: str) -> bool:
+        return (
+            event_type.startswith("AI_")
+            or event_type.startswith("SECURITY_AI_")
+            or event_type == "TRUST_SCORE_UPDATE"
+        )
+
+    @staticmethod
+    def _audit_logs(
+        db: Session,
+        company_id: Optional[int],
+        start_date: datetime,
+        end_date: datetime,
+        condition,
+        predicate: Callable[[str], bool],
+    ) -> Iterator[Dict]:
+        """
+        Audit logs in the period matching condition (SQL) / predicate (on
+        the event type, for archived rows), live and archived merged in
+        created_at order
+        """
+        columns = list(AuditLog.__table__.columns)
         query = (
-            db.query(AuditLog)
+            db.query(*columns)
             .filter(
-                and_(
-                    AuditLog.created_at >= start_date,
-                    AuditLog.created_at <= end_date,
-                    or_(
-                        AuditLog.event_type.like("AI_%"),
-                        AuditLog.event_type.like("SECURITY_AI_%"),
-                        AuditLog.event_type == "TRUST_SCORE_UPDATE",
-                    ),
-                )
+                AuditLog.created_at >= start_date,
+                AuditLog.created_at <= end_date,
+                condition,
             )
-            .order_by(AuditLog.created_at)
+            .order_by(AuditLog.created_at, AuditLog.id)
         )
-
         if company_id:
             query = query.filter(AuditLog.company_id == company_id)
 
-        logs = query.all()
-
-        return [
-            {
-                "id": log.id,
-                "event_type": log.event_type,
-                "user_id": log.user_id,
-                "company_id": log.company_id,
-                "timestamp": log.created_at.isoformat(),
-                "details": log.details,
-                "ai_request_text": log.ai_request_text,
-                "ai_capability": log.ai_capability,
-                "ai_decision": log.ai_decision,
-                "ai_scope_valid": log.ai_scope_valid,
-                "ai_required_role": log.ai_required_role,
-                "ai_user_role": log.ai_user_role,
-                "ai_severity": log.ai_severity,
-                "user_email": log.user.email if log.user else None,
+        live = (
+            {column.name: value for column, value in zip(columns, values)}
+            for values in query.yield_per(1000)
+        )
+        archived = (
+            row
+            for row in ArchiveService.read(
+                AuditLog.__tablename__, start_date, end_date, company_id or None
+            )
+            if predicate(row["event_type"])
+        )
+        return ArchiveService.merge(live, archived)
+
+    @staticmethod
+    def _user_emails(db: Session, user_ids: Iterable[int]) -> Dict[int, str]:
+        ids = {user_id for user_id in user_ids if user_id is not None}
+        if not ids:
+            return {}
+        return dict(db.query(User.id, User.email).filter(User.id.in_(ids)))
+
+    @staticmethod
+    def _format_logs(
+        db: Session, logs: List[Dict], emails: Dict[int, str]
+    ) -> Iterator[dict]:
+        # One user query per batch; emails already seen are reused
+        emails.update(
+            ComplianceExportService._user_emails(
+                db, {log["user_id"] for log in logs} - emails.keys()
+            )
+        )
+        for log in logs:
+            yield {
+                "id": log["id"],
+                "event_type": log["event_type"],
+                "user_id": log["user_id"],
+                "company_id": log["company_id"],
+                "timestamp": log["created_at"].isoformat(),
+                "details": log["details"],
+                "ai_request_text": log["ai_request_text"],
+                "ai_capability": log["ai_capability"],
+                "ai_decision": log["ai_decision"],
+                "ai_scope_valid": log["ai_scope_valid"],
+                "ai_required_role": log["ai_required_role"],
+                "ai_user_role": log["ai_user_role"],
+                "ai_severity": log["ai_severity"],
+                "user_email": emails.get(log["user_id"]),
             }
-            for log in logs
-        ]
+
+    @staticmethod
+    def iter_detailed_logs(
+        db: Session,
+        company_id: Optional[int],
+        start_date: datetime,
+        end_date: datetime,
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Detailed audit logs for the period, archived ones included, streamed"""
+        emails: Dict[int, str] = {}
+        batch = []
+        for log in ComplianceExportService._audit_logs(
+            db,
+            company_id,
+            start_date,
+            end_date,
+            REPORTED_EVENTS,
+            ComplianceExportService._is_reported_event,
+        ):
+            batch.append(log)
+            if len(batch) >= batch_size:
+                yield from ComplianceExportService._format_logs(db, batch, emails)
+                batch = []
+        yield from ComplianceExportService._format_logs(db, batch, emails)
+
+    @staticmethod
+    def _get_detailed_logs(
+        db: Session, company_id: int, start_date: datetime, end_date: datetime
+    ) -> list:
+        """Get detailed audit logs for the period, archived ones included"""
+        return list(
+            ComplianceExportService.iter_detailed_logs(
+                db, company_id, start_date, end_date
+            )
+        )
 
     @staticmethod
     def _get_trust_history(
         db: Session, company_id: int, start_date: datetime, end_date: datetime
     ) -> dict:
         """Get trust score history for all users in the period"""
-        trust_logs = db.query(AuditLog).filter(
-            and_(
-                AuditLog.event_type == "TRUST_SCORE_UPDATE",
-                AuditLog.created_at >= start_date,
-                AuditLog.created_at <= end_date,
-            )
+        trust_logs = ComplianceExportService._audit_logs(
+            db,
+            company_id,
+            start_date,
+            end_date,
+            AuditLog.event_type == "TRUST_SCORE_UPDATE",
+            lambda event_type: event_type == "TRUST_SCORE_UPDATE",
         )
 
-        if company_id:
-            trust_logs = trust_logs.filter(AuditLog.company_id == company_id)
-
-        trust_logs = trust_logs.order_by(AuditLog.created_at).all()
-
         history = {}
         for log in trust_logs:
-            user_id = log.user_id
+            user_id = log["user_id"]
             if user_id not in history:
                 history[user_id] = []
 
+            details = log["details"] or {}
             history[user_id].append(
                 {
-                    "timestamp": log.created_at.isoformat(),
-                    "old_score": log.details.get("old_score"),
-                    "new_score": log.details.get("new_score"),
-                    "reason": log.details.get("reason"),
-                    "violation_type": log.details.get("violation_type"),
-                    "severity": log.details.get("severity"),
+                    "timestamp": log["created_at"].isoformat(),
+                    "old_score": details.get("old_score"),
+                    "new_score": details.get("new_score"),
+                    "reason": details.get("reason"),
+                    "violation_type": details.get("violation_type"),
+                    "severity": details.get("severity"),
                 }
             )
 
         return history
 
     @staticmethod
-    def _calculate_violation_summary(logs: list) -> dict:
-        """Calculate violation statistics from logs"""
-        summary = {
-            "total_events": len(logs),
+    def _count_events(
+        summary: dict,
+        event_type: str,
+        ai_decision: Optional[str],
+        severity: Optional[str],
+        user_id: int,
+        count: int,
+    ):
+        summary["total_events"] += count
+        by_type = summary["violations_by_type"]
+        by_type[event_type] = by_type.get(event_type, 0) + count
+        if ai_decision in summary["ai_decisions"]:
+            summary["ai_decisions"][ai_decision] += count
+        if severity in summary["violations_by_severity"]:
+            summary["violations_by_severity"][severity] += count
+        user = summary["violations_by_user"].setdefault(
+            user_id, {"count": 0, "email": None}
+        )
+        user["count"] += count
+
+    @staticmethod
+    def violation_summary(
+        db: Session,
+        company_id: Optional[int],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict:
+        """
+        Violation statistics for the period, counted with one GROUP BY over
+        the live rows (plus a pass over any archived ones)
+        """
+        summary: Dict[str, Any] = {
+            "total_events": 0,
             "violations_by_type": {},
             "violations_by_severity": {"LOW": 0, "MEDIUM": 0, "HIGH": 0, "CRITICAL": 0},
             "violations_by_user": {},
             "ai_decisions": {"allowed": 0, "blocked": 0, "pending_approval": 0},
         }
 
-        for log in logs:
-            event_type = log["event_type"]
-
-            # Count by event type
-            if event_type not in summary["violations_by_type"]:
-                summary["violations_by_type"][event_type] = 0
-            summary["violations_by_type"][event_type] += 1
-
-            # Count AI decisions
-            if log.get("ai_decision"):
-                decision = log["ai_decision"]
-                if decision in summary["ai_decisions"]:
-                    summary["ai_decisions"][decision] += 1
-
-            # Count by severity
-            severity = log.get("ai_severity", "LOW")
-            if severity and severity.upper() in summary["violations_by_severity"]:
-                summary["violations_by_severity"][severity.upper()] += 1
+        severity = func.upper(AuditLog.ai_severity)
+        query = (
+            db.query(
+                AuditLog.event_type,
+                AuditLog.ai_decision,
+                severity,
+                AuditLog.user_id,
+                func.count(AuditLog.id),
+            )
+            .filter(
+                AuditLog.created_at >= start_date,
+                AuditLog.created_at <= end_date,
+                REPORTED_EVENTS,
+            )
+            .group_by(
+                AuditLog.event_type, AuditLog.ai_decision, severity, AuditLog.user_id
+            )
+        )
+        if company_id:
+            query = query.filter(AuditLog.company_id == company_id)
+        for row in query:
+            ComplianceExportService._count_events(summary, *row)
 
-            # Count by user
-            user_id = log["user_id"]
-            if user_id not in summary["violations_by_user"]:
-                summary["violations_by_user"][user_id] = {
-                    "count": 0,
-                    "email": log.get("user_email"),
-                }
-            summary["violations_by_user"][user_id]["count"] += 1
+        archived = (
+            log
+            for log in ArchiveService.read(
+                AuditLog.__tablename__, start_date, end_date, company_id or None
+            )
+            if ComplianceExportService._is_reported_event(log["event_type"])
+        )
+        batch_size = settings.ARCHIVE_BATCH_SIZE
+        for logs in iter(lambda: list(islice(archived, batch_size)), []):
+            # A row archived by an interrupted run is still live and was
+            # counted above, as ArchiveService.merge dedupes it for the logs
+            live = {
+                log_id
+                for (log_id,) in db.query(AuditLog.id).filter(
+                    AuditLog.id.in_([log["id"] for log in logs])
+                )
+            }
+            for log in logs:
+                if log["id"] in live:
+                    continue
+                ComplianceExportService._count_events(
+                    summary,
+                    log["event_type"],
+                    log["ai_decision"],
+                    log["ai_severity"].upper() if log["ai_severity"] else None,
+                    log["user_id"],
+                    1,
+                )
 
+        emails = ComplianceExportService._user_emails(db, summary["violations_by_user"])
+        for user_id, user in summary["violations_by_user"].items():
+            user["email"] = emails.get(user_id)
         return summary
 
     @staticmethod
     def generate_pdf_report(report_data: dict) -> BytesIO:
         """Generate PDF version of compliance report"""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer,
+                                        Table, TableStyle)
+
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         styles = getSampleStyleSheet()
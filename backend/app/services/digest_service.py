@@ -1,19 +1,70 @@
-from datetime import datetime, timedelta
-from typing import Any, Dict, List
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
 
 import structlog
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, insert
 from sqlalchemy.orm import Session
 
-from app.models.notification import Notification, NotificationType
+from app.config import settings
+from app.metrics import record_digest_batch
+from app.models.notification import (Notification, NotificationStatus,
+                                     NotificationType)
 from app.models.notification_digest import (DigestStatus, DigestType,
                                             NotificationDigest)
 from app.models.notification_preferences import (DigestMode,
                                                  NotificationPreferences)
-from app.models.user import User
 
 logger = structlog.get_logger(__name__)
 
+# Window covered, digest title and send delay per digest type
+DIGEST_WINDOWS = {
+    DigestType.DAILY: (
+        timedelta(days=1),
+        "Daily Notification Digest",
+        timedelta(hours=1),
+    ),
+    DigestType.WEEKLY: (
+        timedelta(days=7),
+        "Weekly Notification Digest",
+        timedelta(hours=2),
+    ),
+}
+
+
+@dataclass
+class DigestBuildResult:
+    digest_type: DigestType
+    users: int = 0
+    digests: int = 0
+    notifications: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+def _type_label(notif_type: str) -> str:
+    return notif_type.replace("_", " ").lower()
+
+
+def daily_summary(type_counts: Dict[str, int]) -> str:
+    total_count = sum(type_counts.values())
+    summary = f"You have {total_count} new notifications from the last 24 hours:\n"
+    for notif_type, count in type_counts.items():
+        summary += f"- {count} {_type_label(notif_type)}\n"
+    return summary
+
+
+def weekly_summary(daily_counts: Dict[date, Dict[str, int]]) -> str:
+    total_count = sum(sum(counts.values()) for counts in daily_counts.values())
+    summary = f"Weekly summary: {total_count} notifications from the past 7 days\n\n"
+    for day in sorted(daily_counts.keys(), reverse=True):
+        summary += f"{day.strftime('%A, %B %d')}:\n"
+        for notif_type, count in daily_counts[day].items():
+            summary += f"  - {count} {_type_label(notif_type)}\n"
+        summary += "\n"
+    return summary
+
 
 class DigestService:
     def __init__(self, db: Session):
@@ -32,7 +83,7 @@ class DigestService:
                 and_(
                     Notification.user_id == user_id,
                     Notification.created_at >= yesterday,
-                    Notification.status == "unread",
+                    Notification.status == NotificationStatus.UNREAD,
                 )
             )
             .all()
@@ -50,9 +101,7 @@ class DigestService:
 
         # Create digest summary
         total_count = len(notifications)
-        summary = f"You have {total_count} new notifications from the last 24 hours:\n"
-        for notif_type, count in type_counts.items():
-            summary += f"- {count} {notif_type.replace('_', ' ').lower()}\n"
+        summary = daily_summary(type_counts)
 
         # Create digest record
         digest = NotificationDigest(
@@ -89,7 +138,7 @@ class DigestService:
                 and_(
                     Notification.user_id == user_id,
                     Notification.created_at >= last_week,
-                    Notification.status == "unread",
+                    Notification.status == NotificationStatus.UNREAD,
                 )
             )
             .all()
@@ -110,16 +159,7 @@ class DigestService:
 
         # Create digest summary
         total_count = len(notifications)
-        summary = (
-            f"Weekly summary: {total_count} notifications from the past 7 days\n\n"
-        )
-
-        for day in sorted(daily_counts.keys(), reverse=True):
-            day_str = day.strftime("%A, %B %d")
-            summary += f"{day_str}:\n"
-            for notif_type, count in daily_counts[day].items():
-                summary += f"  - {count} {notif_type.replace('_', ' ').lower()}\n"
-            summary += "\n"
+        summary = weekly_summary(daily_counts)
 
         # Create digest record
         digest = NotificationDigest(
@@ -143,6 +183,141 @@ class DigestService:
         )
         return digest
 
+    def build_digests(
+        self,
+        digest_type: DigestType,
+        batch_size: Optional[int] = None,
+        now: Optional[datetime] = None,
+        progress: Optional[Callable[[DigestBuildResult, int], None]] = None,
+    ) -> DigestBuildResult:
+        """
+        Create ``digest_type`` digests for every user whose preferences ask
+        for them. Per-user, per-type counts come from one aggregated query;
+        digests are then inserted ``batch_size`` users at a time, and each
+        batch's notifications are marked read by one UPDATE in the same
+        commit. A user's digested notifications are no longer unread, so
+        rerunning after a failure only builds the batches that are missing.
+
+        ``progress(result, total_users)`` is called after every batch.
+        """
+        batch_size = batch_size or settings.DIGEST_BATCH_SIZE
+        now = now or datetime.utcnow()
+        window, title, send_delay = DIGEST_WINDOWS[digest_type]
+        since = now - window
+        started = time.monotonic()
+
+        counts = self._digest_counts(digest_type, since, now)
+        result = DigestBuildResult(digest_type=digest_type, users=len(counts))
+        user_ids = sorted(counts)
+        log = logger.bind(digest_type=digest_type.value, users=len(user_ids))
+        log.info("Building notification digests")
+
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start : start + batch_size]
+            rows = []
+            for user_id in batch:
+                company_id, grouped = counts[user_id]
+                if digest_type == DigestType.DAILY:
+                    total = sum(grouped.values())
+                    summary = daily_summary(grouped)
+                else:
+                    total = sum(sum(types.values()) for types in grouped.values())
+                    summary = weekly_summary(grouped)
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "company_id": company_id,
+                        "digest_type": digest_type,
+                        "status": DigestStatus.PENDING,
+                        "title": title,
+                        "summary": summary,
+                        "notification_count": total,
+                        "scheduled_for": now + send_delay,
+                    }
+                )
+            self.db.execute(insert(NotificationDigest), rows)
+            # Bounded by ``now`` so notifications arriving mid-run are left
+            # unread for the next digest
+            self.db.query(Notification).filter(
+                Notification.user_id.in_(batch),
+                Notification.status == NotificationStatus.UNREAD,
+                Notification.created_at >= since,
+                Notification.created_at < now,
+            ).update({"status": NotificationStatus.READ}, synchronize_session=False)
+            self.db.commit()
+
+            notifications = sum(row["notification_count"] for row in rows)
+            result.digests += len(rows)
+            result.notifications += notifications
+            result.batches += 1
+            record_digest_batch(digest_type.value, len(rows), notifications)
+            log.info(
+                "Digest batch committed",
+                done=start + len(batch),
+                last_user_id=batch[-1],
+            )
+            if progress:
+                progress(result, len(user_ids))
+
+        result.seconds = time.monotonic() - started
+        log.info(
+            "Notification digests built",
+            digests=result.digests,
+            notifications=result.notifications,
+            seconds=round(result.seconds, 3),
+        )
+        return result
+
+    def _digest_counts(
+        self, digest_type: DigestType, since: datetime, until: datetime
+    ) -> Dict[int, tuple]:
+        """
+        Unread notification counts in [since, until) for users in
+        ``digest_type`` mode: {user_id: (company_id, {type: count})}, or
+        {day: {type: count}} per user for weekly digests
+        """
+        mode = (
+            DigestMode.DAILY if digest_type == DigestType.DAILY else DigestMode.WEEKLY
+        )
+        day = func.date(Notification.created_at)
+        columns = [
+            Notification.user_id,
+            NotificationPreferences.company_id,
+            Notification.type,
+        ]
+        if digest_type == DigestType.WEEKLY:
+            columns.append(day)
+        rows = (
+            self.db.query(*columns, func.count(Notification.id))
+            .join(
+                NotificationPreferences,
+                NotificationPreferences.user_id == Notification.user_id,
+            )
+            .filter(
+                NotificationPreferences.digest_mode == mode.value,
+                NotificationPreferences.mute_all.is_(False),
+                Notification.status == NotificationStatus.UNREAD,
+                Notification.created_at >= since,
+                Notification.created_at < until,
+            )
+            .group_by(*columns)
+            .order_by(Notification.user_id, Notification.type)
+            .all()
+        )
+
+        counts = {}
+        for row in rows:
+            user_id, company_id, notif_type = row[:3]
+            _, grouped = counts.setdefault(user_id, (company_id, {}))
+            if digest_type == DigestType.WEEKLY:
+                # SQLite returns date() as text
+                row_day = row[3]
+                if isinstance(row_day, str):
+                    row_day = date.fromisoformat(row_day)
+                grouped = grouped.setdefault(row_day, {})
+            grouped[notif_type.value] = row[-1]
+        return counts
+
     def should_create_digest(self, user_id: int, digest_type: DigestType) -> bool:
         """Check if a digest should be created for the user based on their preferences"""
         prefs = (
@@ -168,7 +343,7 @@ class DigestService:
         """Mark notifications as processed (read/archived) after digest creation"""
         self.db.query(Notification).filter(
             Notification.id.in_(notification_ids)
-        ).update({"status": "read"})
+        ).update({"status": NotificationStatus.READ}, synchronize_session=False)
 
         self.db.commit()
         logger.info(f"Marked {len(notification_ids)} notifications as processed")
@@ -194,17 +369,14 @@ class DigestService:
             # Create a new notification for the digest
             from app.crud_notifications import create_notification
 
-            notification_data = {
-                "user_id": digest.user_id,
-                "company_id": digest.company_id,
-                "title": digest.title,
-                "message": digest.summary,
-                "type": NotificationType.SYSTEM_MESSAGE,
-                "status": "unread",
-            }
-
-            # Create the digest notification
-            create_notification(self.db, notification_data)
+            create_notification(
+                self.db,
+                user_id=digest.user_id,
+                company_id=digest.company_id,
+                title=digest.title,
+                message=digest.summary,
+                type=NotificationType.SYSTEM_MESSAGE,
+            )
 
             # Update digest status
             digest.status = DigestStatus.SENT
@@ -1,13 +1,13 @@
 import os
 import re
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Any, Dict, Optional
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 
 from app.config import settings
+from app.services.smtp_delivery import (OutgoingEmail, SMTPConnectionPool,
+                                        SMTPDispatcher)
 
 logger = structlog.get_logger(__name__)
 
@@ -20,6 +20,14 @@ class EmailService:
         self.smtp_password = settings.SMTP_PASSWORD or settings.SENDGRID_API_KEY
         self.email_from = settings.EMAIL_FROM
         self.sendgrid_api_key = settings.SENDGRID_API_KEY
+        # Authenticated connections are kept open and shared by every send
+        self.smtp_pool = SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.smtp_username,
+            self.smtp_password,
+        )
+        self.smtp_dispatcher = SMTPDispatcher(self.smtp_pool, self.email_from)
 
     def send_email(
         self,
@@ -29,63 +37,59 @@ class EmailService:
         text_content: Optional[str] = None,
     ) -> bool:
         """Send email using SMTP or SendGrid API fallback"""
-        # Validate email
-        if not self._validate_email(to_email):
-            logger.error("Invalid email address", to_email=to_email)
-            return False
-
-        # Try SMTP first
-        if self._send_via_smtp(to_email, subject, html_content, text_content):
-            return True
-
-        # Fallback to SendGrid API if available
-        if self.sendgrid_api_key:
-            return self._send_via_sendgrid(
-                to_email, subject, html_content, text_content
-            )
+        return self.send_batch(
+            [OutgoingEmail(to_email, subject, html_content, text_content)]
+        )[0]
 
-        logger.error("No email provider available", to_email=to_email)
-        return False
+    def send_batch(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """
+        Send several emails over pooled SMTP connections, falling back to
+        SendGrid for each one SMTP could not deliver; returns one result per
+        email
+        """
+        results = [False] * len(emails)
+        valid = []
+        for index, email in enumerate(emails):
+            if self._validate_email(email.to_email):
+                valid.append(index)
+            else:
+                logger.error("Invalid email address", to_email=email.to_email)
 
-    def _send_via_smtp(
-        self,
-        to_email: str,
-        subject: str,
-        html_content: str,
-        text_content: Optional[str] = None,
-    ) -> bool:
-        """Send email using SMTP"""
-        try:
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.email_from
-            msg["To"] = to_email
-
-            # Add text part
-            if text_content:
-                text_part = MIMEText(text_content, "plain")
-                msg.attach(text_part)
-
-            # Add HTML part
-            html_part = MIMEText(html_content, "html")
-            msg.attach(html_part)
-
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            server.sendmail(self.email_from, to_email, msg.as_string())
-            server.quit()
-
-            logger.info("Email sent via SMTP", to_email=to_email, subject=subject)
-            return True
+        # Try SMTP first
+        sent = self._send_via_smtp([emails[index] for index in valid])
+        for index, ok in zip(valid, sent):
+            email = emails[index]
+            if ok:
+                results[index] = True
+            elif self.sendgrid_api_key:
+                # Fallback to SendGrid API if available
+                results[index] = self._send_via_sendgrid(
+                    email.to_email,
+                    email.subject,
+                    email.html_content,
+                    email.text_content,
+                )
+            else:
+                logger.error("No email provider available", to_email=email.to_email)
+        return results
 
-        except Exception as e:
-            logger.warning(
-                "SMTP failed, trying SendGrid fallback", error=str(e), to_email=to_email
-            )
-            return False
+    def _send_via_smtp(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """Send emails through the SMTP dispatcher"""
+        if not emails:
+            return []
+        results = self.smtp_dispatcher.send(emails)
+        for email, ok in zip(emails, results):
+            if ok:
+                logger.info(
+                    "Email sent via SMTP",
+                    to_email=email.to_email,
+                    subject=email.subject,
+                )
+            else:
+                logger.warning(
+                    "SMTP failed, trying SendGrid fallback", to_email=email.to_email
+                )
+        return results
 
     def _send_via_sendgrid(
         self,
@@ -210,25 +214,64 @@ class EmailService:
             to_email, "", "", template_id=template_id, dynamic_data=dynamic_data
         )
 
-    def send_notification_email(
-        self, to_email: str, title: str, message: str, user_name: str = "User"
-    ) -> bool:
-        """Send notification email"""
-        subject = f"Workforce App Notification: {title}"
+    def _notification_templates(
+        self, title: str, message: str
+    ) -> Tuple[Template, Template]:
+        """HTML and text bodies for a notification, leaving $user_name open"""
+        # Escape "$" so only the placeholder is substituted per recipient
+        title = title.replace("$", "$$")
+        message = message.replace("$", "$$")
+        frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000").replace(
+            "$", "$$"
+        )
         html_content = f"""
         <html>
         <body>
             <h2>{title}</h2>
-            <p>Hello {user_name},</p>
+            <p>Hello $user_name,</p>
             <p>{message}</p>
-            <p>You can view all notifications in your <a href="{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/notifications">dashboard</a>.</p>
+            <p>You can view all notifications in your <a href="{frontend_url}/notifications">dashboard</a>.</p>
             <br>
             <p>Best regards,<br>The Workforce App Team</p>
         </body>
         </html>
         """
-        text_content = f"Hello {user_name}, {title}: {message}. View in dashboard: {os.getenv('FRONTEND_URL', 'http://localhost:3000')}/notifications"
-        return self.send_email(to_email, subject, html_content, text_content)
+        text_content = f"Hello $user_name, {title}: {message}. View in dashboard: {frontend_url}/notifications"
+        return Template(html_content), Template(text_content)
+
+    def send_notification_email(
+        self, to_email: str, title: str, message: str, user_name: str = "User"
+    ) -> bool:
+        """Send notification email"""
+        subject = f"Workforce App Notification: {title}"
+        html_template, text_template = self._notification_templates(title, message)
+        return self.send_email(
+            to_email,
+            subject,
+            html_template.substitute(user_name=user_name),
+            text_template.substitute(user_name=user_name),
+        )
+
+    def send_notification_emails(
+        self, recipients: List[Tuple[str, str]], title: str, message: str
+    ) -> List[bool]:
+        """
+        Send the same notification to many (email, user name) recipients. The
+        bodies are rendered once for the batch; only the name differs.
+        """
+        subject = f"Workforce App Notification: {title}"
+        html_template, text_template = self._notification_templates(title, message)
+        return self.send_batch(
+            [
+                OutgoingEmail(
+                    to_email,
+                    subject,
+                    html_template.substitute(user_name=user_name),
+                    text_template.substitute(user_name=user_name),
+                )
+                for to_email, user_name in recipients
+            ]
+        )
 
 
 # Global email service instance
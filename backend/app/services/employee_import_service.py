@@ -0,0 +1,513 @@
+import csv
+import io
+import json
+import secrets
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import structlog
+from passlib.context import CryptContext
+from sqlalchemy import (Column, DateTime, Float, Integer, MetaData, String,
+                        Table, Text, case, cast, exists, false, func, insert,
+                        literal, or_, select, true, update)
+from sqlalchemy.orm import Session
+
+from app.base_crud import upsert_insert
+from app.models.employee_profile import EmployeeProfile
+from app.models.payroll import Employee as PayrollEmployee
+from app.models.payroll import Salary
+from app.models.user import User, UserRole
+from app.services.principal_cache import mark_principals_changed
+
+logger = structlog.get_logger(__name__)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+IMPORT_FORMATS = ("csv", "ndjson")
+STAGE_CHUNK_ROWS = 10000
+MAX_REPORTED_ERRORS = 100
+
+STAGING_COLUMNS = [
+    "line_no",
+    "email",
+    "full_name",
+    "employee_code",
+    "department",
+    "position",
+    "phone",
+    "hire_date",
+    "base_salary",
+]
+
+
+def _staging_table() -> Table:
+    """Session-local staging table; everything lands here before the merge"""
+    return Table(
+        "employee_import_staging",
+        MetaData(),
+        Column("line_no", Integer, primary_key=True),
+        Column("email", String, nullable=False),
+        Column("full_name", String),
+        Column("employee_code", String, nullable=False),
+        Column("department", String),
+        Column("position", String),
+        Column("phone", String),
+        Column("hire_date", DateTime),
+        Column("base_salary", Float, nullable=False),
+        Column("error", Text),
+        prefixes=["TEMPORARY"],
+    )
+
+
+class ImportFormatError(ValueError):
+    """Raised when the import file is not in a supported format"""
+
+
+class EmployeeImportService:
+    @staticmethod
+    def read_rows(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (line number, raw row) from a CSV or NDJSON text stream"""
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            if reader.fieldnames:
+                reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+            for row in reader:
+                yield reader.line_num, row
+        elif fmt == "ndjson":
+            for line_no, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                yield line_no, row if isinstance(row, dict) else {"__invalid__": line}
+        else:
+            raise ImportFormatError(f"Unsupported import format: {fmt}")
+
+    @staticmethod
+    def clean_row(raw: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """Per-row type checks done while streaming; tenant rules run in SQL"""
+        if "__invalid__" in raw:
+            return None, ["Line is not a JSON object"]
+
+        def text(key):
+            value = raw.get(key)
+            value = str(value).strip() if value is not None else ""
+            return value or None
+
+        errors = []
+        email = (text("email") or "").lower()
+        if "@" not in email:
+            errors.append("email: a valid email address is required")
+        employee_code = text("employee_code")
+        if not employee_code:
+            errors.append("employee_code: required")
+
+        base_salary = None
+        try:
+            base_salary = float(text("base_salary"))
+            if base_salary < 0:
+                errors.append("base_salary: must not be negative")
+        except (TypeError, ValueError):
+            errors.append("base_salary: a number is required")
+
+        hire_date = None
+        if text("hire_date"):
+            try:
+                hire_date = datetime.fromisoformat(text("hire_date"))
+            except ValueError:
+                errors.append("hire_date: expected an ISO date (YYYY-MM-DD)")
+
+        if errors:
+            return None, errors
+        return {
+            "email": email,
+            "full_name": text("full_name"),
+            "employee_code": employee_code,
+            "department": text("department"),
+            "position": text("position"),
+            "phone": text("phone"),
+            "hire_date": hire_date,
+            "base_salary": base_salary,
+        }, []
+
+    @staticmethod
+    def _stage_chunk(db: Session, staging: Table, rows: List[Dict[str, Any]]):
+        conn = db.connection()
+        if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(
+                    [
+                        row[c].isoformat() if isinstance(row[c], datetime) else row[c]
+                        for c in STAGING_COLUMNS
+                    ]
+                )
+            buffer.seek(0)
+            with conn.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {staging.name} ({', '.join(STAGING_COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+        else:
+            conn.execute(insert(staging), rows)
+
+    @staticmethod
+    def _validate(db: Session, staging: Table, company_id: int, tenant_id: str):
+        """Flag rows that break tenant rules, one UPDATE per rule"""
+        s = staging
+        users = User.__table__
+        employees = PayrollEmployee.__table__
+        profiles = EmployeeProfile.__table__
+        owners = users.alias("owners")
+
+        rules = [
+            (
+                "Duplicate email in file",
+                s.c.email.in_(
+                    select(s.c.email)
+                    .group_by(s.c.email)
+                    .having(func.count() > 1)
+                    .correlate(None)
+                ),
+            ),
+            (
+                "Duplicate employee_code in file",
+                s.c.employee_code.in_(
+                    select(s.c.employee_code)
+                    .group_by(s.c.employee_code)
+                    .having(func.count() > 1)
+                    .correlate(None)
+                ),
+            ),
+            (
+                "Email belongs to a user in another company",
+                exists().where(
+                    users.c.email == s.c.email,
+                    or_(users.c.company_id.is_(None), users.c.company_id != company_id),
+                ),
+            ),
+            (
+                "employee_code is used by another company",
+                exists().where(
+                    employees.c.employee_id == s.c.employee_code,
+                    employees.c.tenant_id != tenant_id,
+                ),
+            ),
+            (
+                "employee_code is assigned to a different user",
+                or_(
+                    exists()
+                    .where(
+                        employees.c.employee_id == s.c.employee_code,
+                        owners.c.email != s.c.email,
+                    )
+                    .select_from(employees.join(owners, owners.c.id == employees.c.user_id)),
+                    exists()
+                    .where(
+                        profiles.c.employee_id == s.c.employee_code,
+                        owners.c.email != s.c.email,
+                    )
+                    .select_from(profiles.join(owners, owners.c.id == profiles.c.user_id)),
+                ),
+            ),
+        ]
+        for message, condition in rules:
+            db.execute(
+                update(s).where(s.c.error.is_(None), condition).values(error=message)
+            )
+
+    @staticmethod
+    def _merge(
+        db: Session, staging: Table, company_id: int, tenant_id: str
+    ) -> Dict[str, int]:
+        """Merge valid staged rows, one INSERT ... SELECT per target table"""
+        s = staging
+        users = User.__table__
+        employees = PayrollEmployee.__table__
+        salaries = Salary.__table__
+        profiles = EmployeeProfile.__table__
+        valid = s.c.error.is_(None)
+        now = func.now()
+
+        # Imported users get an unusable password and onboard via password reset
+        placeholder_password = pwd_context.hash(secrets.token_urlsafe(32))
+        stmt = upsert_insert(db, users).from_select(
+            [
+                "email",
+                "hashed_password",
+                "full_name",
+                "role",
+                "company_id",
+                "is_active",
+                "is_locked",
+                "trust_score",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                s.c.email,
+                literal(placeholder_password),
+                s.c.full_name,
+                cast(literal(UserRole.EMPLOYEE, users.c.role.type), users.c.role.type),
+                literal(company_id),
+                true(),
+                false(),
+                literal(100),
+                now,
+                now,
+            ).where(valid),
+        )
+        # Updating a user revokes its tokens like an ORM change would, so
+        # cached principals can't outlive the import
+        merged_users = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[users.c.email],
+                set_={
+                    "full_name": func.coalesce(stmt.excluded.full_name, users.c.full_name),
+                    "token_version": users.c.token_version + 1,
+                    "updated_at": now,
+                },
+                where=users.c.company_id == company_id,
+            ).returning(users.c.email, users.c.token_version)
+        ).all()
+        mark_principals_changed(db, dict(merged_users))
+
+        staged_users = s.join(users, users.c.email == s.c.email)
+        stmt = upsert_insert(db, employees).from_select(
+            [
+                "tenant_id",
+                "user_id",
+                "employee_id",
+                "department",
+                "position",
+                "hire_date",
+                "base_salary",
+                "status",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                literal(tenant_id),
+                users.c.id,
+                s.c.employee_code,
+                s.c.department,
+                s.c.position,
+                s.c.hire_date,
+                s.c.base_salary,
+                literal("Active"),
+                now,
+                now,
+            )
+            .select_from(staged_users)
+            .where(valid),
+        )
+        merged_employees = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[employees.c.employee_id],
+                set_={
+                    "department": stmt.excluded.department,
+                    "position": stmt.excluded.position,
+                    "hire_date": func.coalesce(
+                        stmt.excluded.hire_date, employees.c.hire_date
+                    ),
+                    "base_salary": stmt.excluded.base_salary,
+                    "updated_at": now,
+                },
+                where=employees.c.tenant_id == tenant_id,
+            )
+        ).rowcount
+
+        # New salary row only when the open one differs (or there is none yet)
+        open_salary = salaries.alias("open_salary")
+        has_salary = exists().where(open_salary.c.employee_id == employees.c.id)
+        same_salary = exists().where(
+            open_salary.c.employee_id == employees.c.id,
+            open_salary.c.end_date.is_(None),
+            open_salary.c.amount == s.c.base_salary,
+        )
+        merged_salaries = db.execute(
+            insert(salaries).from_select(
+                [
+                    "tenant_id",
+                    "employee_id",
+                    "amount",
+                    "effective_date",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    literal(tenant_id),
+                    employees.c.id,
+                    s.c.base_salary,
+                    case((has_salary, now), else_=func.coalesce(s.c.hire_date, now)),
+                    now,
+                    now,
+                )
+                .select_from(
+                    s.join(employees, employees.c.employee_id == s.c.employee_code)
+                )
+                .where(valid, ~same_salary),
+            )
+        ).rowcount
+
+        stmt = upsert_insert(db, profiles).from_select(
+            [
+                "user_id",
+                "company_id",
+                "department",
+                "position",
+                "phone",
+                "hire_date",
+                "employee_id",
+                "is_active",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                users.c.id,
+                literal(company_id),
+                s.c.department,
+                s.c.position,
+                s.c.phone,
+                s.c.hire_date,
+                s.c.employee_code,
+                true(),
+                now,
+                now,
+            )
+            .select_from(staged_users)
+            .where(valid),
+        )
+        merged_profiles = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[profiles.c.user_id],
+                set_={
+                    "department": stmt.excluded.department,
+                    "position": stmt.excluded.position,
+                    "phone": func.coalesce(stmt.excluded.phone, profiles.c.phone),
+                    "hire_date": func.coalesce(
+                        stmt.excluded.hire_date, profiles.c.hire_date
+                    ),
+                    "employee_id": stmt.excluded.employee_id,
+                    "updated_at": now,
+                },
+                where=profiles.c.company_id == company_id,
+            )
+        ).rowcount
+
+        return {
+            "users": len(merged_users),
+            "employees": merged_employees,
+            "salaries": merged_salaries,
+            "employee_profiles": merged_profiles,
+        }
+
+    @staticmethod
+    def iter_import(
+        db: Session,
+        stream: TextIO,
+        fmt: str,
+        company_id: int,
+        dry_run: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run an import, yielding progress events and finally a summary with
+        stage "done". Valid rows are merged in a single transaction; rows
+        that fail checks are skipped and reported by line number.
+        """
+        started = time.monotonic()
+        tenant_id = str(company_id)
+        staging = _staging_table()
+        conn = db.connection()
+        staging.drop(conn, checkfirst=True)
+        staging.create(conn)
+
+        rows_read = 0
+        rejected: List[Dict[str, Any]] = []
+        rejected_count = 0
+        chunk: List[Dict[str, Any]] = []
+
+        try:
+            for line_no, raw in EmployeeImportService.read_rows(stream, fmt):
+                rows_read += 1
+                row, errors = EmployeeImportService.clean_row(raw)
+                if errors:
+                    rejected_count += 1
+                    if len(rejected) < MAX_REPORTED_ERRORS:
+                        rejected.append({"line": line_no, "errors": errors})
+                    continue
+                row["line_no"] = line_no
+                chunk.append(row)
+                if len(chunk) >= STAGE_CHUNK_ROWS:
+                    EmployeeImportService._stage_chunk(db, staging, chunk)
+                    chunk = []
+                    yield {"stage": "staging", "rows_read": rows_read}
+            if chunk:
+                EmployeeImportService._stage_chunk(db, staging, chunk)
+            yield {"stage": "staging", "rows_read": rows_read}
+
+            EmployeeImportService._validate(db, staging, company_id, tenant_id)
+            invalid = db.execute(
+                select(staging.c.line_no, staging.c.error)
+                .where(staging.c.error.is_not(None))
+                .order_by(staging.c.line_no)
+            ).all()
+            rejected_count += len(invalid)
+            for line_no, error in invalid[: MAX_REPORTED_ERRORS - len(rejected)]:
+                rejected.append({"line": line_no, "errors": [error]})
+            yield {"stage": "validated", "rows_rejected": rejected_count}
+
+            merged = {}
+            if not dry_run:
+                merged = EmployeeImportService._merge(
+                    db, staging, company_id, tenant_id
+                )
+                yield {"stage": "merged", "merged": merged}
+
+            staging.drop(db.connection())
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        summary = {
+            "stage": "done",
+            "dry_run": dry_run,
+            "rows_read": rows_read,
+            "rows_imported": 0 if dry_run else rows_read - rejected_count,
+            "rows_rejected": rejected_count,
+            "merged": merged,
+            "errors": sorted(rejected, key=lambda e: e["line"]),
+            "duration_seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info(
+            "Employee import finished",
+            company_id=company_id,
+            dry_run=dry_run,
+            rows_read=rows_read,
+            rows_rejected=rejected_count,
+            duration_seconds=summary["duration_seconds"],
+        )
+        yield summary
+
+    @staticmethod
+    def run_import(
+        db: Session,
+        stream: TextIO,
+        fmt: str,
+        company_id: int,
+        dry_run: bool = False,
+    ) -> Dict[str, Any]:
+        """Run an import to completion and return its summary"""
+        for event in EmployeeImportService.iter_import(
+            db, stream, fmt, company_id, dry_run
+        ):
+            pass
+        return event
@@ -1,9 +1,7 @@
 import os
 from typing import Any, Dict, Optional
 
-import firebase_admin
 import structlog
-from firebase_admin import credentials, messaging
 from sqlalchemy.orm import Session
 
 logger = structlog.get_logger(__name__)
@@ -11,12 +9,22 @@ logger = structlog.get_logger(__name__)
 
 class FCMService:
     def __init__(self):
+        # The SDK is imported and initialized on first send, not at import time
         self._initialized = False
-        self._initialize_firebase()
+        self._init_attempted = False
+
+    def _ensure_initialized(self) -> bool:
+        if not self._init_attempted:
+            self._init_attempted = True
+            self._initialize_firebase()
+        return self._initialized
 
     def _initialize_firebase(self):
         """Initialize Firebase Admin SDK"""
         try:
+            import firebase_admin
+            from firebase_admin import credentials
+
             # Check if already initialized
             if firebase_admin._apps:
                 self._initialized = True
@@ -92,14 +100,16 @@ class FCMService:
         """
         Send a push notification to a specific FCM token
         """
-        if not self._initialized:
-            logger.error("Firebase not initialized, cannot send push notification")
-            return False
-
         if not token:
             logger.warning("No FCM token provided for push notification")
             return False
 
+        if not self._ensure_initialized():
+            logger.error("Firebase not initialized, cannot send push notification")
+            return False
+
+        from firebase_admin import messaging
+
         try:
             message = messaging.Message(
                 notification=messaging.Notification(
@@ -127,14 +137,16 @@ class FCMService:
         """
         Send push notification to multiple tokens
         """
-        if not self._initialized:
-            logger.error("Firebase not initialized, cannot send multicast notification")
-            return {"success": 0, "failure": len(tokens)}
-
         if not tokens:
             logger.warning("No FCM tokens provided for multicast notification")
             return {"success": 0, "failure": 0}
 
+        if not self._ensure_initialized():
+            logger.error("Firebase not initialized, cannot send multicast notification")
+            return {"success": 0, "failure": len(tokens)}
+
+        from firebase_admin import messaging
+
         try:
             message = messaging.MulticastMessage(
                 notification=messaging.Notification(
@@ -0,0 +1,147 @@
+"""
+Background job handlers. Each takes the worker's session plus the job payload
+as keyword arguments; raising makes the queue retry the job.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.notification_digest import DigestType
+from app.services.approval_service import ApprovalService
+from app.services.archive_service import ARCHIVE_TABLES, ArchiveService
+from app.services.audit_chain_service import AuditChainService
+from app.services.audit_partition_service import AuditPartitionService
+from app.services.compliance_export_jobs import ComplianceExportJobService
+from app.services.digest_service import DigestService
+from app.services.email_service import email_service
+from app.services.fcm_service import fcm_service
+from app.services.job_queue import JobQueue, job_handler
+from app.services.threat_monitor_service import ThreatMonitorService
+
+
+def _build_digests(
+    db: Session,
+    digest_type: DigestType,
+    batch_size: Optional[int],
+    now: Optional[str],
+):
+    result = DigestService(db).build_digests(
+        digest_type, batch_size, now=datetime.fromisoformat(now) if now else None
+    )
+    return {"users": result.users, "notifications": result.notifications}
+
+
+# Batches commit as they go, and ``now`` (the scheduled fire time) pins the
+# window, so a retry only builds the missing ones
+@job_handler("digests.build_daily", max_attempts=3, lease_seconds=2 * 3600)
+def build_daily_digests(
+    db: Session, batch_size: Optional[int] = None, now: Optional[str] = None
+):
+    return _build_digests(db, DigestType.DAILY, batch_size, now)
+
+
+@job_handler("digests.build_weekly", max_attempts=3, lease_seconds=2 * 3600)
+def build_weekly_digests(
+    db: Session, batch_size: Optional[int] = None, now: Optional[str] = None
+):
+    return _build_digests(db, DigestType.WEEKLY, batch_size, now)
+
+
+@job_handler("digests.process_pending")
+def process_pending_digests(db: Session):
+    sent, failed = DigestService(db).process_pending_digests()
+    return {"sent": sent, "failed": failed}
+
+
+@job_handler("digests.cleanup_old")
+def cleanup_old_digests(db: Session, days_old: int = 30):
+    return {"deleted": DigestService(db).cleanup_old_digests(days_old)}
+
+
+@job_handler("approvals.cleanup_expired")
+def cleanup_expired_approvals(db: Session):
+    return {"expired": ApprovalService.cleanup_expired_approvals(db)}
+
+
+@job_handler("threats.monitor_and_alert")
+def monitor_and_alert(db: Session, webhook_configs: Optional[List[Dict]] = None):
+    alerts = ThreatMonitorService.monitor_and_alert(db, webhook_configs)
+    return {"alerts": len(alerts)}
+
+
+# Exports record their own failures on the ComplianceExportJob; a retry only
+# happens when the worker was lost mid-export
+@job_handler("compliance_export.generate", max_attempts=2, lease_seconds=6 * 3600)
+def generate_compliance_export(db: Session, job_id: int):
+    ComplianceExportJobService.run(job_id)
+
+
+@job_handler("email.notification")
+def send_notification_email(
+    db: Session, to_email: str, title: str, message: str, user_name: str = "User"
+):
+    if not email_service.send_notification_email(to_email, title, message, user_name):
+        raise RuntimeError("Notification email was not sent")
+
+
+# One job per fan-out; the bodies are rendered once and sent in SMTP batches.
+# Only a batch where nothing was sent is retried, so nobody gets it twice
+@job_handler("email.notifications")
+def send_notification_emails(
+    db: Session, recipients: List[List[str]], title: str, message: str
+):
+    sent = email_service.send_notification_emails(
+        [(to_email, user_name) for to_email, user_name in recipients], title, message
+    )
+    if recipients and not any(sent):
+        raise RuntimeError("Notification emails were not sent")
+    return {"sent": sum(sent), "failed": len(sent) - sum(sent)}
+
+
+@job_handler("email.welcome")
+def send_welcome_email(db: Session, to_email: str, user_name: str, company_name: str):
+    if not email_service.send_welcome_email(to_email, user_name, company_name):
+        raise RuntimeError("Welcome email was not sent")
+
+
+# Sends also fail for unregistered tokens, so don't retry for long
+@job_handler("push.send", max_attempts=3)
+def send_push_notification(
+    db: Session, token: str, title: str, body: str, data: Dict[str, str] = None
+):
+    if not fcm_service.send_push_notification(token, title, body, data):
+        raise RuntimeError("Push notification was not sent")
+
+
+@job_handler("jobs.purge_finished")
+def purge_finished_jobs(db: Session, days_old: Optional[int] = None):
+    return {"deleted": JobQueue.purge_finished(db, days_old)}
+
+
+@job_handler("audit_partitions.maintain")
+def maintain_audit_partitions(db: Session):
+    if db.get_bind().dialect.name != "postgresql":
+        return {"created": [], "detached": []}
+    plan = AuditPartitionService.maintain(db)
+    return {"created": [str(month) for month in plan.create], "detached": plan.detach}
+
+
+# Full runs hash the chain on a process pool, so they run here and not in
+# a request
+@job_handler("audit_chain.verify_full", max_attempts=2, lease_seconds=6 * 3600)
+def verify_audit_chain_full(db: Session, chain_id: str):
+    result = AuditChainService.run_verification(db, chain_id, full=True)
+    return {
+        "is_valid": result.is_valid,
+        "issues": len(result.issues),
+        "entries_verified": result.entries_verified,
+        "checkpoints_created": len(result.checkpoints),
+    }
+
+
+@job_handler("archive.cold_data", max_attempts=2, lease_seconds=6 * 3600)
+def archive_cold_data(db: Session):
+    return {
+        table: ArchiveService.archive_table(db, table).rows for table in ARCHIVE_TABLES
+    }
@@ -0,0 +1,491 @@
+"""
+Durable background jobs. Jobs are rows in background_jobs, so queueing needs
+nothing beyond the application database: handlers register under a job type
+with ``job_handler``, callers ``JobQueue.enqueue`` work, and ``JobWorker``
+threads (in the API process or scripts/run_job_worker.py) claim due jobs with
+FOR UPDATE SKIP LOCKED, run them and retry failures with backoff.
+
+Delivery is at-least-once: a job whose worker dies is requeued when its lease
+expires, so handlers must tolerate running again. A running job's worker
+renews the lease in the background, so handlers may take longer than one
+lease; only the lease holder can record the outcome.
+"""
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+from sqlalchemy.orm import Session
+
+from app.base_crud import upsert_insert
+from app.config import settings
+from app.db import SessionLocal
+from app.metrics import (record_job_enqueued, record_job_finished,
+                         record_job_started, record_jobs_requeued)
+from app.models.background_job import BackgroundJob, JobStatus
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class JobHandler:
+    job_type: str
+    func: Callable[..., Any]
+    max_attempts: Optional[int] = None  # Defaults to JOB_MAX_ATTEMPTS
+    lease_seconds: Optional[int] = None  # Defaults to JOB_LEASE_SECONDS
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(
+    job_type: str,
+    max_attempts: Optional[int] = None,
+    lease_seconds: Optional[int] = None,
+):
+    """
+    Register ``func(db, **payload)`` as the handler for ``job_type``. Its
+    return value (if JSON-serializable) is stored as the job's result; raising
+    fails the attempt.
+    """
+
+    def register(func):
+        JOB_HANDLERS[job_type] = JobHandler(job_type, func, max_attempts, lease_seconds)
+        return func
+
+    return register
+
+
+def load_handlers():
+    """Import the modules that register the application's handlers"""
+    import app.services.job_handlers  # noqa: F401
+
+
+class LeaseLostError(RuntimeError):
+    """The job's lease expired (or was taken over) before it finished"""
+
+
+def lease_seconds(job_type: str) -> int:
+    handler = JOB_HANDLERS.get(job_type)
+    return (handler and handler.lease_seconds) or settings.JOB_LEASE_SECONDS
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff after ``attempts`` failures, with jitter"""
+    delay = min(
+        settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOB_RETRY_MAX_SECONDS,
+    )
+    # Spread retries of jobs that failed together (e.g. during an outage)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobQueue:
+    @staticmethod
+    def enqueue(
+        db: Session,
+        job_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        delay_seconds: float = 0,
+        max_attempts: Optional[int] = None,
+    ) -> BackgroundJob:
+        """
+        Queue a job in the caller's transaction: it is flushed, and queued
+        once the caller commits. With an idempotency key that has been used
+        before, nothing is queued and the existing job is returned.
+        """
+        load_handlers()
+        handler = JOB_HANDLERS.get(job_type)
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job_type}")
+        values = {
+            "job_type": job_type,
+            "payload": payload or {},
+            "idempotency_key": idempotency_key,
+            "status": JobStatus.QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts
+            or handler.max_attempts
+            or settings.JOB_MAX_ATTEMPTS,
+            "run_at": datetime.utcnow() + timedelta(seconds=delay_seconds),
+        }
+
+        if idempotency_key is None:
+            job = BackgroundJob(**values)
+            db.add(job)
+            db.flush()
+            record_job_enqueued(job_type)
+            return job
+
+        inserted = db.execute(
+            upsert_insert(db, BackgroundJob.__table__)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        ).rowcount
+        if inserted:
+            record_job_enqueued(job_type)
+        return (
+            db.query(BackgroundJob)
+            .filter(BackgroundJob.idempotency_key == idempotency_key)
+            .one()
+        )
+
+    @staticmethod
+    def claim(
+        db: Session, worker_id: str, job_types: Optional[List[str]] = None
+    ) -> Optional[BackgroundJob]:
+        """
+        Lease the oldest due job to ``worker_id``, or return None. Concurrent
+        workers skip each other's locked rows instead of queueing behind them.
+        """
+        now = datetime.utcnow()
+        query = db.query(BackgroundJob.id, BackgroundJob.job_type).filter(
+            BackgroundJob.status == JobStatus.QUEUED,
+            BackgroundJob.run_at <= now,
+        )
+        if job_types:
+            query = query.filter(BackgroundJob.job_type.in_(job_types))
+        candidate = (
+            query.order_by(BackgroundJob.run_at, BackgroundJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if candidate is None:
+            db.rollback()
+            return None
+
+        lease = lease_seconds(candidate.job_type)
+        # The status check keeps the claim safe where SKIP LOCKED isn't
+        # available (SQLite): only one worker's UPDATE matches
+        claimed = (
+            db.query(BackgroundJob)
+            .filter(
+                BackgroundJob.id == candidate.id,
+                BackgroundJob.status == JobStatus.QUEUED,
+            )
+            .update(
+                {
+                    "status": JobStatus.RUNNING,
+                    "attempts": BackgroundJob.attempts + 1,
+                    "locked_by": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease),
+                    "started_at": now,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return db.get(BackgroundJob, candidate.id) if claimed else None
+
+    @staticmethod
+    def _update_leased(db: Session, job: BackgroundJob, worker_id: str, values):
+        """
+        Apply ``values`` to ``job`` only while ``worker_id`` still holds its
+        lease; once it has expired the job may be running elsewhere
+        """
+        updated = (
+            db.query(BackgroundJob)
+            .filter(
+                BackgroundJob.id == job.id,
+                BackgroundJob.locked_by == worker_id,
+                BackgroundJob.status == JobStatus.RUNNING,
+            )
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+        if not updated:
+            raise LeaseLostError(f"Job {job.id} is no longer leased to {worker_id}")
+        db.refresh(job)
+
+    @staticmethod
+    def renew_lease(db: Session, job: BackgroundJob, worker_id: str) -> bool:
+        """Extend a running job's lease; False if ``worker_id`` has lost it"""
+        try:
+            JobQueue._update_leased(
+                db,
+                job,
+                worker_id,
+                {
+                    "lease_expires_at": datetime.utcnow()
+                    + timedelta(seconds=lease_seconds(job.job_type))
+                },
+            )
+        except LeaseLostError:
+            return False
+        return True
+
+    @staticmethod
+    def complete(db: Session, job: BackgroundJob, worker_id: str, result: Any = None):
+        """Record success; raises LeaseLostError if the lease has been lost"""
+        JobQueue._update_leased(
+            db,
+            job,
+            worker_id,
+            {
+                "status": JobStatus.SUCCEEDED,
+                "result": result,
+                "last_error": None,
+                "locked_by": None,
+                "lease_expires_at": None,
+                "finished_at": datetime.utcnow(),
+            },
+        )
+
+    @staticmethod
+    def fail(
+        db: Session, job: BackgroundJob, worker_id: str, error: str, retry: bool = True
+    ) -> bool:
+        """
+        Record a failed attempt; True if the job will be retried. Raises
+        LeaseLostError if the lease has been lost.
+        """
+        values = {"last_error": error, "locked_by": None, "lease_expires_at": None}
+        if retry and job.attempts < job.max_attempts:
+            values["status"] = JobStatus.QUEUED
+            values["run_at"] = datetime.utcnow() + timedelta(
+                seconds=retry_delay(job.attempts)
+            )
+        else:
+            values["status"] = JobStatus.FAILED
+            values["finished_at"] = datetime.utcnow()
+        JobQueue._update_leased(db, job, worker_id, values)
+        return values["status"] == JobStatus.QUEUED
+
+    @staticmethod
+    def requeue_expired(db: Session) -> int:
+        """Requeue RUNNING jobs whose lease ran out (their worker is gone)"""
+        now = datetime.utcnow()
+        expired = (
+            db.query(BackgroundJob)
+            .filter(
+                BackgroundJob.status == JobStatus.RUNNING,
+                BackgroundJob.lease_expires_at < now,
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for job in expired:
+            logger.warning(
+                "Background job lease expired",
+                job_id=job.id,
+                job_type=job.job_type,
+                worker=job.locked_by,
+            )
+            job.status = JobStatus.QUEUED
+            job.run_at = now
+            job.locked_by = None
+            job.lease_expires_at = None
+            job.last_error = "Lease expired before the job finished"
+            if job.attempts >= job.max_attempts:
+                job.status = JobStatus.FAILED
+                job.finished_at = now
+        db.commit()
+        if expired:
+            record_jobs_requeued(len(expired))
+        return len(expired)
+
+    @staticmethod
+    def purge_finished(db: Session, days_old: Optional[int] = None) -> int:
+        """Delete succeeded and failed jobs that finished ``days_old`` ago"""
+        days_old = settings.JOB_RETENTION_DAYS if days_old is None else days_old
+        cutoff = datetime.utcnow() - timedelta(days=days_old)
+        deleted = (
+            db.query(BackgroundJob)
+            .filter(
+                BackgroundJob.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]),
+                BackgroundJob.finished_at < cutoff,
+            )
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+
+class JobWorker:
+    """
+    Polls the queue from ``concurrency`` threads. Each job runs in its own
+    session; job state is saved through another, so a handler that rolls
+    back doesn't lose the attempt. While a handler runs, a heartbeat thread
+    renews the job's lease every third of its length.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: Optional[int] = None,
+        job_types: Optional[List[str]] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.job_types = job_types
+        self.poll_interval = (
+            settings.JOB_POLL_INTERVAL_SECONDS
+            if poll_interval is None
+            else poll_interval
+        )
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        load_handlers()
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"job-worker-{n}", daemon=True)
+                for n in range(self.concurrency)
+            ]
+            for thread in self._threads:
+                thread.start()
+        logger.info(
+            "Job worker started", worker=self.name, concurrency=self.concurrency
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Stop claiming jobs and wait for the running ones to finish"""
+        self._stopping.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            if deadline is None:
+                thread.join()
+            else:
+                thread.join(max(deadline - time.monotonic(), 0))
+        running = [thread for thread in self._threads if thread.is_alive()]
+        if running:
+            # Their jobs are requeued once the lease expires
+            logger.error("Job worker stopped with jobs running", running=len(running))
+            return False
+        self._threads = []
+        return True
+
+    def run_once(self) -> bool:
+        """Claim and run one due job; False if there was none"""
+        worker_id = f"{self.name}:{threading.current_thread().name}"
+        db = self.session_factory()
+        try:
+            job = JobQueue.claim(db, worker_id, self.job_types)
+            if job is None:
+                return False
+            self._execute(db, job, worker_id)
+            return True
+        finally:
+            db.close()
+
+    def run_until_empty(self) -> int:
+        """Run due jobs one after another until none are left (tests, scripts)"""
+        count = 0
+        while self.run_once():
+            count += 1
+        return count
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                if self.run_once():
+                    continue
+                self._requeue_expired()
+            except Exception:
+                logger.exception("Job worker loop failed")
+            self._stopping.wait(self.poll_interval)
+
+    def _requeue_expired(self):
+        db = self.session_factory()
+        try:
+            JobQueue.requeue_expired(db)
+        finally:
+            db.close()
+
+    def _heartbeat(self, job: BackgroundJob, worker_id: str, done: threading.Event):
+        db = self.session_factory()
+        try:
+            job = db.get(BackgroundJob, job.id)
+            while not done.wait(lease_seconds(job.job_type) / 3):
+                if not JobQueue.renew_lease(db, job, worker_id):
+                    logger.warning(
+                        "Background job lease lost while running",
+                        job_id=job.id,
+                        job_type=job.job_type,
+                        worker=worker_id,
+                    )
+                    return
+        except Exception:
+            logger.exception("Background job heartbeat failed", job_id=job.id)
+        finally:
+            db.close()
+
+    def _execute(self, state_db: Session, job: BackgroundJob, worker_id: str):
+        record_job_started(job.job_type, (job.started_at - job.run_at).total_seconds())
+        log = logger.bind(job_id=job.id, job_type=job.job_type, attempt=job.attempts)
+        handler = JOB_HANDLERS.get(job.job_type)
+        if handler is None:
+            try:
+                JobQueue.fail(
+                    state_db, job, worker_id, "No handler registered", retry=False
+                )
+            except LeaseLostError:
+                pass
+            record_job_finished(job.job_type, "failed", 0.0)
+            log.error("No handler for background job")
+            return
+
+        started = time.monotonic()
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(job, worker_id, done),
+            name=f"job-heartbeat-{job.id}",
+            daemon=True,
+        )
+        heartbeat.start()
+        db = self.session_factory()
+        error = None
+        try:
+            result = handler.func(db, **job.payload)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error = e
+        finally:
+            db.close()
+            done.set()
+            heartbeat.join()
+
+        elapsed = time.monotonic() - started
+        try:
+            if error is None:
+                JobQueue.complete(state_db, job, worker_id, result)
+            else:
+                retried = JobQueue.fail(
+                    state_db, job, worker_id, f"{type(error).__name__}: {error}"
+                )
+        except LeaseLostError:
+            # Requeued after the lease ran out; the attempt that holds it now
+            # records the outcome
+            record_job_finished(job.job_type, "lost", elapsed)
+            log.warning("Background job lease lost before it finished")
+            return
+
+        if error is None:
+            record_job_finished(job.job_type, "succeeded", elapsed)
+            log.info("Background job succeeded", seconds=round(elapsed, 3))
+            return
+        record_job_finished(job.job_type, "retried" if retried else "failed", elapsed)
+        log.warning(
+            "Background job failed",
+            error=str(error),
+            retry_at=job.run_at.isoformat() if retried else None,
+            exc_info=error if not retried else False,
+        )
+
+
+job_worker = JobWorker()
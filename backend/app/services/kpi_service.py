@@ -0,0 +1,266 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import structlog
+from sqlalchemy import and_, case, event, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import ReplicaSessionLocal, SessionLocal, settings
+from app.metrics import record_kpi_invalidation, record_kpi_snapshot
+from app.models.leave import Leave
+from app.models.shift import Shift
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+logger = structlog.get_logger(__name__)
+
+# Age buckets for completed tasks, newest first; anything older is "Older"
+COMPLETED_AGE_BUCKETS = (
+    ("Last 7 days", timedelta(days=7)),
+    ("Last 30 days", timedelta(days=30)),
+    ("Last 90 days", timedelta(days=90)),
+)
+
+_WATCHED_MODELS = (Task, Leave, Shift)
+_ALL_COMPANIES = object()
+_DIRTY_KEY = "kpi_dirty_companies"
+
+
+def _status(value) -> str:
+    return (getattr(value, "value", value) or "").strip()
+
+
+def _nested_counts(rows) -> Dict[Any, Dict[str, int]]:
+    counts: Dict[Any, Dict[str, int]] = defaultdict(dict)
+    for key, status, total in rows:
+        counts[key][_status(status)] = counts[key].get(_status(status), 0) + total
+    return dict(counts)
+
+
+class KPIService:
+    """
+    Dashboard KPIs computed with grouped SQL aggregates and cached as one
+    snapshot per company. Snapshots are dropped when a task, leave or shift
+    write for that company commits, and expire after KPI_SNAPSHOT_TTL_SECONDS
+    so writes seen only by other workers are picked up too.
+
+    Callers usually pass a replica session, which may not have the write
+    yet; the first snapshot after an invalidation is computed on a session
+    from primary_factory instead (when one is given, i.e. a replica is
+    configured), so a lagging read never refills the cache.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        primary_factory: Optional[Callable[[], Session]] = None,
+    ):
+        self.ttl_seconds = (
+            settings.KPI_SNAPSHOT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.primary_factory = primary_factory
+        self._snapshots: Dict[int, Dict[str, Any]] = {}
+        self._generations: Dict[int, int] = defaultdict(int)
+        # Companies written since their last primary fill; invalidate_all
+        # covers every company by bumping the epoch
+        self._written: Set[int] = set()
+        self._written_epoch = 0
+        self._primary_epochs: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get_snapshot(self, db: Session, company_id: int) -> Dict[str, Any]:
+        today = date.today()
+        with self._lock:
+            snapshot = self._snapshots.get(company_id)
+            generation = self._generations[company_id]
+            epoch = self._written_epoch
+            written = (
+                company_id in self._written
+                or self._primary_epochs.get(company_id, 0) < epoch
+            )
+        if (
+            snapshot is not None
+            and snapshot["as_of"] == today
+            and time.monotonic() - snapshot["computed_at"] < self.ttl_seconds
+        ):
+            record_kpi_snapshot("hit")
+            return snapshot
+
+        record_kpi_snapshot("miss")
+        if written and self.primary_factory is not None:
+            primary = self.primary_factory()
+            try:
+                snapshot = self.compute_snapshot(primary, company_id, today)
+            finally:
+                primary.close()
+        else:
+            snapshot = self.compute_snapshot(db, company_id, today)
+        with self._lock:
+            # A write committed while computing; serve this one but don't keep it
+            if self._generations[company_id] == generation:
+                self._snapshots[company_id] = snapshot
+                self._written.discard(company_id)
+                self._primary_epochs[company_id] = epoch
+        return snapshot
+
+    def invalidate(self, company_ids: Iterable[int] = ()):
+        with self._lock:
+            for company_id in company_ids:
+                self._generations[company_id] += 1
+                self._written.add(company_id)
+                if self._snapshots.pop(company_id, None) is not None:
+                    record_kpi_invalidation()
+
+    def invalidate_all(self):
+        with self._lock:
+            for company_id in set(self._generations) | set(self._snapshots):
+                self._generations[company_id] += 1
+            self._written_epoch += 1
+            dropped = len(self._snapshots)
+            self._snapshots.clear()
+        for _ in range(dropped):
+            record_kpi_invalidation()
+
+    @staticmethod
+    def compute_snapshot(
+        db: Session, company_id: int, today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Every dashboard count for a company, one grouped query per source"""
+        today = today or date.today()
+        now = datetime.now()
+        tenant_id = str(company_id)
+
+        tasks_by_assignee = _nested_counts(
+            db.query(Task.assignee_id, Task.status, func.count(Task.id))
+            .filter(Task.company_id == company_id)
+            .group_by(Task.assignee_id, Task.status)
+        )
+        tasks_by_creator = _nested_counts(
+            db.query(Task.assigned_by, Task.status, func.count(Task.id))
+            .filter(Task.company_id == company_id, Task.assigned_by.is_not(None))
+            .group_by(Task.assigned_by, Task.status)
+        )
+        tasks: Dict[str, int] = defaultdict(int)
+        for counts in tasks_by_assignee.values():
+            for status, total in counts.items():
+                tasks[status] += total
+
+        age_bucket = case(
+            *(
+                (Task.updated_at >= now - window, label)
+                for label, window in COMPLETED_AGE_BUCKETS
+            ),
+            else_="Older",
+        )
+        completed_by_age = _nested_counts(
+            db.query(Task.assignee_id, age_bucket, func.count(Task.id))
+            .filter(
+                Task.company_id == company_id,
+                Task.status == TaskStatus.COMPLETED,
+                Task.updated_at.is_not(None),
+            )
+            .group_by(Task.assignee_id, age_bucket)
+        )
+
+        leaves_by_employee = _nested_counts(
+            db.query(Leave.employee_id, Leave.status, func.count(Leave.id))
+            .filter(Leave.tenant_id == tenant_id)
+            .group_by(Leave.employee_id, Leave.status)
+        )
+        leaves: Dict[str, int] = defaultdict(int)
+        for counts in leaves_by_employee.values():
+            for status, total in counts.items():
+                leaves[status] += total
+
+        day_start = datetime.combine(today, dt_time.min)
+        day_end = day_start + timedelta(days=1)
+        shifts_today = (
+            db.query(func.count(Shift.id))
+            .filter(
+                Shift.company_id == company_id,
+                or_(
+                    and_(Shift.start_at >= day_start, Shift.start_at < day_end),
+                    and_(Shift.end_at >= day_start, Shift.end_at < day_end),
+                ),
+            )
+            .scalar()
+        )
+        total_employees = (
+            db.query(func.count(User.id)).filter(User.company_id == company_id).scalar()
+        )
+
+        return {
+            "company_id": company_id,
+            "as_of": today,
+            "computed_at": time.monotonic(),
+            "total_employees": total_employees or 0,
+            "shifts_today": shifts_today or 0,
+            "tasks": dict(tasks),
+            "tasks_by_assignee": tasks_by_assignee,
+            "tasks_by_creator": tasks_by_creator,
+            "completed_by_age": completed_by_age,
+            "leaves": dict(leaves),
+            "leaves_by_employee": leaves_by_employee,
+        }
+
+
+# Without a replica, callers' sessions are already on the primary
+kpi_service = KPIService(
+    primary_factory=SessionLocal if ReplicaSessionLocal is not None else None
+)
+
+
+# Invalidation: collect the companies touched by task/leave/shift writes in a
+# session and drop their snapshots once the transaction commits.
+
+
+def _mark_dirty(session: Session, company_id):
+    session.info.setdefault(_DIRTY_KEY, set()).add(company_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_companies(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _WATCHED_MODELS):
+            _mark_dirty(session, obj.company_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_companies(orm_execute_state):
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in _WATCHED_MODELS:
+        return
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params or {}]
+    company_ids = {row.get("company_id") for row in rows}
+    if None in company_ids:
+        # e.g. UPDATE by primary key or WHERE clause: the tenant is unknown
+        _mark_dirty(orm_execute_state.session, _ALL_COMPANIES)
+    else:
+        for company_id in company_ids:
+            _mark_dirty(orm_execute_state.session, company_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if not dirty:
+        return
+    if _ALL_COMPANIES in dirty:
+        kpi_service.invalidate_all()
+    else:
+        kpi_service.invalidate(dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.crud_meetings import (add_participant_to_meeting, create_meeting,
@@ -142,8 +143,10 @@ class MeetingService:
         # For now, return all online users in company (simplified)
         return online_users
 
-    async def leave_meeting(self, db: Session, meeting_id: int, user_id: int):
-        """User leaves the meeting"""
+    def mark_participant_left(
+        self, db: Session, meeting_id: int, user_id: int
+    ) -> Tuple[bool, Optional[int]]:
+        """Record the participant's leave time; returns (left, meeting company_id)"""
         participant = (
             db.query(MeetingParticipant)
             .filter(
@@ -152,24 +155,35 @@ class MeetingService:
             )
             .first()
         )
-        if participant and not participant.leave_time:
-            participant.leave_time = datetime.utcnow()
-            db.commit()
+        if not participant or participant.leave_time:
+            return False, None
+
+        participant.leave_time = datetime.utcnow()
+        db.commit()
+
+        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        return True, meeting.company_id if meeting else None
 
+    async def leave_meeting(self, db: AsyncSession, meeting_id: int, user_id: int):
+        """User leaves the meeting"""
+        left, company_id = await db.run_sync(
+            self.mark_participant_left, meeting_id, user_id
+        )
+        if not left:
+            return False
+
+        if company_id is not None:
             # Mark user offline in Redis
-            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-            if meeting:
-                await redis_service.set_user_offline(meeting.company_id, user_id)
-
-                # Publish leave event
-                await redis_service.publish_event(
-                    f"meeting:{meeting_id}",
-                    {"type": "user_left", "user_id": user_id, "meeting_id": meeting_id},
-                )
-
-            logger.info("User left meeting", meeting_id=meeting_id, user_id=user_id)
-            return True
-        return False
+            await redis_service.set_user_offline(company_id, user_id)
+
+            # Publish leave event
+            await redis_service.publish_event(
+                f"meeting:{meeting_id}",
+                {"type": "user_left", "user_id": user_id, "meeting_id": meeting_id},
+            )
+
+        logger.info("User left meeting", meeting_id=meeting_id, user_id=user_id)
+        return True
 
     def _send_meeting_invite(self, db: Session, meeting: Meeting, user_id: int):
         """Send meeting invite notification"""
@@ -0,0 +1,334 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import DateTime, Enum, event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.metrics import record_principal_invalidation, record_principal_lookup
+from app.models.user import User
+
+logger = structlog.get_logger(__name__)
+
+# (sub, company_id, token version)
+PrincipalKey = Tuple[str, Optional[int], int]
+
+# Never cached; loaded from the database if a request touches it
+UNCACHED_COLUMNS = {"hashed_password"}
+# Changes to these revoke the user's tokens and evict cached principals
+REVOKING_ATTRIBUTES = ("role", "company_id", "is_active", "is_locked")
+
+REDIS_KEY_PREFIX = "auth:principal:"
+REDIS_RETRY_SECONDS = 30
+REDIS_TIMEOUT_SECONDS = 0.05
+
+_DIRTY_KEY = "principal_dirty_subs"
+
+# Writes a principal unless the subject's tokens were revoked past its version
+REDIS_PUT_SCRIPT = """
+local floor = tonumber(redis.call('HGET', KEYS[1], 'floor') or '-1')
+if tonumber(ARGV[1]) < floor then return 0 end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+# Drops a subject's principals, keeping the highest version floor seen
+REDIS_INVALIDATE_SCRIPT = """
+local floor = tonumber(redis.call('HGET', KEYS[1], 'floor') or '-1')
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'floor', math.max(floor, tonumber(ARGV[1])))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def principal_data(user: User) -> Dict[str, Any]:
+    """JSON-safe column values of a loaded user"""
+    data = {}
+    for column in User.__table__.columns:
+        if column.key in UNCACHED_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif hasattr(value, "value"):
+            value = value.value
+        data[column.key] = value
+    return data
+
+
+def principal_from_data(db: Session, data: Dict[str, Any]) -> User:
+    """
+    Rebuild a cached principal as a persistent User in ``db`` without a
+    query; relationships and uncached columns still load lazily on access
+    """
+    values = {}
+    for column in User.__table__.columns:
+        if column.key not in data:
+            continue
+        value = data[column.key]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column.type, Enum) and column.type.enum_class:
+            value = column.type.enum_class(value)
+        values[column.key] = value
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of authenticated users: a bounded in-process LRU with a
+    short TTL in front of Redis. Redis is optional; when it is unreachable
+    the tier is skipped for REDIS_RETRY_SECONDS.
+
+    Invalidating a subject records the token version its principals must
+    now have (its floor). A principal read from the database before the
+    invalidation, and stored after it, is older than the floor and is
+    refused, so a slow request cannot put a revoked principal back.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        redis_ttl_seconds: Optional[int] = None,
+        redis_url: Optional[str] = None,
+    ):
+        self.max_entries = max_entries or settings.PRINCIPAL_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.PRINCIPAL_CACHE_TTL_SECONDS
+        self.redis_ttl_seconds = (
+            redis_ttl_seconds or settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS
+        )
+        self._redis_url = redis_url
+        self._redis_client = None
+        self._redis_retry_at = 0.0
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._keys_by_sub: Dict[str, Set[PrincipalKey]] = {}
+        self._floors: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._lookups = {"lru": [0, 0], "redis": [0, 0]}  # [hits, total]
+
+    # Redis tier
+
+    def _redis(self):
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis_client is None:
+            import redis
+
+            from app.services.redis_service import redis_service
+
+            self._redis_client = redis.Redis.from_url(
+                self._redis_url or redis_service._build_redis_url(),
+                socket_timeout=REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            )
+        return self._redis_client
+
+    def _redis_failed(self, error: Exception):
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning(
+            "Principal cache Redis tier unavailable",
+            error=str(error),
+            retry_in_seconds=REDIS_RETRY_SECONDS,
+        )
+
+    @staticmethod
+    def _redis_field(key: PrincipalKey) -> str:
+        _, company_id, token_version = key
+        return f"{company_id}:{token_version}"
+
+    def _redis_get(self, key: PrincipalKey) -> Optional[Dict[str, Any]]:
+        client = self._redis()
+        if client is None:
+            return None
+        import redis
+
+        try:
+            raw = client.hget(REDIS_KEY_PREFIX + key[0], self._redis_field(key))
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return None
+        return json.loads(raw) if raw else None
+
+    def _redis_put(self, key: PrincipalKey, data: Dict[str, Any]):
+        client = self._redis()
+        if client is None:
+            return
+        import redis
+
+        try:
+            client.eval(
+                REDIS_PUT_SCRIPT,
+                1,
+                REDIS_KEY_PREFIX + key[0],
+                key[2],
+                self._redis_field(key),
+                json.dumps(data),
+                self.redis_ttl_seconds,
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    def _redis_invalidate(self, sub: str, floor: int):
+        client = self._redis()
+        if client is None:
+            return
+        import redis
+
+        try:
+            client.eval(
+                REDIS_INVALIDATE_SCRIPT,
+                1,
+                REDIS_KEY_PREFIX + sub,
+                floor,
+                self.redis_ttl_seconds,
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    # LRU tier
+
+    def _record(self, tier: str, hit: bool):
+        with self._lock:
+            counts = self._lookups[tier]
+            counts[0] += hit
+            counts[1] += 1
+            ratio = counts[0] / counts[1]
+        record_principal_lookup(tier, hit, ratio)
+
+    def _lru_put(self, key: PrincipalKey, data: Dict[str, Any]):
+        with self._lock:
+            if key[2] < self._floors.get(key[0], -1):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, data)
+            self._entries.move_to_end(key)
+            self._keys_by_sub.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget(evicted)
+
+    def _forget(self, key: PrincipalKey):
+        keys = self._keys_by_sub.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_sub[key[0]]
+
+    def get(self, key: PrincipalKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                data = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                    self._forget(key)
+                data = None
+        self._record("lru", data is not None)
+        if data is not None:
+            return data
+
+        data = self._redis_get(key)
+        self._record("redis", data is not None)
+        if data is not None:
+            self._lru_put(key, data)
+        return data
+
+    def put(self, key: PrincipalKey, data: Dict[str, Any]):
+        self._lru_put(key, data)
+        self._redis_put(key, data)
+
+    def invalidate(self, sub: str, floor: int = 0):
+        """
+        Drop every cached principal for this subject, in both tiers, and
+        refuse to store any with a token version below ``floor`` from now on
+        """
+        with self._lock:
+            for key in self._keys_by_sub.pop(sub, set()):
+                self._entries.pop(key, None)
+            self._floors[sub] = max(floor, self._floors.pop(sub, -1))
+            # Floors outlive the entries they guard by at most one TTL, so
+            # the oldest can be dropped once there are more than entries
+            while len(self._floors) > self.max_entries:
+                self._floors.popitem(last=False)
+        self._redis_invalidate(sub, floor)
+        record_principal_invalidation()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_sub.clear()
+            self._floors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                **{
+                    f"{tier}_hit_ratio": (hits / total if total else 0.0)
+                    for tier, (hits, total) in self._lookups.items()
+                },
+            }
+
+
+principal_cache = PrincipalCache()
+
+
+# Revocation: bump token_version when a user's role, company, active or
+# locked state changes, and evict the principals of every changed user on
+# commit. Bulk statements that write users bypass the ORM and must call
+# mark_principals_changed themselves.
+
+
+def mark_principals_changed(session: Session, versions: Dict[str, int]):
+    """
+    Evict these subjects' principals when ``session`` commits; ``versions``
+    maps each subject to its token version after the change
+    """
+    dirty = session.info.setdefault(_DIRTY_KEY, {})
+    for sub, version in versions.items():
+        dirty[sub] = max(version or 0, dirty.get(sub, 0))
+
+
+@event.listens_for(Session, "before_flush")
+def _revoke_changed_principals(session, flush_context, instances):
+    for obj in session.dirty:
+        if not isinstance(obj, User) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if (
+            any(state.attrs[attr].history.has_changes() for attr in REVOKING_ATTRIBUTES)
+            and not state.attrs.token_version.history.has_changes()
+        ):
+            obj.token_version = (obj.token_version or 0) + 1
+        changed = {obj.email: obj.token_version}
+        changed.update(
+            (e, obj.token_version) for e in state.attrs.email.history.deleted or () if e
+        )
+        mark_principals_changed(session, changed)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            # No token of a deleted user may be cached again
+            mark_principals_changed(session, {obj.email: (obj.token_version or 0) + 1})
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session):
+    for sub, floor in session.info.pop(_DIRTY_KEY, {}).items():
+        principal_cache.invalidate(sub, floor)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_DIRTY_KEY, None)
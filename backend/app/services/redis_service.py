@@ -400,13 +400,32 @@ class RedisService:
         result = await self.redis.get(key)
         return int(result) if result else None
 
-    async def cleanup_stale_keys(self):
-        """Cleanup stale Redis keys (run periodically)"""
+    # Ephemeral key patterns and the TTL to give any key found without one
+    EPHEMERAL_KEYS = {
+        "user:online:*": 30,
+        "channel:typing:*": 5,
+        "channel:read:*": 86400,
+        "notifications:*": 300,
+    }
+
+    async def cleanup_stale_keys(self) -> int:
+        """
+        Put a TTL back on ephemeral keys that lost theirs (e.g. written by an
+        older release or a PERSIST), so they can't pile up; returns how many
+        were fixed. Scheduled every 15 minutes, see scheduled_tasks.
+        """
         if not self._initialized:
-            return
-        # This would be called by a background task
-        # For now, rely on TTL expiration
-        pass
+            return 0
+        fixed = 0
+        for pattern, ttl in self.EPHEMERAL_KEYS.items():
+            async for key in self.redis.iscan(match=pattern, count=500):
+                # -1: no expiry (-2 means the key is already gone)
+                if await self.redis.ttl(key) == -1:
+                    await self.redis.expire(key, ttl)
+                    fixed += 1
+        if fixed:
+            logger.info("Expiry restored on stale Redis keys", keys=fixed)
+        return fixed
 
     async def get(self, key: str) -> Optional[str]:
         """Get value from Redis by key"""
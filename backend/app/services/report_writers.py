@@ -0,0 +1,172 @@
+"""
+Incremental writers for compliance reports. Each gets the report header
+(metadata, policies, summary, trust history) once, then the detailed logs one
+row at a time, and writes straight to a binary file, so a report of any size
+is produced without holding its logs in memory.
+"""
+import csv
+import io
+from typing import Any, BinaryIO, Dict
+
+from app.config import settings
+from app.custom_json_encoder import json_dumps_bytes
+
+LOG_COLUMNS = (
+    "id",
+    "timestamp",
+    "event_type",
+    "user_id",
+    "user_email",
+    "company_id",
+    "ai_capability",
+    "ai_decision",
+    "ai_severity",
+    "ai_scope_valid",
+    "ai_required_role",
+    "ai_user_role",
+    "ai_request_text",
+    "details",
+)
+
+
+class JsonReportWriter:
+    """The report as one JSON document, detailed_logs last"""
+
+    extension = "json"
+    media_type = "application/json"
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.rows = 0
+
+    def begin(self, header: Dict[str, Any]):
+        self.f.write(b"{\n")
+        for key, value in header.items():
+            self.f.write(
+                json_dumps_bytes(key) + b": " + json_dumps_bytes(value) + b",\n"
+            )
+        self.f.write(b'"detailed_logs": [')
+
+    def write_log(self, row: Dict[str, Any]):
+        self.f.write((b",\n" if self.rows else b"\n") + json_dumps_bytes(row))
+        self.rows += 1
+
+    def finish(self):
+        self.f.write(b"\n]}\n")
+
+
+class CsvReportWriter:
+    """The detailed logs only, one row per event (details as JSON)"""
+
+    extension = "csv"
+    media_type = "text/csv"
+
+    def __init__(self, f: BinaryIO):
+        self.text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text)
+
+    def begin(self, header: Dict[str, Any]):
+        self.writer.writerow(LOG_COLUMNS)
+
+    def write_log(self, row: Dict[str, Any]):
+        values = dict(row, details=json_dumps_bytes(row["details"]).decode("utf-8"))
+        self.writer.writerow([values[column] for column in LOG_COLUMNS])
+
+    def finish(self):
+        self.text.flush()
+        # Leave the underlying file open for the caller
+        self.text.detach()
+
+
+class PdfReportWriter:
+    """
+    Summary tables followed by one line per event, drawn page by page on a
+    reportlab canvas. Rows past COMPLIANCE_EXPORT_PDF_MAX_ROWS are only
+    counted: reportlab keeps every page until the file is saved.
+    """
+
+    extension = "pdf"
+    media_type = "application/pdf"
+    margin = 50
+
+    def __init__(self, f: BinaryIO):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+
+        self.canvas = canvas.Canvas(f, pagesize=letter, pageCompression=1)
+        self.height = letter[1]
+        self.y = self.height - self.margin
+        self.rows = 0
+        self.omitted = 0
+        self.max_rows = settings.COMPLIANCE_EXPORT_PDF_MAX_ROWS
+
+    def _line(self, text: str, font: str = "Helvetica", size: int = 10, gap: int = 14):
+        if self.y < self.margin:
+            self.canvas.showPage()
+            self.y = self.height - self.margin
+        self.canvas.setFont(font, size)
+        self.canvas.drawString(self.margin, self.y, text)
+        self.y -= gap
+
+    def begin(self, header: Dict[str, Any]):
+        meta = header["report_metadata"]
+        summary = header["violation_summary"]
+        self._line("AI Governance Compliance Report", "Helvetica-Bold", 16, 30)
+        self._line(f"Generated: {meta['generated_at']}")
+        self._line(
+            f"Period: {meta['date_range']['start']} to {meta['date_range']['end']}",
+            gap=24,
+        )
+
+        self._line("Violation Summary", "Helvetica-Bold", 13, 18)
+        self._line(f"Total Events: {summary['total_events']}")
+        self._line(f"Allowed AI Requests: {summary['ai_decisions']['allowed']}")
+        self._line(f"Blocked AI Requests: {summary['ai_decisions']['blocked']}")
+        self._line(
+            f"Pending Approvals: {summary['ai_decisions']['pending_approval']}",
+            gap=24,
+        )
+
+        self._line("Violations by Severity", "Helvetica-Bold", 12, 18)
+        for severity, count in summary["violations_by_severity"].items():
+            self._line(f"{severity}: {count}")
+        self.y -= 10
+
+        self._line("Detailed Logs", "Helvetica-Bold", 12, 18)
+        self._line(
+            f"{'Timestamp':<20} {'Event':<30} {'User':<30} {'Decision':<17} Severity",
+            "Courier-Bold",
+            7,
+            10,
+        )
+
+    def write_log(self, row: Dict[str, Any]):
+        if self.rows >= self.max_rows:
+            self.omitted += 1
+            return
+        self.rows += 1
+        user = row["user_email"] or str(row["user_id"])
+        self._line(
+            f"{row['timestamp'][:19]:<20} {row['event_type'][:30]:<30} "
+            f"{user[:30]:<30} {(row['ai_decision'] or '')[:17]:<17} "
+            f"{row['ai_severity'] or ''}",
+            "Courier",
+            7,
+            9,
+        )
+
+    def finish(self):
+        if self.omitted:
+            self._line(
+                f"{self.omitted} more events not shown; "
+                "export as CSV or JSON for the full log",
+                "Helvetica-Oblique",
+                9,
+            )
+        self.canvas.save()
+
+
+REPORT_WRITERS = {
+    writer.extension: writer
+    for writer in (JsonReportWriter, CsvReportWriter, PdfReportWriter)
+}
@@ -0,0 +1,141 @@
+"""
+The application's periodic tasks. Database maintenance is queued as a
+background job (keyed by fire time, so a fire time is queued once) and runs
+on the job workers; tasks on this process's in-memory or Redis state run
+directly on the event loop.
+"""
+import asyncio
+import dataclasses
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from app.config import settings
+from app.db import SessionLocal
+from app.services.job_queue import JobQueue
+from app.services.scheduler import ScheduledTask, Scheduler
+
+logger = structlog.get_logger(__name__)
+
+
+def enqueue(
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    with_fire_time: bool = False,
+):
+    """
+    A task action that queues ``job_type`` once per fire time. With
+    ``with_fire_time`` the fire time goes in the payload as ``now``, so late
+    runs and retries see the time the job was scheduled for.
+    """
+
+    def submit(fire: datetime):
+        job_payload = payload
+        if with_fire_time:
+            job_payload = {**(payload or {}), "now": fire.isoformat()}
+        with SessionLocal() as db:
+            JobQueue.enqueue(
+                db,
+                job_type,
+                job_payload,
+                idempotency_key=f"schedule:{job_type}:{fire.isoformat()}",
+            )
+            db.commit()
+
+    async def action(fire: datetime):
+        await asyncio.to_thread(submit, fire)
+
+    return action
+
+
+async def cleanup_websockets(fire: datetime):
+    from app.routers.websocket_manager import ws_manager
+
+    await ws_manager.cleanup()
+
+
+async def cleanup_redis_keys(fire: datetime):
+    from app.services.redis_service import redis_service
+
+    await redis_service.cleanup_stale_keys()
+
+
+DEFAULT_TASKS = [
+    # This process's sockets and rate limits, so every node runs it
+    ScheduledTask(
+        "websocket.cleanup",
+        "* * * * *",
+        cleanup_websockets,
+        singleton=False,
+        catch_up="skip",
+    ),
+    ScheduledTask(
+        "redis.cleanup_stale_keys",
+        "*/15 * * * *",
+        cleanup_redis_keys,
+        jitter_seconds=60,
+        catch_up="skip",
+    ),
+    ScheduledTask(
+        "digests.process_pending", "*/10 * * * *", enqueue("digests.process_pending")
+    ),
+    ScheduledTask(
+        "digests.build_daily",
+        "0 6 * * *",
+        enqueue("digests.build_daily", with_fire_time=True),
+    ),
+    ScheduledTask(
+        "digests.build_weekly",
+        "0 6 * * 1",
+        enqueue("digests.build_weekly", with_fire_time=True),
+    ),
+    ScheduledTask(
+        "approvals.cleanup_expired",
+        "*/5 * * * *",
+        enqueue("approvals.cleanup_expired"),
+    ),
+    ScheduledTask(
+        "digests.cleanup_old",
+        "30 3 * * *",
+        enqueue("digests.cleanup_old"),
+        jitter_seconds=300,
+    ),
+    ScheduledTask(
+        "jobs.purge_finished",
+        "0 3 * * *",
+        enqueue("jobs.purge_finished"),
+        jitter_seconds=300,
+    ),
+    ScheduledTask(
+        "audit_partitions.maintain",
+        "15 2 * * *",
+        enqueue("audit_partitions.maintain"),
+    ),
+    ScheduledTask(
+        "archive.cold_data",
+        "0 4 * * *",
+        enqueue("archive.cold_data"),
+        jitter_seconds=600,
+    ),
+]
+
+
+def scheduled_tasks() -> List[ScheduledTask]:
+    """DEFAULT_TASKS with the SCHEDULES overrides applied"""
+    overrides = dict(settings.SCHEDULES)
+    tasks = []
+    for task in DEFAULT_TASKS:
+        spec = overrides.pop(task.name, task.schedule)
+        if not spec:
+            logger.info("Scheduled task disabled", task=task.name)
+            continue
+        tasks.append(
+            task if spec == task.schedule else dataclasses.replace(task, schedule=spec)
+        )
+    for name in overrides:
+        logger.warning("Schedule override for an unknown task", task=name)
+    return tasks
+
+
+scheduler = Scheduler(scheduled_tasks())
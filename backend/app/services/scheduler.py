@@ -0,0 +1,366 @@
+"""
+In-app periodic scheduler. Tasks have cron specs (UTC, parsed by APScheduler's
+CronTrigger) and run on the API's event loop. Cluster-wide ("singleton") tasks
+only run on the node holding the scheduler's PostgreSQL advisory lock; each
+fire time is also claimed in the scheduled_tasks table, so it runs once even
+if two nodes briefly both think they lead. Per-process tasks (e.g. cleaning
+up this process's WebSocket state) run on every node.
+
+Fire times missed while no node was running a task (or while its previous run
+was still going) are handled by the task's catch-up policy:
+
+- ``skip``: drop them and wait for the next fire time
+- ``once``: run once for all of them (the default)
+- ``all``: run once per missed fire time, up to SCHEDULER_MAX_CATCH_UP_RUNS
+"""
+import asyncio
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import create_engine, or_, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.base_crud import advisory_lock_key, upsert_insert
+from app.config import settings
+from app.db import SessionLocal, engine
+from app.metrics import (record_scheduled_task, record_scheduled_task_missed,
+                         set_scheduler_leader)
+from app.models.scheduled_task import ScheduledTaskState
+
+logger = structlog.get_logger(__name__)
+
+CATCH_UP_POLICIES = ("skip", "once", "all")
+
+
+@dataclass
+class ScheduledTask:
+    name: str
+    schedule: str  # Crontab spec, UTC
+    action: Callable[[datetime], Awaitable[Any]]  # Called with the fire time
+    singleton: bool = True  # False: run on every node
+    jitter_seconds: float = 0  # Random start delay, spreads load across tasks
+    catch_up: str = "once"
+    trigger: CronTrigger = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {self.catch_up}")
+        self.trigger = CronTrigger.from_crontab(self.schedule, timezone=timezone.utc)
+
+    def next_fire_time(self, after: datetime) -> datetime:
+        """First fire time strictly after ``after`` (naive UTC in and out)"""
+        aware = after.replace(tzinfo=timezone.utc) + timedelta(microseconds=1)
+        return self.trigger.get_next_fire_time(None, aware).replace(tzinfo=None)
+
+    def fire_times(self, after: datetime, until: datetime) -> List[datetime]:
+        """Fire times in (after, until]"""
+        times = []
+        fire = self.next_fire_time(after)
+        while fire <= until:
+            times.append(fire)
+            fire = self.next_fire_time(fire)
+        return times
+
+
+def catch_up(
+    task: ScheduledTask, missed: List[datetime], waiting: int = 0
+) -> List[datetime]:
+    """
+    The missed fire times to run under the task's policy, given ``waiting``
+    runs already queued for it (a queued run covers missed ones under "once")
+    """
+    if task.catch_up == "skip" or (task.catch_up == "once" and waiting):
+        keep = []
+    elif task.catch_up == "once":
+        keep = missed[-1:]
+    else:
+        room = max(settings.SCHEDULER_MAX_CATCH_UP_RUNS - waiting, 0)
+        keep = missed[len(missed) - room :] if room else []
+    if missed:
+        record_scheduled_task_missed(task.name, "run", len(keep))
+        if len(missed) > len(keep):
+            record_scheduled_task_missed(task.name, "dropped", len(missed) - len(keep))
+    return keep
+
+
+class LeaderElection:
+    """
+    Leadership is a session-level advisory lock held on a dedicated
+    connection: it is released when the leader stops or its connection dies,
+    and another node takes over on its next check. Without PostgreSQL (local
+    SQLite) this process always leads.
+
+    The connection comes from its own unpooled engine, so closing it really
+    disconnects; a pooled connection would go back to the pool still
+    holding the lock.
+    """
+
+    def __init__(self, name: str = "scheduler:leader", bind=None):
+        self.key = advisory_lock_key(name)
+        bind = bind or engine
+        if bind.dialect.name == "postgresql":
+            bind = create_engine(bind.url, poolclass=NullPool)
+        self.bind = bind
+        self._conn = None
+
+    def ensure(self) -> bool:
+        """Acquire or confirm leadership; False while another node leads"""
+        if self.bind.dialect.name != "postgresql":
+            return True
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                logger.warning("Scheduler leader connection lost", error=str(e))
+                self._close(invalidate=True)
+
+        conn = self.bind.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if acquired:
+            self._conn = conn
+        else:
+            conn.close()
+        return bool(acquired)
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self.key}
+            )
+        except Exception as e:
+            logger.warning("Could not release scheduler leader lock", error=str(e))
+            self._close(invalidate=True)
+            return
+        self._close()
+
+    def _close(self, invalidate: bool = False):
+        # Invalidating drops the DBAPI connection even if a pool is in use
+        try:
+            if invalidate:
+                self._conn.invalidate()
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+@dataclass
+class _Plan:
+    next_fire: datetime  # Next cron fire time not yet due
+    pending: List[Tuple[datetime, datetime]] = field(default_factory=list)
+    # (fire time, start at) pairs: due fire times waiting to run
+
+
+class Scheduler:
+    def __init__(
+        self,
+        tasks: List[ScheduledTask],
+        session_factory: Callable[[], Session] = SessionLocal,
+        election: Optional[LeaderElection] = None,
+        tick_seconds: Optional[float] = None,
+    ):
+        self.tasks = {task.name: task for task in tasks}
+        self.session_factory = session_factory
+        self.election = election or LeaderElection()
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_TICK_SECONDS
+        self.node = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self._plans: Dict[str, _Plan] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+            logger.info("Scheduler started", node=self.node, tasks=len(self.tasks))
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop scheduling, give running tasks ``timeout`` seconds, then cancel"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        running = list(self._running.values())
+        if running:
+            _, still_running = await asyncio.wait(running, timeout=timeout)
+            for task in still_running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+        await asyncio.to_thread(self.election.release)
+        self._set_leader(False)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(self._sleep_seconds())
+
+    def _sleep_seconds(self) -> float:
+        now = datetime.utcnow()
+        wakeups = [plan.next_fire for plan in self._plans.values()]
+        wakeups += [plan.pending[0][1] for plan in self._plans.values() if plan.pending]
+        until_next = min((w - now).total_seconds() for w in wakeups) if wakeups else 0
+        return min(max(until_next, 0.1), self.tick_seconds)
+
+    async def tick(self, now: Optional[datetime] = None) -> List[str]:
+        """Start every task that is due; returns their names"""
+        now = now or datetime.utcnow()
+        try:
+            leader = await asyncio.to_thread(self.election.ensure)
+        except Exception as e:
+            logger.warning("Scheduler leader election failed", error=str(e))
+            leader = False
+        if leader != self.is_leader:
+            self._set_leader(leader)
+            # Plans for cluster-wide tasks start over from the saved state
+            for task in self.tasks.values():
+                if task.singleton:
+                    self._plans.pop(task.name, None)
+
+        started = []
+        for task in self.tasks.values():
+            if task.singleton and not leader:
+                continue
+            plan = self._plans.get(task.name)
+            if plan is None:
+                plan = self._plans[task.name] = await self._new_plan(task, now)
+
+            due = task.fire_times(plan.next_fire - timedelta(microseconds=1), now)
+            if due:
+                plan.next_fire = task.next_fire_time(due[-1])
+                # The latest fire time is on time unless an earlier run is
+                # still going or queued; the rest were missed
+                busy = task.name in self._running or bool(plan.pending)
+                on_time = [] if busy else due[-1:]
+                missed = due if busy else due[:-1]
+                runs = catch_up(task, missed, len(plan.pending)) + on_time
+                plan.pending.extend((fire, self._start_at(task, fire)) for fire in runs)
+
+            if plan.pending and task.name not in self._running:
+                fire, start_at = plan.pending[0]
+                if start_at <= now:
+                    plan.pending.pop(0)
+                    self._running[task.name] = asyncio.create_task(
+                        self._execute(task, fire)
+                    )
+                    started.append(task.name)
+        return started
+
+    def _start_at(self, task: ScheduledTask, fire: datetime) -> datetime:
+        return fire + timedelta(seconds=random.uniform(0, task.jitter_seconds))
+
+    def _set_leader(self, leader: bool):
+        if leader != self.is_leader:
+            logger.info("Scheduler leadership changed", node=self.node, leader=leader)
+        self.is_leader = leader
+        set_scheduler_leader(leader)
+
+    async def _new_plan(self, task: ScheduledTask, now: datetime) -> _Plan:
+        plan = _Plan(next_fire=task.next_fire_time(now))
+        if task.singleton:
+            state = await asyncio.to_thread(self._load_state, task.name)
+            if state is not None and state.last_scheduled_at is not None:
+                missed = task.fire_times(state.last_scheduled_at, now)
+                plan.pending = [
+                    (fire, self._start_at(task, fire))
+                    for fire in catch_up(task, missed)
+                ]
+        return plan
+
+    def _load_state(self, name: str) -> Optional[ScheduledTaskState]:
+        with self.session_factory() as db:
+            return db.get(ScheduledTaskState, name)
+
+    def _claim(self, name: str, fire: datetime) -> bool:
+        """Record ``fire`` as the task's latest run unless it already ran"""
+        with self.session_factory() as db:
+            db.execute(
+                upsert_insert(db, ScheduledTaskState.__table__)
+                .values(name=name)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            claimed = (
+                db.query(ScheduledTaskState)
+                .filter(
+                    ScheduledTaskState.name == name,
+                    or_(
+                        ScheduledTaskState.last_scheduled_at.is_(None),
+                        ScheduledTaskState.last_scheduled_at < fire,
+                    ),
+                )
+                .update(
+                    {
+                        "last_scheduled_at": fire,
+                        "last_started_at": datetime.utcnow(),
+                        "last_status": "running",
+                        "last_node": self.node,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return bool(claimed)
+
+    def _record(self, name: str, status: str, seconds: float, error: Optional[str]):
+        with self.session_factory() as db:
+            state = db.get(ScheduledTaskState, name)
+            now = datetime.utcnow()
+            state.last_finished_at = now
+            state.last_status = status
+            state.last_duration_seconds = seconds
+            state.last_error = error
+            if status == "succeeded":
+                state.last_success_at = now
+            db.commit()
+
+    async def _execute(self, task: ScheduledTask, fire: datetime):
+        log = logger.bind(task=task.name, fire_time=fire.isoformat())
+        try:
+            if task.singleton and not await asyncio.to_thread(
+                self._claim, task.name, fire
+            ):
+                log.info("Scheduled run already taken by another node")
+                return
+
+            started = time.monotonic()
+            status, error = "succeeded", None
+            try:
+                await task.action(fire)
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"
+                log.exception("Scheduled task failed")
+            elapsed = time.monotonic() - started
+            record_scheduled_task(task.name, status, elapsed)
+            if task.singleton:
+                await asyncio.to_thread(self._record, task.name, status, elapsed, error)
+            log.info(
+                "Scheduled task finished", status=status, seconds=round(elapsed, 3)
+            )
+        except Exception:
+            log.exception("Scheduled run could not be recorded")
+        finally:
+            self._running.pop(task.name, None)
+
+    async def wait_idle(self):
+        """Wait for the runs started so far (tests)"""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
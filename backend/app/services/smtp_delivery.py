@@ -0,0 +1,318 @@
+"""
+SMTP delivery for EmailService. ``SMTPConnectionPool`` keeps authenticated
+connections open between sends, so STARTTLS and login happen once per
+connection instead of once per message. ``SMTPDispatcher`` queues mail from
+any thread; its sender threads each take a batch of queued messages and send
+the whole batch over one pooled connection.
+"""
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Iterator, List, Optional, Tuple
+
+import structlog
+
+from app.config import settings
+from app.metrics import (record_email_batch, record_email_dropped,
+                         record_smtp_connection_opened, set_email_queue_depth)
+
+logger = structlog.get_logger(__name__)
+
+# The server refused this message, but the connection is still usable
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+@dataclass
+class OutgoingEmail:
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+
+    def as_string(self, email_from: str) -> str:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = self.subject
+        msg["From"] = email_from
+        msg["To"] = self.to_email
+        if self.text_content:
+            msg.attach(MIMEText(self.text_content, "plain"))
+        msg.attach(MIMEText(self.html_content, "html"))
+        return msg.as_string()
+
+
+@dataclass
+class PooledConnection:
+    smtp: smtplib.SMTP
+    messages: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    """
+    At most ``size`` connections are checked out at once. Idle connections
+    are reused newest first, after a NOOP shows the server still has them
+    open. A connection that errors while checked out is closed rather than
+    returned.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        size: Optional[int] = None,
+        starttls: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        idle_seconds: Optional[float] = None,
+        max_messages: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size or settings.SMTP_POOL_SIZE
+        self.starttls = settings.SMTP_STARTTLS if starttls is None else starttls
+        self.timeout = timeout or settings.SMTP_TIMEOUT_SECONDS
+        self.idle_seconds = idle_seconds or settings.SMTP_POOL_IDLE_SECONDS
+        self.max_messages = max_messages or settings.SMTP_MAX_MESSAGES_PER_CONNECTION
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        with self._slots:
+            conn = self._checkout()
+            try:
+                yield conn
+            except Exception:
+                self._close(conn)
+                raise
+            conn.last_used = time.monotonic()
+            if conn.messages >= self.max_messages:
+                self._close(conn)
+            else:
+                with self._lock:
+                    self._idle.append(conn)
+
+    def close_idle(self):
+        """Close connections left unused for longer than ``idle_seconds``"""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            stale = [conn for conn in self._idle if conn.last_used < cutoff]
+            self._idle = [conn for conn in self._idle if conn.last_used >= cutoff]
+        for conn in stale:
+            self._close(conn)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+    def _checkout(self) -> PooledConnection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._open()
+            if time.monotonic() - conn.last_used > self.idle_seconds:
+                self._close(conn)
+                continue
+            try:
+                conn.smtp.noop()
+                return conn
+            except (smtplib.SMTPException, OSError):
+                self._close(conn)
+
+    def _open(self) -> PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        record_smtp_connection_opened()
+        return PooledConnection(smtp)
+
+    def _close(self, conn: PooledConnection):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+
+
+class SMTPDispatcher:
+    """
+    Bounded queue of outgoing mail drained by one sender thread per pool
+    slot, so concurrent callers share a few long-lived connections. Mail is
+    dropped (and counted) rather than blocking callers when the queue is
+    full; a dropped or unsent message resolves to False.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        email_from: str,
+        batch_size: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        poll_interval: float = 1.0,
+    ):
+        self.pool = pool
+        self.email_from = email_from
+        self.batch_size = batch_size or settings.SMTP_BATCH_SIZE
+        self.poll_interval = poll_interval
+        self._queue: "queue.Queue[Tuple[OutgoingEmail, Future]]" = queue.Queue(
+            max_queue or settings.SMTP_QUEUE_SIZE
+        )
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"smtp-sender-{n}", daemon=True)
+                for n in range(self.pool.size)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def submit(self, email: OutgoingEmail) -> "Future[bool]":
+        """Queue one message; the future resolves to whether it was sent"""
+        future: "Future[bool]" = Future()
+        if self._stopping.is_set():
+            record_email_dropped()
+            future.set_result(False)
+            return future
+        self.start()
+        try:
+            self._queue.put_nowait((email, future))
+        except queue.Full:
+            record_email_dropped()
+            logger.warning("Email queue full, message dropped", to_email=email.to_email)
+            future.set_result(False)
+            return future
+        set_email_queue_depth(self._queue.qsize())
+        return future
+
+    def send(
+        self, emails: List[OutgoingEmail], timeout: Optional[float] = None
+    ) -> List[bool]:
+        """Queue ``emails`` and wait up to ``timeout`` seconds for all of them"""
+        timeout = settings.SMTP_SEND_TIMEOUT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        futures = [self.submit(email) for email in emails]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(max(deadline - time.monotonic(), 0)))
+            except FutureTimeout:
+                # Already being sent: wait for it, or a fallback would send
+                # the message twice
+                results.append(False if future.cancel() else future.result())
+        return results
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting mail, send what is queued and close the connections"""
+        self._stopping.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            if deadline is None:
+                thread.join()
+            else:
+                thread.join(max(deadline - time.monotonic(), 0))
+        if any(thread.is_alive() for thread in self._threads):
+            logger.error(
+                "SMTP dispatcher did not drain before shutdown", pending=self.depth
+            )
+            return False
+        self._threads = []
+        self.pool.close_all()
+        return True
+
+    def _take_batch(self) -> List[Tuple[OutgoingEmail, Future]]:
+        try:
+            batch = [self._queue.get(timeout=self.poll_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch:
+                try:
+                    self._send_batch(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                    set_email_queue_depth(self._queue.qsize())
+            elif self._stopping.is_set():
+                return
+            else:
+                self.pool.close_idle()
+
+    def _send_batch(self, batch: List[Tuple[OutgoingEmail, Future]]):
+        # Callers that gave up waiting have cancelled their futures
+        pending = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not pending:
+            return
+        started = time.monotonic()
+        results: List[bool] = []
+        try:
+            with self.pool.connection() as conn:
+                for email, _ in pending:
+                    try:
+                        conn.smtp.sendmail(
+                            self.email_from,
+                            email.to_email,
+                            email.as_string(self.email_from),
+                        )
+                        conn.messages += 1
+                        results.append(True)
+                    except MESSAGE_ERRORS as e:
+                        logger.warning(
+                            "SMTP server rejected email",
+                            to_email=email.to_email,
+                            error=str(e),
+                        )
+                        results.append(False)
+        except Exception as e:
+            logger.warning(
+                "SMTP batch failed", error=str(e), unsent=len(pending) - len(results)
+            )
+        # Resolved once the connection is back in the pool, so a caller's
+        # next send can reuse it
+        results += [False] * (len(pending) - len(results))
+        for (_, future), ok in zip(pending, results):
+            future.set_result(ok)
+        sent = sum(results)
+        record_email_batch(sent, len(results) - sent, time.monotonic() - started)
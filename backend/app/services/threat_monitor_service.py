@@ -1,11 +1,11 @@
 import json
 from datetime import datetime, timedelta
 
-import requests
 import structlog
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
+from app.config import settings
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.schemas.ai import AIPolicySeverity, WebhookAlertConfig
@@ -21,9 +21,16 @@ class ThreatMonitorService:
         db: Session, company_id: int = None, limit: int = 50
     ) -> list:
         """Get live feed of recent AI violations and anomalies"""
+        cutoff_time = datetime.utcnow() - timedelta(
+            days=settings.THREAT_FEED_LOOKBACK_DAYS
+        )
         query = (
             db.query(AuditLog)
-            .filter(AuditLog.event_type.like("SECURITY_AI_%"))
+            .options(joinedload(AuditLog.user))
+            .filter(
+                AuditLog.event_type.like("SECURITY_AI_%"),
+                AuditLog.created_at >= cutoff_time,
+            )
             .order_by(AuditLog.created_at.desc())
         )
 
@@ -162,6 +169,8 @@ class ThreatMonitorService:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
+            import requests
+
             response = requests.post(
                 webhook_config.url, json=payload, headers=headers, timeout=10
             )
@@ -0,0 +1,128 @@
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import db as database
+from app.config import settings
+from app.custom_json_encoder import json_dumps_bytes
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Accepted values of the ?stream= query parameter
+STREAM_MODES = "^ndjson$"
+FILE_CHUNK_SIZE = 64 * 1024
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def iter_ndjson(
+    rows: Iterable[Dict[str, Any]], batch_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Encode rows as NDJSON, yielding one chunk per ``batch_size`` rows"""
+    batch_size = batch_size or settings.NDJSON_STREAM_BATCH_SIZE
+    chunk = []
+    for row in rows:
+        chunk.append(json_dumps_bytes(row))
+        if len(chunk) >= batch_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def ndjson_response(
+    produce: Callable[[Session], Iterable[Dict[str, Any]]],
+    request: Optional[Request] = None,
+    filename: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Stream ``produce(db)`` as NDJSON. The request's session is closed before
+    the body is sent, so rows are read from a session of their own that lives
+    as long as the stream; produce should page with ``yield_per``. Given the
+    request, that session is routed like get_read_db, otherwise it is primary.
+    """
+
+    def body():
+        if request is not None:
+            db = database.read_session(request)
+        else:
+            db = database.session_router.session()
+        try:
+            yield from iter_ndjson(produce(db))
+        finally:
+            db.close()
+
+    headers = None
+    if filename:
+        headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte, inclusive, of a single-range ``Range: bytes=`` header;
+    None to send the whole file (no header, multiple or malformed ranges).
+    Raises ValueError when the range lies outside the file.
+    """
+    match = BYTE_RANGE.match(header.strip()) if header else None
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        if not int(last) or not size:
+            raise ValueError("Empty range")
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, min(end, size - 1)
+
+
+def _iter_file(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(FILE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_range_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    filename: Optional[str] = None,
+) -> Response:
+    """
+    Serve a file honouring a single HTTP Range (206 Partial Content, 416 when
+    unsatisfiable), so large downloads can be resumed
+    """
+    size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes"}
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), size)
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    start, end = byte_range if byte_range else (0, size - 1)
+    length = end - start + 1 if size else 0
+    headers["Content-Length"] = str(length)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        _iter_file(path, start, length),
+        status_code=206 if byte_range else 200,
+        media_type=media_type,
+        headers=headers,
+    )
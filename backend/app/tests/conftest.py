@@ -17,6 +17,7 @@ from app.models.approval_queue import ApprovalQueue, ApprovalQueueItem
 from app.models.company import Company
 from app.models.user import User
 from app.schemas.schemas import CompanyCreate, UserCreate
+from app.services.audit_chain_service import chain_head_cache
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -40,6 +41,8 @@ def db():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        # Chain heads cached by this process point at rows that are now gone
+        chain_head_cache.clear()
 
 
 @pytest.fixture(scope="function")
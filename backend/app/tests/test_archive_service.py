@@ -0,0 +1,251 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import merkle
+from app.config import settings
+from app.models.audit_chain import AuditChain, AuditChainMerkleNode
+from app.models.audit_log import AuditLog
+from app.models.chat import ChatMessage
+from app.models.message_reactions import MessageReaction
+from app.services.archive_service import ArchiveIntegrityError, ArchiveService
+from app.services.audit_chain_service import (AuditChainService,
+                                              chain_head_cache)
+from app.services.audit_chain_verification import (ChainVerificationService,
+                                                   signing_key)
+from app.services.audit_merkle_service import AuditMerkleService
+from app.services.compliance_export_service import ComplianceExportService
+
+NOW = datetime(2026, 6, 15, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    return tmp_path / "archive"
+
+
+def _log(db, user, event_type, created_at, **fields):
+    log = AuditLog(
+        event_type=event_type,
+        user_id=user.id,
+        company_id=user.company_id,
+        details=fields.pop("details", {}),
+        created_at=created_at,
+        **fields,
+    )
+    db.add(log)
+    db.commit()
+    return log
+
+
+def test_audit_logs_round_trip(db: Session, test_user, archive_dir):
+    for days in (400, 380, 370):
+        _log(db, test_user, "AI_QUERY", NOW - timedelta(days=days), details={"d": days})
+    recent = _log(db, test_user, "AI_QUERY", NOW - timedelta(days=10))
+
+    result = ArchiveService.archive_table(
+        db, "audit_logs", before=NOW - timedelta(days=365)
+    )
+
+    assert result.rows == 3
+    assert len(result.files) == 2  # Two months, one company
+    assert [log.id for log in db.query(AuditLog)] == [recent.id]
+    rows = list(ArchiveService.read("audit_logs"))
+    assert [row["details"]["d"] for row in rows] == [400, 380, 370]
+    assert rows[0]["created_at"] == NOW - timedelta(days=400)
+
+    directory = os.path.dirname(result.files[0])
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert manifest["company_id"] == test_user.company_id
+    assert manifest["month"] == "2025-05"
+    assert manifest["parts"][0]["rows"] == 2
+    assert len(manifest["parts"][0]["sha256"]) == 64
+
+    # Range reads only return rows in the range
+    window = list(
+        ArchiveService.read(
+            "audit_logs", NOW - timedelta(days=385), NOW - timedelta(days=375)
+        )
+    )
+    assert [row["details"]["d"] for row in window] == [380]
+    assert ArchiveService.archive_table(db, "audit_logs", before=NOW).rows == 1
+
+
+def test_large_months_are_split_into_parts(db: Session, test_user, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "ARCHIVE_PART_ROWS", 3)
+    # Inserted out of created_at order, so id order differs from read order
+    for hours in (5, 1, 4, 0, 2, 3):
+        _log(db, test_user, "AI_QUERY", NOW - timedelta(days=400, hours=hours))
+
+    result = ArchiveService.archive_table(db, "audit_logs", before=NOW)
+
+    assert result.rows == 6
+    assert len(result.files) == 2
+    assert db.query(AuditLog).count() == 0
+    rows = list(ArchiveService.read("audit_logs"))
+    assert [row["created_at"] for row in rows] == [
+        NOW - timedelta(days=400, hours=hours) for hours in (5, 4, 3, 2, 1, 0)
+    ]
+
+
+def test_corrupt_part_is_detected(db: Session, test_user):
+    _log(db, test_user, "AI_QUERY", NOW - timedelta(days=400))
+    result = ArchiveService.archive_table(db, "audit_logs", before=NOW)
+    with open(result.files[0], "ab") as f:
+        f.write(b"\0")
+
+    assert ArchiveService.verify_archive("audit_logs") == result.files
+    with pytest.raises(ArchiveIntegrityError):
+        list(ArchiveService.read("audit_logs"))
+
+
+def test_chat_messages_keep_their_reactions(db: Session, test_user):
+    message = ChatMessage(
+        company_id=test_user.company_id,
+        sender_id=test_user.id,
+        message="hello",
+        created_at=NOW - timedelta(days=400),
+    )
+    db.add(message)
+    db.flush()
+    db.add(MessageReaction(message_id=message.id, user_id=test_user.id, emoji="+1"))
+    db.commit()
+
+    assert ArchiveService.archive_table(db, "chat_messages", before=NOW).rows == 1
+
+    assert db.query(ChatMessage).count() == 0
+    assert db.query(MessageReaction).count() == 0
+    (row,) = ArchiveService.read("chat_messages")
+    assert row["message"] == "hello"
+    assert [r["emoji"] for r in row["reactions"]] == ["+1"]
+
+
+def test_compliance_export_merges_archived_and_live_logs(db: Session, test_user):
+    _log(
+        db,
+        test_user,
+        "TRUST_SCORE_UPDATE",
+        NOW - timedelta(days=400),
+        details={"old_score": 90, "new_score": 80},
+    )
+    _log(db, test_user, "AI_QUERY", NOW - timedelta(days=390), ai_decision="blocked")
+    _log(db, test_user, "LOGIN", NOW - timedelta(days=380))
+    ArchiveService.archive_table(db, "audit_logs", before=NOW - timedelta(days=365))
+    _log(db, test_user, "AI_QUERY", NOW - timedelta(days=5), ai_decision="allowed")
+
+    start, end = NOW - timedelta(days=500), NOW
+    logs = ComplianceExportService._get_detailed_logs(
+        db, test_user.company_id, start, end
+    )
+    assert [(log["event_type"], log["ai_decision"]) for log in logs] == [
+        ("TRUST_SCORE_UPDATE", None),
+        ("AI_QUERY", "blocked"),
+        ("AI_QUERY", "allowed"),
+    ]
+    assert {log["user_email"] for log in logs} == {test_user.email}
+
+    history = ComplianceExportService._get_trust_history(
+        db, test_user.company_id, start, end
+    )
+    assert history[test_user.id][0]["new_score"] == 80
+
+
+def test_archived_chain_entries_still_verify_and_prove(
+    db: Session, test_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUDIT_CHAIN_CHECKPOINT_INTERVAL", 5)
+    chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+    for n in range(12):
+        AuditChainService.append_to_chain(
+            db=db,
+            chain_id=chain_id,
+            event_type="EVENT",
+            user_id=test_user.id,
+            data={"n": n},
+        )
+    AuditChainService.run_verification(db, chain_id)  # Checkpoints at 4 and 9
+
+    result = ArchiveService.archive_table(
+        db, "audit_chains", before=datetime.utcnow() + timedelta(days=1)
+    )
+
+    # Entries before the latest checkpoint go; the checkpoint entry stays
+    assert result.rows == 9
+    remaining = db.query(AuditChain.sequence_number).order_by(
+        AuditChain.sequence_number
+    )
+    assert [s for (s,) in remaining] == [9, 10, 11]
+    full = ChainVerificationService.verify_full(db, chain_id, workers=1)
+    assert full.is_valid and full.start_sequence == 10
+    assert AuditChainService.run_verification(db, chain_id).is_valid
+
+    # Without the checkpointed entry the chain can't be anchored
+    db.query(AuditChain).filter(AuditChain.sequence_number == 9).delete()
+    db.commit()
+    truncated = ChainVerificationService.verify_full(db, chain_id, workers=1)
+    assert truncated.issues[0] == {"type": "chain_truncated", "first_sequence": 10}
+
+
+def test_archived_chain_entries_keep_inclusion_proofs(
+    db: Session, test_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUDIT_CHAIN_CHECKPOINT_INTERVAL", 5)
+    chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+    for n in range(12):
+        AuditChainService.append_to_chain(
+            db=db,
+            chain_id=chain_id,
+            event_type="EVENT",
+            user_id=test_user.id,
+            data={"n": n},
+        )
+    AuditChainService.run_verification(db, chain_id)
+    root = AuditMerkleService.publish_root(db, chain_id)
+    ArchiveService.archive_table(
+        db, "audit_chains", before=datetime.utcnow() + timedelta(days=1)
+    )
+
+    archived = AuditMerkleService.inclusion_proof(db, chain_id, 3)
+    assert archived["root_hash"] == root.root_hash
+    assert merkle.verify_proof(json.loads(json.dumps(archived)), signing_key()) == []
+
+    # Interior nodes can be rebuilt from the stored leaves of archived entries
+    db.query(AuditChainMerkleNode).filter(AuditChainMerkleNode.level > 0).delete()
+    db.commit()
+    chain_head_cache.clear()
+    AuditChainService.append_to_chain(
+        db=db,
+        chain_id=chain_id,
+        event_type="EVENT",
+        user_id=test_user.id,
+        data={"n": 12},
+    )
+    proof = AuditMerkleService.inclusion_proof(db, chain_id, 12)
+    assert proof["tree_size"] == 13
+    assert merkle.verify_proof(proof, signing_key()) == []
+
+
+def test_violation_summary_counts_rows_archived_twice_once(db: Session, test_user):
+    log = _log(
+        db, test_user, "AI_QUERY", NOW - timedelta(days=400), ai_decision="blocked"
+    )
+    fields = {
+        column.name: getattr(log, column.name) for column in AuditLog.__table__.columns
+    }
+    ArchiveService.archive_table(db, "audit_logs", before=NOW)
+    # An interrupted run wrote its part but never deleted the row
+    db.add(AuditLog(**fields))
+    db.commit()
+
+    summary = ComplianceExportService.violation_summary(
+        db, test_user.company_id, NOW - timedelta(days=500), NOW
+    )
+
+    assert summary["total_events"] == 1
+    assert summary["ai_decisions"]["blocked"] == 1
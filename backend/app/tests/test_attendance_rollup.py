@@ -0,0 +1,154 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import db as app_db
+from app.deps import get_current_user, get_db
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.employee_profile import EmployeeProfile
+from app.models.user import UserRole
+from app.routers import attendance, dashboard
+from app.services.attendance_rollup_service import AttendanceRollupService
+
+
+def _snapshot(db: Session):
+    return sorted(
+        (
+            r.company_id,
+            r.work_date,
+            r.department,
+            r.hour,
+            r.present_count,
+            r.clock_ins,
+            round(r.total_hours, 6),
+        )
+        for r in db.query(AttendanceDailyRollup).all()
+    )
+
+
+@pytest.fixture
+def client(db: Session, test_company, test_user):
+    db.add(
+        EmployeeProfile(
+            user_id=test_user.id, company_id=test_company.id, department="Ops"
+        )
+    )
+    # A team lead, so the bulk endpoint accepts them
+    test_user.role = UserRole.TEAM_LEAD
+    db.commit()
+    app = FastAPI()
+    for module in (attendance, dashboard):
+        app.include_router(module.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[app_db.get_read_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: test_user
+    return TestClient(app)
+
+
+def test_clock_in_and_out_update_rollup(client, db: Session, test_user):
+    first = client.post("/api/attendance/clock-in", json={"employee_id": test_user.id})
+    client.put(
+        "/api/attendance/clock-out",
+        json={"attendance_id": first.json()["id"], "employee_id": test_user.id},
+    )
+    client.post("/api/attendance/clock-in", json={"employee_id": test_user.id})
+
+    rows = db.query(AttendanceDailyRollup).all()
+    assert sum(r.clock_ins for r in rows) == 2
+    # The second session the same day does not count the employee twice
+    assert sum(r.present_count for r in rows) == 1
+    assert {r.department for r in rows} == {"Ops"}
+    assert sum(r.total_hours for r in rows) >= 0
+
+    incremental = _snapshot(db)
+    AttendanceRollupService.rebuild(db)
+    assert _snapshot(db) == incremental
+
+
+def test_bulk_attendance_updates_rollup(
+    client, db: Session, test_company, test_user, test_user2
+):
+    day = datetime(2026, 5, 4, 9)
+    rows = [
+        {
+            "employee_id": employee_id,
+            "clock_in_time": (day + timedelta(hours=offset)).isoformat(),
+            "clock_out_time": (day + timedelta(hours=offset + 4)).isoformat(),
+        }
+        for employee_id, offset in [
+            (test_user.id, 0),
+            (test_user.id, 5),
+            (test_user2.id, 0),
+        ]
+    ]
+    client.post("/api/attendance/bulk", json=rows)
+
+    totals = AttendanceRollupService.daily_totals(db, test_company.id, day.date())
+    assert totals[day.date()]["present_count"] == 2
+    assert totals[day.date()]["clock_ins"] == 3
+    assert totals[day.date()]["total_hours"] == 12
+
+    incremental = _snapshot(db)
+    AttendanceRollupService.rebuild(db, company_id=test_company.id)
+    assert _snapshot(db) == incremental
+
+
+def test_rebuild_replaces_only_requested_range(db: Session, test_company, test_user):
+    for offset in range(3):
+        db.add(
+            Attendance(
+                company_id=test_company.id,
+                employee_id=test_user.id,
+                clock_in_time=datetime(2026, 6, 1 + offset, 8),
+                clock_out_time=datetime(2026, 6, 1 + offset, 17),
+                total_hours=9,
+                overtime_hours=1,
+                status="completed",
+            )
+        )
+    db.commit()
+    AttendanceRollupService.rebuild(db)
+    db.query(AttendanceDailyRollup).update({"present_count": 99})
+    db.commit()
+
+    AttendanceRollupService.rebuild(db, start=date(2026, 6, 2), end=date(2026, 6, 2))
+
+    counts = {
+        r.work_date.day: r.present_count for r in db.query(AttendanceDailyRollup).all()
+    }
+    assert counts == {1: 99, 2: 1, 3: 99}
+    assert AttendanceRollupService.overtime_by_department(
+        db, test_company.id, date(2026, 6, 1)
+    ) == [("", 3.0)]
+
+
+def test_dashboard_reads_rollup(client, db: Session, test_company):
+    today = date.today()
+    db.add(
+        AttendanceDailyRollup(
+            company_id=test_company.id,
+            work_date=today,
+            department="Ops",
+            hour=9,
+            present_count=1,
+            clock_ins=1,
+            total_hours=0,
+            overtime_hours=2.5,
+        )
+    )
+    db.commit()
+
+    trend = client.get("/api/dashboard/attendance", params={"period": "daily"}).json()
+    assert trend[-1] == {"date": today.isoformat(), "present": 1, "absent": 0}
+
+    heatmap = client.get("/api/dashboard/analytics/heatmap").json()
+    assert heatmap["attendance_heatmap"]["data"][(today.weekday() + 1) % 7][9] == 1
+
+    overtime = client.get("/api/dashboard/overtime").json()
+    assert overtime == [{"department": "Ops", "total_overtime": 2.5}]
+
+    realtime = client.get("/api/dashboard/analytics/real-time").json()
+    assert realtime["today_attendance"] == 1
@@ -2,6 +2,7 @@ import json
 from datetime import datetime, timedelta
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.base_crud import create_user
@@ -343,3 +344,239 @@ class TestAuditChain:
         # Second chain should still be empty
         head2 = AuditChainService.get_chain_head(db, chain_id2)
         assert head2 is None
+
+    def test_append_many_chains_a_burst_in_one_transaction(
+        self, db: Session, test_user
+    ):
+        """Test batched appends link to each other and to the existing head"""
+        chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+        first = AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="FIRST", user_id=test_user.id
+        )
+
+        entries = AuditChainService.append_many(
+            db,
+            chain_id,
+            [
+                {
+                    "event_type": "POLICY_DECISION",
+                    "user_id": test_user.id,
+                    "data": {"n": n},
+                }
+                for n in range(3)
+            ],
+        )
+
+        assert [e.sequence_number for e in entries] == [1, 2, 3]
+        assert entries[0].previous_hash == first.current_hash
+        assert all(e.verify_integrity() for e in entries)
+        is_valid, issues = AuditChainService.verify_chain_integrity(db, chain_id)
+        assert is_valid and issues == []
+
+    def test_cached_head_skips_head_query(self, db: Session, test_user):
+        """Test the second append reads the head from the cache"""
+        from app.monitoring.query_stats import track_queries
+
+        chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+        AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="A", user_id=test_user.id
+        )
+
+        with track_queries() as stats:
+            AuditChainService.append_to_chain(
+                db=db, chain_id=chain_id, event_type="B", user_id=test_user.id
+            )
+
+        assert not any(
+            "ORDER BY audit_chains.sequence_number DESC" in sql
+            for sql in stats.statements
+        )
+
+    def test_stale_cached_head_is_reloaded(self, db: Session, test_user):
+        """Test an append from another process invalidates the cached head"""
+        from app.services.audit_chain_service import chain_head_cache
+
+        chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+        AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="A", user_id=test_user.id
+        )
+        stale = chain_head_cache.get(chain_id)
+        AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="B", user_id=test_user.id
+        )
+        chain_head_cache.set(chain_id, *stale)
+
+        entry = AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="C", user_id=test_user.id
+        )
+
+        assert entry.sequence_number == 2
+        assert AuditChainService.verify_chain_integrity(db, chain_id)[0]
+
+    def test_merkle_write_error_is_not_taken_for_a_stale_head(
+        self, db: Session, test_user, monkeypatch
+    ):
+        """Test only a taken sequence number makes an append reload the head"""
+        from app.models.audit_chain import AuditChainMerkleNode
+        from app.services.audit_chain_service import chain_head_cache
+
+        chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+        AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="A", user_id=test_user.id
+        )
+        # The node the next append completes already exists
+        db.add(
+            AuditChainMerkleNode(
+                chain_id=chain_id, level=1, node_index=0, hash="0" * 64
+            )
+        )
+        db.commit()
+        reloads = []
+        monkeypatch.setattr(
+            AuditChainService,
+            "_load_head",
+            staticmethod(lambda db, chain_id: reloads.append(chain_id)),
+        )
+
+        with pytest.raises(IntegrityError, match="audit_chain_merkle_nodes"):
+            AuditChainService.append_to_chain(
+                db=db, chain_id=chain_id, event_type="B", user_id=test_user.id
+            )
+        db.rollback()
+
+        assert reloads == []
+        assert chain_head_cache.get(chain_id) is None
+
+    def _build_chain(self, db: Session, test_user, count: int) -> str:
+        chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+        AuditChainService.append_many(
+            db,
+            chain_id,
+            [
+                {"event_type": "EVENT", "user_id": test_user.id, "data": {"n": n}}
+                for n in range(count)
+            ],
+        )
+        return chain_id
+
+    def test_verification_resumes_from_signed_checkpoint(
+        self, db: Session, test_user, monkeypatch
+    ):
+        """Test clean runs checkpoint and later runs only verify new entries"""
+        from app.config import settings
+        from app.models.audit_chain import AuditChainCheckpoint
+
+        monkeypatch.setattr(settings, "AUDIT_CHAIN_CHECKPOINT_INTERVAL", 5)
+        chain_id = self._build_chain(db, test_user, 12)
+
+        first = AuditChainService.run_verification(db, chain_id)
+        assert first.is_valid and first.entries_verified == 12
+        checkpoints = db.query(AuditChainCheckpoint).order_by(
+            AuditChainCheckpoint.sequence_number
+        )
+        assert [c.sequence_number for c in checkpoints] == [4, 9]
+
+        AuditChainService.append_to_chain(
+            db=db, chain_id=chain_id, event_type="LATER", user_id=test_user.id
+        )
+        second = AuditChainService.run_verification(db, chain_id)
+        assert second.is_valid
+        assert (second.start_sequence, second.entries_verified) == (10, 3)
+
+    def test_forged_checkpoint_falls_back_to_genesis(
+        self, db: Session, test_user, monkeypatch
+    ):
+        """Test a checkpoint with a bad signature is reported and ignored"""
+        from app.config import settings
+        from app.models.audit_chain import AuditChainCheckpoint
+
+        monkeypatch.setattr(settings, "AUDIT_CHAIN_CHECKPOINT_INTERVAL", 5)
+        chain_id = self._build_chain(db, test_user, 6)
+        AuditChainService.run_verification(db, chain_id)
+
+        # Tamper with an early entry and move the checkpoint past it
+        entry = (
+            db.query(AuditChain)
+            .filter(AuditChain.chain_id == chain_id, AuditChain.sequence_number == 1)
+            .one()
+        )
+        entry.data = json.dumps({"n": 999})
+        checkpoint = db.query(AuditChainCheckpoint).one()
+        checkpoint.signature = "0" * 64
+        db.commit()
+
+        result = AuditChainService.run_verification(db, chain_id)
+
+        assert result.start_sequence == 0
+        assert {issue["type"] for issue in result.issues} == {
+            "checkpoint_invalid",
+            "entry_tampered",
+        }
+
+    def test_clean_verification_resigns_stale_checkpoint(
+        self, db: Session, test_user, monkeypatch
+    ):
+        """Test a checkpoint with a stale signature is rewritten, not kept"""
+        from app.config import settings
+        from app.models.audit_chain import AuditChainCheckpoint
+        from app.services.audit_chain_verification import \
+            checkpoint_is_authentic
+
+        monkeypatch.setattr(settings, "AUDIT_CHAIN_CHECKPOINT_INTERVAL", 5)
+        chain_id = self._build_chain(db, test_user, 6)
+        AuditChainService.run_verification(db, chain_id)
+        checkpoint = db.query(AuditChainCheckpoint).one()
+        checkpoint.signature = "0" * 64
+        db.commit()
+
+        assert not AuditChainService.run_verification(db, chain_id).is_valid
+        db.refresh(checkpoint)
+        assert checkpoint_is_authentic(checkpoint)
+        assert AuditChainService.run_verification(db, chain_id).is_valid
+
+    def test_full_verification_runs_as_a_job(self, db: Session, test_user):
+        """Test the queued full verification reports the chain's outcome"""
+        from app.services.job_handlers import verify_audit_chain_full
+
+        chain_id = self._build_chain(db, test_user, 3)
+
+        assert verify_audit_chain_full(db, chain_id) == {
+            "is_valid": True,
+            "issues": 0,
+            "entries_verified": 3,
+            "checkpoints_created": 0,
+        }
+
+    def test_parallel_full_verification_matches_serial(
+        self, db: Session, test_user, monkeypatch
+    ):
+        """Test segments verified on a process pool are stitched in order"""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "AUDIT_CHAIN_VERIFY_SEGMENT_SIZE", 4)
+        chain_id = self._build_chain(db, test_user, 15)
+        # Break the link at a segment boundary and tamper inside a segment
+        for sequence_number, values in [
+            (8, {"previous_hash": "f" * 64}),
+            (10, {"event_type": "FORGED"}),
+        ]:
+            db.query(AuditChain).filter(
+                AuditChain.chain_id == chain_id,
+                AuditChain.sequence_number == sequence_number,
+            ).update(values)
+        db.commit()
+
+        from app.services.audit_chain_verification import \
+            ChainVerificationService
+
+        serial = ChainVerificationService.verify_full(db, chain_id, workers=1)
+        parallel = ChainVerificationService.verify_full(db, chain_id, workers=2)
+
+        assert parallel.parallel and not serial.parallel
+        assert parallel.entries_verified == serial.entries_verified == 15
+        assert parallel.issues == serial.issues
+        assert [i["type"] for i in parallel.issues] == [
+            "hash_chain_broken",
+            "entry_tampered",
+            "entry_tampered",
+        ]
@@ -0,0 +1,181 @@
+import hashlib
+import json
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import merkle
+from app.config import settings
+from app.core.rbac import require_superadmin
+from app.db import get_db
+from app.models.audit_chain import (AuditChain, AuditChainMerkleNode,
+                                    AuditChainMerkleRoot)
+from app.models.user import UserRole
+from app.routers import admin
+from app.services.audit_chain_service import (AuditChainService,
+                                              chain_head_cache)
+from app.services.audit_chain_verification import signing_key
+from app.services.audit_merkle_service import AuditMerkleService
+
+
+def _naive_root(leaves):
+    if len(leaves) == 1:
+        return leaves[0]
+    k = merkle._split(len(leaves))
+    return merkle.node_hash(_naive_root(leaves[:k]), _naive_root(leaves[k:]))
+
+
+def _entry_hash(n):
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+def test_accumulator_matches_rfc6962_tree_and_proves_every_leaf():
+    frontier, nodes, size = {}, {}, 0
+    leaves = []
+    for n in range(33):
+        leaves.append(merkle.leaf_hash(_entry_hash(n)))
+        nodes[(0, n)] = leaves[-1]
+        size, completed = merkle.append_leaf(frontier, size, leaves[-1])
+        nodes.update({(level, index): h for level, index, h in completed})
+
+        root = merkle.root_from_frontier(frontier)
+        assert root == _naive_root(leaves)
+        for leaf_index in range(size):
+            keys = merkle.proof_node_keys(leaf_index, size)
+            path, proof_root = merkle.inclusion_proof(
+                leaf_index, size, {key: nodes[key] for key in keys}
+            )
+            assert proof_root == root
+            assert len(path) <= size.bit_length()
+            assert merkle.verify_inclusion(
+                _entry_hash(leaf_index), leaf_index, size, path, root
+            )
+
+
+def test_inclusion_rejects_wrong_leaf_index_and_truncated_proof():
+    frontier, nodes, size = {}, {}, 0
+    for n in range(6):
+        leaf = merkle.leaf_hash(_entry_hash(n))
+        nodes[(0, n)] = leaf
+        size, completed = merkle.append_leaf(frontier, size, leaf)
+        nodes.update({(level, index): h for level, index, h in completed})
+    path, root = merkle.inclusion_proof(3, 6, nodes)
+
+    assert merkle.verify_inclusion(_entry_hash(3), 3, 6, path, root)
+    assert not merkle.verify_inclusion(_entry_hash(3), 2, 6, path, root)
+    assert not merkle.verify_inclusion(_entry_hash(4), 3, 6, path, root)
+    assert not merkle.verify_inclusion(_entry_hash(3), 3, 6, path[:-1], root)
+    assert not merkle.verify_inclusion(_entry_hash(3), 3, 6, path, "0" * 64)
+
+
+def _append(db, test_user, count):
+    chain_id = AuditChainService.get_or_create_chain_id(test_user.company_id)
+    for n in range(count):
+        AuditChainService.append_to_chain(
+            db=db,
+            chain_id=chain_id,
+            event_type="EVENT",
+            user_id=test_user.id,
+            data={"n": n},
+        )
+    return chain_id
+
+
+def test_appends_store_periodic_signed_roots(db: Session, test_user, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_CHAIN_MERKLE_ROOT_INTERVAL", 4)
+    chain_id = _append(db, test_user, 9)
+
+    roots = db.query(AuditChainMerkleRoot).order_by(AuditChainMerkleRoot.tree_size)
+    assert [r.tree_size for r in roots] == [4, 8]
+    hashes = [
+        merkle.leaf_hash(h)
+        for (h,) in db.query(AuditChain.current_hash).order_by(
+            AuditChain.sequence_number
+        )
+    ]
+    assert roots[1].root_hash == _naive_root(hashes[:8])
+    assert merkle.verify_root_signature(
+        signing_key(), chain_id, 8, roots[1].root_hash, roots[1].signature
+    )
+
+
+def test_inclusion_proof_verifies_offline(db: Session, test_user, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_CHAIN_MERKLE_ROOT_INTERVAL", 4)
+    chain_id = _append(db, test_user, 7)
+
+    covered = AuditMerkleService.inclusion_proof(db, chain_id, 2)
+    assert covered["tree_size"] == 4
+    # No signed root covers entry 5 yet, so the current root is published
+    latest = AuditMerkleService.inclusion_proof(db, chain_id, 5)
+    assert latest["tree_size"] == 7
+
+    for proof in (covered, latest):
+        document = json.loads(json.dumps(proof))
+        assert merkle.verify_proof(document, key=signing_key()) == []
+    assert merkle.verify_proof(latest, key=b"wrong key") == ["bad_root_signature"]
+    assert AuditMerkleService.inclusion_proof(db, chain_id, 99) is None
+
+
+def test_rewritten_entry_is_not_included_in_signed_root(
+    db: Session, test_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUDIT_CHAIN_MERKLE_ROOT_INTERVAL", 4)
+    chain_id = _append(db, test_user, 4)
+
+    # Rewrite an entry consistently (data and hash); the signed root still
+    # pins the original
+    entry = db.query(AuditChain).filter(AuditChain.sequence_number == 1).one()
+    entry.data = json.dumps({"n": 999})
+    entry.current_hash = entry.compute_hash()
+    db.commit()
+
+    proof = AuditMerkleService.inclusion_proof(db, chain_id, 1, tree_size=4)
+    assert merkle.verify_proof(proof, key=signing_key()) == ["not_included"]
+
+
+def test_chain_without_nodes_is_rebuilt_by_the_verifier(db: Session, test_user):
+    chain_id = _append(db, test_user, 5)
+    db.query(AuditChainMerkleNode).delete()
+    db.commit()
+    chain_head_cache.clear()
+
+    # Appends don't rebuild the tree
+    _append(db, test_user, 1)
+    assert db.query(AuditChainMerkleNode).count() == 0
+
+    assert chain_head_cache.get(chain_id) is not None
+    assert AuditChainService.run_verification(db, chain_id).is_valid
+    assert db.query(AuditChainMerkleNode).count() > 0
+    # The rebuild drops this process's cached head and frontier
+    assert chain_head_cache.get(chain_id) is None
+    assert AuditMerkleService.frontier(db, chain_id, 6) is not None
+    hashes = [
+        merkle.leaf_hash(h)
+        for (h,) in db.query(AuditChain.current_hash).order_by(
+            AuditChain.sequence_number
+        )
+    ]
+    proof = AuditMerkleService.inclusion_proof(db, chain_id, 3)
+    assert proof["root_hash"] == _naive_root(hashes)
+    assert merkle.verify_proof(proof) == []
+
+
+def test_proof_endpoint(db: Session, test_user, test_superadmin):
+    chain_id = _append(db, test_user, 3)
+    superadmin = SimpleNamespace(
+        id=test_superadmin.id, role=UserRole.SUPERADMIN, company_id=None
+    )
+    api = FastAPI()
+    api.include_router(admin.router, prefix="/api/admin")
+    api.dependency_overrides[get_db] = lambda: db
+    api.dependency_overrides[require_superadmin] = lambda: superadmin
+    client = TestClient(api)
+
+    response = client.get(f"/api/admin/audit-chain/proof/{chain_id}/1")
+    assert response.status_code == 200
+    assert merkle.verify_proof(response.json(), key=signing_key()) == []
+
+    missing = client.get(f"/api/admin/audit-chain/proof/{chain_id}/1?tree_size=2")
+    assert missing.status_code == 404
@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+from app.services.audit_partition_service import (AuditPartitionService,
+                                                  add_months, partition_month,
+                                                  partition_name)
+from app.services.threat_monitor_service import ThreatMonitorService
+
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "audit_logs_p2026_03"
+    assert partition_month("audit_logs_p2026_03") == date(2026, 3, 1)
+    assert partition_month("audit_logs_default") is None
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_plan_creates_missing_months_ahead():
+    existing = [date(2026, 10, 1), date(2026, 11, 1)]
+
+    plan = AuditPartitionService.plan(
+        existing, date(2026, 10, 17), months_ahead=3, retention_months=0
+    )
+
+    assert plan.create == [date(2026, 12, 1), date(2027, 1, 1)]
+    assert plan.detach == []
+
+
+def test_plan_detaches_months_past_retention():
+    existing = [add_months(date(2024, 8, 1), n) for n in range(30)]
+
+    plan = AuditPartitionService.plan(
+        existing, date(2026, 10, 17), months_ahead=1, retention_months=24
+    )
+
+    # Horizon is 2024-10-01: August and September 2024 have fully passed it
+    assert plan.detach == ["audit_logs_p2024_08", "audit_logs_p2024_09"]
+    assert plan.create == []
+
+
+def test_maintain_is_a_no_op_without_partitioning(db: Session):
+    assert not AuditPartitionService.is_partitioned(db)
+    assert not AuditPartitionService.maintain(db)
+
+
+def test_live_violations_only_read_the_lookback_window(db: Session, test_user):
+    for days_ago in (1, 400):
+        db.add(
+            AuditLog(
+                event_type="SECURITY_AI_PROMPT_INJECTION",
+                user_id=test_user.id,
+                company_id=test_user.company_id,
+                details={"severity": "HIGH"},
+                created_at=datetime.utcnow() - timedelta(days=days_ago),
+            )
+        )
+    db.commit()
+
+    violations = ThreatMonitorService.get_live_violations(db)
+
+    assert len(violations) == 1
@@ -0,0 +1,117 @@
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.metrics import registry
+from app.models.audit_log import AuditLog
+from app.services import audit_service
+from app.services.audit_service import AuditService
+from app.services.audit_writer import AuditLogWriter
+
+
+@pytest.fixture
+def make_writer(db: Session):
+    writers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("flush_interval", 0.01)
+        writer = AuditLogWriter(sessionmaker(bind=db.get_bind()), **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.stop(timeout=5)
+
+
+def _row(user_id, n):
+    return {"event_type": "TEST", "user_id": user_id, "details": {"n": n}}
+
+
+def _dropped(reason):
+    return (
+        registry.get_sample_value(
+            "workforce_audit_log_events_dropped_total", {"reason": reason}
+        )
+        or 0
+    )
+
+
+def test_events_are_written_in_batches(db: Session, test_user, make_writer):
+    writer = make_writer(batch_size=3)
+    for n in range(7):
+        assert writer.submit(_row(test_user.id, n))
+
+    assert writer.flush(timeout=5)
+    details = [log.details["n"] for log in db.query(AuditLog).order_by(AuditLog.id)]
+    assert details == list(range(7))
+    assert writer.depth == 0
+
+
+def test_bad_row_does_not_drop_its_batch(db: Session, test_user, make_writer):
+    writer = make_writer(batch_size=10)
+    before = _dropped("write_error")
+    writer.start()
+    # Submitted before the thread wakes up, so all three share a batch
+    for row in (_row(test_user.id, 1), _row(None, 2), _row(test_user.id, 3)):
+        writer.submit(row)
+
+    assert writer.flush(timeout=5)
+    assert [log.details["n"] for log in db.query(AuditLog).order_by(AuditLog.id)] == [
+        1,
+        3,
+    ]
+    assert _dropped("write_error") == before + 1
+
+
+def test_full_queue_drops_instead_of_blocking(test_user, make_writer, monkeypatch):
+    writer = make_writer(max_queue=1)
+    monkeypatch.setattr(writer, "start", lambda: None)  # nothing drains
+    before = _dropped("queue_full")
+
+    assert writer.submit(_row(test_user.id, 1))
+    assert not writer.submit(_row(test_user.id, 2))
+    assert _dropped("queue_full") == before + 1
+
+
+def test_stop_flushes_queued_events(db: Session, test_user, make_writer):
+    writer = make_writer(flush_interval=0.5)
+    for n in range(3):
+        writer.submit(_row(test_user.id, n))
+
+    assert writer.stop(timeout=5)
+    assert db.query(AuditLog).count() == 3
+    assert not writer.submit(_row(test_user.id, 4))
+
+
+def test_async_durability_queues_log_event(
+    db: Session, test_user, make_writer, monkeypatch
+):
+    writer = make_writer()
+    monkeypatch.setattr(settings, "AUDIT_LOG_DURABILITY", "async")
+    monkeypatch.setattr(audit_service, "audit_log_writer", writer)
+
+    AuditService.log_admin_action(db, "VIEW_STATS", test_user.id, details={"n": 1})
+
+    assert writer.flush(timeout=5)
+    log = db.query(AuditLog).one()
+    assert (log.event_type, log.resource_type) == ("ADMIN_VIEW_STATS", "admin")
+    assert log.created_at is not None
+
+
+def test_async_durability_commits_flushed_work(
+    db: Session, test_user, make_writer, monkeypatch
+):
+    writer = make_writer()
+    monkeypatch.setattr(settings, "AUDIT_LOG_DURABILITY", "async")
+    monkeypatch.setattr(audit_service, "audit_log_writer", writer)
+    test_user.full_name = "Renamed"
+    db.flush()
+
+    AuditService.log_admin_action(db, "UPDATE_USER", test_user.id)
+
+    assert not db.in_transaction()
+    db.rollback()
+    db.refresh(test_user)
+    assert test_user.full_name == "Renamed"
+    assert writer.flush(timeout=5)
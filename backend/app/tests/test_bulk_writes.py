@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import db as app_db
+from app.crud import bulk_insert, create_user
+from app.deps import get_current_user, get_db
+from app.models.attendance import Attendance
+from app.models.payroll import Employee as PayrollEmployee
+from app.models.payroll import PayrollEntry, PayrollRun
+from app.models.shift import Shift
+from app.models.user import User, UserRole
+from app.monitoring.query_stats import track_queries
+from app.routers import attendance, payroll, shifts
+
+
+def _client(db: Session, user: User):
+    app = FastAPI()
+    for module in (shifts, payroll, attendance):
+        app.include_router(module.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[app_db.get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+@pytest.fixture
+def client(db: Session, test_companyadmin: User):
+    return _client(db, test_companyadmin)
+
+
+def _shift_rows(company, employee, count=1, start=datetime(2026, 3, 2, 9)):
+    return [
+        {
+            "company_id": company.id,
+            "employee_id": employee.id,
+            "start_at": (start + timedelta(days=i)).isoformat(),
+            "end_at": (start + timedelta(days=i, hours=8)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "role, shifts_allowed, payroll_allowed",
+    [
+        (UserRole.COMPANY_ADMIN, True, True),
+        (UserRole.DEPARTMENT_ADMIN, True, True),
+        (UserRole.TEAM_LEAD, True, False),
+        (UserRole.EMPLOYEE, False, False),
+    ],
+)
+def test_bulk_endpoints_check_user_roles(
+    db: Session, test_company, test_user, role, shifts_allowed, payroll_allowed
+):
+    user = create_user(
+        db=db,
+        email=f"{role.value.lower()}@example.com",
+        password="testpass",
+        full_name=role.value,
+        role=role.value,
+        company_id=test_company.id,
+    )
+    client = _client(db, user)
+    clock_in = datetime(2026, 4, 1, 9).isoformat()
+
+    responses = {
+        "shifts": client.post(
+            "/api/shifts/bulk", json=_shift_rows(test_company, test_user)
+        ),
+        "attendance": client.post(
+            "/api/attendance/bulk",
+            json=[{"employee_id": test_user.id, "clock_in_time": clock_in}],
+        ),
+        "payroll": client.post("/api/payroll-entries/bulk", json=[]),
+    }
+
+    allowed = {
+        "shifts": shifts_allowed,
+        "attendance": shifts_allowed,
+        "payroll": payroll_allowed,
+    }
+    assert {name: r.status_code != 403 for name, r in responses.items()} == allowed
+    if shifts_allowed:
+        assert len(responses["shifts"].json()["items"]) == 1
+        assert len(responses["attendance"].json()["items"]) == 1
+
+
+def test_bulk_insert_batches_and_preserves_order(db: Session, test_company, test_user):
+    start = datetime(2026, 2, 1, 9)
+    rows = [
+        {
+            "company_id": test_company.id,
+            "employee_id": test_user.id,
+            "start_at": start + timedelta(days=i),
+            "end_at": start + timedelta(days=i, hours=8),
+            "location": f"Site {i}",
+        }
+        for i in range(25)
+    ]
+    company_id = test_company.id
+
+    with track_queries() as stats:
+        created, errors = bulk_insert(db, Shift, rows, batch_size=10)
+
+    assert errors == []
+    assert [s["location"] for s in created] == [f"Site {i}" for i in range(25)]
+    assert all(s["id"] and s["created_at"] for s in created)
+    # One INSERT ... RETURNING per batch of 10, not one per row
+    assert stats.count == 3
+    assert db.query(Shift).filter(Shift.company_id == company_id).count() == 25
+
+
+def test_rejected_row_does_not_fail_its_batch(db: Session, test_company, test_user):
+    rows = [
+        {
+            "company_id": test_company.id,
+            "employee_id": test_user.id,
+            "start_at": datetime(2026, 2, 1, 9),
+            "end_at": datetime(2026, 2, 1, 17),
+            "location": f"Site {i}",
+        }
+        for i in range(4)
+    ]
+    rows[2]["start_at"] = None
+
+    created, errors = bulk_insert(db, Shift, rows, indexes=[10, 11, 12, 13])
+
+    assert [s["location"] for s in created] == ["Site 0", "Site 1", "Site 3"]
+    assert errors == [{"index": 12, "errors": ["Database rejected this row"]}]
+
+
+def test_bulk_shifts_report_invalid_rows_by_index(
+    client, db: Session, test_company, test_user
+):
+    start = datetime(2026, 3, 2, 9)
+    rows = [
+        {
+            "company_id": test_company.id,
+            "employee_id": test_user.id,
+            "start_at": start.isoformat(),
+            "end_at": (start + timedelta(hours=8)).isoformat(),
+        },
+        {"company_id": test_company.id, "employee_id": test_user.id},
+        {
+            "company_id": test_company.id,
+            "employee_id": test_user.id,
+            "start_at": start.isoformat(),
+            "end_at": (start - timedelta(hours=1)).isoformat(),
+        },
+        {
+            "company_id": test_company.id + 1,
+            "employee_id": test_user.id,
+            "start_at": start.isoformat(),
+            "end_at": (start + timedelta(hours=8)).isoformat(),
+        },
+    ]
+
+    body = client.post("/api/shifts/bulk", json=rows).json()
+
+    assert len(body["items"]) == 1
+    assert [e["index"] for e in body["errors"]] == [1, 2, 3]
+    assert any("end_at" in msg for msg in body["errors"][0]["errors"])
+    assert body["errors"][1]["errors"] == ["end_at must be after start_at"]
+
+
+def test_bulk_shift_update(client, db: Session, test_company, test_user):
+    start = datetime(2026, 3, 2, 9)
+    created = client.post(
+        "/api/shifts/bulk",
+        json=[
+            {
+                "company_id": test_company.id,
+                "employee_id": test_user.id,
+                "start_at": (start + timedelta(days=i)).isoformat(),
+                "end_at": (start + timedelta(days=i, hours=8)).isoformat(),
+            }
+            for i in range(3)
+        ],
+    ).json()["items"]
+
+    body = client.put(
+        "/api/shifts/bulk",
+        json=[
+            {"id": created[0]["id"], "location": "Warehouse"},
+            {"id": created[1]["id"]},
+            {"id": 999999, "location": "Nowhere"},
+            # Valid alone, but before the shift's stored start_at
+            {"id": created[2]["id"], "end_at": start.isoformat()},
+        ],
+    ).json()
+
+    assert [s["location"] for s in body["items"]] == ["Warehouse"]
+    assert [e["index"] for e in body["errors"]] == [1, 2, 3]
+    assert body["errors"][2]["errors"] == ["end_at must be after start_at"]
+    assert db.get(Shift, created[0]["id"]).location == "Warehouse"
+
+
+def test_bulk_payroll_entries_check_tenant(client, db: Session, test_company):
+    tenant_id = str(test_company.id)
+    run = PayrollRun(
+        tenant_id=tenant_id,
+        period_start=datetime(2026, 1, 1),
+        period_end=datetime(2026, 1, 31),
+    )
+    other_run = PayrollRun(
+        tenant_id="other",
+        period_start=datetime(2026, 1, 1),
+        period_end=datetime(2026, 1, 31),
+    )
+    employee = PayrollEmployee(
+        tenant_id=tenant_id, user_id=1, employee_id="E-1", base_salary=1000
+    )
+    db.add_all([run, other_run, employee])
+    db.commit()
+
+    rows = [
+        {"payroll_run_id": run.id, "employee_id": employee.id, "net_pay": 900},
+        {"payroll_run_id": other_run.id, "employee_id": employee.id},
+    ]
+    body = client.post("/api/payroll-entries/bulk", json=rows).json()
+
+    assert [e["net_pay"] for e in body["items"]] == [900]
+    assert body["items"][0]["status"] == "Pending"
+    assert body["errors"] == [{"index": 1, "errors": ["Payroll run not found"]}]
+    assert db.query(PayrollEntry).count() == 1
+
+
+def test_bulk_attendance_allows_one_open_record(
+    client, db: Session, test_user, test_user2
+):
+    clock_in = datetime(2026, 4, 1, 9)
+    rows = [
+        {
+            "employee_id": test_user.id,
+            "clock_in_time": clock_in.isoformat(),
+            "clock_out_time": (clock_in + timedelta(hours=8)).isoformat(),
+        },
+        {"employee_id": test_user.id, "clock_in_time": clock_in.isoformat()},
+        {"employee_id": test_user.id, "clock_in_time": clock_in.isoformat()},
+        {
+            "employee_id": test_user2.id,
+            "clock_in_time": clock_in.isoformat(),
+            "clock_out_time": (clock_in - timedelta(hours=1)).isoformat(),
+        },
+    ]
+    body = client.post("/api/attendance/bulk", json=rows).json()
+
+    assert [a["status"] for a in body["items"]] == ["completed", "active"]
+    assert body["items"][0]["total_hours"] == 8
+    assert [e["index"] for e in body["errors"]] == [2, 3]
+    assert db.query(Attendance).count() == 2
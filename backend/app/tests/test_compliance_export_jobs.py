@@ -0,0 +1,236 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.core.rbac import require_superadmin
+from app.db import get_db
+from app.models.audit_log import AuditLog
+from app.models.background_job import BackgroundJob
+from app.models.compliance_export_job import ExportStatus
+from app.models.user import UserRole
+from app.routers import admin
+from app.schemas.ai import ComplianceExportRequest
+from app.services.compliance_export_jobs import ComplianceExportJobService
+from app.services.compliance_export_service import ComplianceExportService
+from app.streaming import parse_byte_range
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "COMPLIANCE_EXPORT_DIR", str(tmp_path / "exports"))
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path / "archive"))
+
+
+def _events(db, user):
+    rows = [
+        ("AI_QUERY", "allowed", "low"),
+        ("AI_QUERY", "blocked", "HIGH"),
+        ("SECURITY_AI_JAILBREAK", "blocked", "critical"),
+        ("TRUST_SCORE_UPDATE", None, None),
+        ("LOGIN", None, None),  # Not part of compliance reports
+    ]
+    for n, (event_type, decision, severity) in enumerate(rows):
+        db.add(
+            AuditLog(
+                event_type=event_type,
+                user_id=user.id,
+                company_id=user.company_id,
+                details={"new_score": 90} if event_type == "TRUST_SCORE_UPDATE" else {},
+                ai_decision=decision,
+                ai_severity=severity,
+                created_at=NOW - timedelta(hours=n + 1),
+            )
+        )
+    db.commit()
+
+
+def _request(fmt, **fields):
+    return ComplianceExportRequest(
+        start_date=(NOW - timedelta(days=1)).isoformat(),
+        end_date=NOW.isoformat(),
+        format=fmt,
+        **fields,
+    )
+
+
+def _run(db, job_id):
+    factory = sessionmaker(bind=db.get_bind())
+    ComplianceExportJobService.run(
+        job_id, session_factory=factory, read_session_factory=factory
+    )
+
+
+def test_parse_byte_range():
+    assert parse_byte_range(None, 100) is None
+    assert parse_byte_range("bytes=0-9", 100) == (0, 9)
+    assert parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert parse_byte_range("bytes=-10", 100) == (90, 99)
+    assert parse_byte_range("bytes=50-500", 100) == (50, 99)
+    # Multiple or malformed ranges are ignored: the whole file is sent
+    assert parse_byte_range("bytes=0-1,5-6", 100) is None
+    assert parse_byte_range("items=0-1", 100) is None
+    assert parse_byte_range("bytes=9-0", 100) is None
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=100-", 100)
+
+
+def test_violation_summary_is_grouped_in_sql(db: Session, test_user):
+    _events(db, test_user)
+
+    summary = ComplianceExportService.violation_summary(
+        db, test_user.company_id, NOW - timedelta(days=1), NOW
+    )
+
+    assert summary["total_events"] == 4
+    assert summary["violations_by_type"] == {
+        "AI_QUERY": 2,
+        "SECURITY_AI_JAILBREAK": 1,
+        "TRUST_SCORE_UPDATE": 1,
+    }
+    assert summary["ai_decisions"] == {
+        "allowed": 1,
+        "blocked": 2,
+        "pending_approval": 0,
+    }
+    assert summary["violations_by_severity"] == {
+        "LOW": 1,
+        "MEDIUM": 0,
+        "HIGH": 1,
+        "CRITICAL": 1,
+    }
+    assert summary["violations_by_user"] == {
+        test_user.id: {"count": 4, "email": test_user.email}
+    }
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "pdf"])
+def test_export_job_writes_file(db: Session, test_user, fmt):
+    _events(db, test_user)
+    job = ComplianceExportJobService.create_job(db, _request(fmt), test_user.id)
+
+    _run(db, job.id)
+
+    db.refresh(job)
+    assert job.status == ExportStatus.COMPLETED
+    assert (job.rows_total, job.rows_written, job.progress) == (4, 4, 1.0)
+    with open(job.file_path, "rb") as f:
+        content = f.read()
+    assert len(content) == job.file_size
+    if fmt == "json":
+        report = json.loads(content)
+        assert report["violation_summary"]["total_events"] == 4
+        # Newest first in the fixture, oldest first in the report
+        assert [log["event_type"] for log in report["detailed_logs"]] == [
+            "TRUST_SCORE_UPDATE",
+            "SECURITY_AI_JAILBREAK",
+            "AI_QUERY",
+            "AI_QUERY",
+        ]
+        assert report["trust_score_history"][str(test_user.id)][0]["new_score"] == 90
+    elif fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(content.decode("utf-8"))))
+        assert len(rows) == 4
+        assert rows[0]["user_email"] == test_user.email
+    else:
+        assert content.startswith(b"%PDF")
+
+    # A job only runs once
+    _run(db, job.id)
+    db.refresh(job)
+    assert job.rows_written == 4
+
+
+def test_export_job_records_failure(db: Session, test_user):
+    job = ComplianceExportJobService.create_job(db, _request("json"), test_user.id)
+    job.parameters = dict(job.parameters, company_id="not a number")
+    db.commit()
+
+    _run(db, job.id)
+
+    db.refresh(job)
+    assert job.status == ExportStatus.FAILED
+    assert job.error
+    assert job.file_path is None
+
+
+def test_export_endpoints(db: Session, test_user, test_superadmin):
+    _events(db, test_user)
+    superadmin = SimpleNamespace(
+        id=test_superadmin.id, role=UserRole.SUPERADMIN, company_id=None
+    )
+    api = FastAPI()
+    api.include_router(admin.router, prefix="/api/admin")
+    api.dependency_overrides[get_db] = lambda: db
+    api.dependency_overrides[require_superadmin] = lambda: superadmin
+    client = TestClient(api)
+
+    bad = client.post(
+        "/api/admin/ai/compliance-exports", json=_request("xml").model_dump()
+    )
+    assert bad.status_code == 400
+
+    started = client.post(
+        "/api/admin/ai/compliance-exports", json=_request("csv").model_dump()
+    )
+    assert started.status_code == 202
+    job_id = started.json()["id"]
+    assert started.json()["status"] == "PENDING"
+    queued = db.query(BackgroundJob).one()
+    assert (queued.job_type, queued.payload) == (
+        "compliance_export.generate",
+        {"job_id": job_id},
+    )
+    assert (
+        client.get(f"/api/admin/ai/compliance-exports/{job_id}/download").status_code
+        == 409
+    )
+
+    _run(db, job_id)
+    db.expire_all()  # The job was updated through another session
+    status = client.get(f"/api/admin/ai/compliance-exports/{job_id}").json()
+    assert status["status"] == "COMPLETED"
+    assert status["progress"] == 1.0
+    download_url = status["download_url"]
+
+    full = client.get(download_url)
+    assert full.status_code == 200
+    assert full.headers["accept-ranges"] == "bytes"
+    assert len(full.content) == status["file_size"]
+
+    partial = client.get(download_url, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 10-19/{status['file_size']}"
+    assert partial.content == full.content[10:20]
+
+    beyond = client.get(
+        download_url, headers={"Range": f"bytes={status['file_size']}-"}
+    )
+    assert beyond.status_code == 416
+
+
+def test_legacy_export_endpoint_queues_a_job(db: Session, test_superadmin):
+    superadmin = SimpleNamespace(
+        id=test_superadmin.id, role=UserRole.SUPERADMIN, company_id=None
+    )
+    api = FastAPI()
+    api.include_router(admin.router, prefix="/api/admin")
+    api.dependency_overrides[get_db] = lambda: db
+    api.dependency_overrides[require_superadmin] = lambda: superadmin
+
+    response = TestClient(api).post(
+        "/api/admin/ai/compliance-export", json=_request("json").model_dump()
+    )
+
+    assert response.status_code == 202
+    queued = db.query(BackgroundJob).one()
+    assert queued.payload == {"job_id": response.json()["id"]}
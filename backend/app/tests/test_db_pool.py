@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine
+
+from app.config import Settings
+from app.db_pool import engine_options, instrumented_pool_class
+from app.metrics import registry
+
+
+def _sample(name, pool):
+    return registry.get_sample_value(name, {"pool": pool}) or 0
+
+
+def test_engine_profile_follows_app_env():
+    profile = Settings(APP_ENV="production").engine_profile()
+    assert profile["name"] == "prod"
+    assert profile["echo"] is False
+    assert profile["statement_timeout_ms"] > 0
+
+
+def test_engine_profile_overrides():
+    profile = Settings(
+        DB_ENGINE_PROFILE="prod", DB_POOL_SIZE=3, DB_STATEMENT_TIMEOUT_MS=0
+    ).engine_profile()
+    assert profile["pool_size"] == 3
+    assert profile["statement_timeout_ms"] == 0
+    assert profile["max_overflow"] == 10
+
+
+def test_unknown_engine_profile():
+    with pytest.raises(ValueError):
+        Settings(DB_ENGINE_PROFILE="bogus").engine_profile()
+
+
+def test_engine_options_statement_timeout():
+    profile = Settings(DB_ENGINE_PROFILE="prod").engine_profile()
+    url = "postgresql://u:p@localhost/db"
+
+    sync_options = engine_options(profile, url, "primary")
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=15000"}
+    assert sync_options["pool_size"] == 20
+
+    async_options = engine_options(profile, url, "primary", is_async=True)
+    assert async_options["connect_args"] == {
+        "server_settings": {"statement_timeout": "15000"}
+    }
+
+
+def test_pool_metrics_exported():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=instrumented_pool_class("test_pool"),
+        pool_size=1,
+        max_overflow=1,
+    )
+    checkouts = _sample("workforce_db_pool_checkout_wait_seconds_count", "test_pool")
+    overflows = _sample("workforce_db_pool_overflow_total", "test_pool")
+
+    first = engine.connect()
+    second = engine.connect()
+    assert _sample("workforce_db_pool_connections_in_use", "test_pool") == 2
+
+    second.close()
+    first.close()
+    assert _sample("workforce_db_pool_connections_in_use", "test_pool") == 0
+    assert (
+        _sample("workforce_db_pool_checkout_wait_seconds_count", "test_pool")
+        == checkouts + 2
+    )
+    assert _sample("workforce_db_pool_overflow_total", "test_pool") == overflows + 1
+    engine.dispose()
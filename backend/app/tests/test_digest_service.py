@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.crud import create_user
+from app.models.notification import (Notification, NotificationStatus,
+                                     NotificationType)
+from app.models.notification_digest import (DigestStatus, DigestType,
+                                            NotificationDigest)
+from app.models.notification_preferences import NotificationPreferences
+from app.services.digest_service import DigestService
+from app.services.job_handlers import build_daily_digests
+
+NOW = datetime(2026, 3, 5, 6, 0)
+
+
+def _user(db, company, email, digest_mode, mute_all=False):
+    user = create_user(
+        db=db,
+        email=email,
+        password="testpass",
+        full_name=email,
+        role="EMPLOYEE",
+        company_id=company.id,
+    )
+    db.add(
+        NotificationPreferences(
+            user_id=user.id,
+            company_id=company.id,
+            digest_mode=digest_mode,
+            mute_all=mute_all,
+        )
+    )
+    db.commit()
+    return user
+
+
+def _notify(db, user, type, hours_ago, status=NotificationStatus.UNREAD):
+    notification = Notification(
+        user_id=user.id,
+        company_id=user.company_id,
+        title="Update",
+        message="Something happened",
+        type=type,
+        status=status,
+        created_at=NOW - timedelta(hours=hours_ago),
+    )
+    db.add(notification)
+    db.commit()
+    return notification
+
+
+@pytest.fixture
+def users(db: Session, test_company):
+    return {
+        mode: _user(db, test_company, f"{mode}@example.com", mode)
+        for mode in ("daily", "weekly", "immediate")
+    }
+
+
+def test_daily_digests_are_built_in_batches(db: Session, test_company, users):
+    daily, immediate = users["daily"], users["immediate"]
+    other = _user(db, test_company, "other@example.com", "daily")
+    muted = _user(db, test_company, "muted@example.com", "daily", mute_all=True)
+    _notify(db, daily, NotificationType.TASK_ASSIGNED, 1)
+    _notify(db, daily, NotificationType.TASK_ASSIGNED, 5)
+    _notify(db, daily, NotificationType.SHIFT_SCHEDULED, 2)
+    old = _notify(db, daily, NotificationType.TASK_ASSIGNED, 30)
+    later = _notify(db, daily, NotificationType.TASK_ASSIGNED, -1)
+    _notify(db, daily, NotificationType.CHAT_MESSAGE, 3, NotificationStatus.READ)
+    _notify(db, other, NotificationType.LEAVE_APPROVED, 4)
+    skipped = [
+        _notify(db, immediate, NotificationType.TASK_ASSIGNED, 1),
+        _notify(db, muted, NotificationType.TASK_ASSIGNED, 1),
+    ]
+    reports = []
+
+    result = DigestService(db).build_digests(
+        DigestType.DAILY,
+        batch_size=1,
+        now=NOW,
+        progress=lambda result, total: reports.append((result.digests, total)),
+    )
+
+    assert (result.users, result.digests, result.batches) == (2, 2, 2)
+    assert result.notifications == 4
+    assert reports == [(1, 2), (2, 2)]
+
+    digests = {d.user_id: d for d in db.query(NotificationDigest)}
+    assert set(digests) == {daily.id, other.id}
+    digest = digests[daily.id]
+    assert digest.digest_type == DigestType.DAILY
+    assert digest.status == DigestStatus.PENDING
+    assert digest.company_id == test_company.id
+    assert digest.notification_count == 3
+    assert digest.scheduled_for == NOW + timedelta(hours=1)
+    assert digest.summary == (
+        "You have 3 new notifications from the last 24 hours:\n"
+        "- 1 shift scheduled\n"
+        "- 2 task assigned\n"
+    )
+
+    unread = {
+        n.id
+        for n in db.query(Notification).filter(
+            Notification.status == NotificationStatus.UNREAD
+        )
+    }
+    assert unread == {old.id, later.id} | {n.id for n in skipped}
+
+
+def test_rerun_only_builds_missing_digests(db: Session, users):
+    daily = users["daily"]
+    _notify(db, daily, NotificationType.TASK_ASSIGNED, 1)
+    service = DigestService(db)
+
+    assert service.build_digests(DigestType.DAILY, now=NOW).digests == 1
+    # Everything digested is read now, so a retried run has nothing to add
+    assert service.build_digests(DigestType.DAILY, now=NOW).digests == 0
+
+    _notify(db, daily, NotificationType.TASK_COMPLETED, 0.5)
+    result = service.build_digests(DigestType.DAILY, now=NOW)
+    assert (result.digests, result.notifications) == (1, 1)
+    assert db.query(NotificationDigest).count() == 2
+
+
+def test_digest_job_uses_the_scheduled_time(db: Session, users):
+    _notify(db, users["daily"], NotificationType.TASK_ASSIGNED, 1)
+
+    # A late run or a retry builds the window the job was scheduled for
+    assert build_daily_digests(db, now=NOW.isoformat())["users"] == 1
+    digest = db.query(NotificationDigest).one()
+    assert digest.scheduled_for == NOW + timedelta(hours=1)
+
+
+def test_weekly_digest_groups_by_day(db: Session, users):
+    weekly = users["weekly"]
+    _notify(db, weekly, NotificationType.TASK_ASSIGNED, 1)
+    _notify(db, weekly, NotificationType.TASK_ASSIGNED, 2)
+    _notify(db, weekly, NotificationType.LEAVE_APPROVED, 24 * 3)
+    _notify(db, weekly, NotificationType.LEAVE_APPROVED, 24 * 8)
+    _notify(db, users["daily"], NotificationType.TASK_ASSIGNED, 1)
+
+    result = DigestService(db).build_digests(DigestType.WEEKLY, now=NOW)
+
+    assert (result.digests, result.notifications) == (1, 3)
+    digest = db.query(NotificationDigest).one()
+    assert digest.user_id == weekly.id
+    assert digest.digest_type == DigestType.WEEKLY
+    assert digest.scheduled_for == NOW + timedelta(hours=2)
+    assert digest.summary == (
+        "Weekly summary: 3 notifications from the past 7 days\n\n"
+        "Thursday, March 05:\n"
+        "  - 2 task assigned\n\n"
+        "Monday, March 02:\n"
+        "  - 1 leave approved\n\n"
+    )
@@ -10,6 +10,9 @@ class TestEmailService:
     def setup_method(self):
         self.email_service = EmailService()
 
+    def teardown_method(self):
+        self.email_service.smtp_dispatcher.stop(timeout=5)
+
     @patch("smtplib.SMTP")
     def test_send_email_via_smtp_success(self, mock_smtp):
         """Test successful email sending via SMTP"""
@@ -21,11 +24,23 @@ class TestEmailService:
         )
 
         assert result is True
-        mock_smtp.assert_called_once_with(settings.SMTP_SERVER, settings.SMTP_PORT)
+        mock_smtp.assert_called_once_with(
+            settings.SMTP_SERVER,
+            settings.SMTP_PORT,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once()
         mock_server.sendmail.assert_called_once()
-        mock_server.quit.assert_called_once()
+        # The connection stays open for the next email
+        mock_server.quit.assert_not_called()
+
+        assert self.email_service.send_email(
+            "other@example.com", "Test Subject", "<p>Test</p>", "Test"
+        )
+        mock_smtp.assert_called_once()
+        mock_server.login.assert_called_once()
+        assert mock_server.sendmail.call_count == 2
 
     @patch("smtplib.SMTP")
     def test_send_email_via_smtp_failure_fallback_to_sendgrid(self, mock_smtp):
@@ -0,0 +1,206 @@
+import io
+import json
+import tempfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.auth import create_access_token
+from app.deps import get_db
+from app.models.company import Company
+from app.models.employee_profile import EmployeeProfile
+from app.models.payroll import Employee as PayrollEmployee
+from app.models.payroll import Salary
+from app.models.user import User
+from app.routers import employees
+from app.services.employee_import_service import EmployeeImportService
+
+HEADER = "email,full_name,employee_code,department,position,hire_date,base_salary\n"
+
+
+def _csv(*lines):
+    return io.StringIO(HEADER + "".join(line + "\n" for line in lines))
+
+
+@pytest.fixture
+def other_company_user(db: Session, test_company: Company):
+    user = User(
+        email="taken@other.com",
+        hashed_password="x",
+        full_name="Other",
+        company_id=test_company.id + 100,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_import_merges_valid_rows_and_reports_rejects(
+    db: Session, test_company: Company, test_user: User, other_company_user
+):
+    stream = _csv(
+        "new1@example.com,New One,E-1,Ops,Analyst,2025-01-15,5000",
+        "test@example.com,,E-2,Eng,Developer,,6000",
+        "dup@example.com,Dup A,E-3,Ops,Clerk,,100",
+        "dup@example.com,Dup B,E-4,Ops,Clerk,,100",
+        "bad@example.com,Bad,E-5,Ops,Clerk,,lots",
+        "taken@other.com,Taken,E-6,Ops,Clerk,,100",
+        "new2@example.com,New Two,E-8,Ops,Clerk,,100",
+        "new3@example.com,New Three,E-8,Ops,Clerk,,100",
+    )
+
+    summary = EmployeeImportService.run_import(db, stream, "csv", test_company.id)
+
+    assert summary["rows_read"] == 8
+    assert summary["rows_imported"] == 2
+    assert summary["errors"] == [
+        {"line": 4, "errors": ["Duplicate email in file"]},
+        {"line": 5, "errors": ["Duplicate email in file"]},
+        {"line": 6, "errors": ["base_salary: a number is required"]},
+        {"line": 7, "errors": ["Email belongs to a user in another company"]},
+        {"line": 8, "errors": ["Duplicate employee_code in file"]},
+        {"line": 9, "errors": ["Duplicate employee_code in file"]},
+    ]
+
+    new_user = db.query(User).filter(User.email == "new1@example.com").one()
+    assert new_user.company_id == test_company.id
+    assert new_user.full_name == "New One"
+    assert db.query(User).filter(User.email == "test@example.com").count() == 1
+
+    employee = (
+        db.query(PayrollEmployee).filter(PayrollEmployee.employee_id == "E-2").one()
+    )
+    assert employee.user_id == test_user.id
+    assert employee.tenant_id == str(test_company.id)
+    salaries = db.query(Salary).filter(Salary.employee_id == employee.id).all()
+    assert [s.amount for s in salaries] == [6000]
+
+    profile = (
+        db.query(EmployeeProfile).filter(EmployeeProfile.user_id == test_user.id).one()
+    )
+    assert (profile.department, profile.employee_id) == ("Eng", "E-2")
+
+
+def test_reimport_updates_without_duplicating_salaries(
+    db: Session, test_company: Company, test_user: User
+):
+    row = "test@example.com,Test User,E-9,Eng,Developer,2024-05-01,{}"
+    EmployeeImportService.run_import(db, _csv(row.format(4000)), "csv", test_company.id)
+    EmployeeImportService.run_import(db, _csv(row.format(4000)), "csv", test_company.id)
+    employee = (
+        db.query(PayrollEmployee).filter(PayrollEmployee.employee_id == "E-9").one()
+    )
+    assert db.query(Salary).filter(Salary.employee_id == employee.id).count() == 1
+
+    summary = EmployeeImportService.run_import(
+        db, _csv(row.format(4500).replace("Eng", "Platform")), "csv", test_company.id
+    )
+    db.expire_all()
+
+    assert summary["rows_imported"] == 1
+    assert employee.department == "Platform"
+    assert employee.base_salary == 4500
+    amounts = sorted(
+        s.amount
+        for s in db.query(Salary).filter(Salary.employee_id == employee.id).all()
+    )
+    assert amounts == [4000, 4500]
+
+
+def test_employee_code_of_another_tenant_is_rejected(
+    db: Session, test_company: Company, test_user: User
+):
+    db.add(
+        PayrollEmployee(
+            tenant_id="other", user_id=test_user.id, employee_id="E-77", base_salary=1
+        )
+    )
+    db.commit()
+
+    summary = EmployeeImportService.run_import(
+        db,
+        _csv("test2@example.com,,E-77,Ops,Clerk,,10"),
+        "csv",
+        test_company.id,
+    )
+
+    assert summary["rows_imported"] == 0
+    assert summary["errors"] == [
+        {"line": 2, "errors": ["employee_code is used by another company"]}
+    ]
+
+
+def test_dry_run_writes_nothing(db: Session, test_company: Company):
+    ndjson = io.StringIO(
+        json.dumps({"email": "dry@example.com", "employee_code": "D-1", "base_salary": 1})
+        + "\nnot json\n"
+    )
+
+    summary = EmployeeImportService.run_import(
+        db, ndjson, "ndjson", test_company.id, dry_run=True
+    )
+
+    assert summary["rows_rejected"] == 1
+    assert summary["rows_imported"] == 0
+    assert summary["errors"] == [{"line": 2, "errors": ["Line is not a JSON object"]}]
+    assert db.query(User).filter(User.email == "dry@example.com").count() == 0
+
+
+@pytest.fixture
+def import_client(db: Session, monkeypatch):
+    monkeypatch.setattr(employees, "SessionLocal", lambda: db)
+    app = FastAPI()
+    app.include_router(employees.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def _auth(user: User):
+    token = create_access_token(
+        user.email, user.company_id, user.role.value, token_version=user.token_version
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_import_endpoint_streams_progress(import_client, test_companyadmin: User):
+    client = import_client
+    client.headers.update(_auth(test_companyadmin))
+
+    response = client.post(
+        "/api/employees/import",
+        files={"file": ("staff.csv", HEADER + "api@example.com,,A-1,,,,10\n")},
+    )
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [e["stage"] for e in events] == ["staging", "validated", "merged", "done"]
+    assert events[-1]["rows_imported"] == 1
+
+    bad = client.post("/api/employees/import", files={"file": ("staff.xlsx", b"")})
+    assert bad.status_code == 400
+
+
+def test_import_endpoint_removes_its_spool_file(
+    import_client, test_companyadmin: User, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    response = import_client.post(
+        "/api/employees/import",
+        files={"file": ("staff.csv", HEADER + "spool@example.com,,A-2,,,,10\n")},
+        headers=_auth(test_companyadmin),
+    )
+
+    assert response.status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_import_endpoint_requires_an_admin(import_client, test_user: User):
+    response = import_client.post(
+        "/api/employees/import",
+        files={"file": ("staff.csv", HEADER)},
+        headers=_auth(test_user),
+    )
+    assert response.status_code == 403
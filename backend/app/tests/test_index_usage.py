@@ -0,0 +1,166 @@
+"""EXPLAIN-based checks that hot queries keep using their composite indexes"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import distinct, func, text
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.audit_log import AuditLog
+from app.models.chat import ChatMessage
+from app.models.notification import (Notification, NotificationStatus,
+                                     NotificationType)
+
+
+def _plan(db: Session, query, literal_binds: bool = False) -> str:
+    """SQLite EXPLAIN QUERY PLAN output for an ORM query, as one string.
+
+    Partial indexes are only chosen when the planner can see the predicate
+    value, which psycopg2 gives Postgres by inlining parameters client-side;
+    ``literal_binds`` does the same here.
+    """
+    compiled = query.statement.compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": literal_binds},
+    )
+    params = tuple(
+        str(compiled.params[name]) if isinstance(compiled.params[name], datetime)
+        else compiled.params[name]
+        for name in compiled.positiontup
+    )
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.fixture
+def seeded(db: Session, test_company, test_user, test_user2):
+    """A few thousand rows spread over users and companies, then ANALYZE"""
+    now = datetime.utcnow()
+    users = [test_user.id, test_user2.id]
+    attendance, audit_logs, notifications, messages = [], [], [], []
+
+    for i in range(2000):
+        user_id = users[i % 2]
+        company_id = test_company.id if i % 4 else test_company.id + 1
+        created = now - timedelta(hours=i)
+        attendance.append(
+            Attendance(
+                company_id=company_id,
+                employee_id=user_id,
+                clock_in_time=created,
+                clock_out_time=None if i % 50 == 0 else created + timedelta(hours=8),
+                status="active" if i % 3 else "completed",
+            )
+        )
+        audit_logs.append(
+            AuditLog(
+                event_type="SECURITY_AI_VIOLATION" if i % 5 == 0 else "AUTH_SUCCESS",
+                user_id=user_id,
+                company_id=company_id,
+                created_at=created,
+            )
+        )
+        notifications.append(
+            Notification(
+                user_id=user_id,
+                company_id=company_id,
+                title="t",
+                message="m",
+                type=NotificationType.SYSTEM_MESSAGE,
+                status=NotificationStatus.UNREAD,
+                created_at=created,
+            )
+        )
+        messages.append(
+            ChatMessage(
+                company_id=test_company.id,
+                sender_id=user_id,
+                channel_id=i % 20 + 1,
+                message="hi",
+            )
+        )
+
+    db.add_all(attendance + audit_logs + notifications + messages)
+    db.commit()
+    db.execute(text("ANALYZE"))
+    return test_company.id, test_user.id
+
+
+def test_attendance_trend_uses_composite_index(db: Session, seeded):
+    company_id, _ = seeded
+    query = db.query(
+        func.date(Attendance.clock_in_time),
+        func.count(distinct(Attendance.employee_id)),
+    ).filter(
+        Attendance.company_id == company_id,
+        Attendance.clock_in_time >= datetime.utcnow() - timedelta(days=30),
+        Attendance.status == "active",
+    )
+    assert "ix_attendance_company_status_clock_in" in _plan(db, query)
+
+
+def test_open_attendance_uses_partial_index(db: Session, seeded):
+    _, user_id = seeded
+    query = db.query(Attendance).filter(
+        Attendance.employee_id == user_id, Attendance.clock_out_time.is_(None)
+    )
+    assert "ix_attendance_employee_open" in _plan(db, query)
+
+
+def test_anomaly_rule_count_uses_composite_index(db: Session, seeded):
+    _, user_id = seeded
+    query = db.query(func.count(AuditLog.id)).filter(
+        AuditLog.user_id == user_id,
+        AuditLog.event_type == "SECURITY_AUTH_FAILURE",
+        AuditLog.created_at >= datetime.utcnow() - timedelta(hours=1),
+    )
+    assert "ix_audit_logs_user_event_created" in _plan(db, query)
+
+
+def test_ai_violation_feed_uses_partial_index(db: Session, seeded):
+    company_id, _ = seeded
+    query = (
+        db.query(AuditLog)
+        .filter(
+            AuditLog.event_type.like("SECURITY_AI_%"),
+            AuditLog.company_id == company_id,
+        )
+        .order_by(AuditLog.created_at.desc())
+        .limit(50)
+    )
+    plan = _plan(db, query, literal_binds=True)
+    assert "ix_audit_logs_ai_security_company_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_notification_feed_uses_composite_index(db: Session, seeded):
+    company_id, user_id = seeded
+    query = (
+        db.query(Notification)
+        .filter(
+            Notification.user_id == user_id, Notification.company_id == company_id
+        )
+        .order_by(Notification.created_at.desc())
+        .limit(50)
+    )
+    plan = _plan(db, query)
+    assert "ix_notifications_user_company_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_channel_history_uses_composite_index(db: Session, seeded):
+    company_id, _ = seeded
+    query = (
+        db.query(ChatMessage)
+        .filter(
+            ChatMessage.channel_id == 3,
+            ChatMessage.company_id == company_id,
+            ChatMessage.id < 1500,
+        )
+        .order_by(ChatMessage.id.desc())
+        .limit(50)
+    )
+    plan = _plan(db, query)
+    assert "ix_chat_messages_channel_id_id" in plan
+    assert "TEMP B-TREE" not in plan
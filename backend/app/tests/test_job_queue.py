@@ -0,0 +1,269 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.models.background_job import BackgroundJob, JobStatus
+from app.services.job_queue import (JOB_HANDLERS, JobQueue, JobWorker,
+                                    LeaseLostError, job_handler, retry_delay)
+
+calls = []
+
+
+@pytest.fixture(autouse=True)
+def handlers():
+    calls.clear()
+
+    @job_handler("test.echo")
+    def echo(db, value):
+        calls.append(value)
+        return {"value": value}
+
+    @job_handler("test.flaky", max_attempts=3)
+    def flaky(db, failures):
+        calls.append(len(calls))
+        if len(calls) <= failures:
+            raise ConnectionError("SMTP unavailable")
+
+    yield
+    JOB_HANDLERS.pop("test.echo")
+    JOB_HANDLERS.pop("test.flaky")
+
+
+@pytest.fixture
+def worker(db: Session):
+    return JobWorker(session_factory=sessionmaker(bind=db.get_bind()))
+
+
+def _make_due(db, job):
+    job.run_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+
+def test_job_runs_and_stores_result(db: Session, worker):
+    job = JobQueue.enqueue(db, "test.echo", {"value": 42})
+    db.commit()
+    assert job.status == JobStatus.QUEUED
+    assert job.max_attempts == settings.JOB_MAX_ATTEMPTS
+
+    assert worker.run_until_empty() == 1
+
+    db.refresh(job)
+    assert calls == [42]
+    assert job.status == JobStatus.SUCCEEDED
+    assert (job.attempts, job.result, job.locked_by) == (1, {"value": 42}, None)
+    assert job.finished_at is not None
+
+
+def test_idempotency_key_deduplicates(db: Session, worker):
+    first = JobQueue.enqueue(db, "test.echo", {"value": 1}, idempotency_key="k1")
+    second = JobQueue.enqueue(db, "test.echo", {"value": 2}, idempotency_key="k1")
+    other = JobQueue.enqueue(db, "test.echo", {"value": 3}, idempotency_key="k2")
+    db.commit()
+
+    assert first.id == second.id != other.id
+    assert db.query(BackgroundJob).count() == 2
+    worker.run_until_empty()
+    assert sorted(calls) == [1, 3]
+
+    # Still deduplicated once the first job has finished
+    again = JobQueue.enqueue(db, "test.echo", {"value": 4}, idempotency_key="k1")
+    assert again.id == first.id
+    assert worker.run_until_empty() == 0
+
+
+def test_failed_job_is_retried_with_backoff(db: Session, worker):
+    job = JobQueue.enqueue(db, "test.flaky", {"failures": 1})
+    db.commit()
+
+    assert worker.run_once()
+    db.refresh(job)
+    assert job.status == JobStatus.QUEUED
+    assert job.attempts == 1
+    assert job.last_error == "ConnectionError: SMTP unavailable"
+    assert job.run_at > datetime.utcnow()
+    # Not due yet
+    assert not worker.run_once()
+
+    _make_due(db, job)
+    assert worker.run_once()
+    db.refresh(job)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.attempts == 2
+
+
+def test_job_fails_after_max_attempts(db: Session, worker):
+    job = JobQueue.enqueue(db, "test.flaky", {"failures": 10})
+    db.commit()
+    assert job.max_attempts == 3
+
+    for _ in range(3):
+        _make_due(db, job)
+        assert worker.run_once()
+        db.refresh(job)
+
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 3
+    assert not worker.run_once()
+
+
+def test_retry_delay_backs_off_exponentially(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "JOB_RETRY_MAX_SECONDS", 60.0)
+    assert 5 <= retry_delay(1) <= 10
+    assert 20 <= retry_delay(3) <= 40
+    assert 30 <= retry_delay(10) <= 60
+
+
+def test_expired_lease_is_requeued(db: Session):
+    job = JobQueue.enqueue(db, "test.echo", {"value": 1})
+    db.commit()
+    claimed = JobQueue.claim(db, "worker-a")
+    assert claimed.id == job.id
+    assert claimed.status == JobStatus.RUNNING
+    # Nothing else is due while the lease is held
+    assert JobQueue.claim(db, "worker-b") is None
+
+    claimed.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert JobQueue.requeue_expired(db) == 1
+
+    db.refresh(job)
+    assert job.status == JobStatus.QUEUED
+    assert JobQueue.claim(db, "worker-b").attempts == 2
+
+
+def test_enqueue_joins_the_callers_transaction(db: Session):
+    JobQueue.enqueue(db, "test.echo", {"value": 1})
+    db.rollback()
+    assert db.query(BackgroundJob).count() == 0
+
+
+def test_outcome_needs_the_lease(db: Session):
+    job = JobQueue.enqueue(db, "test.echo", {"value": 1})
+    db.commit()
+    claimed = JobQueue.claim(db, "worker-a")
+    claimed.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    JobQueue.requeue_expired(db)
+    assert JobQueue.claim(db, "worker-b").id == job.id
+
+    with pytest.raises(LeaseLostError):
+        JobQueue.complete(db, job, "worker-a", {"value": 1})
+    assert not JobQueue.renew_lease(db, job, "worker-a")
+
+    db.refresh(job)
+    assert (job.status, job.locked_by) == (JobStatus.RUNNING, "worker-b")
+    JobQueue.complete(db, job, "worker-b", {"value": 1})
+    assert job.status == JobStatus.SUCCEEDED
+
+
+def test_lease_is_renewed_while_the_handler_runs(db: Session, worker, monkeypatch):
+    @job_handler("test.slow", lease_seconds=1)
+    def slow(db):
+        time.sleep(1.5)
+
+    try:
+        job = JobQueue.enqueue(db, "test.slow")
+        db.commit()
+        requeued = []
+        original = JobQueue.claim
+
+        def claim_and_requeue(*args, **kwargs):
+            claimed = original(*args, **kwargs)
+            if claimed is not None:
+                # Another worker sweeping for expired leases mid-run
+                threading.Timer(
+                    1.2, lambda: requeued.append(JobQueue.requeue_expired(db))
+                ).start()
+            return claimed
+
+        monkeypatch.setattr(JobQueue, "claim", claim_and_requeue)
+        assert worker.run_once()
+    finally:
+        JOB_HANDLERS.pop("test.slow")
+
+    db.refresh(job)
+    assert requeued == [0]
+    assert (job.status, job.attempts) == (JobStatus.SUCCEEDED, 1)
+
+
+def test_claim_filters_job_types(db: Session):
+    JobQueue.enqueue(db, "test.echo", {"value": 1})
+    db.commit()
+    assert JobQueue.claim(db, "worker", job_types=["test.flaky"]) is None
+    assert JobQueue.claim(db, "worker", job_types=["test.echo"]) is not None
+
+
+def test_unknown_job_type_is_rejected(db: Session):
+    with pytest.raises(ValueError):
+        JobQueue.enqueue(db, "test.missing")
+
+
+def test_purge_finished(db: Session, worker):
+    old = JobQueue.enqueue(db, "test.echo", {"value": 1})
+    recent = JobQueue.enqueue(db, "test.echo", {"value": 2})
+    db.commit()
+    worker.run_until_empty()
+    db.refresh(old)
+    old.finished_at = datetime.utcnow() - timedelta(days=30)
+    queued = JobQueue.enqueue(db, "test.echo", {"value": 3}, delay_seconds=60)
+
+    assert JobQueue.purge_finished(db, days_old=7) == 1
+    assert {job.id for job in db.query(BackgroundJob)} == {recent.id, queued.id}
+
+
+def test_failed_push_enqueue_keeps_the_notification(db: Session, test_user, monkeypatch):
+    from app.crud_notifications import create_notification
+    from app.models.notification import Notification, NotificationType
+
+    test_user.fcm_token = "device-token"
+    db.commit()
+
+    def broken_enqueue(db, job_type, *args, **kwargs):
+        db.add(BackgroundJob(job_type=job_type, payload=None, run_at=None))
+        db.flush()
+
+    monkeypatch.setattr(JobQueue, "enqueue", broken_enqueue)
+    notification = create_notification(
+        db,
+        test_user.id,
+        test_user.company_id,
+        "Shift",
+        "You have a new shift",
+        NotificationType.SHIFT_SCHEDULED,
+    )
+
+    # The savepoint rolled back only the job; the session is still usable
+    assert db.query(Notification).filter_by(id=notification.id).count() == 1
+    assert db.query(BackgroundJob).count() == 0
+
+
+def test_fan_out_queues_one_email_job(db: Session, test_user, test_user2, monkeypatch):
+    from app import crud_notification_preferences
+    from app.crud_notifications import create_notifications
+    from app.models.notification import Notification, NotificationType
+
+    monkeypatch.setattr(
+        crud_notification_preferences,
+        "should_send_email_notification",
+        lambda db, user_id, company_id, notification_type: True,
+    )
+    notifications = create_notifications(
+        db,
+        [test_user.id, test_user2.id],
+        test_user.company_id,
+        "Channel",
+        "New message",
+        NotificationType.CHAT_MESSAGE,
+    )
+
+    assert db.query(Notification).count() == len(notifications) == 2
+    job = db.query(BackgroundJob).filter_by(job_type="email.notifications").one()
+    assert job.payload["recipients"] == [
+        [user.email, user.full_name or user.email] for user in (test_user, test_user2)
+    ]
+    assert db.query(BackgroundJob).filter_by(job_type="email.notification").count() == 0
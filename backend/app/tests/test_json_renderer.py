@@ -0,0 +1,76 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+from app.custom_json_response import CustomJSONResponse
+from app.models.user import UserRole
+
+ORG_TREE = {
+    "departments": [
+        {"id": 1, "name": "Engineering", "company_id": 1, "teams": [1, 2], "user_count": 3}
+    ],
+    "teams": [{"id": 1, "name": "Platform", "department_id": 1, "user_count": 2}],
+    "users": [
+        {
+            "id": 7,
+            "email": "jose@example.com",
+            "full_name": "José Müller",
+            "role": "EMPLOYEE",
+            "department_id": None,
+            "team_id": 1,
+        }
+    ],
+}
+AUDIT_LOGS = {
+    "logs": [
+        {
+            "id": 1,
+            "event_type": "LOGIN",
+            "details": {"ip": "10.0.0.1", "success": True, "score": 0.75},
+            "created_at": "2025-01-02T03:04:05.123456",
+        }
+    ],
+    "total": 1,
+    "limit": 50,
+    "offset": 0,
+}
+
+
+class Level(Enum):
+    HIGH = "high"
+
+
+class Entry(BaseModel):
+    name: str
+    at: datetime
+
+
+def _render(content):
+    return CustomJSONResponse(content).body
+
+
+def test_fixtures_render_identically_to_stdlib_json():
+    for fixture in (ORG_TREE, AUDIT_LOGS, [], {}, {"nested": [[1, 2], {"a": None}]}):
+        assert _render(fixture) == JSONResponse(fixture).body
+
+
+def test_native_types_match_jsonable_encoder():
+    at = datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+    content = {
+        "at": at,
+        "day": date(2025, 1, 2),
+        "role": UserRole.TEAM_LEAD,
+        "level": Level.HIGH,
+        "amount": Decimal("12.50"),
+        "count": Decimal("3"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "entry": Entry(name="x", at=at),
+        10: "int key",
+    }
+
+    assert _render(content) == JSONResponse(jsonable_encoder(content)).body
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.crud import (InvalidCursorError, decode_cursor, encode_cursor,
+                      paginate_keyset)
+from app.deps import get_current_user, get_db
+from app.models.company import Company
+from app.models.task import Task
+from app.models.user import User
+from app.routers import tasks
+
+
+@pytest.fixture
+def company_tasks(db: Session, test_company: Company):
+    """25 tasks where pairs share a created_at, so ties are broken by id"""
+    base = datetime(2026, 1, 1, 9, 0, 0)
+    for i in range(25):
+        db.add(
+            Task(
+                company_id=test_company.id,
+                title=f"Task {i}",
+                created_at=base + timedelta(minutes=i // 2),
+            )
+        )
+    db.commit()
+    return db.query(Task).filter(Task.company_id == test_company.id)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 4, 5, 6, 7, 891011)
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-a-cursor", "WzFd", encode_cursor(datetime.utcnow(), 1)[:-3]]
+)
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_row_once(db: Session, company_tasks):
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        rows, cursor = paginate_keyset(company_tasks, Task, cursor, limit=10)
+        seen.extend(rows)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len({t.id for t in seen}) == 25
+    keys = [(t.created_at, t.id) for t in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_exact_final_page_has_no_next_cursor(db: Session, company_tasks):
+    rows, cursor = paginate_keyset(company_tasks, Task, limit=25)
+    assert len(rows) == 25
+    assert cursor is None
+
+
+@pytest.fixture
+def client(db: Session, test_user: User, company_tasks):
+    app = FastAPI()
+    app.include_router(tasks.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: test_user
+    return TestClient(app)
+
+
+def test_task_list_endpoint_returns_next_cursor(client):
+    first = client.get("/api/tasks/", params={"limit": 20}).json()
+    assert len(first["items"]) == 20
+    assert first["next_cursor"]
+
+    second = client.get(
+        "/api/tasks/", params={"limit": 20, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(second["items"]) == 5
+    assert second["next_cursor"] is None
+    assert not {t["id"] for t in first["items"]} & {t["id"] for t in second["items"]}
+
+
+def test_task_list_endpoint_rejects_bad_cursor(client):
+    response = client.get("/api/tasks/", params={"cursor": "garbage"})
+    assert response.status_code == 400
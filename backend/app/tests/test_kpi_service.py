@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud import bulk_insert
+from app.db import get_read_db
+from app.deps import get_current_user
+from app.models.leave import Leave
+from app.models.shift import Shift
+from app.models.task import Task, TaskStatus
+from app.monitoring.query_stats import track_queries
+from app.routers import dashboard
+from app.services.kpi_service import KPIService, kpi_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    kpi_service.invalidate_all()
+    yield
+    kpi_service.invalidate_all()
+
+
+@pytest.fixture
+def seeded(db: Session, test_company, test_user, test_user2):
+    now = datetime.now()
+    statuses = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+    for i in range(9):
+        db.add(
+            Task(
+                company_id=test_company.id,
+                title=f"Task {i}",
+                assignee_id=test_user.id if i % 3 else test_user2.id,
+                assigned_by=test_user2.id,
+                status=statuses[i % 3],
+                updated_at=now - timedelta(days=10 * i),
+            )
+        )
+    for status in ("Pending", "Pending", "Approved"):
+        db.add(
+            Leave(
+                company_id=test_company.id,
+                tenant_id=str(test_company.id),
+                employee_id=test_user.id,
+                type="ANNUAL",
+                start_at=now,
+                end_at=now + timedelta(days=1),
+                status=status,
+            )
+        )
+    db.add(
+        Shift(
+            company_id=test_company.id,
+            employee_id=test_user.id,
+            start_at=now.replace(hour=9, minute=0),
+            end_at=now.replace(hour=17, minute=0),
+        )
+    )
+    db.commit()
+    return test_company.id
+
+
+def test_snapshot_counts(db: Session, seeded, test_user, test_user2):
+    snapshot = KPIService.compute_snapshot(db, seeded)
+
+    assert snapshot["tasks"] == {"PENDING": 3, "IN_PROGRESS": 3, "COMPLETED": 3}
+    assert snapshot["tasks_by_assignee"][test_user.id] == {
+        "IN_PROGRESS": 3,
+        "COMPLETED": 3,
+    }
+    assert snapshot["tasks_by_creator"][test_user2.id]["PENDING"] == 3
+    # Completed tasks are i = 2, 5, 8 -> updated 20, 50 and 80 days ago
+    assert snapshot["completed_by_age"][test_user.id] == {
+        "Last 30 days": 1,
+        "Last 90 days": 2,
+    }
+    assert snapshot["leaves"] == {"Pending": 2, "Approved": 1}
+    assert snapshot["shifts_today"] == 1
+    assert snapshot["total_employees"] == 2
+
+
+def test_snapshot_is_cached_until_a_write_commits(db: Session, seeded, test_user):
+    kpi_service.get_snapshot(db, seeded)
+    with track_queries() as stats:
+        kpi_service.get_snapshot(db, seeded)
+    assert stats.count == 0
+
+    db.add(Task(company_id=seeded, title="New", status=TaskStatus.PENDING))
+    db.commit()
+    assert kpi_service.get_snapshot(db, seeded)["tasks"]["PENDING"] == 4
+
+    start = datetime(2026, 1, 5, 9)
+    bulk_insert(
+        db,
+        Shift,
+        [
+            {
+                "company_id": seeded,
+                "employee_id": test_user.id,
+                "start_at": start,
+                "end_at": start + timedelta(hours=8),
+            }
+        ],
+    )
+    assert seeded not in kpi_service._snapshots
+
+
+def test_writes_for_another_company_keep_the_snapshot(db: Session, seeded):
+    kpi_service.get_snapshot(db, seeded)
+    db.add(Task(company_id=seeded + 1, title="Elsewhere", status=TaskStatus.PENDING))
+    db.commit()
+    assert seeded in kpi_service._snapshots
+
+    db.add(Task(company_id=seeded, title="Rolled back", status=TaskStatus.PENDING))
+    db.flush()
+    db.rollback()
+    assert seeded in kpi_service._snapshots
+
+
+def test_snapshot_after_a_write_is_read_from_the_primary(db: Session, seeded):
+    opened = []
+
+    def primary():
+        opened.append(True)
+        return sessionmaker(bind=db.get_bind())()
+
+    service = KPIService(primary_factory=primary)
+    service.get_snapshot(db, seeded)  # Nothing written yet: the replica will do
+    assert opened == []
+
+    service.invalidate([seeded])
+    assert service.get_snapshot(db, seeded)["tasks"]["PENDING"] == 3
+    service.get_snapshot(db, seeded)
+    assert len(opened) == 1
+
+    service.invalidate_all()
+    service.get_snapshot(db, seeded)
+    assert len(opened) == 2
+    service.invalidate([seeded + 1])
+    service.get_snapshot(db, seeded)
+    assert len(opened) == 2
+
+
+def test_kpi_endpoint_uses_aggregates(db: Session, seeded, test_user):
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/api")
+    app.dependency_overrides[get_read_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: test_user
+    client = TestClient(app)
+
+    assert client.get("/api/dashboard/kpis").json() == {
+        "total_employees": 2,
+        "active_tasks": 6,
+        "pending_leaves": 2,
+        "shifts_today": 1,
+    }
+    assert client.get("/api/dashboard/charts/task-status").json()[2] == {
+        "name": "Completed",
+        "value": 3,
+    }
@@ -109,3 +109,45 @@ def test_get_meetings_for_user(
     meetings = meeting_service.get_meetings_for_user(db, test_user2.id, test_company.id)
     assert len(meetings) >= 1
     assert any(m.title == "Test Meeting" for m in meetings)
+
+
+@pytest.mark.asyncio
+async def test_leave_meeting_async_session(
+    db: Session, test_company: Company, test_user: User, test_user2: User
+):
+    """Test leaving a meeting through the async session path"""
+    from unittest.mock import AsyncMock, patch
+
+    from app.db import SyncSessionShim
+
+    start_time = datetime.utcnow() + timedelta(hours=1)
+    meeting = meeting_service.create_meeting(
+        db=db,
+        title="Test Meeting",
+        organizer_id=test_user.id,
+        company_id=test_company.id,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=1),
+        participant_ids=[test_user2.id],
+    )
+
+    with patch(
+        "app.services.meeting_service.redis_service.set_user_offline",
+        new_callable=AsyncMock,
+    ) as mock_offline, patch(
+        "app.services.meeting_service.redis_service.publish_event",
+        new_callable=AsyncMock,
+    ):
+        left = await meeting_service.leave_meeting(
+            SyncSessionShim(db), meeting.id, test_user2.id
+        )
+        assert left is True
+        mock_offline.assert_awaited_once_with(test_company.id, test_user2.id)
+
+        # Leaving twice is a no-op
+        assert (
+            await meeting_service.leave_meeting(
+                SyncSessionShim(db), meeting.id, test_user2.id
+            )
+            is False
+        )
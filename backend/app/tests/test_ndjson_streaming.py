@@ -0,0 +1,152 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.db
+from app.config import settings
+from app.core.rbac import require_superadmin
+from app.db import SessionRouter, get_db, get_read_db
+from app.deps import get_current_user
+from app.models.audit_log import AuditLog
+from app.models.company_department import CompanyDepartment
+from app.models.company_team import CompanyTeam
+from app.models.user import UserRole
+from app.routers import admin, org
+from app.streaming import iter_ndjson
+
+
+@pytest.fixture
+def client(db: Session, test_superadmin, monkeypatch):
+    # Streams open their own session; point them at the test database
+    monkeypatch.setattr(
+        app.db, "session_router", SessionRouter(sessionmaker(bind=db.get_bind()))
+    )
+    monkeypatch.setattr(settings, "NDJSON_STREAM_BATCH_SIZE", 2)
+    superadmin = SimpleNamespace(
+        id=test_superadmin.id, role=UserRole.SUPERADMIN, company_id=None
+    )
+    api = FastAPI()
+    api.include_router(admin.router, prefix="/api/admin")
+    api.include_router(org.router)
+    api.dependency_overrides[get_db] = lambda: db
+    api.dependency_overrides[get_read_db] = lambda: db
+    api.dependency_overrides[get_current_user] = lambda: superadmin
+    api.dependency_overrides[require_superadmin] = lambda: superadmin
+    return TestClient(api)
+
+
+def _lines(response):
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_iter_ndjson_yields_one_chunk_per_batch():
+    chunks = list(iter_ndjson(({"n": i} for i in range(5)), batch_size=2))
+
+    assert chunks == [b'{"n":0}\n{"n":1}\n', b'{"n":2}\n{"n":3}\n', b'{"n":4}\n']
+
+
+def test_audit_logs_stream_every_matching_row(
+    client, db: Session, test_company, test_user
+):
+    for i in range(5):
+        db.add(
+            AuditLog(
+                event_type="LOGIN",
+                user_id=test_user.id,
+                company_id=test_company.id,
+                details={"n": i},
+            )
+        )
+    db.add(AuditLog(event_type="LOGIN", user_id=test_user.id, company_id=999))
+    db.commit()
+
+    rows = _lines(
+        client.get(
+            "/api/admin/audit/logs",
+            params={"stream": "ndjson", "company_id": test_company.id, "limit": 1},
+        )
+    )
+
+    logins = [row for row in rows if row["event_type"] == "LOGIN"]
+    assert [row["details"]["n"] for row in logins] == [4, 3, 2, 1, 0]
+    assert {row["company_id"] for row in rows} == {test_company.id}
+
+
+def test_audit_log_total_only_on_offset_or_request(
+    client, db: Session, test_company, test_user, monkeypatch
+):
+    # Viewing the logs is itself logged; keep the count stable between calls
+    monkeypatch.setattr(admin.AuditService, "log_admin_action", lambda **_: None)
+    for i in range(5):
+        db.add(
+            AuditLog(
+                event_type="LOGIN",
+                user_id=test_user.id,
+                company_id=test_company.id,
+                created_at=datetime(2026, 1, 1, 9, i),
+            )
+        )
+    db.commit()
+    params = {"company_id": test_company.id, "limit": 2}
+
+    first = client.get("/api/admin/audit/logs", params=params).json()
+    counted = client.get(
+        "/api/admin/audit/logs", params={**params, "include_total": True}
+    ).json()
+    by_offset = client.get(
+        "/api/admin/audit/logs", params={**params, "offset": 2}
+    ).json()
+    by_cursor = client.get(
+        "/api/admin/audit/logs", params={**params, "cursor": first["next_cursor"]}
+    ).json()
+
+    assert (first["total"], first["offset"]) == (None, 0)
+    assert counted["total"] == 5
+    assert by_cursor["total"] is None
+    assert (by_offset["total"], by_offset["offset"]) == (5, 2)
+    assert [log["id"] for log in by_offset["logs"]] == [
+        log["id"] for log in by_cursor["logs"]
+    ]
+    assert by_offset["next_cursor"] == by_cursor["next_cursor"]
+
+
+def test_org_tree_stream_matches_tree(client, db: Session, test_company, test_user):
+    department = CompanyDepartment(name="Engineering", company_id=test_company.id)
+    db.add(department)
+    db.flush()
+    team = CompanyTeam(name="Platform", department_id=department.id)
+    db.add(team)
+    db.flush()
+    test_user.department_id, test_user.team_id = department.id, team.id
+    db.commit()
+
+    tree = client.get("/api/org/tree", params={"company_id": test_company.id}).json()
+    rows = _lines(
+        client.get(
+            "/api/org/tree", params={"company_id": test_company.id, "stream": "ndjson"}
+        )
+    )
+
+    for kind, key in (
+        ("department", "departments"),
+        ("team", "teams"),
+        ("user", "users"),
+    ):
+        streamed = [
+            {k: v for k, v in row.items() if k != "type"}
+            for row in rows
+            if row["type"] == kind
+        ]
+        assert streamed == tree[key]
+
+
+def test_unknown_stream_mode_is_rejected(client):
+    response = client.get("/api/admin/ai/logs", params={"stream": "csv"})
+
+    assert response.status_code == 422
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from sqlalchemy.orm import Session
 
+from app.db import SyncSessionShim
 from app.models.company import Company
 from app.models.notification import Notification, NotificationStatus
 from app.models.user import User
@@ -128,7 +129,10 @@ class TestNotificationCaching:
 
                 # Should work with defaults
                 result = await get_notifications(
-                    limit=50, offset=0, db=mock_db, current_user=mock_user
+                    limit=50,
+                    offset=0,
+                    db=SyncSessionShim(mock_db),
+                    current_user=mock_user,
                 )
                 assert result == []
 
@@ -154,7 +158,10 @@ class TestNotificationCaching:
             return_value=cached_notifications,
         ):
             result = await get_notifications(
-                limit=10, offset=0, db=mock_db, current_user=mock_user
+                limit=10,
+                offset=0,
+                db=SyncSessionShim(mock_db),
+                current_user=mock_user,
             )
 
             # Should return cached data without querying database
@@ -192,7 +199,10 @@ class TestNotificationCaching:
                 )
 
                 result = await get_notifications(
-                    limit=10, offset=0, db=mock_db, current_user=mock_user
+                    limit=10,
+                    offset=0,
+                    db=SyncSessionShim(mock_db),
+                    current_user=mock_user,
                 )
 
                 # Should query database
@@ -217,7 +227,10 @@ class TestNotificationCaching:
 
                 # Test limit too high - should be capped at 100
                 result = await get_notifications(
-                    limit=150, offset=0, db=mock_db, current_user=mock_user
+                    limit=150,
+                    offset=0,
+                    db=SyncSessionShim(mock_db),
+                    current_user=mock_user,
                 )
                 # Should be capped at 100
                 mock_db.query.return_value.filter.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.assert_called_with(
@@ -232,7 +245,10 @@ class TestNotificationCaching:
 
                 # Test limit too low - should be set to 50
                 result = await get_notifications(
-                    limit=0, offset=0, db=mock_db, current_user=mock_user
+                    limit=0,
+                    offset=0,
+                    db=SyncSessionShim(mock_db),
+                    current_user=mock_user,
                 )
                 # Should be set to 50
                 mock_db.query.return_value.filter.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.assert_called_with(
@@ -257,7 +273,10 @@ class TestNotificationCaching:
                 )
 
                 result = await get_notifications(
-                    limit=10, offset=0, db=mock_db, current_user=mock_user
+                    limit=10,
+                    offset=0,
+                    db=SyncSessionShim(mock_db),
+                    current_user=mock_user,
                 )
 
                 # Should use company_id=0 for superadmin
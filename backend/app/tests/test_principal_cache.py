@@ -0,0 +1,119 @@
+import io
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.deps import _resolve_principal
+from app.models.user import User, UserRole
+from app.monitoring.query_stats import track_queries
+from app.services.employee_import_service import EmployeeImportService
+from app.services.principal_cache import PrincipalCache, principal_cache
+from app.services.security_service import SecurityService
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def _claims(user: User, token_version: int = 0):
+    return {"sub": user.email, "company_id": user.company_id, "tv": token_version}
+
+
+def test_second_resolve_is_served_from_cache(db: Session, test_user: User):
+    claims = _claims(test_user)
+    first = _resolve_principal(db, claims)
+    db.expunge_all()
+
+    with track_queries() as stats:
+        second = _resolve_principal(db, claims)
+
+    assert stats.count == 0
+    assert (second.id, second.email, second.role) == (
+        first.id,
+        first.email,
+        first.role,
+    )
+    assert second.company.id == test_user.company_id
+
+
+def test_role_change_revokes_tokens_and_evicts(db: Session, test_user: User):
+    _resolve_principal(db, _claims(test_user))
+
+    test_user.role = UserRole.COMPANY_ADMIN
+    db.commit()
+
+    assert test_user.token_version == 1
+    assert principal_cache.stats()["entries"] == 0
+    with pytest.raises(HTTPException) as exc:
+        _resolve_principal(db, _claims(test_user))
+    assert exc.value.detail == "Token revoked"
+    assert _resolve_principal(db, _claims(test_user, 1)).role == UserRole.COMPANY_ADMIN
+
+
+def test_lock_account_invalidates_cached_principal(db: Session, test_user: User):
+    _resolve_principal(db, _claims(test_user))
+
+    SecurityService.lock_account(db, test_user.id, "test")
+
+    with pytest.raises(HTTPException):
+        _resolve_principal(db, _claims(test_user))
+
+
+def test_unrelated_update_keeps_token_version(db: Session, test_user: User):
+    _resolve_principal(db, _claims(test_user))
+
+    test_user.full_name = "Renamed"
+    db.commit()
+
+    assert test_user.token_version == 0
+    assert principal_cache.stats()["entries"] == 0
+    db.expunge_all()
+    assert _resolve_principal(db, _claims(test_user)).full_name == "Renamed"
+
+
+def test_principal_read_before_revocation_is_not_stored():
+    cache = PrincipalCache(ttl_seconds=60, redis_url="redis://127.0.0.1:1/0")
+    sub = "user@example.com"
+
+    # A request loaded version 0, then the user's tokens were revoked
+    cache.invalidate(sub, floor=1)
+    cache.put((sub, 1, 0), {"id": 1, "token_version": 0})
+    cache.put((sub, 1, 1), {"id": 1, "token_version": 1})
+
+    assert cache.get((sub, 1, 0)) is None
+    assert cache.get((sub, 1, 1)) == {"id": 1, "token_version": 1}
+
+
+def test_employee_import_revokes_updated_users(
+    db: Session, test_company, test_user: User
+):
+    _resolve_principal(db, _claims(test_user))
+    rows = io.StringIO(
+        "email,full_name,employee_code,base_salary\n"
+        f"{test_user.email},Imported Name,E-1,1000\n"
+    )
+
+    EmployeeImportService.run_import(db, rows, "csv", test_company.id)
+
+    db.refresh(test_user)
+    assert (test_user.full_name, test_user.token_version) == ("Imported Name", 1)
+    assert principal_cache.stats()["entries"] == 0
+
+
+def test_lru_is_bounded_and_skips_unavailable_redis():
+    cache = PrincipalCache(
+        max_entries=2, ttl_seconds=60, redis_url="redis://127.0.0.1:1/0"
+    )
+    for i in range(3):
+        cache.put((f"user{i}@example.com", 1, 0), {"id": i})
+
+    assert cache.get(("user0@example.com", 1, 0)) is None
+    assert cache.get(("user2@example.com", 1, 0)) == {"id": 2}
+    assert cache.stats()["entries"] == 2
+
+    cache.invalidate("user2@example.com")
+    assert cache.get(("user2@example.com", 1, 0)) is None
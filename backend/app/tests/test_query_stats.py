@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.crud_chat import create_chat_message, get_channel_messages
+from app.crud.crud_reactions import add_reaction
+from app.models.channels import Channel, ChannelType
+from app.models.company import Company
+from app.models.user import User
+from app.monitoring.query_stats import (RequestQueryStats, check_query_budget,
+                                        track_queries)
+
+
+def test_track_queries_counts_statements(db: Session):
+    with track_queries() as stats:
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+
+    assert stats.count == 3
+    assert stats.duration > 0
+    assert stats.most_repeated() == ("SELECT 1", 3)
+
+
+def test_queries_outside_tracking_are_ignored(db: Session):
+    with track_queries() as stats:
+        pass
+    db.execute(text("SELECT 1"))
+    assert stats.count == 0
+
+
+def test_budget_exceeded_logs_repeated_statement():
+    stats = RequestQueryStats()
+    for _ in range(4):
+        stats.record("SELECT * FROM message_reactions WHERE message_id = ?", 0.001)
+
+    with patch("app.monitoring.query_stats.logger") as mock_logger:
+        assert check_query_budget("/api/chat/x", stats, budget=5)
+        assert not check_query_budget("/api/chat/x", stats, budget=3)
+
+    mock_logger.warning.assert_called_once()
+    kwargs = mock_logger.warning.call_args.kwargs
+    assert kwargs["repeated_count"] == 4
+    assert "message_reactions" in kwargs["repeated_statement"]
+
+
+def test_channel_messages_query_count_is_constant(
+    db: Session, test_company: Company, test_user: User
+):
+    """Reactions are loaded in one query, not one per message"""
+    channel = Channel(
+        name="General",
+        type=ChannelType.GROUP,
+        company_id=test_company.id,
+        created_by=test_user.id,
+    )
+    db.add(channel)
+    db.commit()
+
+    for i in range(10):
+        msg = create_chat_message(db, channel.id, test_user.id, f"message {i}")
+        add_reaction(db, msg["id"], test_user.id, "👍")
+
+    channel_id, company_id = channel.id, test_company.id
+    with track_queries() as stats:
+        messages = get_channel_messages(db, channel_id, company_id)
+
+    assert len(messages) == 10
+    assert all(m["reactions"][0]["count"] == 1 for m in messages)
+    assert stats.count == 2
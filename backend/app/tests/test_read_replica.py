@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import READ_YOUR_WRITES_HEADER, Base, SessionRouter, get_read_db
+from app.models.company import Company
+
+
+@pytest.fixture
+def router(tmp_path):
+    """Two SQLite files standing in for the primary and the replica"""
+    factories = []
+    engines = []
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with factory() as db:
+            db.add(Company(name=f"{name} company"))
+            db.commit()
+        engines.append(engine)
+        factories.append(factory)
+
+    yield SessionRouter(*factories)
+
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def client(router):
+    app = FastAPI()
+
+    @app.get("/company")
+    def read_company(db: Session = Depends(get_read_db)):
+        return {"name": db.query(Company).first().name}
+
+    with patch("app.db.session_router", router):
+        yield TestClient(app)
+
+
+def test_read_only_sessions_use_replica(client):
+    assert client.get("/company").json() == {"name": "replica company"}
+
+
+def test_read_your_writes_header_uses_primary(client):
+    response = client.get("/company", headers={READ_YOUR_WRITES_HEADER: "1"})
+    assert response.json() == {"name": "primary company"}
+
+
+def test_write_sessions_always_use_primary(router):
+    with router.session() as db:
+        assert db.query(Company).first().name == "primary company"
+
+
+def test_reads_fall_back_to_primary_without_replica(router):
+    single = SessionRouter(router.primary_factory)
+    with single.session(read_only=True) as db:
+        assert db.query(Company).first().name == "primary company"
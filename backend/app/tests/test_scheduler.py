@@ -0,0 +1,225 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.models.background_job import BackgroundJob
+from app.models.scheduled_task import ScheduledTaskState
+from app.services import scheduled_tasks as scheduled_tasks_module
+from app.services.scheduled_tasks import scheduled_tasks
+from app.services.scheduler import ScheduledTask, Scheduler, catch_up
+
+T0 = datetime(2026, 3, 2, 10, 30)
+
+
+class FixedElection:
+    def __init__(self, leader: bool):
+        self.leader = leader
+
+    def ensure(self) -> bool:
+        return self.leader
+
+    def release(self):
+        pass
+
+
+def _recorder(calls, name, delay=0.0, fail=False):
+    async def action(fire):
+        calls.append((name, fire))
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("boom")
+
+    return action
+
+
+def _scheduler(db, tasks, leader=True):
+    return Scheduler(
+        tasks,
+        session_factory=sessionmaker(bind=db.get_bind()),
+        election=FixedElection(leader),
+    )
+
+
+def _at(hour, minute=0):
+    return T0.replace(hour=hour, minute=minute)
+
+
+def test_cron_fire_times():
+    task = ScheduledTask("t", "*/15 * * * *", _recorder([], "t"))
+    assert task.next_fire_time(_at(10, 7)) == _at(10, 15)
+    # Strictly after
+    assert task.next_fire_time(_at(10, 15)) == _at(10, 30)
+    assert task.fire_times(_at(10, 7), _at(11)) == [
+        _at(10, 15),
+        _at(10, 30),
+        _at(10, 45),
+        _at(11),
+    ]
+
+    with pytest.raises(ValueError):
+        ScheduledTask("t", "61 * * * *", _recorder([], "t"))
+    with pytest.raises(ValueError):
+        ScheduledTask("t", "* * * * *", _recorder([], "t"), catch_up="sometimes")
+
+
+def test_catch_up_policies(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_MAX_CATCH_UP_RUNS", 3)
+    missed = [_at(hour) for hour in range(1, 6)]
+
+    def task(policy):
+        return ScheduledTask("t", "0 * * * *", _recorder([], "t"), catch_up=policy)
+
+    assert catch_up(task("skip"), missed) == []
+    assert catch_up(task("once"), missed) == [_at(5)]
+    assert catch_up(task("once"), missed, waiting=1) == []
+    assert catch_up(task("all"), missed) == [_at(3), _at(4), _at(5)]
+    assert catch_up(task("all"), missed, waiting=2) == [_at(5)]
+    assert catch_up(task("all"), [], waiting=0) == []
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [("skip", []), ("once", [12]), ("all", [11, 12])],
+)
+def test_missed_runs_are_caught_up_from_saved_state(db: Session, policy, expected):
+    db.add(ScheduledTaskState(name="hourly", last_scheduled_at=_at(10)))
+    db.commit()
+    calls = []
+    task = ScheduledTask(
+        "hourly", "0 * * * *", _recorder(calls, "hourly"), catch_up=policy
+    )
+    scheduler = _scheduler(db, [task])
+
+    async def run():
+        # One catch-up run is started per tick
+        for _ in range(3):
+            await scheduler.tick(_at(12, 30))
+            await scheduler.wait_idle()
+
+    asyncio.run(run())
+
+    assert [fire.hour for _, fire in calls] == expected
+    state = db.get(ScheduledTaskState, "hourly")
+    db.refresh(state)
+    if expected:
+        assert state.last_scheduled_at == _at(expected[-1])
+        assert state.last_status == "succeeded"
+        assert state.last_success_at is not None
+    else:
+        assert state.last_scheduled_at == _at(10)
+
+
+def test_tasks_run_when_due_and_failures_are_recorded(db: Session):
+    calls = []
+    tasks = [
+        ScheduledTask("ok", "0 * * * *", _recorder(calls, "ok")),
+        ScheduledTask("broken", "5 * * * *", _recorder(calls, "broken", fail=True)),
+    ]
+    scheduler = _scheduler(db, tasks)
+
+    async def run():
+        # Nothing is saved yet, so nothing is missed
+        assert await scheduler.tick(_at(10, 30)) == []
+        assert await scheduler.tick(_at(10, 59)) == []
+        assert await scheduler.tick(_at(11)) == ["ok"]
+        await scheduler.wait_idle()
+        assert await scheduler.tick(_at(11, 5)) == ["broken"]
+        await scheduler.wait_idle()
+        assert await scheduler.tick(_at(11, 6)) == []
+
+    asyncio.run(run())
+
+    assert calls == [("ok", _at(11)), ("broken", _at(11, 5))]
+    broken = db.get(ScheduledTaskState, "broken")
+    assert broken.last_status == "failed"
+    assert broken.last_error == "RuntimeError: boom"
+    assert broken.last_success_at is None
+    assert db.get(ScheduledTaskState, "ok").last_status == "succeeded"
+
+
+def test_followers_only_run_per_process_tasks(db: Session):
+    calls = []
+    tasks = [
+        ScheduledTask("cluster", "0 * * * *", _recorder(calls, "cluster")),
+        ScheduledTask("local", "0 * * * *", _recorder(calls, "local"), singleton=False),
+    ]
+    scheduler = _scheduler(db, tasks, leader=False)
+
+    async def run():
+        await scheduler.tick(_at(10, 30))
+        assert await scheduler.tick(_at(11)) == ["local"]
+        await scheduler.wait_idle()
+
+    asyncio.run(run())
+
+    assert calls == [("local", _at(11))]
+    assert db.query(ScheduledTaskState).count() == 0
+
+
+def test_fire_time_runs_on_one_node(db: Session):
+    calls = []
+    task = ScheduledTask("cluster", "0 * * * *", _recorder(calls, "cluster"))
+    # Both believe they lead (e.g. during a failover)
+    nodes = [_scheduler(db, [task]), _scheduler(db, [task])]
+
+    async def run():
+        for node in nodes:
+            await node.tick(_at(10, 30))
+        for node in nodes:
+            await node.tick(_at(11))
+            await node.wait_idle()
+
+    asyncio.run(run())
+
+    assert calls == [("cluster", _at(11))]
+
+
+@pytest.mark.parametrize("policy, expected", [("skip", 1), ("once", 2)])
+def test_fire_times_during_a_long_run(db: Session, policy, expected):
+    calls = []
+    task = ScheduledTask(
+        "slow", "* * * * *", _recorder(calls, "slow", delay=0.05), catch_up=policy
+    )
+    scheduler = _scheduler(db, [task])
+
+    async def run():
+        await scheduler.tick(_at(10, 30))
+        assert await scheduler.tick(_at(10, 31)) == ["slow"]
+        # Due while the first run is still going
+        assert await scheduler.tick(_at(10, 32)) == []
+        await scheduler.wait_idle()
+        await scheduler.tick(_at(10, 32))
+        await scheduler.wait_idle()
+
+    asyncio.run(run())
+
+    assert len(calls) == expected
+
+
+def test_schedule_overrides(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "SCHEDULES",
+        {"digests.cleanup_old": "0 5 * * *", "jobs.purge_finished": ""},
+    )
+    tasks = {task.name: task for task in scheduled_tasks()}
+
+    assert tasks["digests.cleanup_old"].schedule == "0 5 * * *"
+    assert tasks["digests.cleanup_old"].next_fire_time(_at(4)) == _at(5)
+    assert "jobs.purge_finished" not in tasks
+    assert not tasks["websocket.cleanup"].singleton
+
+
+def test_digest_jobs_carry_their_fire_time(db: Session, monkeypatch):
+    monkeypatch.setattr(
+        scheduled_tasks_module, "SessionLocal", sessionmaker(bind=db.get_bind())
+    )
+    tasks = {task.name: task for task in scheduled_tasks()}
+
+    asyncio.run(tasks["digests.build_daily"].action(_at(6)))
+
+    job = db.query(BackgroundJob).filter_by(job_type="digests.build_daily").one()
+    assert job.payload == {"now": _at(6).isoformat()}
@@ -0,0 +1,164 @@
+import smtplib
+import socket
+import threading
+from email import message_from_string
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.services.email_service import EmailService
+from app.services.smtp_delivery import (OutgoingEmail, SMTPConnectionPool,
+                                        SMTPDispatcher)
+
+
+class Inbox:
+    """aiosmtpd handler that keeps what it receives"""
+
+    def __init__(self):
+        self.messages = []
+        self.refused = set()
+        self.lock = threading.Lock()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refused:
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.lock:
+            self.messages.append(
+                (envelope.rcpt_tos[0], message_from_string(envelope.content.decode()))
+            )
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture
+def inbox():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = Inbox()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    handler.port = port
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Count the SMTP connections opened"""
+    connections = []
+
+    class CountingSMTP(smtplib.SMTP):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            connections.append(self)
+
+    monkeypatch.setattr(smtplib, "SMTP", CountingSMTP)
+    return connections
+
+
+@pytest.fixture
+def dispatcher(inbox):
+    pool = SMTPConnectionPool("127.0.0.1", inbox.port, size=2, starttls=False)
+    dispatcher = SMTPDispatcher(pool, "noreply@workforceapp.com", batch_size=10)
+    yield dispatcher
+    dispatcher.stop(timeout=5)
+
+
+def _emails(count, prefix="user"):
+    return [
+        OutgoingEmail(f"{prefix}{n}@example.com", f"Subject {n}", f"<p>{n}</p>")
+        for n in range(count)
+    ]
+
+
+def test_batches_share_pooled_connections(inbox, opened, dispatcher):
+    assert dispatcher.send(_emails(25)) == [True] * 25
+    assert dispatcher.send(_emails(5, "again")) == [True] * 5
+
+    assert len(inbox.messages) == 30
+    assert {to for to, _ in inbox.messages} >= {
+        "user0@example.com",
+        "again4@example.com",
+    }
+    # At most one connection per sender thread, kept open between sends
+    assert 1 <= len(opened) <= 2
+    assert dispatcher.depth == 0
+
+
+def test_refused_recipient_does_not_fail_the_batch(inbox, opened, dispatcher):
+    inbox.refused.add("user1@example.com")
+
+    assert dispatcher.send(_emails(3)) == [True, False, True]
+    assert sorted(to for to, _ in inbox.messages) == [
+        "user0@example.com",
+        "user2@example.com",
+    ]
+    assert len(opened) == 1
+
+
+def test_dropped_connection_is_replaced(inbox, opened, dispatcher):
+    assert dispatcher.send(_emails(1)) == [True]
+    # The server (or a proxy) closed the idle connection
+    dispatcher.pool._idle[0].smtp.sock.shutdown(socket.SHUT_RDWR)
+
+    assert dispatcher.send(_emails(1, "later")) == [True]
+    assert len(opened) == 2
+    assert len(inbox.messages) == 2
+
+
+def test_connections_are_recycled_after_max_messages(inbox, opened):
+    pool = SMTPConnectionPool(
+        "127.0.0.1", inbox.port, size=1, starttls=False, max_messages=2
+    )
+    dispatcher = SMTPDispatcher(pool, "noreply@workforceapp.com", batch_size=1)
+    try:
+        assert dispatcher.send(_emails(4)) == [True] * 4
+    finally:
+        dispatcher.stop(timeout=5)
+    assert len(opened) == 2
+
+
+def test_unreachable_server_falls_back_to_sendgrid(monkeypatch):
+    service = EmailService()
+    service.smtp_pool.port = 1
+    service.sendgrid_api_key = "test_key"
+    fallback = []
+    monkeypatch.setattr(
+        service,
+        "_send_via_sendgrid",
+        lambda to_email, *args: fallback.append(to_email) or True,
+    )
+    try:
+        assert service.send_batch(_emails(2)) == [True, True]
+    finally:
+        service.smtp_dispatcher.stop(timeout=5)
+    assert fallback == ["user0@example.com", "user1@example.com"]
+
+
+def test_notification_emails_are_rendered_once_per_batch(inbox):
+    service = EmailService()
+    service.smtp_pool = SMTPConnectionPool("127.0.0.1", inbox.port, starttls=False)
+    service.smtp_dispatcher = SMTPDispatcher(service.smtp_pool, service.email_from)
+    try:
+        results = service.send_notification_emails(
+            [("ann@example.com", "Ann"), ("bob@example.com", "Bob"), ("bad", "X")],
+            "Bonus of $100",
+            "Payroll runs on Friday",
+        )
+    finally:
+        service.smtp_dispatcher.stop(timeout=5)
+
+    assert results == [True, True, False]
+    received = dict(inbox.messages)
+    assert set(received) == {"ann@example.com", "bob@example.com"}
+    message = received["bob@example.com"]
+    assert message["Subject"] == "Workforce App Notification: Bonus of $100"
+    text, html = [
+        part.get_payload(decode=True).decode() for part in message.get_payload()
+    ]
+    assert text.startswith("Hello Bob, Bonus of $100: Payroll runs on Friday.")
+    assert "<p>Hello Bob,</p>" in html
@@ -0,0 +1,28 @@
+from app.config import settings
+from app.monitoring.startup_profile import parse_importtime, profile_startup
+
+IMPORTTIME_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        420 |   encodings
+import time:      1000 |       1420 | app.main
+"""
+
+
+def test_parse_importtime_tracks_nesting():
+    records = parse_importtime(IMPORTTIME_SAMPLE)
+    assert [(r.module, r.depth) for r in records] == [
+        ("_io", 2),
+        ("encodings", 1),
+        ("app.main", 0),
+    ]
+    assert records[-1].cumulative_us == 1420
+
+
+def test_app_import_stays_within_budget():
+    profile = profile_startup("app.main")
+
+    assert profile.eager_heavy_modules() == [], profile.report()
+    assert (
+        profile.total_seconds <= settings.STARTUP_IMPORT_BUDGET_SECONDS
+    ), profile.report()
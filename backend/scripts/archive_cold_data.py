@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Move old audit_logs, audit_chains and chat_messages rows to cold storage.
+
+Rows created before the retention horizon (ARCHIVE_RETENTION_DAYS, or
+--before) are written to zstd-compressed JSONL files under ARCHIVE_DIR,
+partitioned by company and month, then deleted. Audit chain entries are only
+archived up to a verified checkpoint. --verify checks every archived file
+against its manifest checksum instead.
+
+    python scripts/archive_cold_data.py --dry-run
+    python scripts/archive_cold_data.py --tables audit_logs --before 2024-01-01
+    python scripts/archive_cold_data.py --verify
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db import SessionLocal  # noqa: E402
+from app.services.archive_service import (ARCHIVE_TABLES,  # noqa: E402
+                                          ArchiveService)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tables", nargs="+", choices=sorted(ARCHIVE_TABLES), default=None
+    )
+    parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        help="Archive rows created before this date (default from settings)",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--verify", action="store_true", help="Check checksums only")
+    args = parser.parse_args()
+    tables = args.tables or list(ARCHIVE_TABLES)
+
+    if args.verify:
+        failures = [path for t in tables for path in ArchiveService.verify_archive(t)]
+        for path in failures:
+            print(f"Checksum mismatch: {path}")
+        print(f"{len(failures)} corrupt archive file(s)")
+        sys.exit(1 if failures else 0)
+
+    with SessionLocal() as db:
+        for table in tables:
+            result = ArchiveService.archive_table(
+                db, table, before=args.before, dry_run=args.dry_run
+            )
+            verb = "Would archive" if args.dry_run else "Archived"
+            print(f"{verb} {result.rows} {table} rows in {len(result.files)} file(s)")
+
+
+if __name__ == "__main__":
+    main()
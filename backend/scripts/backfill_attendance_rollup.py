@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Rebuild attendance_daily_rollup from raw attendance rows.
+
+Run once after the migration, and again for any company or date range the
+rollup may have drifted on (clock-in/out keeps it current afterwards).
+
+    python scripts/backfill_attendance_rollup.py
+    python scripts/backfill_attendance_rollup.py --company-id 3 --start 2026-01-01
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db import SessionLocal  # noqa: E402
+from app.services.attendance_rollup_service import \
+    AttendanceRollupService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--company-id", type=int, help="Only this company")
+    parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD, inclusive")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rows = AttendanceRollupService.rebuild(
+            db, company_id=args.company_id, start=args.start, end=args.end
+        )
+    print(f"Wrote {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Build the Merkle accumulator for existing audit chains.
+
+Run once after the migration that adds audit_chain_merkle_nodes, so chains
+written before it get their interior nodes and a signed root for their
+current size (appends keep the accumulator current afterwards).
+
+    python scripts/backfill_audit_merkle.py
+    python scripts/backfill_audit_merkle.py --chain-id company_3
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.base_crud import advisory_xact_lock  # noqa: E402
+from app.db import SessionLocal  # noqa: E402
+from app.models.audit_chain import AuditChain  # noqa: E402
+from app.services.audit_merkle_service import \
+    AuditMerkleService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chain-id", help="Only this chain")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.chain_id:
+            chain_ids = [args.chain_id]
+        else:
+            chain_ids = [c for (c,) in db.query(AuditChain.chain_id).distinct()]
+        for chain_id in chain_ids:
+            # Hold off appends to the chain while its nodes are rewritten
+            advisory_xact_lock(db, f"audit_chain:{chain_id}")
+            AuditMerkleService.rebuild(db, chain_id)
+            db.commit()
+            root = AuditMerkleService.publish_root(db, chain_id)
+            print(f"{chain_id}: {root.tree_size} entries, root {root.root_hash}")
+
+
+if __name__ == "__main__":
+    main()
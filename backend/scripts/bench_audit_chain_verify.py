@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Benchmark audit chain verification on a large synthetic chain.
+
+Builds a chain of --entries entries in a temporary SQLite database, then
+times a full serial verification, a full verification on a process pool,
+and an incremental run that resumes from the latest signed checkpoint after
+--tail new entries were appended.
+
+    python scripts/bench_audit_chain_verify.py --entries 1000000 --workers 4
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db import Base  # noqa: E402
+from app.merkle import compute_entry_hash  # noqa: E402
+from app.models.audit_chain import (AuditChain,  # noqa: E402
+                                    AuditChainCheckpoint)
+from app.services.audit_chain_service import AuditChainService  # noqa: E402
+from app.services.audit_chain_verification import \
+    ChainVerificationService  # noqa: E402
+
+CHAIN_ID = "company_1"
+
+
+def chain_rows(start, count, previous_hash):
+    created_at = datetime(2025, 1, 1)
+    for sequence_number in range(start, start + count):
+        row = {
+            "chain_id": CHAIN_ID,
+            "sequence_number": sequence_number,
+            "previous_hash": previous_hash,
+            "event_type": "AI_AI_REQUEST",
+            "user_id": sequence_number % 50 + 1,
+            "company_id": 1,
+            "data": json.dumps({"capability": "summarize", "n": sequence_number}),
+            "created_at": created_at + timedelta(milliseconds=sequence_number),
+            "is_tampered": False,
+        }
+        row["current_hash"] = compute_entry_hash(
+            row["chain_id"],
+            row["sequence_number"],
+            row["previous_hash"],
+            row["event_type"],
+            row["user_id"],
+            row["company_id"],
+            row["data"],
+            row["created_at"],
+        )
+        previous_hash = row["current_hash"]
+        yield row
+
+
+def load(db, start, count, previous_hash, chunk=20000):
+    batch = []
+    for row in chain_rows(start, count, previous_hash):
+        batch.append(row)
+        if len(batch) >= chunk:
+            db.execute(insert(AuditChain), batch)
+            batch = []
+    if batch:
+        db.execute(insert(AuditChain), batch)
+    db.commit()
+
+
+def timed(label, run):
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<28}{result.entries_verified:>10}{elapsed:>10.2f}s"
+        f"{result.entries_verified / elapsed:>12.0f}/s"
+        f"{len(result.issues):>8}"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000000)
+    parser.add_argument("--tail", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'chain.db')}")
+        Base.metadata.create_all(
+            engine, tables=[AuditChain.__table__, AuditChainCheckpoint.__table__]
+        )
+        db = sessionmaker(bind=engine)()
+
+        started = time.perf_counter()
+        load(db, 0, args.entries, AuditChainService.GENESIS_HASH)
+        print(f"built {args.entries} entries in {time.perf_counter() - started:.1f}s")
+
+        print(f"{'run':<28}{'entries':>10}{'time':>11}{'rate':>14}{'issues':>8}")
+        timed(
+            "full, serial",
+            lambda: ChainVerificationService.verify_full(db, CHAIN_ID, workers=1),
+        )
+        timed(
+            f"full, {args.workers} workers",
+            lambda: ChainVerificationService.verify_full(
+                db, CHAIN_ID, workers=args.workers
+            ),
+        )
+        timed(
+            "incremental, no checkpoint",
+            lambda: AuditChainService.run_verification(db, CHAIN_ID),
+        )
+
+        head = AuditChainService.get_chain_head(db, CHAIN_ID)
+        load(db, args.entries, args.tail, head.current_hash)
+        timed(
+            f"incremental, +{args.tail} entries",
+            lambda: AuditChainService.run_verification(db, CHAIN_ID),
+        )
+        checkpoints = db.query(AuditChainCheckpoint).count()
+        db.close()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"checkpoints stored: {checkpoints}, peak RSS: {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
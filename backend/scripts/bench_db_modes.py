@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Compare sync and async DB session modes under concurrent load.
+
+Starts the API once per mode (ASYNC_DB_ENABLED=false/true), logs in, hammers
+an endpoint that runs on get_async_db and prints requests/sec and latency
+percentiles for each run.
+
+    python scripts/bench_db_modes.py --email demo@company.com --password password123
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def start_server(port, async_enabled):
+    env = dict(os.environ, ASYNC_DB_ENABLED="true" if async_enabled else "false")
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+async def wait_for_health(client, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            r = await client.get("/health")
+            if r.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("API did not become healthy in time")
+
+
+async def run_load(client, path, headers, concurrency, total):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            r = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if r.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def bench_mode(args, async_enabled):
+    proc = start_server(args.port, async_enabled)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            await wait_for_health(client)
+            r = await client.post(
+                "/api/auth/login",
+                json={"email": args.email, "password": args.password},
+            )
+            r.raise_for_status()
+            headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+            # Warm up pools and caches before measuring
+            await run_load(client, args.path, headers, args.concurrency, 50)
+            return await run_load(
+                client, args.path, headers, args.concurrency, args.requests
+            )
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", default="/api/notifications/?limit=50")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, async_enabled in (("sync", False), ("async", True)):
+        results[mode] = asyncio.run(bench_mode(args, async_enabled))
+
+    print(f"{'mode':<6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<6} {r['rps']:>10.1f} {r['p50_ms']:>10.2f} "
+            f"{r['p99_ms']:>10.2f} {r['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the JSON response renderer.
+
+Renders org-tree and audit-log shaped payloads of 1k and 10k items with the
+orjson-based CustomJSONResponse and with Starlette's stdlib JSONResponse, and
+prints the best time per render and the speedup.
+
+    python scripts/bench_json_render.py --repeat 20
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.custom_json_response import CustomJSONResponse  # noqa: E402
+
+
+def org_tree(size):
+    departments = max(size // 100, 1)
+    teams = max(size // 20, 1)
+    return {
+        "departments": [
+            {
+                "id": d,
+                "name": f"Department {d}",
+                "company_id": 1,
+                "teams": [t for t in range(teams) if t % departments == d],
+                "user_count": size // departments,
+            }
+            for d in range(departments)
+        ],
+        "teams": [
+            {
+                "id": t,
+                "name": f"Team {t}",
+                "department_id": t % departments,
+                "user_count": size // teams,
+            }
+            for t in range(teams)
+        ],
+        "users": [
+            {
+                "id": u,
+                "email": f"user{u}@example.com",
+                "full_name": f"User {u}",
+                "role": "EMPLOYEE",
+                "department_id": u % departments,
+                "team_id": u % teams,
+            }
+            for u in range(size)
+        ],
+    }
+
+
+def audit_logs(size):
+    start = datetime(2025, 1, 1)
+    return {
+        "logs": [
+            {
+                "id": i,
+                "company_id": 1,
+                "user_id": i % 50,
+                "event_type": "API_REQUEST",
+                "resource_type": "api",
+                "resource_id": None,
+                "details": {
+                    "method": "GET",
+                    "path": f"/api/tasks/{i}",
+                    "status_code": 200,
+                    "duration": 0.0123,
+                },
+                "ip_address": "10.0.0.1",
+                "user_agent": "Mozilla/5.0",
+                "created_at": (start + timedelta(seconds=i)).isoformat(),
+            }
+            for i in range(size)
+        ],
+        "total": size,
+        "limit": size,
+        "offset": 0,
+    }
+
+
+def best_seconds(render, content, repeat):
+    return min(timeit.repeat(lambda: render(content), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    renderers = {
+        "orjson": CustomJSONResponse(None).render,
+        "stdlib": JSONResponse(None).render,
+    }
+    print(f"{'payload':<12}{'items':>8}{'orjson ms':>12}{'stdlib ms':>12}{'speedup':>10}")
+    for name, build in (("org_tree", org_tree), ("audit_logs", audit_logs)):
+        for size in args.sizes:
+            content = build(size)
+            timings = {
+                label: best_seconds(render, content, args.repeat)
+                for label, render in renderers.items()
+            }
+            print(
+                f"{name:<12}{size:>8}"
+                f"{timings['orjson'] * 1000:>12.2f}{timings['stdlib'] * 1000:>12.2f}"
+                f"{timings['stdlib'] / timings['orjson']:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
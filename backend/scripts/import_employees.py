@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Bulk-import employees and salaries for one company from CSV or NDJSON.
+
+Rows are streamed into a staging table (COPY on PostgreSQL), validated in
+SQL and merged in a single transaction. Progress events go to stderr and
+the final summary is printed as JSON.
+
+    python scripts/import_employees.py employees.csv --company-id 3
+    python scripts/import_employees.py employees.ndjson --company-id 3 --dry-run
+
+Columns: email, employee_code, base_salary (required), full_name,
+department, position, phone, hire_date (YYYY-MM-DD).
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db import SessionLocal  # noqa: E402
+from app.services.employee_import_service import (  # noqa: E402
+    IMPORT_FORMATS, EmployeeImportService)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="Defaults to the file extension (.csv, .ndjson or .jsonl)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Validate only, write nothing"
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or os.path.splitext(args.path)[1].lstrip(".").lower()
+    fmt = "ndjson" if fmt == "jsonl" else fmt
+    if fmt not in IMPORT_FORMATS:
+        parser.error(f"cannot infer format from {args.path}, pass --format")
+
+    with open(args.path, encoding="utf-8-sig", newline="") as stream, SessionLocal() as db:
+        for event in EmployeeImportService.iter_import(
+            db, stream, fmt, args.company_id, args.dry_run
+        ):
+            if event["stage"] == "done":
+                print(json.dumps(event, indent=2, default=str))
+            else:
+                print(json.dumps(event), file=sys.stderr)
+
+    return 0 if event["rows_rejected"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
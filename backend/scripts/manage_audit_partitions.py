@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Maintain the monthly audit_logs partitions.
+
+Creates partitions for the current month and the next --months-ahead months,
+and detaches partitions whose month is older than --retention-months (they
+stay as standalone tables for archiving unless --drop is given). Run daily;
+it is a no-op when everything is in place.
+
+    python scripts/manage_audit_partitions.py
+    python scripts/manage_audit_partitions.py --dry-run --retention-months 12
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db import SessionLocal  # noqa: E402
+from app.services.audit_partition_service import (  # noqa: E402
+    AuditPartitionService, partition_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, help="Default from settings")
+    parser.add_argument("--retention-months", type=int, help="0 detaches nothing")
+    parser.add_argument("--drop", action="store_true", help="Drop detached tables")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        plan = AuditPartitionService.maintain(
+            db,
+            months_ahead=args.months_ahead,
+            retention_months=args.retention_months,
+            drop=args.drop,
+            dry_run=args.dry_run,
+        )
+
+    prefix = "Would " if args.dry_run else ""
+    for month in plan.create:
+        print(f"{prefix}create {partition_name(month)}")
+    for name in plan.detach:
+        print(f"{prefix}{'drop' if args.drop else 'detach'} {name}")
+    if not plan:
+        print("Partitions are up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Profile API cold-start import time with ``python -X importtime``.
+
+Imports app.main in a fresh interpreter, writes the breakdown (slowest
+modules, self time per package, heavy dependencies loaded eagerly) and
+exits non-zero when the total exceeds STARTUP_IMPORT_BUDGET_SECONDS.
+
+    python scripts/profile_startup.py --output logs/startup_importtime.txt
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.config import settings  # noqa: E402
+from app.monitoring.startup_profile import profile_startup  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app.main", help="Module to import")
+    parser.add_argument("--limit", type=int, default=25, help="Rows per section")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=settings.STARTUP_IMPORT_BUDGET_SECONDS,
+        help="Seconds (default: STARTUP_IMPORT_BUDGET_SECONDS)",
+    )
+    args = parser.parse_args()
+
+    profile = profile_startup(args.target)
+    report = profile.report(args.limit)
+    report += f"Budget: {args.budget:.3f}s\n"
+    print(report, end="")
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+    over_budget = profile.total_seconds > args.budget
+    return 1 if over_budget or profile.eager_heavy_modules() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Run background job workers, or queue a job.
+
+Workers poll the background_jobs table until SIGINT/SIGTERM, then let running
+jobs finish. Run as many worker processes as needed; they share the queue.
+--drain runs due jobs until none are left and exits (e.g. from cron).
+
+    python scripts/run_job_worker.py --concurrency 4
+    python scripts/run_job_worker.py --types email.notification push.send
+    python scripts/run_job_worker.py --enqueue approvals.cleanup_expired
+    python scripts/run_job_worker.py --enqueue digests.cleanup_old --payload '{"days_old": 60}'
+    python scripts/run_job_worker.py --drain
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.config import settings  # noqa: E402
+from app.db import SessionLocal  # noqa: E402
+from app.services.job_queue import (JOB_HANDLERS, JobQueue,  # noqa: E402
+                                    JobWorker, load_handlers)
+
+
+def main():
+    load_handlers()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--types", nargs="+", choices=sorted(JOB_HANDLERS))
+    parser.add_argument("--drain", action="store_true", help="Exit once idle")
+    parser.add_argument("--enqueue", choices=sorted(JOB_HANDLERS))
+    parser.add_argument("--payload", type=json.loads, default=None)
+    parser.add_argument("--idempotency-key", default=None)
+    args = parser.parse_args()
+
+    if args.enqueue:
+        with SessionLocal() as db:
+            job = JobQueue.enqueue(
+                db, args.enqueue, args.payload, idempotency_key=args.idempotency_key
+            )
+            db.commit()
+            print(f"Job {job.id} ({job.job_type}) is {job.status.value}")
+        return
+
+    worker = JobWorker(concurrency=args.concurrency, job_types=args.types)
+    if args.drain:
+        print(f"Ran {worker.run_until_empty()} job(s)")
+        return
+
+    stopping = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stopping.set())
+    worker.start()
+    stopping.wait()
+    print("Stopping; waiting for running jobs")
+    sys.exit(0 if worker.stop(settings.JOB_SHUTDOWN_TIMEOUT_SECONDS) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Verify an audit chain inclusion proof offline.
+
+Takes the JSON returned by GET /api/admin/audit-chain/proof/{chain_id}/{seq}
+and checks that the entry's fields hash to its entry_hash, that the entry is
+included in the signed Merkle root, and, given the signing key
+(AUDIT_CHAIN_SIGNING_KEY, or SECRET_KEY when that is unset), the root's
+signature. Needs only the standard library and app/merkle.py.
+
+    python scripts/verify_audit_proof.py proof.json --key "$AUDIT_CHAIN_SIGNING_KEY"
+    curl ... | python scripts/verify_audit_proof.py -
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.merkle import verify_proof  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("proof", help="Proof JSON file, or - for stdin")
+    parser.add_argument("--key", help="Signing key, to check the root signature")
+    args = parser.parse_args()
+
+    if args.proof == "-":
+        document = json.load(sys.stdin)
+    else:
+        with open(args.proof) as f:
+            document = json.load(f)
+
+    failures = verify_proof(
+        document, key=args.key.encode("utf-8") if args.key else None
+    )
+    label = f"{document['chain_id']}#{document['sequence_number']}"
+    if failures:
+        print(f"{label}: INVALID ({', '.join(failures)})")
+        sys.exit(1)
+    signed = "signed root" if args.key else "root (signature not checked)"
+    print(f"{label}: included in {signed} at tree size {document['tree_size']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import React from 'react';
+
+// Fetches the next cursor page of a list; hidden once the list is complete
+const LoadMoreButton = ({ hasMore, loading, onClick }) => {
+  if (!hasMore) {
+    return null;
+  }
+  return (
+    <div className="flex justify-center py-6">
+      <button
+        onClick={onClick}
+        disabled={loading}
+        className="px-4 py-2 text-sm font-medium text-neutral-700 border border-neutral-200 rounded-lg hover:bg-neutral-50 transition-colors duration-200 disabled:opacity-50"
+      >
+        {loading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
@@ -121,4 +121,13 @@ export const useAuth = () => {
   return context;
 };
 
-export { api };
+// List endpoints return one page at a time ({ items, next_cursor }); pass the
+// returned nextCursor to fetch the page after it
+const getPage = async (url, params = {}, cursor = null) => {
+  const response = await api.get(url, {
+    params: { ...params, ...(cursor ? { cursor } : {}) },
+  });
+  return { items: response.data.items, nextCursor: response.data.next_cursor };
+};
+
+export { api, getPage };
@@ -152,7 +152,7 @@ export const handlers = [
 
   // Tasks endpoints
   http.get('/tasks', () => {
-    return HttpResponse.json(mockTasks);
+    return HttpResponse.json({ items: mockTasks, next_cursor: null });
   }),
   http.post('/tasks', () => {
     return HttpResponse.json({ id: 2, title: 'Task 2' });
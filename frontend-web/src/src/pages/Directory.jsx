@@ -7,7 +7,8 @@ import {
   XMarkIcon,
   FunnelIcon
 } from '@heroicons/react/24/outline';
-import { api } from '../contexts/AuthContext';
+import { getPage } from '../contexts/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const Directory = () => {
   const [users, setUsers] = useState([]);
@@ -15,14 +16,17 @@ const Directory = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [roleFilter, setRoleFilter] = useState('');
   const [error, setError] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchUsers = async () => {
       try {
         setLoading(true);
         setError('');
-        const response = await api.get('/employees');
-        setUsers(response.data);
+        const page = await getPage('/employees');
+        setUsers(page.items);
+        setNextCursor(page.nextCursor);
       } catch (error) {
         console.error('Error fetching users:', error);
         setError('Failed to load directory. Using sample data.');
@@ -64,6 +68,20 @@ const Directory = () => {
     fetchUsers();
   }, []);
 
+  const loadMoreUsers = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getPage('/employees', {}, nextCursor);
+      setUsers(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more users:', error);
+      setError('Failed to load more employees.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filteredUsers = useMemo(() => {
     return users.filter(user => {
       const matchesSearch = (user.name?.toLowerCase().includes(searchTerm.toLowerCase()) || false) ||
@@ -199,6 +217,8 @@ const Directory = () => {
           ))}
         </div>
 
+        <LoadMoreButton hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreUsers} />
+
         {filteredUsers.length === 0 && !loading && (
           <div className="text-center py-12">
             <div className="w-16 h-16 bg-neutral-100 rounded-full flex items-center justify-center mx-auto mb-4">
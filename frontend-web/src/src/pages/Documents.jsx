@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from 'react';
-import { api, useAuth } from '../contexts/AuthContext';
+import { api, getPage, useAuth } from '../contexts/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 import { DocumentIcon, ArrowUpTrayIcon, EyeIcon, ArrowDownTrayIcon } from '@heroicons/react/24/outline';
 
 const Documents = () => {
@@ -12,6 +13,8 @@ const Documents = () => {
   const [docType, setDocType] = useState('OTHER');
   const [accessRole, setAccessRole] = useState('EMPLOYEE');
   const [showUploadForm, setShowUploadForm] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchDocuments();
@@ -21,8 +24,9 @@ const Documents = () => {
     try {
       setLoading(true);
       setError('');
-      const response = await api.get('/api/documents/list');
-      setDocuments(response.data);
+      const page = await getPage('/api/documents/list');
+      setDocuments(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError('Failed to load documents.');
     } finally {
@@ -30,6 +34,19 @@ const Documents = () => {
     }
   };
 
+  const loadMoreDocuments = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getPage('/api/documents/list', {}, nextCursor);
+      setDocuments(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError('Failed to load more documents.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleUpload = async (e) => {
     e.preventDefault();
     if (!file) return;
@@ -201,6 +218,8 @@ const Documents = () => {
           </tbody>
         </table>
       </div>
+
+      <LoadMoreButton hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreDocuments} />
     </div>
   );
 };
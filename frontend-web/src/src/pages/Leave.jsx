@@ -11,7 +11,8 @@ import {
   FunnelIcon,
   XMarkIcon
 } from '@heroicons/react/24/outline';
-import { api } from '../contexts/AuthContext';
+import { api, getPage } from '../contexts/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const Leave = () => {
   const [leaves, setLeaves] = useState([]);
@@ -22,6 +23,8 @@ const Leave = () => {
   const [statusFilter, setStatusFilter] = useState('');
   const [typeFilter, setTypeFilter] = useState('');
   const [submitting, setSubmitting] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchLeaveData = async () => {
@@ -29,9 +32,10 @@ const Leave = () => {
         setLoading(true);
         setError('');
 
-        // Fetch leave requests
-        const leavesResponse = await api.get('/leaves');
-        setLeaves(leavesResponse.data);
+        // Fetch the first page of leave requests
+        const page = await getPage('/leaves');
+        setLeaves(page.items);
+        setNextCursor(page.nextCursor);
 
         // Fetch leave balances
         const balancesResponse = await api.get('/leaves/balances');
@@ -88,6 +92,20 @@ const Leave = () => {
     fetchLeaveData();
   }, []);
 
+  const loadMoreLeaves = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getPage('/leaves', {}, nextCursor);
+      setLeaves(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more leave requests:', error);
+      setError('Failed to load more leave requests.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filteredLeaves = useMemo(() => {
     return leaves.filter(leave => {
       const matchesStatus = !statusFilter || leave.status === statusFilter;
@@ -336,6 +354,8 @@ const Leave = () => {
             </table>
           </div>
 
+          <LoadMoreButton hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreLeaves} />
+
           {filteredLeaves.length === 0 && (
             <div className="text-center py-12">
               <div className="w-16 h-16 bg-neutral-100 rounded-full flex items-center justify-center mx-auto mb-4">
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { api, useAuth } from '../contexts/AuthContext';
+import { api, getPage, useAuth } from '../contexts/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 import { toast } from 'react-toastify';
 import { CheckCircleIcon, XCircleIcon, ClockIcon } from '@heroicons/react/24/outline';
 
@@ -9,6 +10,8 @@ const ManagerApprovals = () => {
   const [swaps, setSwaps] = useState([]);
   const [loading, setLoading] = useState(true);
   const [processing, setProcessing] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchPendingRequests();
@@ -17,11 +20,12 @@ const ManagerApprovals = () => {
   const fetchPendingRequests = async () => {
     try {
       setLoading(true);
-      const [leavesResponse, swapsResponse] = await Promise.all([
-        api.get('/leaves?status=Pending'),
+      const [leavesPage, swapsResponse] = await Promise.all([
+        getPage('/leaves', { status: 'Pending' }),
         api.get('/shifts/swaps?status=PENDING')
       ]);
-      setLeaves(leavesResponse.data);
+      setLeaves(leavesPage.items);
+      setNextCursor(leavesPage.nextCursor);
       setSwaps(swapsResponse.data);
     } catch (error) {
       console.error('Error fetching pending requests:', error);
@@ -31,6 +35,20 @@ const ManagerApprovals = () => {
     }
   };
 
+  const loadMoreLeaves = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getPage('/leaves', { status: 'Pending' }, nextCursor);
+      setLeaves(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more leave requests:', error);
+      toast.error('Failed to load more leave requests');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleLeaveApproval = async (leaveId, status) => {
     try {
       setProcessing(leaveId);
@@ -119,6 +137,7 @@ const ManagerApprovals = () => {
                 </div>
               </div>
             ))}
+            <LoadMoreButton hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreLeaves} />
           </div>
         )}
       </div>
@@ -12,7 +12,8 @@ import {
   UserIcon,
   FlagIcon
 } from '@heroicons/react/24/outline';
-import { api, useAuth } from '../contexts/AuthContext';
+import { api, getPage, useAuth } from '../contexts/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 import TaskAttachments from '../components/TaskAttachments';
 
 const Tasks = () => {
@@ -28,6 +29,8 @@ const Tasks = () => {
   const [selectedTask, setSelectedTask] = useState(null);
   const [isEditing, setIsEditing] = useState(false);
   const [taskAttachments, setTaskAttachments] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [formData, setFormData] = useState({
     title: '',
     description: '',
@@ -43,13 +46,14 @@ const Tasks = () => {
         setLoading(true);
         setError('');
 
-        // Fetch tasks and users in parallel
-        const [tasksResponse, usersResponse] = await Promise.all([
-          api.get('/tasks'),
+        // Fetch the first page of tasks and the users in parallel
+        const [tasksPage, usersResponse] = await Promise.all([
+          getPage('/tasks'),
           api.get('/users')
         ]);
 
-        setTasks(tasksResponse.data);
+        setTasks(tasksPage.items);
+        setNextCursor(tasksPage.nextCursor);
         setUsers(usersResponse.data);
       } catch (error) {
         console.error('Error fetching data:', error);
@@ -62,6 +66,20 @@ const Tasks = () => {
     fetchData();
   }, []);
 
+  const loadMoreTasks = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getPage('/tasks', {}, nextCursor);
+      setTasks(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more tasks:', error);
+      setError('Failed to load more tasks. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filteredTasks = useMemo(() => {
     return tasks.filter(task => {
       const matchesSearch = task.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -471,6 +489,8 @@ const Tasks = () => {
           </div>
         )}
 
+        <LoadMoreButton hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreTasks} />
+
         {filteredTasks.length === 0 && (
           <div className="bg-surface border border-border rounded-lg p-12 text-center">
             <div className="w-16 h-16 bg-neutral-100 rounded-full flex items-center justify-center mx-auto mb-4">
@@ -44,11 +44,13 @@ class EmployeesState {
   final List<EmployeeProfile> employees;
   final bool isLoading;
   final String? error;
+  final String? nextCursor;
 
   EmployeesState({
     this.employees = const [],
     this.isLoading = false,
     this.error,
+    this.nextCursor,
   });
 
   EmployeesState copyWith({
@@ -60,23 +62,25 @@ class EmployeesState {
       employees: employees ?? this.employees,
       isLoading: isLoading ?? this.isLoading,
       error: error,
+      nextCursor: nextCursor,
     );
   }
 }
 
 class EmployeesNotifier extends StateNotifier<EmployeesState> {
   final ApiService _apiService;
+  bool _loadingMore = false;
 
   EmployeesNotifier(this._apiService) : super(EmployeesState());
 
   Future<void> fetchEmployees() async {
     state = state.copyWith(isLoading: true, error: null);
     try {
-      final response = await _apiService.get('/employees/');
+      final response = await _apiService.getEmployees();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
-        final employees = data.map((e) => EmployeeProfile.fromJson(e)).toList();
-        state = state.copyWith(employees: employees, isLoading: false);
+        final Map<String, dynamic> data = json.decode(response.body);
+        final employees = (data['items'] as List<dynamic>).map((e) => EmployeeProfile.fromJson(e)).toList();
+        state = EmployeesState(employees: employees, nextCursor: data['next_cursor']);
       } else {
         state = state.copyWith(isLoading: false, error: 'Failed to load employees');
       }
@@ -85,6 +89,29 @@ class EmployeesNotifier extends StateNotifier<EmployeesState> {
     }
   }
 
+  // Fetches the page after the ones already loaded and appends it
+  Future<void> loadMoreEmployees() async {
+    final cursor = state.nextCursor;
+    if (cursor == null || _loadingMore) {
+      return;
+    }
+    _loadingMore = true;
+    try {
+      final response = await _apiService.getEmployees(cursor: cursor);
+      if (response.statusCode == 200) {
+        final Map<String, dynamic> data = json.decode(response.body);
+        final employees = (data['items'] as List<dynamic>).map((e) => EmployeeProfile.fromJson(e)).toList();
+        state = EmployeesState(employees: [...state.employees, ...employees], nextCursor: data['next_cursor']);
+      } else {
+        state = state.copyWith(error: 'Failed to load more employees');
+      }
+    } catch (e) {
+      state = state.copyWith(error: e.toString());
+    } finally {
+      _loadingMore = false;
+    }
+  }
+
   // Additional methods for create, update, delete can be added here
 
   Future<void> createEmployee({
@@ -58,11 +58,13 @@ class LeavesState {
   final List<Leave> leaves;
   final bool isLoading;
   final String? error;
+  final String? nextCursor;
 
   LeavesState({
     this.leaves = const [],
     this.isLoading = false,
     this.error,
+    this.nextCursor,
   });
 
   LeavesState copyWith({
@@ -74,12 +76,14 @@ class LeavesState {
       leaves: leaves ?? this.leaves,
       isLoading: isLoading ?? this.isLoading,
       error: error,
+      nextCursor: nextCursor,
     );
   }
 }
 
 class LeavesNotifier extends StateNotifier<LeavesState> {
   final ApiService _apiService;
+  bool _loadingMore = false;
 
   LeavesNotifier(this._apiService) : super(LeavesState());
 
@@ -88,9 +92,9 @@ class LeavesNotifier extends StateNotifier<LeavesState> {
     try {
       final response = await _apiService.getLeaves();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
-        final leaves = data.map((e) => Leave.fromJson(e)).toList();
-        state = state.copyWith(leaves: leaves, isLoading: false);
+        final Map<String, dynamic> data = json.decode(response.body);
+        final leaves = (data['items'] as List<dynamic>).map((e) => Leave.fromJson(e)).toList();
+        state = LeavesState(leaves: leaves, nextCursor: data['next_cursor']);
       } else {
         state = state.copyWith(isLoading: false, error: 'Failed to load leaves');
       }
@@ -99,6 +103,29 @@ class LeavesNotifier extends StateNotifier<LeavesState> {
     }
   }
 
+  // Fetches the page after the ones already loaded and appends it
+  Future<void> loadMoreLeaves() async {
+    final cursor = state.nextCursor;
+    if (cursor == null || _loadingMore) {
+      return;
+    }
+    _loadingMore = true;
+    try {
+      final response = await _apiService.getLeaves(cursor: cursor);
+      if (response.statusCode == 200) {
+        final Map<String, dynamic> data = json.decode(response.body);
+        final leaves = (data['items'] as List<dynamic>).map((e) => Leave.fromJson(e)).toList();
+        state = LeavesState(leaves: [...state.leaves, ...leaves], nextCursor: data['next_cursor']);
+      } else {
+        state = state.copyWith(error: 'Failed to load more leaves');
+      }
+    } catch (e) {
+      state = state.copyWith(error: e.toString());
+    } finally {
+      _loadingMore = false;
+    }
+  }
+
   Future<void> createLeave({
     required int employeeId,
     required String leaveType,
@@ -54,11 +54,13 @@ class ShiftsState {
   final List<Shift> shifts;
   final bool isLoading;
   final String? error;
+  final String? nextCursor;
 
   ShiftsState({
     this.shifts = const [],
     this.isLoading = false,
     this.error,
+    this.nextCursor,
   });
 
   ShiftsState copyWith({
@@ -70,12 +72,14 @@ class ShiftsState {
       shifts: shifts ?? this.shifts,
       isLoading: isLoading ?? this.isLoading,
       error: error,
+      nextCursor: nextCursor,
     );
   }
 }
 
 class ShiftsNotifier extends StateNotifier<ShiftsState> {
   final ApiService _apiService;
+  bool _loadingMore = false;
 
   ShiftsNotifier(this._apiService) : super(ShiftsState());
 
@@ -84,9 +88,9 @@ class ShiftsNotifier extends StateNotifier<ShiftsState> {
     try {
       final response = await _apiService.getShifts();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
-        final shifts = data.map((e) => Shift.fromJson(e)).toList();
-        state = state.copyWith(shifts: shifts, isLoading: false);
+        final Map<String, dynamic> data = json.decode(response.body);
+        final shifts = (data['items'] as List<dynamic>).map((e) => Shift.fromJson(e)).toList();
+        state = ShiftsState(shifts: shifts, nextCursor: data['next_cursor']);
       } else {
         state = state.copyWith(isLoading: false, error: 'Failed to load shifts');
       }
@@ -95,6 +99,29 @@ class ShiftsNotifier extends StateNotifier<ShiftsState> {
     }
   }
 
+  // Fetches the page after the ones already loaded and appends it
+  Future<void> loadMoreShifts() async {
+    final cursor = state.nextCursor;
+    if (cursor == null || _loadingMore) {
+      return;
+    }
+    _loadingMore = true;
+    try {
+      final response = await _apiService.getShifts(cursor: cursor);
+      if (response.statusCode == 200) {
+        final Map<String, dynamic> data = json.decode(response.body);
+        final shifts = (data['items'] as List<dynamic>).map((e) => Shift.fromJson(e)).toList();
+        state = ShiftsState(shifts: [...state.shifts, ...shifts], nextCursor: data['next_cursor']);
+      } else {
+        state = state.copyWith(error: 'Failed to load more shifts');
+      }
+    } catch (e) {
+      state = state.copyWith(error: e.toString());
+    } finally {
+      _loadingMore = false;
+    }
+  }
+
   Future<void> createShift({
     required int employeeId,
     required String shiftName,
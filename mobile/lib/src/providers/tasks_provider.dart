@@ -47,11 +47,13 @@ class TasksState {
   final List<Task> tasks;
   final bool isLoading;
   final String? error;
+  final String? nextCursor;
 
   TasksState({
     this.tasks = const [],
     this.isLoading = false,
     this.error,
+    this.nextCursor,
   });
 
   TasksState copyWith({
@@ -63,12 +65,14 @@ class TasksState {
       tasks: tasks ?? this.tasks,
       isLoading: isLoading ?? this.isLoading,
       error: error ?? this.error,
+      nextCursor: nextCursor,
     );
   }
 }
 
 class TasksNotifier extends StateNotifier<TasksState> {
   final ApiService _apiService;
+  bool _loadingMore = false;
 
   TasksNotifier(this._apiService) : super(TasksState());
 
@@ -79,13 +83,12 @@ class TasksNotifier extends StateNotifier<TasksState> {
       final response = await _apiService.getTasks();
       
       if (response.statusCode == 200) {
-          final List<dynamic> data = json.decode(response.body);
-          final tasks = data.map((taskJson) => Task.fromJson(taskJson)).toList();
+          final Map<String, dynamic> data = json.decode(response.body);
+          final tasks = (data['items'] as List<dynamic>).map((taskJson) => Task.fromJson(taskJson)).toList();
           
-          state = state.copyWith(
+          state = TasksState(
             tasks: tasks,
-            isLoading: false,
-            error: null,
+            nextCursor: data['next_cursor'],
           );
       } else {
           state = state.copyWith(
@@ -101,6 +104,32 @@ class TasksNotifier extends StateNotifier<TasksState> {
     }
   }
 
+  // Fetches the page after the ones already loaded and appends it
+  Future<void> loadMoreTasks() async {
+    final cursor = state.nextCursor;
+    if (cursor == null || _loadingMore) {
+      return;
+    }
+    _loadingMore = true;
+    try {
+      final response = await _apiService.getTasks(cursor: cursor);
+      if (response.statusCode == 200) {
+        final Map<String, dynamic> data = json.decode(response.body);
+        final tasks = (data['items'] as List<dynamic>).map((taskJson) => Task.fromJson(taskJson)).toList();
+        state = TasksState(
+          tasks: [...state.tasks, ...tasks],
+          nextCursor: data['next_cursor'],
+        );
+      } else {
+        state = state.copyWith(error: 'Failed to fetch more tasks: ${response.statusCode}');
+      }
+    } catch (e) {
+      state = state.copyWith(error: 'Network error: ${e.toString()}');
+    } finally {
+      _loadingMore = false;
+    }
+  }
+
   void clearError() {
     state = state.copyWith(error: null);
   }
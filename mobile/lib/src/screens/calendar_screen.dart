@@ -78,7 +78,7 @@ class _CalendarScreenState extends State<CalendarScreen> {
     try {
       final response = await _apiService.getShifts();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
+        final List<dynamic> data = json.decode(response.body)['items'];
         setState(() {
           _shifts = data.map((item) => item as Map<String, dynamic>).toList();
         });
@@ -92,7 +92,7 @@ class _CalendarScreenState extends State<CalendarScreen> {
     try {
       final response = await _apiService.getTasks();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
+        final List<dynamic> data = json.decode(response.body)['items'];
         setState(() {
           _tasks = data.map((item) => item as Map<String, dynamic>).toList();
         });
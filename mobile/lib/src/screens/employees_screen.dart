@@ -53,6 +53,7 @@ class _EmployeesScreenState extends ConsumerState<EmployeesScreen> {
             searchController: _searchController,
             employeesState: employeesState,
             userRole: authState.role,
+            onLoadMore: () => ref.read(employeesProvider.notifier).loadMoreEmployees(),
           ),
           const _AttendanceTab(),
           const _LeaveRequestsTab(),
@@ -84,11 +85,13 @@ class _EmployeesTab extends StatelessWidget {
   final TextEditingController searchController;
   final EmployeesState employeesState;
   final String? userRole;
+  final VoidCallback onLoadMore;
 
   const _EmployeesTab({
     required this.searchController,
     required this.employeesState,
     required this.userRole,
+    required this.onLoadMore,
   });
 
   @override
@@ -151,8 +154,16 @@ class _EmployeesTab extends StatelessWidget {
                             ),
                           )
                         : ListView.builder(
-                            itemCount: employeesState.employees.length,
+                            itemCount: employeesState.employees.length +
+                                (employeesState.nextCursor != null ? 1 : 0),
                             itemBuilder: (context, index) {
+                              if (index == employeesState.employees.length) {
+                                WidgetsBinding.instance.addPostFrameCallback((_) => onLoadMore());
+                                return const Padding(
+                                  padding: EdgeInsets.all(16),
+                                  child: Center(child: CircularProgressIndicator()),
+                                );
+                              }
                               final employee = employeesState.employees[index];
                               return EmployeeCard(
                                 employee: employee,
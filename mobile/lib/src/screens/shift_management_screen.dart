@@ -82,7 +82,7 @@ class _ShiftManagementScreenState extends State<ShiftManagementScreen> {
     try {
       final response = await _apiService.getShifts();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
+        final List<dynamic> data = json.decode(response.body)['items'];
         setState(() {
           _shifts = data.map((item) => item as Map<String, dynamic>).toList();
         });
@@ -96,7 +96,7 @@ class _ShiftManagementScreenState extends State<ShiftManagementScreen> {
     try {
       final response = await _apiService.getEmployees();
       if (response.statusCode == 200) {
-        final List<dynamic> data = json.decode(response.body);
+        final List<dynamic> data = json.decode(response.body)['items'];
         setState(() {
           _employees = data.map((item) => item as Map<String, dynamic>).toList();
         });
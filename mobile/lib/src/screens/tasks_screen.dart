@@ -12,7 +12,9 @@ class TasksScreen extends ConsumerStatefulWidget {
 class _TasksScreenState extends ConsumerState<TasksScreen> {
   final ApiService _apiService = ApiService();
   List<dynamic> _tasks = [];
+  String? _nextCursor;
   bool _isLoading = true;
+  bool _isLoadingMore = false;
   Map<String, dynamic>? _currentUser;
 
   @override
@@ -35,8 +37,10 @@ class _TasksScreenState extends ConsumerState<TasksScreen> {
     setState(() => _isLoading = true);
     final response = await _apiService.getTasks();
     if (response.statusCode == 200) {
+      final data = json.decode(response.body) as Map<String, dynamic>;
       setState(() {
-        _tasks = json.decode(response.body) as List<dynamic>;
+        _tasks = data['items'] as List<dynamic>;
+        _nextCursor = data['next_cursor'] as String?;
         _isLoading = false;
       });
     } else {
@@ -45,6 +49,24 @@ class _TasksScreenState extends ConsumerState<TasksScreen> {
     }
   }
 
+  // Called when the list scrolls to its last item
+  Future<void> _fetchMoreTasks() async {
+    final cursor = _nextCursor;
+    if (cursor == null || _isLoadingMore) return;
+    setState(() => _isLoadingMore = true);
+    final response = await _apiService.getTasks(cursor: cursor);
+    if (response.statusCode == 200) {
+      final data = json.decode(response.body) as Map<String, dynamic>;
+      setState(() {
+        _tasks = [..._tasks, ...data['items'] as List<dynamic>];
+        _nextCursor = data['next_cursor'] as String?;
+        _isLoadingMore = false;
+      });
+    } else {
+      setState(() => _isLoadingMore = false);
+    }
+  }
+
   @override
   Widget build(BuildContext context) {
     return Scaffold(
@@ -62,8 +84,15 @@ class _TasksScreenState extends ConsumerState<TasksScreen> {
           : _tasks.isEmpty
               ? const Center(child: Text('No tasks available.'))
               : ListView.builder(
-                  itemCount: _tasks.length,
+                  itemCount: _tasks.length + (_nextCursor != null ? 1 : 0),
                   itemBuilder: (context, index) {
+                    if (index == _tasks.length) {
+                      WidgetsBinding.instance.addPostFrameCallback((_) => _fetchMoreTasks());
+                      return const Padding(
+                        padding: EdgeInsets.all(16),
+                        child: Center(child: CircularProgressIndicator()),
+                      );
+                    }
                     final task = _tasks[index];
                     return _TaskCard(task: task);
                   },
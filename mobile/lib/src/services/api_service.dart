@@ -72,6 +72,16 @@ class ApiService {
     );
   }
 
+  // List endpoints return one page at a time ({items, next_cursor}); pass
+  // the returned next_cursor back in to fetch the page after it
+  Future<http.Response> getPage(String endpoint, {String? cursor}) async {
+    if (cursor == null) {
+      return await get(endpoint);
+    }
+    final separator = endpoint.contains('?') ? '&' : '?';
+    return await get('$endpoint${separator}cursor=${Uri.encodeQueryComponent(cursor)}');
+  }
+
   Future<http.Response> post(String endpoint, dynamic data) async {
     if (!await isConnected()) {
       throw Exception('No internet connection');
@@ -164,8 +174,8 @@ class ApiService {
   }
 
   // Task specific methods
-  Future<http.Response> getTasks() async {
-    return await get('/tasks/');
+  Future<http.Response> getTasks({String? cursor}) async {
+    return await getPage('/tasks/', cursor: cursor);
   }
 
   Future<http.Response> createTask(Map<String, dynamic> taskData) async {
@@ -190,8 +200,8 @@ class ApiService {
   }
 
   // Employee specific methods
-  Future<http.Response> getEmployees() async {
-    return await get('/employees/');
+  Future<http.Response> getEmployees({String? cursor}) async {
+    return await getPage('/employees/', cursor: cursor);
   }
 
   Future<http.Response> getEmployee(int userId) async {
@@ -211,8 +221,8 @@ class ApiService {
   }
 
   // Leave specific methods
-  Future<http.Response> getLeaves() async {
-    return await get('/leaves/');
+  Future<http.Response> getLeaves({String? cursor}) async {
+    return await getPage('/leaves/', cursor: cursor);
   }
 
   Future<http.Response> getLeave(int leaveId) async {
@@ -236,8 +246,8 @@ class ApiService {
   }
 
   // Shift specific methods
-  Future<http.Response> getShifts() async {
-    return await get('/shifts/');
+  Future<http.Response> getShifts({String? cursor}) async {
+    return await getPage('/shifts/', cursor: cursor);
   }
 
   Future<http.Response> getShift(int shiftId) async {
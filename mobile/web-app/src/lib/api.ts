@@ -88,28 +88,56 @@ export const updateKpi = async (kpiKey: string, value: number) => {
   }
 };
 
-export const getEmployees = async () => {
+// List endpoints return one page at a time ({ items, next_cursor }). Screens
+// load the first page and pass nextCursor back to load more on demand.
+export interface Page<T = any> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+const EMPTY_PAGE: Page = { items: [], nextCursor: null };
+
+// Resolves to null on a 401
+const fetchPage = async (
+  path: string,
+  token: string,
+  what: string,
+  cursor?: string | null
+): Promise<Page | null> => {
+  const params = new URLSearchParams();
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const query = params.toString();
+  const response = await fetch(API_BASE_URL + path + (query ? '?' + query : ''), {
+    headers: {
+      'Authorization': 'Bearer ' + token,
+      'Content-Type': 'application/json',
+    },
+  });
+  if (response.status === 401) {
+    return null;
+  }
+  if (!response.ok) {
+    throw new Error('Failed to fetch ' + what);
+  }
+  const page = await response.json();
+  return { items: page.items, nextCursor: page.next_cursor };
+};
+
+export const getEmployees = async (cursor?: string | null): Promise<Page> => {
   try {
     const token = getAuthToken();
     if (!token) {
       window.location.href = '/login';
-      return [];
+      return EMPTY_PAGE;
     }
-    const response = await fetch(API_BASE_URL + '/employees/', {
-      headers: {
-        'Authorization': 'Bearer ' + token,
-        'Content-Type': 'application/json',
-      },
-    });
-    if (response.status === 401) {
+    const data = await fetchPage('/employees/', token, 'employees', cursor);
+    if (data === null) {
       clearAuthToken();
       window.location.href = '/login';
-      return [];
-    }
-    if (!response.ok) {
-      throw new Error('Failed to fetch employees');
+      return EMPTY_PAGE;
     }
-    const data = await response.json();
     return data;
   } catch (error) {
     console.error('Error fetching employees:', error);
@@ -233,28 +261,19 @@ export const getEmployee = async (employeeId: string | number) => {
   }
 };
 
-export const getTasks = async () => {
+export const getTasks = async (cursor?: string | null): Promise<Page> => {
   try {
     const token = getAuthToken();
     if (!token) {
       window.location.href = '/login';
-      return [];
+      return EMPTY_PAGE;
     }
-    const response = await fetch(API_BASE_URL + '/tasks/', {
-      headers: {
-        'Authorization': 'Bearer ' + token,
-        'Content-Type': 'application/json',
-      },
-    });
-    if (response.status === 401) {
+    const data = await fetchPage('/tasks/', token, 'tasks', cursor);
+    if (data === null) {
       clearAuthToken();
       window.location.href = '/login';
-      return [];
+      return EMPTY_PAGE;
     }
-    if (!response.ok) {
-      throw new Error('Failed to fetch tasks');
-    }
-    const data = await response.json();
     return data;
   } catch (error) {
     console.error('Error fetching tasks:', error);
@@ -592,28 +611,19 @@ export const deleteNotificationPreferences = async () => {
   }
 };
 
-export const getLeaves = async () => {
+export const getLeaves = async (cursor?: string | null): Promise<Page> => {
   try {
     const token = getAuthToken();
     if (!token) {
       window.location.href = '/login';
-      return [];
+      return EMPTY_PAGE;
     }
-    const response = await fetch(API_BASE_URL + '/leaves/', {
-      headers: {
-        'Authorization': 'Bearer ' + token,
-        'Content-Type': 'application/json',
-      },
-    });
-    if (response.status === 401) {
+    const data = await fetchPage('/leaves/', token, 'leaves', cursor);
+    if (data === null) {
       clearAuthToken();
       window.location.href = '/login';
-      return [];
-    }
-    if (!response.ok) {
-      throw new Error('Failed to fetch leaves');
+      return EMPTY_PAGE;
     }
-    const data = await response.json();
     return data;
   } catch (error) {
     console.error('Error fetching leaves:', error);
@@ -680,28 +690,19 @@ export const getMyLeaves = async () => {
   }
 };
 
-export const getShifts = async () => {
+export const getShifts = async (cursor?: string | null): Promise<Page> => {
   try {
     const token = getAuthToken();
     if (!token) {
       window.location.href = '/login';
-      return [];
+      return EMPTY_PAGE;
     }
-    const response = await fetch(API_BASE_URL + '/shifts/', {
-      headers: {
-        'Authorization': 'Bearer ' + token,
-        'Content-Type': 'application/json',
-      },
-    });
-    if (response.status === 401) {
+    const data = await fetchPage('/shifts/', token, 'shifts', cursor);
+    if (data === null) {
       clearAuthToken();
       window.location.href = '/login';
-      return [];
+      return EMPTY_PAGE;
     }
-    if (!response.ok) {
-      throw new Error('Failed to fetch shifts');
-    }
-    const data = await response.json();
     return data;
   } catch (error) {
     console.error('Error fetching shifts:', error);
@@ -42,15 +42,18 @@ const EmployeesScreen: React.FC = () => {
   const [currentPage, setCurrentPage] = useState(1);
   const [employeesPerPage] = useState(5);
   const [operationLoading, setOperationLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchEmployees = async () => {
       try {
         setLoading(true);
         setError(null);
-        const data = await getEmployees();
-        setEmployees(data);
-        setFilteredEmployees(data);
+        const page = await getEmployees();
+        setEmployees(page.items);
+        setFilteredEmployees(page.items);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         setError('Failed to load employees. Please try again.');
       } finally {
@@ -69,9 +72,25 @@ const EmployeesScreen: React.FC = () => {
       (employee.department?.toLowerCase() ?? '').includes(searchTerm.toLowerCase())
     );
     setFilteredEmployees(filtered);
-    setCurrentPage(1); // Reset to first page when filtering
   }, [searchTerm, employees]);
 
+  useEffect(() => {
+    setCurrentPage(1); // Reset to first page when filtering
+  }, [searchTerm]);
+
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getEmployees(nextCursor);
+      setEmployees(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError('Failed to load more employees. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Pagination logic
   const indexOfLastEmployee = currentPage * employeesPerPage;
   const indexOfFirstEmployee = indexOfLastEmployee - employeesPerPage;
@@ -248,6 +267,14 @@ const EmployeesScreen: React.FC = () => {
               </div>
             </div>
           )}
+
+          {nextCursor && (
+            <div className="flex justify-center mt-4">
+              <Button onClick={handleLoadMore} disabled={loadingMore} variant="outline">
+                {loadingMore ? 'Loading...' : 'Load more employees'}
+              </Button>
+            </div>
+          )}
         </>
       ) : (
         <div className="text-center py-12">
@@ -24,6 +24,8 @@ const TasksScreen: React.FC = () => {
   const [currentPage, setCurrentPage] = useState(1);
   const [tasksPerPage] = useState(5);
   const [operationLoading, setOperationLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // New state for enhanced functionality
   const [employees, setEmployees] = useState<any[]>([]);
@@ -50,9 +52,10 @@ const TasksScreen: React.FC = () => {
       try {
         setLoading(true);
         setError(null);
-        const data = await getTasks();
-        setTasks(data);
-        setFilteredTasks(data);
+        const page = await getTasks();
+        setTasks(page.items);
+        setFilteredTasks(page.items);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         setError('Failed to load tasks. Please try again.');
       } finally {
@@ -66,8 +69,8 @@ const TasksScreen: React.FC = () => {
   useEffect(() => {
     const fetchEmployees = async () => {
       try {
-        const data = await getEmployees();
-        setEmployees(data);
+        const page = await getEmployees();
+        setEmployees(page.items);
       } catch (err) {
         console.error('Failed to load employees:', err);
       }
@@ -103,9 +106,25 @@ const TasksScreen: React.FC = () => {
       return matchesSearch && matchesStatus && matchesPriority && matchesAssignee;
     });
     setFilteredTasks(filtered);
-    setCurrentPage(1); // Reset to first page when filtering
   }, [searchTerm, tasks, statusFilter, priorityFilter, assigneeFilter]);
 
+  useEffect(() => {
+    setCurrentPage(1); // Reset to first page when filtering
+  }, [searchTerm, statusFilter, priorityFilter, assigneeFilter]);
+
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getTasks(nextCursor);
+      setTasks(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError('Failed to load more tasks. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Pagination logic
   const indexOfLastTask = currentPage * tasksPerPage;
   const indexOfFirstTask = indexOfLastTask - tasksPerPage;
@@ -421,6 +440,14 @@ const TasksScreen: React.FC = () => {
               </div>
             </div>
           )}
+
+          {nextCursor && (
+            <div className="flex justify-center mt-4">
+              <Button onClick={handleLoadMore} disabled={loadingMore} variant="outline">
+                {loadingMore ? 'Loading...' : 'Load more tasks'}
+              </Button>
+            </div>
+          )}
         </>
       ) : (
         <div className="text-center py-12">